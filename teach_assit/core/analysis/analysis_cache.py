@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import javalang
+
+from teach_assit.core.analysis.static_analyzer import ANALYZER_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisResultCache:
+    """
+    Cache persistant des résultats d'analyse statique.
+
+    Un résultat est identifié par (empreinte du source, exercice, empreinte des règles,
+    version de l'analyseur). Les patterns personnalisés sont exclus de l'empreinte des
+    règles et mémorisés à part : si seuls les patterns ont changé, le résultat en cache
+    reste valable pour toutes les autres vérifications et seule la règle des patterns
+    est réévaluée.
+    """
+
+    def __init__(self, db_path=None, analyzer_version=ANALYZER_VERSION):
+        """
+        Initialise le cache.
+
+        Args:
+            db_path (str, optional): Chemin de la base SQLite. Si None, utilise
+                data/analysis_cache.db à la racine du projet.
+            analyzer_version (str): Version de l'analyseur, incluse dans la clé.
+        """
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent.parent
+            data_dir = project_root / "data"
+            os.makedirs(data_dir, exist_ok=True)
+            db_path = str(data_dir / "analysis_cache.db")
+        self.db_path = db_path
+        self.analyzer_version = f"{analyzer_version}/{getattr(javalang, '__version__', '')}"
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialize()
+
+    def _get_connection(self):
+        """Ouvre une connexion à la base du cache."""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize(self):
+        """Crée la table du cache si nécessaire."""
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_results (
+                source_hash TEXT NOT NULL,
+                exercise_id TEXT NOT NULL,
+                rules_hash TEXT NOT NULL,
+                analyzer_version TEXT NOT NULL,
+                patterns_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (source_hash, exercise_id, rules_hash, analyzer_version)
+            )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def hash_source(code):
+        """
+        Calcule l'empreinte d'un code source.
+
+        Args:
+            code (str): Code Java.
+
+        Returns:
+            str: Empreinte sha256 hexadécimale.
+        """
+        return hashlib.sha256(code.encode('utf-8', errors='surrogatepass')).hexdigest()
+
+    @staticmethod
+    def hash_config(config):
+        """
+        Calcule les empreintes des règles d'un exercice.
+
+        Args:
+            config (ExerciseConfig): Configuration de l'exercice.
+
+        Returns:
+            tuple: (empreinte des règles hors patterns, empreinte des patterns personnalisés).
+        """
+        rules = {key: value for key, value in config.rules.items() if key != 'customPatterns'}
+        rules_json = json.dumps(rules, sort_keys=True, default=str)
+        patterns_json = json.dumps(config.get_custom_patterns(), sort_keys=True, default=str)
+        return (hashlib.sha256(rules_json.encode('utf-8')).hexdigest(),
+                hashlib.sha256(patterns_json.encode('utf-8')).hexdigest())
+
+    def get(self, source_hash, exercise_id, rules_hash):
+        """
+        Lit un résultat en cache.
+
+        Args:
+            source_hash (str): Empreinte du code source.
+            exercise_id (str): Identifiant de l'exercice.
+            rules_hash (str): Empreinte des règles hors patterns.
+
+        Returns:
+            tuple: (résultat, empreinte des patterns utilisés), ou None si absent.
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                'SELECT result, patterns_hash FROM analysis_results '
+                'WHERE source_hash = ? AND exercise_id = ? AND rules_hash = ? AND analyzer_version = ?',
+                (source_hash, exercise_id, rules_hash, self.analyzer_version)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Impossible de lire le cache d'analyse: {str(e)}")
+            row = None
+        finally:
+            conn.close()
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        return json.loads(row[0]), row[1]
+
+    def record_hit(self, partial=False):
+        """
+        Comptabilise un résultat réutilisé.
+
+        Args:
+            partial (bool): True si seuls les patterns ont dû être réévalués.
+        """
+        with self._lock:
+            if partial:
+                self.partial_hits += 1
+            else:
+                self.hits += 1
+
+    def put(self, source_hash, exercise_id, rules_hash, patterns_hash, result):
+        """
+        Enregistre le résultat d'une analyse.
+
+        Args:
+            source_hash (str): Empreinte du code source.
+            exercise_id (str): Identifiant de l'exercice.
+            rules_hash (str): Empreinte des règles hors patterns.
+            patterns_hash (str): Empreinte des patterns personnalisés.
+            result (dict): Résultat de StaticAnalyzer.analyze_code (sans diagnostics du compilateur).
+        """
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO analysis_results '
+                '(source_hash, exercise_id, rules_hash, analyzer_version, patterns_hash, result, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (source_hash, exercise_id, rules_hash, self.analyzer_version, patterns_hash,
+                 json.dumps(result), time.time())
+            )
+            conn.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Impossible d'enregistrer le résultat d'analyse dans le cache: {str(e)}")
+        finally:
+            conn.close()
+
+    def invalidate(self, exercise_id=None):
+        """
+        Supprime des résultats du cache.
+
+        Args:
+            exercise_id (str, optional): Exercice dont les résultats sont à supprimer.
+                Si None, vide tout le cache.
+
+        Returns:
+            int: Nombre de résultats supprimés.
+        """
+        conn = self._get_connection()
+        try:
+            if exercise_id is None:
+                cursor = conn.execute('DELETE FROM analysis_results')
+            else:
+                cursor = conn.execute('DELETE FROM analysis_results WHERE exercise_id = ?', (exercise_id,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_stats(self):
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            dict: {'hits', 'partial_hits', 'misses'}.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'partial_hits': self.partial_hits, 'misses': self.misses}
@@ -0,0 +1,161 @@
+import javalang
+
+
+# Correspondance entre noms de structures de contrôle et types de nœuds javalang
+CONTROL_STRUCTURE_TYPES = {
+    'if': javalang.tree.IfStatement,
+    'for': javalang.tree.ForStatement,
+    'while': javalang.tree.WhileStatement,
+    'do': javalang.tree.DoStatement,
+    'switch': javalang.tree.SwitchStatement,
+    'try': javalang.tree.TryStatement
+}
+
+_STRUCTURE_NAMES = {node_type: name for name, node_type in CONTROL_STRUCTURE_TYPES.items()}
+
+
+def _position(node):
+    """Retourne (ligne, colonne) d'un nœud, ou None si javalang ne la fournit pas."""
+    position = getattr(node, 'position', None)
+    if position is None:
+        return None
+    return (position.line, position.column)
+
+
+def _type_name(type_node):
+    """Nom d'un type tel qu'attendu dans les configurations (String[] pour un tableau)."""
+    name = str(type_node.name)
+    if getattr(type_node, 'dimensions', None):
+        name += '[]'
+    return name
+
+
+class AstIndex:
+    """
+    Index des faits d'un arbre syntaxique javalang, construit en un seul parcours.
+
+    Les vérifications de l'analyseur statique interrogent cet index au lieu de
+    reparcourir l'arbre avec tree.filter() pour chaque règle.
+    """
+
+    def __init__(self, tree):
+        """
+        Initialise l'index en parcourant l'arbre une seule fois.
+
+        Args:
+            tree (CompilationUnit): Arbre syntaxique javalang (non modifié).
+        """
+        # Classes dans l'ordre du parcours : {'name', 'position', 'fields', 'methods'}
+        self.classes = []
+        # Noms des champs de toutes les classes
+        self.field_names = set()
+        # Toutes les méthodes dans l'ordre du parcours : {'name', 'params', 'param_names',
+        # 'return', 'position', 'locals', 'references'}
+        self.methods = []
+        # Déclarations de variables locales : {'name', 'position'}
+        self.local_variables = []
+        # Références à des membres : {'member', 'qualifier', 'position'}
+        self.member_references = []
+        # Nombre d'occurrences de chaque structure de contrôle
+        self.control_counts = {name: 0 for name in CONTROL_STRUCTURE_TYPES}
+        self._method_entries = {}
+        self._walk(tree)
+
+    def _method_entry(self, method_node):
+        """Retourne l'entrée d'une méthode, créée lors de sa première rencontre."""
+        entry = self._method_entries.get(id(method_node))
+        if entry is None:
+            entry = {
+                'name': method_node.name,
+                'params': [_type_name(param.type) for param in method_node.parameters],
+                'param_names': [param.name for param in method_node.parameters],
+                'return': str(method_node.return_type.name) if method_node.return_type else "void",
+                'position': _position(method_node),
+                'locals': set(param.name for param in method_node.parameters),
+                'references': set()
+            }
+            self._method_entries[id(method_node)] = entry
+        return entry
+
+    def _walk(self, tree):
+        """
+        Parcourt l'arbre en profondeur (même ordre que tree.filter) sans récursion.
+
+        Chaque élément de la pile porte les méthodes englobantes, pour rattacher les
+        variables locales et les références à toutes les méthodes qui les contiennent.
+        """
+        stack = [(tree, ())]
+        while stack:
+            node, enclosing = stack.pop()
+
+            if isinstance(node, (list, tuple)):
+                for child in reversed(node):
+                    if isinstance(child, (javalang.ast.Node, list, tuple)):
+                        stack.append((child, enclosing))
+                continue
+
+            node_type = type(node)
+            if node_type is javalang.tree.ClassDeclaration:
+                fields = []
+                for field in node.fields:
+                    for declarator in field.declarators:
+                        fields.append(declarator.name)
+                self.field_names.update(fields)
+                self.classes.append({
+                    'name': node.name,
+                    'position': _position(node),
+                    'fields': fields,
+                    'methods': [self._method_entry(method) for method in node.methods]
+                })
+            elif node_type is javalang.tree.MethodDeclaration:
+                entry = self._method_entry(node)
+                self.methods.append(entry)
+                enclosing = enclosing + (entry,)
+            elif node_type is javalang.tree.LocalVariableDeclaration:
+                for declarator in node.declarators:
+                    self.local_variables.append({'name': declarator.name, 'position': _position(node)})
+                    for method in enclosing:
+                        method['locals'].add(declarator.name)
+            elif node_type is javalang.tree.MemberReference:
+                self.member_references.append({
+                    'member': node.member,
+                    'qualifier': node.qualifier,
+                    'position': _position(node)
+                })
+                if node.qualifier is None:
+                    for method in enclosing:
+                        method['references'].add(node.member)
+            elif node_type in _STRUCTURE_NAMES:
+                self.control_counts[_STRUCTURE_NAMES[node_type]] += 1
+
+            for child in reversed(node.children):
+                if isinstance(child, (javalang.ast.Node, list, tuple)):
+                    stack.append((child, enclosing))
+
+    def class_method_signatures(self):
+        """
+        Retourne les signatures des méthodes déclarées directement dans les classes.
+
+        Returns:
+            dict: {nom de méthode: [{'params': [types], 'return': type}]}
+        """
+        signatures = {}
+        for class_entry in self.classes:
+            for method in class_entry['methods']:
+                signatures.setdefault(method['name'], []).append({
+                    'params': list(method['params']),
+                    'return': method['return']
+                })
+        return signatures
+
+    def has_control_structure(self, structure):
+        """
+        Indique si une structure de contrôle apparaît dans le code.
+
+        Args:
+            structure (str): Nom de la structure ('if', 'for', 'while', 'do', 'switch', 'try').
+
+        Returns:
+            bool: True si au moins une occurrence a été trouvée.
+        """
+        return self.control_counts.get(structure, 0) > 0
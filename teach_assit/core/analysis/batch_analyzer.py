@@ -0,0 +1,248 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from teach_assit.core.analysis.models import ExerciseConfig
+from teach_assit.core.analysis.parse_cache import ParseCache, get_shared_parse_cache
+from teach_assit.core.analysis.static_analyzer import StaticAnalyzer
+from teach_assit.core.submission_fs import read_source
+
+
+# Nombre maximum d'analyses soumises mais non terminées, par processus
+PENDING_PER_WORKER = 4
+
+# État propre à chaque processus de travail (initialisé une fois par processus)
+_worker_configs = {}
+_worker_analyzer = None
+
+
+def _init_worker(config_dicts, parse_cache_dir):
+    """
+    Initialise un processus de travail : les configurations sont transmises une seule fois.
+
+    Args:
+        config_dicts (dict): {identifiant d'exercice: dictionnaire de configuration}.
+        parse_cache_dir (str): Répertoire du cache des arbres sur disque (ou None).
+    """
+    global _worker_configs, _worker_analyzer
+    _worker_configs = {ex_id: ExerciseConfig(config_dict) for ex_id, config_dict in config_dicts.items()}
+    _worker_analyzer = StaticAnalyzer(parse_cache=ParseCache(cache_dir=parse_cache_dir))
+
+
+def analyze_job(job, configs, analyzer):
+    """
+    Analyse le fichier d'une tâche.
+
+    Args:
+        job (dict): Tâche {'student', 'file', 'path', 'exercise_id', 'compile_diagnostics' (optionnel),
+            'code' (optionnel, source déjà lu)}.
+        configs (dict): {identifiant d'exercice: ExerciseConfig}.
+        analyzer (StaticAnalyzer): Analyseur à utiliser.
+
+    Returns:
+        dict: Résultat de l'analyse, enrichi de 'exerciseId' (ou {'error', 'exerciseId'}).
+    """
+    exercise_id = job['exercise_id']
+    try:
+        config = configs.get(exercise_id)
+        if config is None:
+            raise KeyError(f"Configuration introuvable pour l'exercice {exercise_id}")
+        code = job.get('code')
+        if code is None:
+            code = read_source(job['path'])
+        result = analyzer.analyze_code(code, config, job.get('compile_diagnostics'))
+        result['exerciseId'] = exercise_id
+        return result
+    except Exception as e:
+        return {
+            'error': f"Erreur lors de l'analyse: {str(e)}",
+            'exerciseId': exercise_id
+        }
+
+
+def _analyze_in_worker(job):
+    """Analyse une tâche dans un processus de travail."""
+    return analyze_job(job, _worker_configs, _worker_analyzer)
+
+
+class BatchAnalyzer:
+    """
+    Analyse statique d'un lot de soumissions réparti sur plusieurs processus.
+
+    Les configurations d'exercices sont envoyées une fois à chaque processus ;
+    seules les tâches (chemins de fichiers) et les résultats transitent ensuite.
+    Si le pool de processus est indisponible, l'analyse se poursuit dans le
+    processus courant. Avec un cache de résultats, seuls les fichiers nouveaux ou
+    modifiés sont analysés.
+    """
+
+    def __init__(self, exercise_configs, max_workers=None, parse_cache_dir=None, result_cache=None):
+        """
+        Initialise l'analyseur par lots.
+
+        Args:
+            exercise_configs (dict): {identifiant d'exercice: ExerciseConfig}.
+            max_workers (int, optional): Nombre de processus (par défaut, nombre de cœurs).
+            parse_cache_dir (str, optional): Cache des arbres sur disque partagé par les processus.
+            result_cache (AnalysisResultCache, optional): Cache persistant des résultats d'analyse.
+        """
+        self.exercise_configs = exercise_configs
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parse_cache_dir = parse_cache_dir
+        self.result_cache = result_cache
+        self._config_hashes = {}
+        self._cancelled = False
+
+    def cancel(self):
+        """Demande l'arrêt de l'analyse : les tâches non commencées sont abandonnées."""
+        self._cancelled = True
+
+    def analyze(self, jobs):
+        """
+        Analyse les tâches et retourne les résultats au fur et à mesure.
+
+        Args:
+            jobs (iterable): Tâches {'student', 'file', 'path', 'exercise_id',
+                'compile_diagnostics' (optionnel)} ; peut être un générateur.
+
+        Yields:
+            tuple: (tâche, résultat) ; les résultats en cache d'abord, puis les
+                autres dans l'ordre de fin des analyses.
+        """
+        self._cancelled = False
+        if self.result_cache is not None:
+            to_analyze = []
+            for job in jobs:
+                if self._cancelled:
+                    return
+                cached = self._cached_result(job)
+                if cached is not None:
+                    yield job, cached
+                else:
+                    to_analyze.append(job)
+            jobs = to_analyze
+
+        for job, result in self._analyze(iter(jobs)):
+            if 'source_hash' in job and 'error' not in result:
+                self._store(job, result)
+            yield job, result
+
+    def _analyze(self, jobs):
+        """Analyse les tâches dans le pool de processus, ou dans ce processus."""
+        if self.max_workers > 1:
+            remaining = yield from self._analyze_in_pool(jobs)
+        else:
+            remaining = jobs
+        yield from self._analyze_in_process(remaining)
+
+    def _hashes(self, exercise_id):
+        """Empreintes (règles, patterns) d'un exercice, calculées une fois par lot."""
+        if exercise_id not in self._config_hashes:
+            self._config_hashes[exercise_id] = self.result_cache.hash_config(self.exercise_configs[exercise_id])
+        return self._config_hashes[exercise_id]
+
+    def _cached_result(self, job):
+        """
+        Cherche le résultat d'une tâche dans le cache.
+
+        Le source lu est conservé dans la tâche ('code', 'source_hash') pour éviter
+        une seconde lecture. Si seuls les patterns ont changé depuis l'analyse en
+        cache, seule cette règle est réévaluée.
+
+        Returns:
+            dict: Résultat, ou None si la tâche doit être analysée.
+        """
+        exercise_id = job['exercise_id']
+        config = self.exercise_configs.get(exercise_id)
+        if config is None:
+            return None
+        try:
+            job['code'] = read_source(job['path'])
+        except (OSError, UnicodeDecodeError):
+            return None
+
+        job['source_hash'] = self.result_cache.hash_source(job['code'])
+        rules_hash, patterns_hash = self._hashes(exercise_id)
+        cached = self.result_cache.get(job['source_hash'], exercise_id, rules_hash)
+        if cached is None:
+            return None
+
+        result, cached_patterns_hash = cached
+        if cached_patterns_hash != patterns_hash:
+            StaticAnalyzer(parse_cache=get_shared_parse_cache()).update_patterns(job['code'], config, result)
+            self.result_cache.put(job['source_hash'], exercise_id, rules_hash, patterns_hash, result)
+        self.result_cache.record_hit(partial=cached_patterns_hash != patterns_hash)
+        if job.get('compile_diagnostics') is not None:
+            result['compile_diagnostics'] = list(job['compile_diagnostics'])
+        result['exerciseId'] = exercise_id
+        return result
+
+    def _store(self, job, result):
+        """Enregistre le résultat d'une tâche (sans les données propres à la soumission)."""
+        rules_hash, patterns_hash = self._hashes(job['exercise_id'])
+        stored = {key: value for key, value in result.items() if key not in ('exerciseId', 'compile_diagnostics')}
+        self.result_cache.put(job['source_hash'], job['exercise_id'], rules_hash, patterns_hash, stored)
+
+    def _analyze_in_process(self, jobs):
+        """Analyse les tâches une par une dans le processus courant."""
+        analyzer = StaticAnalyzer(parse_cache=get_shared_parse_cache())
+        for job in jobs:
+            if self._cancelled:
+                return
+            yield job, analyze_job(job, self.exercise_configs, analyzer)
+
+    def _analyze_in_pool(self, jobs):
+        """
+        Analyse les tâches dans un pool de processus.
+
+        Les tâches sont soumises au fil de l'eau (au plus PENDING_PER_WORKER par
+        processus en attente), ce qui permet de les produire pendant l'analyse.
+
+        Returns:
+            iterator: Tâches restant à analyser si le pool est devenu indisponible.
+        """
+        config_dicts = {ex_id: config.to_dict() for ex_id, config in self.exercise_configs.items()}
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # 'spawn' : pas de fork d'un processus qui exécute des threads (Qt, JVM)
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(config_dicts, self.parse_cache_dir)
+            )
+        except (OSError, ValueError):
+            return jobs
+
+        pending = {}
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and not self._cancelled and len(pending) < self.max_workers * PENDING_PER_WORKER:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                    else:
+                        pending[executor.submit(_analyze_in_worker, job)] = job
+                if not pending or self._cancelled:
+                    return iter(())
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except BrokenProcessPool:
+                        # Le pool est inutilisable : terminer dans ce processus
+                        unfinished = [job] + [pending[f] for f in pending]
+                        pending.clear()
+                        return _chain(unfinished, jobs)
+                    yield job, result
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _chain(first, rest):
+    """Enchaîne une liste de tâches et un itérateur de tâches."""
+    yield from first
+    yield from rest
@@ -0,0 +1,185 @@
+from collections import deque
+
+
+# Groupes de mots-clés reconnus dans les noms de fichiers même lorsque l'identifiant
+# complet de l'exercice n'y figure pas (Intervalle.java, Log.java, ...)
+SPECIAL_KEYWORDS = (
+    ('intervalle',),
+    ('fonction', 'log'),
+)
+
+# Priorités des correspondances (la plus petite l'emporte)
+PRIORITY_ID = 0
+PRIORITY_KEYWORD = 1
+PRIORITY_SPECIAL = 2
+PRIORITY_ALIAS = 3
+
+
+def exercise_keyword(exercise_id):
+    """
+    Extrait le mot-clé d'un identifiant d'exercice ('02-intervalle' donne 'intervalle').
+
+    Args:
+        exercise_id (str): Identifiant de l'exercice.
+
+    Returns:
+        str: Mot-clé en minuscules.
+    """
+    if '-' in exercise_id:
+        return exercise_id.split('-', 1)[1].lower()
+    return exercise_id.lower()
+
+
+class KeywordAutomaton:
+    """
+    Automate d'Aho-Corasick : trouve en un seul parcours d'un texte toutes les
+    occurrences d'un ensemble de mots-clés.
+    """
+
+    def __init__(self):
+        """Initialise un automate vide."""
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        self._built = True
+
+    def add(self, keyword, value):
+        """
+        Ajoute un mot-clé à l'automate.
+
+        Args:
+            keyword (str): Mot-clé à rechercher.
+            value: Valeur retournée lorsque le mot-clé est trouvé.
+        """
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._outputs[state].append(value)
+        self._built = False
+
+    def _build(self):
+        """Calcule les liens d'échec (parcours en largeur du trie)."""
+        queue = deque()
+        for state in self._goto[0].values():
+            self._fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+        self._built = True
+
+    def search(self, text):
+        """
+        Retourne les valeurs de tous les mots-clés présents dans le texte.
+
+        Args:
+            text (str): Texte à parcourir.
+
+        Returns:
+            list: Valeurs des mots-clés trouvés (une par occurrence).
+        """
+        if not self._built:
+            self._build()
+        found = []
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            found.extend(self._outputs[state])
+        return found
+
+
+class ExerciseMatcher:
+    """
+    Associe des fichiers soumis aux exercices d'une évaluation.
+
+    Les correspondances sont, par ordre de priorité : l'identifiant complet de
+    l'exercice, son mot-clé ('intervalle' pour '02-intervalle'), les mots-clés
+    spéciaux (SPECIAL_KEYWORDS), puis les alias fournis. À priorité égale, l'ordre
+    des exercices dans l'évaluation l'emporte. Tous les mots-clés sont recherchés en
+    un seul parcours du nom de fichier, et le résultat est mémorisé par nom.
+    """
+
+    def __init__(self, exercise_ids, aliases=None):
+        """
+        Initialise le matcher.
+
+        Args:
+            exercise_ids (list): Identifiants des exercices, dans l'ordre de l'évaluation.
+            aliases (dict, optional): {identifiant d'exercice: mots-clés supplémentaires}.
+        """
+        self.exercise_ids = [ex_id for ex_id in exercise_ids if ex_id]
+        self._automaton = KeywordAutomaton()
+        self._cache = {}
+
+        for order, ex_id in enumerate(self.exercise_ids):
+            self._automaton.add(ex_id.lower(), (PRIORITY_ID, order, ex_id))
+
+        # Un mot-clé partagé par plusieurs exercices garde sa première position
+        # mais désigne le dernier exercice déclaré
+        keywords = {}
+        for ex_id in self.exercise_ids:
+            keywords[exercise_keyword(ex_id)] = ex_id
+        for order, (keyword, ex_id) in enumerate(keywords.items()):
+            self._automaton.add(keyword, (PRIORITY_KEYWORD, order, ex_id))
+
+        for order, group in enumerate(SPECIAL_KEYWORDS):
+            ex_id = next((ex_id for ex_id in self.exercise_ids
+                          if any(keyword in ex_id.lower() for keyword in group)), None)
+            if ex_id is not None:
+                for keyword in group:
+                    self._automaton.add(keyword, (PRIORITY_SPECIAL, order, ex_id))
+
+        for ex_id, ex_aliases in (aliases or {}).items():
+            if ex_id not in self.exercise_ids:
+                continue
+            order = self.exercise_ids.index(ex_id)
+            for alias in ex_aliases:
+                if alias:
+                    self._automaton.add(alias.lower(), (PRIORITY_ALIAS, order, ex_id))
+
+    def match(self, file_name):
+        """
+        Retourne l'exercice correspondant à un fichier.
+
+        Args:
+            file_name (str): Nom ou chemin relatif du fichier.
+
+        Returns:
+            str: Identifiant de l'exercice, ou None si aucun ne correspond.
+        """
+        if file_name not in self._cache:
+            found = self._automaton.search(file_name.lower())
+            self._cache[file_name] = min(found)[2] if found else None
+        return self._cache[file_name]
+
+    def filter_files(self, file_names):
+        """
+        Associe une liste de fichiers aux exercices.
+
+        Args:
+            file_names (list): Noms ou chemins relatifs des fichiers.
+
+        Returns:
+            dict: {fichier: identifiant d'exercice} pour les fichiers reconnus, dans l'ordre.
+        """
+        matched = {}
+        for file_name in file_names:
+            ex_id = self.match(file_name)
+            if ex_id is not None:
+                matched[file_name] = ex_id
+        return matched
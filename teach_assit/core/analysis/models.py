@@ -1,3 +1,9 @@
+import json
+
+from teach_assit.core.analysis.exercise_matcher import ExerciseMatcher
+from teach_assit.core.analysis.rule_program import RuleProgram
+
+
 class ExerciseConfig:
     """Représente la configuration d'un exercice."""
     
@@ -18,6 +24,9 @@ class ExerciseConfig:
         
         # Règles de vérification
         self.rules = config_dict.get('rules', {})
+        
+        # Programme de règles compilé et empreinte des règles qui l'ont produit
+        self._rule_program = None
     
     def to_dict(self):
         """
@@ -35,6 +44,24 @@ class ExerciseConfig:
             'grading_criteria': self.grading_criteria
         }
     
+    def get_rule_program(self):
+        """
+        Retourne les règles compilées (patterns, opérateurs, signatures).
+        
+        Le programme est compilé au premier appel puis réutilisé tant que les
+        règles ne changent pas ; toute modification de self.rules, y compris
+        directe, entraîne une nouvelle compilation.
+        
+        Returns:
+            RuleProgram: Programme de règles partagé (à ne pas modifier).
+        """
+        fingerprint = json.dumps(self.rules, sort_keys=True, default=str)
+        cached = self._rule_program
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, RuleProgram(self.rules))
+            self._rule_program = cached
+        return cached[1]
+    
     def get_required_methods(self):
         """Retourne la liste des méthodes requises."""
         return self.rules.get('requiredMethods', [])
@@ -151,7 +178,10 @@ class AssessmentConfig:
         self.name = config_dict.get('name', '')
         self.exercises = config_dict.get('exercises', [])
         self.total_max_points = config_dict.get('totalMaxPoints', 0)
-    
+
+        # Matcher fichiers -> exercices et identifiants d'exercices qui l'ont produit
+        self._exercise_matcher = None
+
     def to_dict(self):
         """
         Convertit l'objet en dictionnaire.
@@ -174,7 +204,24 @@ class AssessmentConfig:
             list: Liste d'identifiants d'exercices.
         """
         return [ex['exerciseId'] for ex in self.exercises]
-    
+
+    def get_exercise_matcher(self):
+        """
+        Retourne le matcher qui associe les fichiers soumis aux exercices de l'évaluation.
+
+        Le matcher est construit au premier appel puis réutilisé (avec ses
+        correspondances mémorisées) tant que la liste des exercices ne change pas.
+
+        Returns:
+            ExerciseMatcher: Matcher partagé.
+        """
+        exercise_ids = tuple(ex.get('exerciseId', '') for ex in self.exercises)
+        cached = self._exercise_matcher
+        if cached is None or cached[0] != exercise_ids:
+            cached = (exercise_ids, ExerciseMatcher(exercise_ids))
+            self._exercise_matcher = cached
+        return cached[1]
+
     def get_exercise_max_points(self, exercise_id):
         """
         Retourne le nombre maximal de points pour un exercice.
@@ -0,0 +1,139 @@
+from javalang.tokenizer import Annotation, BasicType, Identifier, Keyword, Literal, Operator, Separator, String, tokenize
+
+
+# Opérateurs qui ne sont signalés qu'entre deux opérandes (pas '-1', ni 'import java.util.*')
+BINARY_ONLY_OPERATORS = frozenset(('+', '-', '*', '/', '%'))
+
+# Jetons admis entre les chevrons d'une liste d'arguments de type (Map<String, int[]>)
+_TYPE_ARGUMENT_OPERATORS = frozenset(('<', '>', '?', '&'))
+_TYPE_ARGUMENT_SEPARATORS = frozenset(('.', ',', '[', ']'))
+_TYPE_ARGUMENT_KEYWORDS = frozenset(('extends', 'super'))
+
+# Mots-clés qui terminent une opérande
+_OPERAND_KEYWORDS = frozenset(('this', 'super'))
+
+
+def tokenize_java(code):
+    """
+    Découpe le code en jetons javalang, en ignorant les caractères invalides.
+
+    Utilisé lorsque le code ne peut pas être analysé syntaxiquement : les opérateurs
+    restent vérifiables même si le lexer rencontre une erreur.
+
+    Args:
+        code (str): Code Java.
+
+    Returns:
+        list: Jetons javalang.
+    """
+    return list(tokenize(code, ignore_errors=True))
+
+
+def _closing_type_argument(tokens, start):
+    """
+    Cherche le '>' qui ferme une liste d'arguments de type ouverte en start.
+
+    Args:
+        tokens (list): Jetons javalang.
+        start (int): Indice du '<' ouvrant.
+
+    Returns:
+        int: Indice du '>' fermant, ou None si les jetons ne forment pas un type.
+    """
+    depth = 0
+    for i in range(start, len(tokens)):
+        token = tokens[i]
+        if isinstance(token, (Identifier, BasicType, Annotation)):
+            continue
+        if isinstance(token, Operator):
+            if token.value not in _TYPE_ARGUMENT_OPERATORS:
+                return None
+            if token.value == '<':
+                depth += 1
+            elif token.value == '>':
+                depth -= 1
+                if depth == 0:
+                    return i
+        elif isinstance(token, Separator):
+            if token.value not in _TYPE_ARGUMENT_SEPARATORS:
+                return None
+        elif not isinstance(token, Keyword) or token.value not in _TYPE_ARGUMENT_KEYWORDS:
+            return None
+    return None
+
+
+def _ends_operand(token):
+    """Indique si un jeton peut terminer l'opérande gauche d'un opérateur binaire."""
+    if isinstance(token, (Identifier, Literal)):
+        return True
+    if isinstance(token, Separator):
+        return token.value in (')', ']')
+    if isinstance(token, Keyword):
+        return token.value in _OPERAND_KEYWORDS
+    if isinstance(token, Operator):
+        return token.value in ('++', '--')
+    return False
+
+
+def _is_string_literal(token):
+    """Indique si un jeton est une chaîne littérale (et non un caractère)."""
+    return isinstance(token, String) and token.value.startswith('"')
+
+
+def scan_operators(tokens):
+    """
+    Parcourt les jetons une seule fois et retourne les opérateurs réellement utilisés.
+
+    Les chevrons des types génériques sont ignorés, les '>' consécutifs sont
+    regroupés en décalages ('>>', '>>>'), les opérateurs arithmétiques ne sont
+    retenus qu'en position binaire et un '+' accolé à une chaîne littérale est une
+    concaténation. Les chaînes et commentaires ne produisant pas
+    de jetons opérateurs, ils ne sont jamais signalés.
+
+    Args:
+        tokens (list): Jetons javalang (non modifiés).
+
+    Returns:
+        list: Tuples (opérateur, ligne, colonne).
+    """
+    found = []
+    # Indices des chevrons appartenant à des arguments de type
+    type_brackets = set()
+    previous = None
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if not isinstance(token, Operator) or i in type_brackets:
+            previous = token
+            i += 1
+            continue
+
+        op = token.value
+        position = token.position
+        if op == '<' and (isinstance(previous, (Identifier, Keyword, Separator)) or previous is None):
+            closing = _closing_type_argument(tokens, i)
+            if closing is not None:
+                type_brackets.update(
+                    j for j in range(i, closing + 1)
+                    if isinstance(tokens[j], Operator) and tokens[j].value in ('<', '>')
+                )
+                previous = token
+                i += 1
+                continue
+        elif op == '>':
+            # javalang découpe '>>' et '>>>' en '>' accolés
+            while (len(op) < 3 and i + 1 < len(tokens) and i + 1 not in type_brackets
+                   and isinstance(tokens[i + 1], Operator) and tokens[i + 1].value == '>'
+                   and tokens[i + 1].position.line == position.line
+                   and tokens[i + 1].position.column == position.column + len(op)):
+                op += '>'
+                i += 1
+
+        binary = previous is not None and _ends_operand(previous)
+        following = tokens[i + 1] if i + 1 < len(tokens) else None
+        concatenation = op == '+' and (_is_string_literal(previous) or _is_string_literal(following))
+        if (op not in BINARY_ONLY_OPERATORS or binary) and not concatenation:
+            found.append((op, position.line, position.column))
+        previous = tokens[i]
+        i += 1
+    return found
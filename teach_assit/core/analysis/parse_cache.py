@@ -0,0 +1,222 @@
+import os
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+import javalang
+from javalang.parser import JavaSyntaxError, JavaParserError, Parser
+from javalang.tokenizer import LexerError, tokenize
+
+from teach_assit.core.analysis.ast_index import AstIndex
+from teach_assit.core.analysis.operator_scanner import tokenize_java
+
+
+# Nombre d'arbres conservés en mémoire par défaut
+DEFAULT_MAX_ENTRIES = 256
+
+# Erreurs déterministes de javalang : elles sont mémorisées comme les arbres
+PARSE_ERRORS = (JavaSyntaxError, JavaParserError, LexerError)
+
+
+class ParseCache:
+    """
+    Cache des arbres syntaxiques javalang, indexé par l'empreinte du code source.
+
+    Les arbres sont conservés en mémoire (LRU borné) et, si un répertoire est
+    fourni, sérialisés sur disque pour être réutilisés d'une session à l'autre.
+    Les arbres sont partagés entre les analyses : ils ne doivent pas être modifiés.
+    L'index des faits de chaque arbre (AstIndex) et les jetons du code sont
+    conservés avec lui en mémoire.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, cache_dir=None):
+        """
+        Initialise le cache.
+
+        Args:
+            max_entries (int): Nombre maximum d'arbres conservés en mémoire.
+            cache_dir (str, optional): Répertoire du cache sur disque (désactivé si None).
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(code):
+        """
+        Calcule la clé d'un code source.
+
+        Args:
+            code (str): Code Java.
+
+        Returns:
+            str: Empreinte sha256 hexadécimale (inclut la version de javalang).
+        """
+        digest = hashlib.sha256(code.encode('utf-8', errors='surrogatepass'))
+        digest.update(b"\0" + getattr(javalang, '__version__', '').encode('ascii'))
+        return digest.hexdigest()
+
+    def parse(self, code):
+        """
+        Analyse syntaxiquement le code, ou retourne l'arbre déjà calculé.
+
+        Args:
+            code (str): Code Java.
+
+        Returns:
+            CompilationUnit: Arbre syntaxique javalang.
+
+        Raises:
+            JavaSyntaxError, JavaParserError, LexerError: Comme javalang.parse.parse.
+        """
+        _, entry = self._entry(code)
+        if entry['error'] is not None:
+            raise entry['error']
+        return entry['tree']
+
+    def index(self, code):
+        """
+        Retourne l'index des faits de l'arbre du code, construit une seule fois par arbre.
+
+        Args:
+            code (str): Code Java.
+
+        Returns:
+            AstIndex: Index de l'arbre syntaxique.
+
+        Raises:
+            JavaSyntaxError, JavaParserError, LexerError: Comme javalang.parse.parse.
+        """
+        _, entry = self._entry(code)
+        if entry['error'] is not None:
+            raise entry['error']
+        if entry['index'] is None:
+            entry['index'] = AstIndex(entry['tree'])
+        return entry['index']
+
+    def tokens(self, code):
+        """
+        Retourne les jetons du code, ceux-là mêmes qui ont servi à l'analyse syntaxique.
+
+        Disponibles aussi pour un code syntaxiquement invalide ; si le lexer a
+        échoué, le code est redécoupé en ignorant les caractères invalides.
+
+        Args:
+            code (str): Code Java.
+
+        Returns:
+            list: Jetons javalang (à ne pas modifier).
+        """
+        _, entry = self._entry(code)
+        if entry['tokens'] is None:
+            entry['tokens'] = tokenize_java(code)
+        return entry['tokens']
+
+    def _entry(self, code):
+        """
+        Retourne (clé, entrée) du code en l'analysant si nécessaire.
+
+        L'entrée est un dictionnaire {'tree', 'error', 'index', 'tokens'} : le code
+        est découpé en jetons une seule fois, et ces jetons alimentent le parser.
+        """
+        key = self.make_key(code)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                with self._lock:
+                    self.hits += 1
+            else:
+                with self._lock:
+                    self.misses += 1
+                entry = {'tree': None, 'error': None, 'index': None, 'tokens': None}
+                try:
+                    entry['tokens'] = list(tokenize(code))
+                    entry['tree'] = Parser(entry['tokens']).parse()
+                    self._save(key, entry['tree'])
+                except PARSE_ERRORS as e:
+                    entry['error'] = e
+            self._remember(key, entry)
+
+        return key, entry
+
+    def _remember(self, key, entry):
+        """Ajoute une entrée en mémoire en évinçant la moins récemment utilisée."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _path(self, key):
+        """Chemin du fichier d'une entrée sur disque."""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pickle")
+
+    def _load(self, key):
+        """Charge l'entrée d'un arbre depuis le disque (None si absente ou illisible)."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), 'rb') as cache_file:
+                return {'tree': pickle.load(cache_file), 'error': None, 'index': None, 'tokens': None}
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+
+    def _save(self, key, tree):
+        """Enregistre un arbre sur disque (ignoré en cas d'échec)."""
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump(tree, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except (OSError, pickle.PicklingError, RecursionError):
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def clear(self):
+        """Vide le cache en mémoire."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self):
+        """
+        Retourne les compteurs du cache.
+
+        Returns:
+            dict: {'hits', 'misses', 'size'} (size : nombre d'arbres en mémoire).
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_parse_cache():
+    """
+    Retourne le cache en mémoire partagé par les analyseurs du processus.
+
+    Returns:
+        ParseCache: Cache partagé.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = ParseCache()
+        return _shared_cache
@@ -0,0 +1,113 @@
+import re
+
+from teach_assit.core.analysis.operator_scanner import scan_operators
+
+
+# Tous les opérateurs possibles en Java (vérifiés par l'analyseur)
+ALL_OPERATORS = ('+', '-', '*', '/', '%', '==', '!=', '>', '<', '>=', '<=', '&&', '||', '!', '&', '|', '^', '~', '<<', '>>', '>>>')
+
+
+def _signature_pattern(method_return, method_name, method_params):
+    """
+    Construit l'expression régulière d'une signature de méthode.
+
+    Args:
+        method_return (str): Type de retour attendu.
+        method_name (str): Nom de la méthode, ou un groupe regex pour capturer le nom.
+        method_params (list): Types des paramètres.
+
+    Returns:
+        str: Expression régulière de la déclaration de la méthode.
+    """
+    param_pattern = r"\s*,\s*".join(f"{re.escape(param_type)}\\s+\\w+" for param_type in method_params)
+    return rf"(public|private|protected)?\s+(static)?\s+{re.escape(method_return)}\s+{method_name}\s*\(\s*{param_pattern}?\s*\)"
+
+
+class RuleProgram:
+    """
+    Règles d'un exercice compilées une fois pour toutes les analyses.
+
+    Contient les patterns précompilés, l'ensemble des opérateurs interdits
+    et les signatures de méthodes résolues. Une instance est partagée entre les
+    analyses : elle ne doit pas être modifiée (ExerciseConfig en recrée une
+    lorsque ses règles changent).
+    """
+
+    def __init__(self, rules):
+        """
+        Initialise le programme en compilant les règles.
+
+        Args:
+            rules (dict): Règles de vérification de la configuration d'exercice.
+        """
+        self.required_methods = tuple(self._compile_method(method) for method in rules.get('requiredMethods', []))
+        self.patterns = tuple(
+            self._compile_pattern(pattern_info)
+            for pattern_info in rules.get('customPatterns', [])
+            if pattern_info.get('pattern', '')
+        )
+        self.allowed_operators = tuple(rules.get('allowedOperators', []))
+        self.disallowed_operators = frozenset(op for op in ALL_OPERATORS if op not in self.allowed_operators)
+
+    @staticmethod
+    def _compile_method(required_method):
+        """
+        Résout la signature d'une méthode requise.
+
+        Args:
+            required_method (dict): Méthode requise ({'name', 'params', 'returnType'}).
+
+        Returns:
+            dict: {'name', 'params', 'return', 'regex', 'any_name_regex'} ; any_name_regex
+                capture le nom (groupe 3) des méthodes de même signature.
+        """
+        method_name = required_method.get('name', '')
+        method_params = list(required_method.get('params', []))
+        method_return = required_method.get('returnType', 'void')
+        return {
+            'name': method_name,
+            'params': method_params,
+            'return': method_return,
+            'regex': re.compile(_signature_pattern(method_return, re.escape(method_name), method_params), re.IGNORECASE),
+            'any_name_regex': re.compile(_signature_pattern(method_return, r"(\w+)", method_params), re.IGNORECASE)
+        }
+
+    @staticmethod
+    def _compile_pattern(pattern_info):
+        """
+        Compile un pattern personnalisé.
+
+        Args:
+            pattern_info (dict): Pattern de la configuration.
+
+        Returns:
+            dict: {'description', 'errorMessage', 'required', 'negative', 'regex', 'error'} ;
+                regex vaut None et error contient le message si l'expression est invalide.
+        """
+        compiled = {
+            'description': pattern_info.get('description', ''),
+            'errorMessage': pattern_info.get('errorMessage', ''),
+            'required': pattern_info.get('required', False),
+            'negative': pattern_info.get('negative', False),
+            'regex': None,
+            'error': None
+        }
+        try:
+            compiled['regex'] = re.compile(pattern_info['pattern'], re.DOTALL)
+        except re.error as e:
+            compiled['error'] = str(e)
+        return compiled
+
+    def find_disallowed_operators(self, tokens):
+        """
+        Recherche les opérateurs non autorisés en un seul parcours des jetons.
+
+        Args:
+            tokens (list): Jetons javalang du code (ParseCache.tokens).
+
+        Returns:
+            list: Tuples (opérateur, ligne, colonne).
+        """
+        if not self.disallowed_operators:
+            return []
+        return [found for found in scan_operators(tokens) if found[0] in self.disallowed_operators]
@@ -16,6 +16,26 @@ from teach_assit.core.database.managers import (
     FeedbackManager
 )
 
+# Appels dont les requêtes filtrées doivent toujours utiliser un index :
+# (méthode du DatabaseManager, arguments). Les valeurs ne désignent aucune ligne.
+AUDITED_CALLS = [
+    ('get_extracted_folders_by_zip', (0,)),
+    ('get_files_by_folder', (0,)),
+    ('delete_zip_file', (0,)),
+    ('delete_extracted_folders_under', ('/tmp',)),
+    ('update_extracted_folder_status', (0, 'active')),
+    ('get_exercise_config', ('',)),
+    ('delete_exercise_config', ('',)),
+    ('get_assessment_config', ('',)),
+    ('delete_assessment_config', ('',)),
+    ('get_setting', ('',)),
+    ('delete_setting', ('',)),
+    ('get_feedback', (0,)),
+    ('get_student_feedbacks', ('',)),
+    ('get_assessment_feedbacks', ('',)),
+    ('delete_feedback', (0,)),
+]
+
 class DatabaseManager:
     """Gestionnaire de base de données SQLite pour l'application TeachAssist."""
     
@@ -51,11 +71,40 @@ class DatabaseManager:
         # Initialisation de la structure de la base de données
         self.schema_manager.initialize_database()
     
+    def close(self):
+        """Ferme les connexions à la base de données (rouvertes automatiquement au besoin)."""
+        self.connection_provider.close()
+    
+    def get_schema_version(self):
+        """
+        Retourne la version du schéma de la base de données.
+        
+        Returns:
+            int: Nombre de migrations appliquées
+        """
+        return self.schema_manager.get_schema_version()
+    
+    def audit_query_plans(self, calls=None):
+        """
+        Vérifie qu'aucune requête filtrée des gestionnaires ne parcourt une table entière.
+        
+        Args:
+            calls (list, optional): Liste de (nom de méthode, arguments) à exécuter.
+                Par défaut, AUDITED_CALLS.
+            
+        Returns:
+            list: [{'query': requête, 'scans': étapes de parcours complet}], vide si tout est indexé
+        """
+        if calls is None:
+            calls = AUDITED_CALLS
+        return self.schema_manager.audit_query_plans(
+            [(getattr(self, name), args) for name, args in calls])
+    
     # Méthodes déléguées au ZipManager
     
-    def add_zip_file(self, filename, filepath, file_size, md5_hash=None, description=None):
+    def add_zip_file(self, filename, filepath, file_size, md5_hash=None, description=None, file_mtime=None):
         """
-        Ajoute un fichier ZIP à la base de données.
+        Ajoute un fichier ZIP à la base de données (ou met à jour l'archive de même chemin et même empreinte MD5).
         
         Args:
             filename (str): Nom du fichier ZIP
@@ -63,11 +112,12 @@ class DatabaseManager:
             file_size (int): Taille du fichier en octets
             md5_hash (str, optional): Hash MD5 du fichier pour vérification
             description (str, optional): Description du contenu du ZIP
+            file_mtime (float, optional): Date de modification du fichier
             
         Returns:
             int: ID du fichier ZIP dans la base de données
         """
-        return self.zip_manager.add_zip_file(filename, filepath, file_size, md5_hash, description)
+        return self.zip_manager.add_zip_file(filename, filepath, file_size, md5_hash, description, file_mtime)
     
     def add_extracted_folder(self, zip_id, folder_path):
         """
@@ -97,6 +147,54 @@ class DatabaseManager:
         """
         return self.zip_manager.add_extracted_file(folder_id, filepath, file_size, file_type)
     
+    def add_extracted_files_bulk(self, folder_id, files):
+        """
+        Ajoute en une seule transaction les fichiers d'un dossier extrait.
+        
+        Args:
+            folder_id (int): ID du dossier contenant les fichiers
+            files (iterable): Tuples (filepath, file_size, file_type)
+            
+        Returns:
+            int: Nombre de fichiers ajoutés
+        """
+        return self.zip_manager.add_extracted_files_bulk(folder_id, files)
+    
+    def import_zip_with_contents(self, filename, filepath, file_size, folder_path, files,
+                                 md5_hash=None, description=None):
+        """
+        Enregistre en une seule transaction un fichier ZIP, son dossier extrait et ses fichiers.
+        
+        Args:
+            filename (str): Nom du fichier ZIP
+            filepath (str): Chemin complet vers le fichier
+            file_size (int): Taille du fichier en octets
+            folder_path (str): Chemin vers le dossier extrait
+            files (iterable): Tuples (filepath, file_size, file_type) des fichiers extraits
+            md5_hash (str, optional): Hash MD5 du fichier pour vérification
+            description (str, optional): Description du contenu du ZIP
+            
+        Returns:
+            tuple: (zip_id, folder_id)
+        """
+        return self.zip_manager.import_zip_with_contents(filename, filepath, file_size, folder_path, files,
+                                                         md5_hash, description)
+    
+    def import_zips_with_contents(self, archives):
+        """
+        Enregistre un lot de fichiers ZIP extraits en une seule transaction.
+        
+        Les archives déjà connues (même chemin et même empreinte MD5) sont mises
+        à jour et conservent leur dossier extrait.
+        
+        Args:
+            archives (list): Dictionnaires décrivant chaque archive (voir ZipManager)
+            
+        Returns:
+            list: Tuples (zip_id, folder_id), dans l'ordre des archives
+        """
+        return self.zip_manager.import_zips_with_contents(archives)
+    
     def get_all_zip_files(self):
         """
         Récupère tous les fichiers ZIP stockés dans la base de données.
@@ -106,6 +204,15 @@ class DatabaseManager:
         """
         return self.zip_manager.get_all_zip_files()
     
+    def get_archive_states(self):
+        """
+        Récupère en une requête l'état de toutes les archives connues et de leurs dossiers extraits.
+        
+        Returns:
+            list: Tuples (zip_id, filepath, file_size, file_mtime, md5_hash, folder_id, folder_path)
+        """
+        return self.zip_manager.get_archive_states()
+    
     def get_extracted_folders_by_zip(self, zip_id):
         """
         Récupère tous les dossiers extraits pour un fichier ZIP donné.
@@ -142,6 +249,30 @@ class DatabaseManager:
         """
         return self.zip_manager.delete_zip_file(zip_id)
     
+    def delete_zip_files(self, zip_ids):
+        """
+        Supprime un lot de fichiers ZIP et leurs dossiers/fichiers en une seule transaction.
+        
+        Args:
+            zip_ids (iterable): IDs des fichiers ZIP à supprimer
+            
+        Returns:
+            list: Chemins des dossiers extraits qui ne sont plus référencés par aucune archive
+        """
+        return self.zip_manager.delete_zip_files(zip_ids)
+    
+    def delete_extracted_folders_under(self, root_dir):
+        """
+        Supprime les dossiers extraits situés dans un répertoire, et leurs fichiers.
+        
+        Args:
+            root_dir (str): Répertoire supprimé du disque
+            
+        Returns:
+            int: Nombre de dossiers supprimés
+        """
+        return self.zip_manager.delete_extracted_folders_under(root_dir)
+    
     def update_extracted_folder_status(self, folder_id, status):
         """
         Met à jour le statut d'un dossier extrait.
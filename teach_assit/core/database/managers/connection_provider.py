@@ -3,25 +3,143 @@ Fournisseur de connexion à la base de données.
 Centralise la création et la gestion des connexions à la base de données.
 """
 
+import atexit
 import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+# Réglages appliqués à chaque connexion
+BUSY_TIMEOUT = 30  # secondes d'attente si la base est verrouillée par un autre processus
+CACHE_SIZE_KB = 8192  # cache de pages par connexion
+MMAP_SIZE = 64 * 1024 * 1024  # lecture du fichier par projection mémoire
+
+# Fournisseurs encore ouverts, fermés à l'arrêt de l'application
+_open_providers = weakref.WeakSet()
+
+
+class _ThreadConnection:
+    """Connexion d'un thread, conservée dans ses données locales."""
+
+    def __init__(self, conn, generation):
+        self.conn = conn
+        self.generation = generation
+
+
+def _release_connection(provider_ref, conn):
+    """Ferme la connexion d'un thread terminé et l'oublie."""
+    provider = provider_ref()
+    if provider is not None:
+        with provider._lock:
+            if conn in provider._connections:
+                provider._connections.remove(conn)
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+
 
 class ConnectionProvider:
-    """Fournisseur de connexion à la base de données SQLite."""
-    
+    """
+    Fournisseur de connexion à la base de données SQLite.
+
+    Chaque thread réutilise sa propre connexion au lieu d'en ouvrir une à chaque
+    appel. La base est en mode WAL avec synchronous=NORMAL : un commit n'attend
+    plus l'écriture physique sur disque, seuls les points de contrôle du journal
+    le font. Les clés étrangères sont appliquées (suppressions en cascade).
+    La connexion d'un thread est fermée quand ce thread se termine ; close()
+    (ou l'arrêt du programme) ferme toutes les connexions encore ouvertes.
+    """
+
     def __init__(self, db_path):
         """
         Initialise le fournisseur de connexion.
-        
+
         Args:
             db_path (str): Chemin vers le fichier de base de données SQLite
         """
         self.db_path = db_path
-    
+        self._local = threading.local()
+        # Réentrant : un thread terminé peut libérer sa connexion pendant un appel en cours
+        self._lock = threading.RLock()
+        self._connections = []
+        # Incrémenté par close() : les connexions des générations précédentes sont rouvertes
+        self._generation = 0
+        _open_providers.add(self)
+
+    def _connect(self):
+        """
+        Ouvre et configure une nouvelle connexion.
+
+        Returns:
+            sqlite3.Connection: Connexion configurée
+        """
+        # check_same_thread=False : la connexion n'est utilisée que par son thread,
+        # mais close() doit pouvoir la fermer depuis un autre thread
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KB}')
+        conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        return conn
+
     def get_connection(self):
         """
-        Fournit une connexion à la base de données.
-        
+        Fournit la connexion du thread courant à la base de données.
+
+        La connexion est partagée par tous les appels du même thread : elle ne doit
+        pas être fermée par l'appelant.
+
         Returns:
             sqlite3.Connection: Connexion à la base de données
         """
-        return sqlite3.connect(self.db_path) 
\ No newline at end of file
+        holder = getattr(self._local, 'holder', None)
+        if holder is not None and holder.generation == self._generation:
+            return holder.conn
+
+        conn = self._connect()
+        with self._lock:
+            self._connections.append(conn)
+            holder = _ThreadConnection(conn, self._generation)
+            self._local.holder = holder
+        # Les données locales du thread sont libérées à sa fin : la connexion est alors fermée
+        weakref.finalize(holder, _release_connection, weakref.ref(self), conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Exécute un bloc d'opérations dans une seule transaction.
+
+        Les modifications sont validées en une fois à la fin du bloc, ou annulées
+        si une exception est levée.
+
+        Yields:
+            sqlite3.Connection: Connexion du thread courant
+        """
+        conn = self.get_connection()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def close(self):
+        """Ferme toutes les connexions ouvertes (elles seront rouvertes au besoin)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._generation += 1
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+@atexit.register
+def close_all_connections():
+    """Ferme les connexions de tous les fournisseurs encore ouverts."""
+    for provider in list(_open_providers):
+        provider.close()
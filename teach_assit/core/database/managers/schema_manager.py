@@ -5,6 +5,77 @@ Gère la création et la mise à jour de la structure de la base de données.
 
 import sqlite3
 
+# Migrations du schéma, appliquées dans l'ordre : la migration d'indice i amène la
+# base à la version i + 1 (PRAGMA user_version). Ne jamais modifier une migration
+# déjà publiée, en ajouter une nouvelle.
+MIGRATIONS = [
+    # 1 : index des colonnes filtrées par les gestionnaires
+    [
+        'CREATE INDEX IF NOT EXISTS idx_extracted_folders_zip_id '
+        'ON extracted_folders (zip_id, extraction_date)',
+        'CREATE INDEX IF NOT EXISTS idx_extracted_files_folder_id '
+        'ON extracted_files (folder_id)',
+        'CREATE INDEX IF NOT EXISTS idx_feedbacks_student_name '
+        'ON feedbacks (student_name, creation_date)',
+        'CREATE INDEX IF NOT EXISTS idx_feedbacks_assessment_id '
+        'ON feedbacks (assessment_id, student_name, creation_date DESC)',
+    ],
+    # 2 : suppression en cascade des dossiers et fichiers extraits (SQLite ne permet pas
+    # de modifier une clé étrangère : les tables sont reconstruites, sans les lignes orphelines)
+    [
+        '''
+        CREATE TABLE extracted_folders_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            zip_id INTEGER NOT NULL,
+            folder_path TEXT NOT NULL,
+            extraction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            status TEXT DEFAULT 'active',
+            FOREIGN KEY (zip_id) REFERENCES zip_files (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        INSERT INTO extracted_folders_new (id, zip_id, folder_path, extraction_date, status)
+        SELECT id, zip_id, folder_path, extraction_date, status FROM extracted_folders
+        WHERE zip_id IN (SELECT id FROM zip_files)
+        ''',
+        'DROP TABLE extracted_folders',
+        'ALTER TABLE extracted_folders_new RENAME TO extracted_folders',
+        '''
+        CREATE TABLE extracted_files_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            folder_id INTEGER NOT NULL,
+            filepath TEXT NOT NULL,
+            file_size INTEGER NOT NULL,
+            file_type TEXT,
+            FOREIGN KEY (folder_id) REFERENCES extracted_folders (id) ON DELETE CASCADE
+        )
+        ''',
+        '''
+        INSERT INTO extracted_files_new (id, folder_id, filepath, file_size, file_type)
+        SELECT id, folder_id, filepath, file_size, file_type FROM extracted_files
+        WHERE folder_id IN (SELECT id FROM extracted_folders)
+        ''',
+        'DROP TABLE extracted_files',
+        'ALTER TABLE extracted_files_new RENAME TO extracted_files',
+        'CREATE INDEX IF NOT EXISTS idx_extracted_folders_zip_id '
+        'ON extracted_folders (zip_id, extraction_date)',
+        'CREATE INDEX IF NOT EXISTS idx_extracted_files_folder_id '
+        'ON extracted_files (folder_id)',
+        # Un dossier extrait peut être partagé par plusieurs archives identiques
+        'CREATE INDEX IF NOT EXISTS idx_extracted_folders_folder_path '
+        'ON extracted_folders (folder_path)',
+    ],
+    # 3 : date de modification du fichier pour reconnaître une archive inchangée sans
+    # recalculer son empreinte, et recherche d'une archive par empreinte et chemin
+    [
+        'ALTER TABLE zip_files ADD COLUMN file_mtime REAL',
+        'CREATE INDEX IF NOT EXISTS idx_zip_files_md5_filepath ON zip_files (md5_hash, filepath)',
+    ],
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
 class SchemaManager:
     """Gestionnaire du schéma de la base de données."""
     
@@ -28,7 +99,7 @@ class SchemaManager:
         cursor = conn.cursor()
         
         try:
-            # Table pour les fichiers ZIP
+            # Table pour les fichiers ZIP (la colonne file_mtime est ajoutée par la migration 3)
             cursor.execute('''
             CREATE TABLE IF NOT EXISTS zip_files (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -49,7 +120,7 @@ class SchemaManager:
                 folder_path TEXT NOT NULL,
                 extraction_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 status TEXT DEFAULT 'active',
-                FOREIGN KEY (zip_id) REFERENCES zip_files (id)
+                FOREIGN KEY (zip_id) REFERENCES zip_files (id) ON DELETE CASCADE
             )
             ''')
             
@@ -61,7 +132,7 @@ class SchemaManager:
                 filepath TEXT NOT NULL,
                 file_size INTEGER NOT NULL,
                 file_type TEXT,
-                FOREIGN KEY (folder_id) REFERENCES extracted_folders (id)
+                FOREIGN KEY (folder_id) REFERENCES extracted_folders (id) ON DELETE CASCADE
             )
             ''')
             
@@ -114,9 +185,102 @@ class SchemaManager:
             )
             ''')
             
+            self._apply_migrations(conn)
+            
             conn.commit()
             return True
         except sqlite3.Error as e:
             print(f"Erreur lors de l'initialisation de la base de données: {e}")
             conn.rollback()
-            return False 
\ No newline at end of file
+            return False
+    
+    def get_schema_version(self):
+        """
+        Retourne la version du schéma de la base de données.
+        
+        Returns:
+            int: Nombre de migrations appliquées (PRAGMA user_version)
+        """
+        conn = self.connection_provider.get_connection()
+        return conn.execute('PRAGMA user_version').fetchone()[0]
+    
+    def _apply_migrations(self, conn):
+        """
+        Applique les migrations qui manquent à la base, dans une seule transaction.
+        
+        Les clés étrangères sont désactivées pendant les migrations : reconstruire
+        une table ne doit pas supprimer en cascade les lignes qui la référencent.
+        
+        Args:
+            conn (sqlite3.Connection): Connexion du thread courant
+        """
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        
+        # PRAGMA foreign_keys est sans effet à l'intérieur d'une transaction
+        conn.commit()
+        conn.execute('PRAGMA foreign_keys=OFF')
+        try:
+            conn.execute('BEGIN')
+            for index in range(version, SCHEMA_VERSION):
+                for statement in MIGRATIONS[index]:
+                    conn.execute(statement)
+                # PRAGMA n'accepte pas de paramètre lié ; la valeur est un entier
+                conn.execute(f'PRAGMA user_version = {index + 1}')
+            conn.commit()
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute('PRAGMA foreign_keys=ON')
+    
+    def find_full_scans(self, statement):
+        """
+        Indique les tables parcourues en entier par une requête (EXPLAIN QUERY PLAN).
+        
+        Args:
+            statement (str): Requête SQL complète (sans paramètre à lier)
+            
+        Returns:
+            list: Étapes du plan qui parcourent une table entière ('SCAN feedbacks')
+        """
+        conn = self.connection_provider.get_connection()
+        plan = conn.execute(f'EXPLAIN QUERY PLAN {statement}').fetchall()
+        return [row[3] for row in plan if row[3].startswith('SCAN ') and row[3] != 'SCAN CONSTANT ROW']
+    
+    def audit_query_plans(self, calls):
+        """
+        Exécute des appels aux gestionnaires et vérifie le plan de chacune de leurs requêtes.
+        
+        Les requêtes exécutées sont enregistrées (avec leurs paramètres) par la
+        fonction de trace de la connexion du thread courant, puis leur plan est
+        examiné : une requête filtrée qui parcourt une table entière signale un
+        index manquant.
+        
+        Args:
+            calls (list): Liste de (fonction, arguments) à exécuter
+            
+        Returns:
+            list: [{'query': requête, 'scans': étapes de parcours complet}], vide si tout est indexé
+        """
+        conn = self.connection_provider.get_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            for function, args in calls:
+                function(*args)
+        finally:
+            conn.set_trace_callback(None)
+        
+        regressions = []
+        seen = set()
+        for statement in statements:
+            query = ' '.join(statement.split())
+            keyword = query.split(' ', 1)[0].upper()
+            if keyword not in ('SELECT', 'UPDATE', 'DELETE') or ' WHERE ' not in query.upper() or query in seen:
+                continue
+            seen.add(query)
+            scans = self.find_full_scans(query)
+            if scans:
+                regressions.append({'query': query, 'scans': scans})
+        return regressions
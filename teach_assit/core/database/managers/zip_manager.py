@@ -2,8 +2,12 @@
 Gestionnaire des fichiers ZIP dans la base de données.
 """
 
+import os
 import sqlite3
 
+# Nombre maximal d'identifiants par clause IN (limite des paramètres liés de SQLite)
+IN_CLAUSE_CHUNK = 500
+
 class ZipManager:
     """Gestionnaire des fichiers ZIP et des dossiers/fichiers extraits."""
     
@@ -16,31 +20,35 @@ class ZipManager:
         """
         self.connection_provider = connection_provider
     
-    def add_zip_file(self, filename, filepath, file_size, md5_hash=None, description=None):
+    def add_zip_file(self, filename, filepath, file_size, md5_hash=None, description=None, file_mtime=None):
         """
         Ajoute un fichier ZIP à la base de données.
         
+        Une archive déjà importée depuis le même chemin avec la même empreinte MD5
+        n'est pas ajoutée une seconde fois : son enregistrement est mis à jour (nom,
+        taille, date). Une archive identique à un autre chemin (par exemple celle d'un
+        autre étudiant) a sa propre ligne.
+        
         Args:
             filename (str): Nom du fichier ZIP
             filepath (str): Chemin complet vers le fichier
             file_size (int): Taille du fichier en octets
             md5_hash (str, optional): Hash MD5 du fichier pour vérification
             description (str, optional): Description du contenu du ZIP
+            file_mtime (float, optional): Date de modification du fichier (os.stat)
             
         Returns:
             int: ID du fichier ZIP dans la base de données
         """
-        conn = self.connection_provider.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        INSERT INTO zip_files (filename, filepath, file_size, md5_hash, description)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (filename, filepath, file_size, md5_hash, description))
-        
-        zip_id = cursor.lastrowid
-        conn.commit()
-        
+        with self.connection_provider.transaction() as conn:
+            zip_id, _ = self._upsert_zip_file(conn.cursor(), {
+                'filename': filename,
+                'filepath': filepath,
+                'file_size': file_size,
+                'md5_hash': md5_hash,
+                'description': description,
+                'file_mtime': file_mtime
+            })
         return zip_id
     
     def add_extracted_folder(self, zip_id, folder_path):
@@ -93,6 +101,145 @@ class ZipManager:
         
         return file_id
     
+    def add_extracted_files_bulk(self, folder_id, files):
+        """
+        Ajoute en une seule transaction les fichiers d'un dossier extrait.
+        
+        Args:
+            folder_id (int): ID du dossier contenant les fichiers
+            files (iterable): Tuples (filepath, file_size, file_type)
+            
+        Returns:
+            int: Nombre de fichiers ajoutés
+        """
+        with self.connection_provider.transaction() as conn:
+            return self._insert_extracted_files(conn.cursor(), folder_id, files)
+    
+    def import_zip_with_contents(self, filename, filepath, file_size, folder_path, files,
+                                 md5_hash=None, description=None):
+        """
+        Enregistre en une seule transaction un fichier ZIP, son dossier extrait et ses fichiers.
+        
+        Args:
+            filename (str): Nom du fichier ZIP
+            filepath (str): Chemin complet vers le fichier
+            file_size (int): Taille du fichier en octets
+            folder_path (str): Chemin vers le dossier extrait
+            files (iterable): Tuples (filepath, file_size, file_type) des fichiers extraits
+            md5_hash (str, optional): Hash MD5 du fichier pour vérification
+            description (str, optional): Description du contenu du ZIP
+            
+        Returns:
+            tuple: (zip_id, folder_id)
+        """
+        return self.import_zips_with_contents([{
+            'filename': filename,
+            'filepath': filepath,
+            'file_size': file_size,
+            'md5_hash': md5_hash,
+            'description': description,
+            'folder_path': folder_path,
+            'files': files
+        }])[0]
+    
+    def import_zips_with_contents(self, archives):
+        """
+        Enregistre un lot de fichiers ZIP extraits en une seule transaction (un seul commit).
+        
+        Une archive déjà connue (même chemin et même empreinte MD5) est mise à jour
+        au lieu d'être ajoutée ; si son dossier extrait est déjà enregistré, il est
+        réutilisé avec ses fichiers, sinon il remplace les anciens dossiers de
+        l'archive. Un dossier partagé avec une archive identique ('source_folder_id')
+        reçoit une copie des fichiers enregistrés pour ce dossier.
+        
+        Args:
+            archives (list): Dictionnaires {'filename', 'filepath', 'file_size', 'md5_hash',
+                'description', 'folder_path', 'files'} et, en option, 'file_mtime' et
+                'source_folder_id' ; 'files' contient des tuples (filepath, file_size, file_type)
+            
+        Returns:
+            list: Tuples (zip_id, folder_id), dans l'ordre des archives
+        """
+        ids = []
+        with self.connection_provider.transaction() as conn:
+            cursor = conn.cursor()
+            for archive in archives:
+                zip_id, existing = self._upsert_zip_file(cursor, archive)
+                
+                folder_id = None
+                if existing:
+                    cursor.execute('''
+                    SELECT id FROM extracted_folders
+                    WHERE zip_id = ? AND folder_path = ?
+                    ORDER BY id DESC LIMIT 1
+                    ''', (zip_id, archive['folder_path']))
+                    row = cursor.fetchone()
+                    if row is not None:
+                        folder_id = row[0]
+                    else:
+                        # Les fichiers des anciens dossiers sont supprimés en cascade
+                        cursor.execute('DELETE FROM extracted_folders WHERE zip_id = ?', (zip_id,))
+                
+                if folder_id is None:
+                    cursor.execute('''
+                    INSERT INTO extracted_folders (zip_id, folder_path)
+                    VALUES (?, ?)
+                    ''', (zip_id, archive['folder_path']))
+                    folder_id = cursor.lastrowid
+                    if archive.get('source_folder_id') is not None:
+                        cursor.execute('''
+                        INSERT INTO extracted_files (folder_id, filepath, file_size, file_type)
+                        SELECT ?, filepath, file_size, file_type FROM extracted_files
+                        WHERE folder_id = ?
+                        ''', (folder_id, archive['source_folder_id']))
+                    else:
+                        self._insert_extracted_files(cursor, folder_id, archive['files'])
+                ids.append((zip_id, folder_id))
+        return ids
+    
+    def _upsert_zip_file(self, cursor, archive):
+        """
+        Ajoute une archive ou met à jour celle qui a le même chemin et la même empreinte MD5
+        (sans valider la transaction).
+        
+        Returns:
+            tuple: (zip_id, True si l'archive était déjà enregistrée)
+        """
+        row = None
+        if archive.get('md5_hash') is not None:
+            cursor.execute('''
+            SELECT id FROM zip_files
+            WHERE md5_hash = ? AND filepath = ?
+            ORDER BY id DESC LIMIT 1
+            ''', (archive['md5_hash'], archive['filepath']))
+            row = cursor.fetchone()
+        
+        if row is not None:
+            cursor.execute('''
+            UPDATE zip_files
+            SET filename = ?, file_size = ?, file_mtime = ?,
+                description = COALESCE(?, description)
+            WHERE id = ?
+            ''', (archive['filename'], archive['file_size'], archive.get('file_mtime'),
+                  archive.get('description'), row[0]))
+            return row[0], True
+        
+        cursor.execute('''
+        INSERT INTO zip_files (filename, filepath, file_size, md5_hash, description, file_mtime)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ''', (archive['filename'], archive['filepath'], archive['file_size'],
+              archive.get('md5_hash'), archive.get('description'), archive.get('file_mtime')))
+        return cursor.lastrowid, False
+    
+    def _insert_extracted_files(self, cursor, folder_id, files):
+        """Insère les fichiers d'un dossier extrait (sans valider la transaction)."""
+        rows = [(folder_id, filepath, file_size, file_type) for filepath, file_size, file_type in files]
+        cursor.executemany('''
+        INSERT INTO extracted_files (folder_id, filepath, file_size, file_type)
+        VALUES (?, ?, ?, ?)
+        ''', rows)
+        return len(rows)
+    
     def get_all_zip_files(self):
         """
         Récupère tous les fichiers ZIP stockés dans la base de données.
@@ -113,6 +260,27 @@ class ZipManager:
         
         return result
     
+    def get_archive_states(self):
+        """
+        Récupère en une requête l'état de toutes les archives connues et de leurs dossiers extraits.
+        
+        Returns:
+            list: Tuples (zip_id, filepath, file_size, file_mtime, md5_hash, folder_id, folder_path),
+                triés par archive puis par dossier ; folder_id et folder_path valent None
+                pour une archive sans dossier extrait
+        """
+        conn = self.connection_provider.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('''
+        SELECT z.id, z.filepath, z.file_size, z.file_mtime, z.md5_hash, f.id, f.folder_path
+        FROM zip_files z
+        LEFT JOIN extracted_folders f ON f.zip_id = z.id
+        ORDER BY z.id, f.id
+        ''')
+        
+        return cursor.fetchall()
+    
     def get_extracted_folders_by_zip(self, zip_id):
         """
         Récupère tous les dossiers extraits pour un fichier ZIP donné.
@@ -170,30 +338,69 @@ class ZipManager:
         Returns:
             bool: True si la suppression a réussi
         """
-        conn = self.connection_provider.get_connection()
-        cursor = conn.cursor()
-        
         try:
-            # Récupère tous les dossiers extraits
-            cursor.execute('SELECT id FROM extracted_folders WHERE zip_id = ?', (zip_id,))
-            folder_ids = [row[0] for row in cursor.fetchall()]
-            
-            # Supprime les fichiers extraits
-            for folder_id in folder_ids:
-                cursor.execute('DELETE FROM extracted_files WHERE folder_id = ?', (folder_id,))
-            
-            # Supprime les dossiers extraits
-            cursor.execute('DELETE FROM extracted_folders WHERE zip_id = ?', (zip_id,))
-            
-            # Supprime le fichier ZIP
-            cursor.execute('DELETE FROM zip_files WHERE id = ?', (zip_id,))
-            
-            conn.commit()
+            self.delete_zip_files([zip_id])
             return True
         except sqlite3.Error:
-            conn.rollback()
             return False
     
+    def delete_zip_files(self, zip_ids):
+        """
+        Supprime un lot de fichiers ZIP en une seule transaction.
+        
+        Les dossiers et fichiers extraits associés sont supprimés en cascade par
+        les clés étrangères.
+        
+        Args:
+            zip_ids (iterable): IDs des fichiers ZIP à supprimer
+        
+        Returns:
+            list: Chemins des dossiers extraits qui ne sont plus référencés par aucune archive
+        """
+        zip_ids = list(dict.fromkeys(zip_ids))
+        with self.connection_provider.transaction() as conn:
+            cursor = conn.cursor()
+            
+            folder_paths = set()
+            for start in range(0, len(zip_ids), IN_CLAUSE_CHUNK):
+                chunk = zip_ids[start:start + IN_CLAUSE_CHUNK]
+                cursor.execute(f'''
+                SELECT DISTINCT folder_path FROM extracted_folders
+                WHERE zip_id IN ({', '.join('?' * len(chunk))})
+                ''', chunk)
+                folder_paths.update(row[0] for row in cursor.fetchall())
+            
+            cursor.executemany('DELETE FROM zip_files WHERE id = ?', [(zip_id,) for zip_id in zip_ids])
+            
+            # Un dossier partagé avec une archive identique restante est conservé
+            return [path for path in sorted(folder_paths)
+                    if cursor.execute('SELECT 1 FROM extracted_folders WHERE folder_path = ? LIMIT 1',
+                                      (path,)).fetchone() is None]
+    
+    def delete_extracted_folders_under(self, root_dir):
+        """
+        Supprime les dossiers extraits situés dans un répertoire, et leurs fichiers.
+        
+        Les archives restent enregistrées : elles seront extraites de nouveau au
+        prochain import.
+        
+        Args:
+            root_dir (str): Répertoire supprimé du disque
+        
+        Returns:
+            int: Nombre de dossiers supprimés
+        """
+        root_dir = root_dir.rstrip('/\\') or root_dir
+        # Chemins commençant par 'root_dir/' : intervalle parcouru avec l'index sur folder_path
+        low = root_dir + os.sep
+        high = root_dir + chr(ord(os.sep) + 1)
+        with self.connection_provider.transaction() as conn:
+            cursor = conn.execute('''
+            DELETE FROM extracted_folders
+            WHERE folder_path = ? OR (folder_path >= ? AND folder_path < ?)
+            ''', (root_dir, low, high))
+            return cursor.rowcount
+    
     def update_extracted_folder_status(self, folder_id, status):
         """
         Met à jour le statut d'un dossier extrait.
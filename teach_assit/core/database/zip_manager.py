@@ -3,10 +3,96 @@ Utilitaire pour gérer les fichiers ZIP en conjonction avec la base de données.
 """
 
 import os
+import shutil
 import zipfile
 import hashlib
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from teach_assit.core.database.db_manager import DatabaseManager
+from teach_assit.core.submission_fs import split_archive_path
+
+
+# Taille des blocs lus pour le calcul des empreintes (hashlib libère le GIL sur les gros blocs)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class ArchiveCatalog:
+    """
+    Instantané des archives déjà importées, chargé en une seule requête.
+    
+    Il reconnaît sans accès à la base une archive inchangée (même chemin, même
+    taille et même date de modification) ou une archive de même contenu (même
+    empreinte MD5), éventuellement importée sous un autre nom, à condition que
+    son dossier extrait existe encore : ce dossier est alors partagé, chaque
+    archive gardant sa propre ligne. Il n'est que lu : les threads d'extraction
+    peuvent le partager.
+    """
+    
+    def __init__(self, states):
+        """
+        Initialise le catalogue.
+        
+        Args:
+            states (list): Tuples retournés par DatabaseManager.get_archive_states
+        """
+        self._by_path = {}
+        self._by_hash = {}
+        # Lignes triées par archive puis par dossier : le dernier dossier extrait l'emporte
+        for zip_id, filepath, file_size, file_mtime, md5_hash, folder_id, folder_path in states:
+            entry = {
+                'zip_id': zip_id,
+                'file_size': file_size,
+                'file_mtime': file_mtime,
+                'md5_hash': md5_hash,
+                'folder_id': folder_id,
+                'folder_path': folder_path
+            }
+            self._by_path[os.path.normpath(filepath)] = entry
+            if md5_hash:
+                self._by_hash[md5_hash] = entry
+    
+    def find_unchanged(self, filepath, file_size, file_mtime):
+        """
+        Cherche une archive importée depuis ce chemin et non modifiée depuis.
+        
+        Args:
+            filepath (str): Chemin du fichier ZIP
+            file_size (int): Taille actuelle du fichier
+            file_mtime (float): Date de modification actuelle du fichier
+            
+        Returns:
+            dict: Archive connue, ou None
+        """
+        entry = self._by_path.get(os.path.normpath(filepath))
+        if (entry is not None and entry['md5_hash'] and entry['file_size'] == file_size
+                and entry['file_mtime'] == file_mtime and self._is_extracted(entry)):
+            return entry
+        return None
+    
+    def find_by_hash(self, md5_hash):
+        """
+        Cherche une archive importée de même contenu.
+        
+        Args:
+            md5_hash (str): Empreinte MD5 du fichier ZIP
+            
+        Returns:
+            dict: Archive connue, ou None
+        """
+        entry = self._by_hash.get(md5_hash)
+        if entry is not None and self._is_extracted(entry):
+            return entry
+        return None
+    
+    def _is_extracted(self, entry):
+        """Vérifie que le dossier extrait (ou l'archive lue sans extraction) existe encore."""
+        if entry['folder_path'] is None:
+            return False
+        parts = split_archive_path(entry['folder_path'])
+        if parts is not None:
+            return os.path.isfile(parts[0])
+        return os.path.isdir(entry['folder_path'])
 
 
 class ZipManager:
@@ -22,11 +108,13 @@ class ZipManager:
         """
         self.db_manager = db_manager or DatabaseManager()
         
-        # Crée le dossier d'extraction si nécessaire
+        # Dossier d'extraction (créé à la première extraction)
         project_root = Path(__file__).parent.parent.parent.parent
         self.extract_base_dir = project_root / "data" / "extracted"
-        if not os.path.exists(self.extract_base_dir):
-            os.makedirs(self.extract_base_dir)
+        
+        # Suppression des dossiers extraits en arrière-plan (un seul thread, créé au besoin)
+        self._cleanup_executor = None
+        self._cleanup_futures = []
     
     def calculate_md5(self, filepath):
         """
@@ -40,7 +128,7 @@ class ZipManager:
         """
         hash_md5 = hashlib.md5()
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
     
@@ -48,6 +136,9 @@ class ZipManager:
         """
         Importe un fichier ZIP dans la base de données.
         
+        Une archive déjà importée (même contenu) n'est pas ajoutée une seconde fois :
+        son enregistrement, son dossier extrait et ses fichiers sont réutilisés.
+        
         Args:
             filepath (str): Chemin vers le fichier ZIP
             description (str, optional): Description du fichier
@@ -56,27 +147,109 @@ class ZipManager:
         Returns:
             tuple: (zip_id, folder_id si extrait, sinon None)
         """
-        if not os.path.exists(filepath) or not zipfile.is_zipfile(filepath):
-            raise ValueError(f"Le fichier {filepath} n'existe pas ou n'est pas un fichier ZIP valide")
-        
-        filename = os.path.basename(filepath)
-        file_size = os.path.getsize(filepath)
-        md5_hash = self.calculate_md5(filepath)
+        if auto_extract:
+            # Archive, dossier et fichiers enregistrés en une seule transaction
+            return self.import_prepared_zip_files([self.prepare_zip_file(filepath, description)])[0]
         
-        # Sauvegarde dans la base de données
+        self._check_zip_file(filepath)
+        stat = os.stat(filepath)
         zip_id = self.db_manager.add_zip_file(
-            filename=filename,
+            filename=os.path.basename(filepath),
             filepath=filepath,
-            file_size=file_size,
-            md5_hash=md5_hash,
-            description=description
+            file_size=stat.st_size,
+            md5_hash=self.calculate_md5(filepath),
+            description=description,
+            file_mtime=stat.st_mtime
         )
+        return zip_id, None
+    
+    def get_archive_catalog(self):
+        """
+        Charge l'état des archives déjà importées.
         
-        folder_id = None
-        if auto_extract:
-            folder_id = self.extract_zip(zip_id, filepath)
+        Returns:
+            ArchiveCatalog: Catalogue des archives connues
+        """
+        return ArchiveCatalog(self.db_manager.get_archive_states())
+    
+    def find_imported_archive(self, filepath, catalog):
+        """
+        Cherche une archive déjà importée et extraite identique au fichier.
+        
+        La taille et la date de modification sont comparées d'abord : l'empreinte
+        MD5 n'est calculée que pour une archive nouvelle ou modifiée.
         
-        return zip_id, folder_id
+        Args:
+            filepath (str): Chemin vers le fichier ZIP
+            catalog (ArchiveCatalog): Archives connues
+            
+        Returns:
+            tuple: (archive connue ou None, hash MD5, taille, date de modification)
+        """
+        stat = os.stat(filepath)
+        entry = catalog.find_unchanged(filepath, stat.st_size, stat.st_mtime)
+        if entry is not None:
+            return entry, entry['md5_hash'], stat.st_size, stat.st_mtime
+        md5_hash = self.calculate_md5(filepath)
+        return catalog.find_by_hash(md5_hash), md5_hash, stat.st_size, stat.st_mtime
+    
+    def prepare_zip_file(self, filepath, description=None, catalog=None):
+        """
+        Extrait un fichier ZIP et décrit son contenu, sans rien écrire dans la base de données.
+        
+        Le dossier d'extraction est nommé d'après l'empreinte MD5 de l'archive, ce qui
+        permet d'extraire avant l'enregistrement (et donc d'enregistrer un lot
+        d'archives en une seule transaction). Une archive déjà importée n'est pas
+        extraite de nouveau : son dossier et ses fichiers enregistrés sont réutilisés
+        (et copiés pour une archive identique importée sous un autre nom).
+        
+        Args:
+            filepath (str): Chemin vers le fichier ZIP
+            description (str, optional): Description du fichier
+            catalog (ArchiveCatalog, optional): Archives connues (chargées si None)
+            
+        Returns:
+            dict: Archive à passer à import_prepared_zip_files ('reused' indique une
+                archive déjà importée)
+        """
+        self._check_zip_file(filepath)
+        if catalog is None:
+            catalog = self.get_archive_catalog()
+        entry, md5_hash, file_size, file_mtime = self.find_imported_archive(filepath, catalog)
+        source_folder_id = None
+        if entry is not None:
+            extract_dir = entry['folder_path']
+            files = []
+            source_folder_id = entry['folder_id']
+        else:
+            extract_dir = str(self._extract(filepath, md5_hash))
+            files = self._list_files(extract_dir)
+        return {
+            'filename': os.path.basename(filepath),
+            'filepath': filepath,
+            'file_size': file_size,
+            'file_mtime': file_mtime,
+            'md5_hash': md5_hash,
+            'description': description,
+            'folder_path': extract_dir,
+            'files': files,
+            'source_folder_id': source_folder_id,
+            'reused': entry is not None
+        }
+    
+    def import_prepared_zip_files(self, archives):
+        """
+        Enregistre des archives préparées en une seule transaction (un seul commit pour le lot).
+        
+        Args:
+            archives (list): Archives retournées par prepare_zip_file
+            
+        Returns:
+            list: Tuples (zip_id, folder_id), dans l'ordre des archives
+        """
+        if not archives:
+            return []
+        return self.db_manager.import_zips_with_contents(archives)
     
     def extract_zip(self, zip_id, zip_filepath=None):
         """
@@ -100,34 +273,46 @@ class ZipManager:
             if zip_filepath is None:
                 raise ValueError(f"Fichier ZIP avec ID {zip_id} non trouvé dans la base de données")
         
-        # Crée un dossier unique pour cette extraction
-        extract_dir = self.extract_base_dir / f"zip_{zip_id}_{os.path.basename(zip_filepath).split('.')[0]}"
-        if not os.path.exists(extract_dir):
-            os.makedirs(extract_dir)
+        extract_dir = self._extract(zip_filepath, self.calculate_md5(zip_filepath))
         
-        # Extrait le ZIP
-        with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
-        # Enregistre le dossier extrait dans la base de données
+        # Enregistre le dossier extrait, puis tous ses fichiers en une seule transaction
         folder_id = self.db_manager.add_extracted_folder(zip_id, str(extract_dir))
-        
-        # Parcours tous les fichiers extraits et les ajoute à la base de données
-        for root, _, files in os.walk(extract_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_size = os.path.getsize(file_path)
-                file_type = os.path.splitext(file)[1].lstrip('.')
-                
-                self.db_manager.add_extracted_file(
-                    folder_id=folder_id,
-                    filepath=file_path,
-                    file_size=file_size,
-                    file_type=file_type
-                )
+        self.db_manager.add_extracted_files_bulk(folder_id, self._list_files(extract_dir))
         
         return folder_id
     
+    def _check_zip_file(self, filepath):
+        """Vérifie qu'un fichier est une archive ZIP valide."""
+        if not os.path.exists(filepath) or not zipfile.is_zipfile(filepath):
+            raise ValueError(f"Le fichier {filepath} n'existe pas ou n'est pas un fichier ZIP valide")
+    
+    def _extract(self, zip_filepath, md5_hash):
+        """
+        Extrait une archive dans le dossier associé à son contenu.
+        
+        Returns:
+            Path: Dossier d'extraction
+        """
+        extract_dir = self.extract_base_dir / f"zip_{md5_hash[:16]}_{os.path.basename(zip_filepath).split('.')[0]}"
+        os.makedirs(extract_dir, exist_ok=True)
+        with zipfile.ZipFile(zip_filepath, 'r') as zip_ref:
+            zip_ref.extractall(extract_dir)
+        return extract_dir
+    
+    def _list_files(self, extract_dir):
+        """
+        Liste les fichiers extraits.
+        
+        Returns:
+            list: Tuples (filepath, file_size, file_type)
+        """
+        files = []
+        for root, _, names in os.walk(extract_dir):
+            for name in names:
+                file_path = os.path.join(root, name)
+                files.append((file_path, os.path.getsize(file_path), os.path.splitext(name)[1].lstrip('.')))
+        return files
+    
     def get_all_zip_files(self):
         """
         Récupère tous les fichiers ZIP.
@@ -161,29 +346,59 @@ class ZipManager:
         """
         return self.db_manager.get_files_by_folder(folder_id)
     
-    def delete_zip_with_extracts(self, zip_id):
+    def delete_zip_with_extracts(self, zip_id, remove_files=True):
         """
         Supprime un fichier ZIP et tous ses dossiers extraits de la base de données.
         Optionnellement, supprime aussi les fichiers physiques.
         
         Args:
             zip_id (int): ID du fichier ZIP
+            remove_files (bool, optional): Si True, supprime aussi les dossiers extraits
             
         Returns:
             bool: True si la suppression a réussi
         """
-        # Récupère les informations du ZIP et des dossiers avant de les supprimer
-        zip_files = self.db_manager.get_all_zip_files()
-        zip_filepath = None
-        for zip_file in zip_files:
-            if zip_file[0] == zip_id:
-                zip_filepath = zip_file[2]
-                break
+        return self.delete_zips_with_extracts([zip_id], remove_files)
+    
+    def delete_zips_with_extracts(self, zip_ids, remove_files=True):
+        """
+        Supprime un lot de fichiers ZIP et leurs dossiers extraits en une seule transaction.
         
-        extracted_folders = self.db_manager.get_extracted_folders_by_zip(zip_id)
-        folder_paths = [folder[1] for folder in extracted_folders]
+        Les dossiers physiques qui ne servent plus à aucune archive sont supprimés
+        par un thread d'arrière-plan ; seuls ceux créés sous le dossier
+        d'extraction de ce gestionnaire sont concernés.
         
-        # Supprime de la base de données
-        db_success = self.db_manager.delete_zip_file(zip_id)
+        Args:
+            zip_ids (iterable): IDs des fichiers ZIP
+            remove_files (bool, optional): Si True, supprime aussi les dossiers extraits
+            
+        Returns:
+            bool: True si la suppression a réussi
+        """
+        try:
+            folder_paths = self.db_manager.delete_zip_files(zip_ids)
+        except sqlite3.Error as e:
+            print(f"Erreur lors de la suppression des fichiers ZIP: {e}")
+            return False
         
-        return db_success 
\ No newline at end of file
+        if remove_files:
+            base_dir = os.path.abspath(self.extract_base_dir)
+            owned = [path for path in folder_paths
+                     if os.path.dirname(os.path.abspath(path)) == base_dir]
+            if owned:
+                if self._cleanup_executor is None:
+                    self._cleanup_executor = ThreadPoolExecutor(max_workers=1)
+                self._cleanup_futures = [future for future in self._cleanup_futures if not future.done()]
+                self._cleanup_futures.append(self._cleanup_executor.submit(self._remove_folders, owned))
+        return True
+    
+    def wait_for_cleanup(self):
+        """Attend la fin des suppressions de dossiers en cours."""
+        for future in list(self._cleanup_futures):
+            future.result()
+        self._cleanup_futures = []
+    
+    def _remove_folders(self, folder_paths):
+        """Supprime des dossiers extraits (exécuté par le thread d'arrière-plan)."""
+        for path in folder_paths:
+            shutil.rmtree(path, ignore_errors=True)
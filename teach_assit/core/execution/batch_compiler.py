@@ -0,0 +1,93 @@
+"""
+Compilation par lots : une seule JVM exécute le compilateur Java pour toute une cohorte.
+"""
+
+import base64
+import subprocess
+import logging
+from typing import List, Optional, Tuple
+
+from teach_assit.core.execution.java_support import BATCH_COMPILER_CLASS
+
+logger = logging.getLogger(__name__)
+
+
+class JavaBatchCompiler:
+    """
+    Compile une liste de fichiers sources, chacun dans sa propre unité de
+    compilation, avec une seule JVM (API javax.tools).
+
+    Les soumissions d'une cohorte déclarent en général la même classe publique
+    (ex. `Intervalle`) : elles ne peuvent donc pas être passées à un même appel
+    javac. Chaque fichier est compilé séparément, mais le démarrage de la JVM et
+    le chargement du compilateur ne sont payés qu'une fois ; les diagnostics
+    sont ainsi naturellement séparés par fichier.
+    """
+
+    def __init__(self, support_classes_dir: str, java_command: Optional[List[str]] = None):
+        """
+        Initialiser le compilateur par lots.
+
+        Args:
+            support_classes_dir: Répertoire contenant les classes de support compilées
+            java_command: Commande de lancement de la JVM (par défaut ['java'])
+        """
+        self.support_classes_dir = support_classes_dir
+        self.java_command = list(java_command or ['java'])
+
+    def compile(self, source_paths: List[str], timeout_per_file: int = 10,
+                startup_timeout: int = 30) -> List[Optional[Tuple[bool, str]]]:
+        """
+        Compiler chaque fichier source ; les .class sont écrits à côté de la source.
+
+        Args:
+            source_paths: Chemins absolus des fichiers à compiler
+            timeout_per_file: Budget de compilation par fichier en secondes
+            startup_timeout: Budget de démarrage de la JVM en secondes
+
+        Returns:
+            list: Un (success, output) par fichier, dans l'ordre, ou None pour les
+                fichiers que la JVM n'a pas pu traiter (à compiler individuellement)
+        """
+        results = [None] * len(source_paths)
+        if not source_paths:
+            return results
+
+        commands = "".join(
+            f"COMPILE {base64.b64encode(path.encode('utf-8')).decode('ascii')}\n" for path in source_paths
+        ) + "QUIT\n"
+        timeout = startup_timeout + timeout_per_file * len(source_paths)
+
+        try:
+            process = subprocess.Popen(
+                self.java_command + ['-cp', self.support_classes_dir, BATCH_COMPILER_CLASS],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            logger.warning(f"Impossible de démarrer le compilateur par lots: {str(e)}")
+            return results
+
+        try:
+            stdout, _ = process.communicate(input=commands.encode('ascii'), timeout=timeout)
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Timeout du compilateur par lots (> {timeout}s)")
+            process.kill()
+            stdout, _ = process.communicate()
+
+        index = 0
+        for raw_line in stdout.decode('ascii', errors='replace').splitlines():
+            kind, _, payload = raw_line.partition(' ')
+            if kind == 'NOCOMPILER':
+                logger.warning("La JVM ne fournit pas de compilateur Java (JRE ?)")
+                break
+            if kind != 'DONE' or index >= len(results):
+                continue
+            exit_code, _, diagnostics = payload.partition(' ')
+            output = base64.b64decode(diagnostics).decode('utf-8', errors='replace')
+            results[index] = (exit_code == '0', output)
+            index += 1
+
+        logger.info(f"Compilation par lots: {index}/{len(source_paths)} fichier(s) traité(s)")
+        return results
@@ -0,0 +1,269 @@
+"""
+Archive CDS (Class Data Sharing) des classes du JDK utilisées par les programmes étudiants.
+
+L'archive est construite une fois par installation du JDK (identifiée par la sortie
+de `java -version`) et conservée dans data/cds. Les options de lancement associées
+sont vérifiées sur un programme type avant d'être utilisées : une option refusée
+par la JVM, ou qui ajouterait des avertissements à la sortie standard, est écartée.
+Une construction sans option utilisable est enregistrée comme un échec, retenté
+après FAILED_BUILD_RETRY_SECONDS.
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import subprocess
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from teach_assit.core.execution.java_support import compile_support_classes, DRIVER_CLASS, WARMUP_CLASS
+
+logger = logging.getLogger(__name__)
+
+# Options de démarrage adaptées à des programmes courts
+STARTUP_OPTIONS = ['-XX:TieredStopAtLevel=1', '-XX:+UseSerialGC']
+
+# Entrée fournie au programme type
+WARMUP_INPUT = "2.25\n"
+
+# Préfixes des classes du JDK conservées dans la liste de classes
+JDK_CLASS_PREFIXES = ('java/', 'javax/', 'jdk/', 'sun/', 'com/sun/')
+
+# Délai avant de retenter une construction échouée, en secondes
+FAILED_BUILD_RETRY_SECONDS = 24 * 3600
+
+
+class CdsArchiveManager:
+    """Construit, valide et fournit l'archive CDS et les options JVM associées."""
+
+    def __init__(self, cds_dir: Optional[str] = None, java_command: Optional[List[str]] = None):
+        """
+        Initialiser le gestionnaire.
+
+        Args:
+            cds_dir: Répertoire des archives. Si None, utilise data/cds à la racine du projet.
+            java_command: Commande de lancement de la JVM (par défaut ['java'])
+        """
+        if cds_dir is None:
+            project_root = Path(__file__).parent.parent.parent.parent
+            cds_dir = str(project_root / "data" / "cds")
+        self.cds_dir = cds_dir
+        self.java_command = list(java_command or ['java'])
+        self._java_version = None
+        self._options = None
+
+    def get_java_version(self) -> Optional[str]:
+        """
+        Obtenir la description de la JVM installée.
+
+        Returns:
+            str: Sortie de `java -version`, ou None si Java est indisponible
+        """
+        if self._java_version is None:
+            try:
+                result = subprocess.run(self.java_command + ['-version'], capture_output=True, text=True, timeout=30)
+                self._java_version = (result.stdout + result.stderr).strip()
+            except (subprocess.SubprocessError, OSError):
+                return None
+        return self._java_version
+
+    def get_jvm_options(self) -> List[str]:
+        """
+        Obtenir les options JVM à utiliser pour les exécutions, en construisant
+        l'archive si nécessaire.
+
+        Returns:
+            list: Options validées (vide si aucune n'est utilisable)
+        """
+        if self._options is not None:
+            return list(self._options)
+
+        version = self.get_java_version()
+        if version is None:
+            self._options = []
+            return []
+
+        version_hash = hashlib.sha256(version.encode('utf-8')).hexdigest()[:16]
+        meta_path = os.path.join(self.cds_dir, f"{version_hash}.json")
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            if meta.get("java_version") == version and self._is_reusable(meta):
+                self._options = meta["options"]
+                return list(self._options)
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        self._options = self._build(version, version_hash)
+        meta = {"java_version": version, "options": self._options}
+        if not self._options:
+            # Échec (JVM momentanément indisponible, archive refusée...) : retenté plus tard
+            meta["failed_at"] = time.time()
+        try:
+            os.makedirs(self.cds_dir, exist_ok=True)
+            with open(meta_path, 'w', encoding='utf-8') as meta_file:
+                json.dump(meta, meta_file, indent=2)
+        except OSError as e:
+            logger.warning(f"Impossible d'enregistrer la configuration CDS: {str(e)}")
+        return list(self._options)
+
+    @staticmethod
+    def _is_reusable(meta: Dict) -> bool:
+        """
+        Indiquer si une configuration enregistrée peut être réutilisée.
+
+        Args:
+            meta: Configuration lue dans <empreinte>.json
+
+        Returns:
+            bool: True si les options sont utilisables, ou si l'échec enregistré est trop
+                récent pour être retenté
+        """
+        if "failed_at" in meta:
+            return time.time() - meta["failed_at"] < FAILED_BUILD_RETRY_SECONDS
+        return bool(meta["options"]) and all(not option.startswith('-XX:SharedArchiveFile=')
+                                             or os.path.exists(option.split('=', 1)[1])
+                                             for option in meta["options"])
+
+    def _build(self, version: str, version_hash: str) -> List[str]:
+        """
+        Construire l'archive de la version courante et valider les options.
+
+        Args:
+            version: Sortie de `java -version`
+            version_hash: Empreinte de la version, utilisée pour nommer l'archive
+
+        Returns:
+            list: Options validées
+        """
+        os.makedirs(self.cds_dir, exist_ok=True)
+        self._remove_stale_archives(version_hash)
+
+        support_classes_dir = compile_support_classes(os.path.join(self.cds_dir, "support"))
+        if support_classes_dir is None:
+            return []
+
+        expected_output = self._run_warmup(support_classes_dir, [])
+        if expected_output is None:
+            return []
+
+        archive_path = os.path.join(self.cds_dir, f"{version_hash}.jsa")
+        candidates = []
+        if self._dump_archive(support_classes_dir, archive_path):
+            candidates.append([f'-XX:SharedArchiveFile={archive_path}', '-Xshare:auto'] + STARTUP_OPTIONS)
+        candidates.append(['-Xshare:auto'] + STARTUP_OPTIONS)
+
+        for options in candidates:
+            if self._run_warmup(support_classes_dir, options) == expected_output:
+                logger.info(f"Options JVM de démarrage retenues: {' '.join(options)}")
+                return options
+            logger.info(f"Options JVM écartées: {' '.join(options)}")
+        return []
+
+    def _dump_archive(self, support_classes_dir: str, archive_path: str) -> bool:
+        """
+        Lister les classes chargées par le programme type, puis créer l'archive.
+
+        Args:
+            support_classes_dir: Répertoire des classes de support
+            archive_path: Chemin de l'archive à créer
+
+        Returns:
+            bool: True si l'archive a été créée
+        """
+        raw_list_path = archive_path[:-len('.jsa')] + ".raw.classlist"
+        class_list_path = archive_path[:-len('.jsa')] + ".classlist"
+        try:
+            # Exécuter le programme type à travers le pilote, comme un programme étudiant
+            subprocess.run(
+                self.java_command + ['-Xshare:off', f'-XX:DumpLoadedClassList={raw_list_path}',
+                                     '-cp', support_classes_dir, DRIVER_CLASS, support_classes_dir, WARMUP_CLASS],
+                input=base64.b64encode(WARMUP_INPUT.encode('utf-8')) + b"\n",
+                capture_output=True,
+                timeout=60
+            )
+            with open(raw_list_path, 'r', encoding='utf-8', errors='replace') as raw_list:
+                classes = [line.split()[0] for line in raw_list
+                           if line.strip() and line.startswith(JDK_CLASS_PREFIXES)]
+            with open(class_list_path, 'w', encoding='utf-8') as class_list:
+                class_list.write("\n".join(classes) + "\n")
+
+            # Archive des seules classes du JDK : indépendante du classpath de chaque étudiant
+            result = subprocess.run(
+                self.java_command + ['-Xshare:dump', f'-XX:SharedClassListFile={class_list_path}',
+                                     f'-XX:SharedArchiveFile={archive_path}'],
+                capture_output=True,
+                text=True,
+                timeout=300
+            )
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.warning(f"Impossible de créer l'archive CDS: {str(e)}")
+            return False
+        finally:
+            if os.path.exists(raw_list_path):
+                os.remove(raw_list_path)
+
+        if result.returncode != 0 or not os.path.exists(archive_path):
+            logger.warning(f"Échec de création de l'archive CDS: {result.stdout}{result.stderr}")
+            return False
+
+        logger.info(f"Archive CDS créée: {archive_path} ({len(classes)} classes)")
+        return True
+
+    def _run_warmup(self, support_classes_dir: str, options: List[str]) -> Optional[str]:
+        """
+        Exécuter le programme type avec des options JVM.
+
+        Returns:
+            str: Sortie standard, ou None si la JVM a échoué
+        """
+        try:
+            result = subprocess.run(
+                self.java_command + options + ['-cp', support_classes_dir, WARMUP_CLASS],
+                input=WARMUP_INPUT,
+                capture_output=True,
+                text=True,
+                timeout=60
+            )
+        except (subprocess.SubprocessError, OSError):
+            return None
+        return result.stdout if result.returncode == 0 else None
+
+    def _remove_stale_archives(self, version_hash: str):
+        """Supprimer les archives construites pour d'autres versions du JDK."""
+        for name in os.listdir(self.cds_dir):
+            if name.endswith(('.jsa', '.classlist', '.json')) and not name.startswith(version_hash):
+                try:
+                    os.remove(os.path.join(self.cds_dir, name))
+                except OSError:
+                    pass
+
+    def benchmark(self, runs: int = 10) -> Optional[Dict[str, float]]:
+        """
+        Mesurer le temps de lancement du programme type avec et sans les options.
+
+        Args:
+            runs: Nombre de lancements par configuration
+
+        Returns:
+            dict: {'baseline', 'tuned', 'delta'} en secondes par lancement, ou None si Java est indisponible
+        """
+        options = self.get_jvm_options()
+        support_classes_dir = compile_support_classes(os.path.join(self.cds_dir, "support"))
+        if support_classes_dir is None:
+            return None
+
+        timings = {}
+        for label, run_options in (("baseline", []), ("tuned", options)):
+            # Un premier lancement non mesuré pour chauffer le cache disque
+            self._run_warmup(support_classes_dir, run_options)
+            start = time.perf_counter()
+            for _ in range(runs):
+                self._run_warmup(support_classes_dir, run_options)
+            timings[label] = (time.perf_counter() - start) / runs
+
+        timings["delta"] = timings["baseline"] - timings["tuned"]
+        return timings
@@ -3,33 +3,99 @@ Module pour gérer la compilation et l'exécution des codes Java des étudiants.
 """
 
 import os
+import re
+import hashlib
 import subprocess
 import tempfile
 import time
 import shutil
+import signal
 import logging
 from typing import Dict, List, Tuple, Any, Optional
 
+from teach_assit.core.execution.java_support import compile_support_classes
+from teach_assit.core.execution.java_harness import JavaHarness
+from teach_assit.core.execution.input_driver import JavaInputDriver
+from teach_assit.core.execution.batch_compiler import JavaBatchCompiler
+from teach_assit.core.execution.compile_server import JavaCompileServer, format_diagnostics, parse_javac_output
+from teach_assit.core.execution.compile_cache import CompilationCache
+from teach_assit.core.execution.result_cache import ExecutionResultCache
+from teach_assit.core.execution.output_capture import OutputLimits
+from teach_assit.core.execution.sandbox import CgroupSlice, ResourceLimits, run_process
+from teach_assit.core.submission_fs import get_submission_fs, read_source, read_source_bytes
+
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Codes de sortie d'un programme arrêté par une limite de ressources (temps CPU, taille
+# de fichier, mémoire du cgroup) : le résultat dépend des limites, absentes de la clé de cache
+LIMIT_EXIT_CODES = tuple(-getattr(signal, name) for name in ('SIGXCPU', 'SIGXFSZ', 'SIGKILL')
+                         if hasattr(signal, name))
+
 class JavaExecutor:
     """Classe pour compiler et exécuter du code Java."""
     
-    def __init__(self, temp_dir: Optional[str] = None):
+    def __init__(self, temp_dir: Optional[str] = None, use_harness: bool = True,
+                 compile_cache: Optional[CompilationCache] = None,
+                 result_cache: Optional[ExecutionResultCache] = None,
+                 jvm_options: Optional[List[str]] = None, use_driver: bool = True,
+                 resource_limits: Optional[ResourceLimits] = None,
+                 cgroup: Optional[CgroupSlice] = None,
+                 output_limits: Optional[OutputLimits] = None, use_compile_server: bool = True):
         """
         Initialiser l'exécuteur de code Java.
         
         Args:
             temp_dir: Répertoire temporaire pour les fichiers de compilation (optionnel)
+            use_harness: Réutiliser une JVM persistante pour les tests (repli sur un
+                processus par entrée si le harnais est indisponible)
+            compile_cache: Cache persistant des compilations (optionnel)
+            result_cache: Cache persistant des résultats d'exécution (optionnel)
+            jvm_options: Options passées à la JVM lors des exécutions
+            use_driver: Sans harnais, exécuter toutes les entrées d'un programme dans
+                un seul lancement de JVM (repli sur un processus par entrée si le
+                programme modifie l'état global de la JVM)
+            resource_limits: Limites de ressources par exécution. Le harnais et le
+                pilote les appliquent à leur JVM et contrôlent le temps CPU de chaque
+                entrée ; un processus dédié les reçoit au lancement.
+            cgroup: Sous-groupe cgroup v2 délégué pour les exécutions (optionnel).
+                Chaque entrée est alors exécutée dans un processus dédié (sans harnais
+                ni pilote), pour que le cgroup ne contienne que cette entrée.
+            output_limits: Limites de capture des sorties des programmes (par défaut
+                OutputLimits() : début et fin de chaque flux, arrêt au-delà du budget)
+            use_compile_server: Compiler en mémoire dans une JVM résidente (repli sur
+                javac si le serveur est indisponible)
         """
         self.temp_dir = temp_dir if temp_dir else tempfile.mkdtemp(prefix="teachassist_")
+        self.use_harness = use_harness
+        self.use_driver = use_driver
+        self.use_compile_server = use_compile_server
+        self._harness = None
+        self._compile_server = None
+        # Diagnostics structurés de la dernière compilation
+        self._last_diagnostics = None
+        self._support_classes_dir = None
+        # Compilations effectuées par compile_batch, indexées par chemin absolu du fichier
+        self._precompiled = {}
+        self._batch_counter = 0
+        self.compile_cache = compile_cache
+        self.result_cache = result_cache
+        self.jvm_options = list(jvm_options or [])
+        self.resource_limits = resource_limits
+        self.cgroup = cgroup
+        self.output_limits = output_limits or OutputLimits()
+        if cgroup is not None:
+            self.use_harness = False
+            self.use_driver = False
+        self.javac_version = ""
         logger.info(f"Répertoire temporaire de compilation créé: {self.temp_dir}")
         
         # Vérifier si Java est installé
         try:
-            subprocess.run(['javac', '-version'], capture_output=True, check=True)
+            result = subprocess.run(['javac', '-version'], capture_output=True, text=True, check=True)
+            # javac 8 écrit sa version sur stderr, les versions suivantes sur stdout
+            self.javac_version = (result.stdout + result.stderr).strip()
             logger.info("Java compiler (javac) trouvé et fonctionnel.")
         except (subprocess.SubprocessError, FileNotFoundError):
             logger.error("Le compilateur Java (javac) n'est pas disponible. Veuillez installer le JDK.")
@@ -44,6 +110,20 @@ class JavaExecutor:
         Returns:
             (success, output): Un tuple avec le statut de succès et la sortie
         """
+        success, output, _ = self.compile_with_diagnostics(file_path)
+        return success, output
+    
+    def compile_with_diagnostics(self, file_path: str) -> Tuple[bool, str, List[Dict[str, Any]]]:
+        """
+        Compiler un fichier Java et obtenir les diagnostics structurés du compilateur.
+        
+        Args:
+            file_path: Chemin vers le fichier Java à compiler
+        
+        Returns:
+            (success, output, diagnostics): Statut, sortie texte et diagnostics
+                {'kind', 'line', 'column', 'message'}
+        """
         # Créer un répertoire pour ce fichier spécifique
         file_name = os.path.basename(file_path)
         file_dir = os.path.dirname(file_path)
@@ -51,9 +131,15 @@ class JavaExecutor:
         
         os.makedirs(compile_dir, exist_ok=True)
         
-        # Copier le fichier dans le répertoire temporaire
+        # Supprimer les classes d'une compilation précédente portant le même nom de fichier
+        for stale_file in os.listdir(compile_dir):
+            if stale_file.endswith('.class'):
+                os.remove(os.path.join(compile_dir, stale_file))
+        
+        # Copier le fichier dans le répertoire temporaire (seul ce fichier est écrit
+        # sur disque lorsque la soumission est lue directement dans son archive)
         temp_file_path = os.path.join(compile_dir, file_name)
-        shutil.copy2(file_path, temp_file_path)
+        get_submission_fs().materialize(file_path, temp_file_path)
         
         # Extraire préalablement le nom de la classe du fichier
         real_class_name = self._extract_class_name_from_file(temp_file_path)
@@ -80,6 +166,55 @@ class JavaExecutor:
                 # Stocker le vrai nom de classe pour l'exécution
                 self._real_class_name = real_class_name
         
+        # Réutiliser une compilation identique déjà présente dans le cache
+        cache_key = self._cache_key(temp_file_path)
+        cached = self._restore_from_cache(cache_key, compile_dir)
+        if cached:
+            if cached["class_name"] != os.path.splitext(file_name)[0]:
+                self._real_class_name = cached["class_name"]
+            diagnostics = cached["diagnostics"]
+            if diagnostics is None:
+                diagnostics = parse_javac_output(cached["output"])
+            return cached["success"], cached["output"], diagnostics
+        
+        self._last_diagnostics = None
+        success, output, timed_out = self._compile_staged_file(temp_file_path, compile_dir)
+        diagnostics = self._last_diagnostics
+        if diagnostics is None:
+            diagnostics = parse_javac_output(output)
+        self._store_in_cache(cache_key, compile_dir, success, output,
+                             os.path.splitext(os.path.basename(temp_file_path))[0], diagnostics, timed_out)
+        return success, output, diagnostics
+    
+    def _compile_staged_file(self, temp_file_path: str, compile_dir: str) -> Tuple[bool, str, bool]:
+        """
+        Compiler un fichier copié dans son répertoire de compilation.
+        
+        Args:
+            temp_file_path: Chemin du fichier à compiler
+            compile_dir: Répertoire de compilation
+        
+        Returns:
+            (success, output, timed_out): Statut de succès, sortie, et indicateur d'un
+                échec dû au dépassement du temps de compilation
+        """
+        server_outcome = self._compile_in_server(temp_file_path, compile_dir)
+        if server_outcome is not None:
+            success, output = server_outcome
+            match = re.search(r'class\s+(\w+)\s+is\s+public,\s+should\s+be\s+declared', output)
+            if success or not match:
+                return success, output, False
+            # Nom de classe différent du nom de fichier : recompiler sous le bon nom
+            real_class_name = match.group(1)
+            logger.info(f"Erreur de nom de classe détectée. Classe réelle: {real_class_name}, "
+                        f"nom de fichier: {os.path.basename(temp_file_path)}")
+            server_outcome = self._compile_in_server(temp_file_path, compile_dir, file_name=f"{real_class_name}.java")
+            if server_outcome is not None:
+                if server_outcome[0]:
+                    self._real_class_name = real_class_name
+                    return True, "Compilation réussie après correction du nom de fichier", False
+                return server_outcome[0], server_outcome[1], False
+        
         # Exécuter javac pour compiler le fichier
         try:
             logger.info(f"Compilation de {os.path.basename(temp_file_path)}...")
@@ -93,13 +228,12 @@ class JavaExecutor:
             # Vérifier si la compilation a réussi
             if result.returncode == 0:
                 logger.info(f"Compilation réussie pour {os.path.basename(temp_file_path)}")
-                return True, "Compilation réussie"
+                return True, "Compilation réussie", False
             else:
                 # Vérifier si l'erreur est due à un nom de classe différent du nom de fichier
                 stderr = result.stderr
                 if "public class" in stderr and "should be declared in a file named" in stderr:
                     # Extraire le vrai nom de classe à partir du message d'erreur
-                    import re
                     match = re.search(r'class\s+(\w+)\s+should\s+be\s+declared', stderr)
                     if match:
                         real_class_name = match.group(1)
@@ -130,23 +264,23 @@ class JavaExecutor:
                             logger.info(f"Compilation réussie après correction du nom de fichier pour {real_class_name}")
                             # Stocker le vrai nom de classe pour l'exécution
                             self._real_class_name = real_class_name
-                            return True, "Compilation réussie après correction du nom de fichier"
+                            return True, "Compilation réussie après correction du nom de fichier", False
                         else:
                             # La compilation a échoué même avec le bon nom de fichier
                             logger.warning(f"Échec de compilation après correction du nom de fichier: {result.stderr}")
-                            return False, result.stderr
+                            return False, result.stderr, False
                 
                 # Erreur standard de compilation
                 logger.warning(f"Échec de compilation pour {os.path.basename(temp_file_path)}: {stderr}")
-                return False, stderr
+                return False, stderr, False
         
         except subprocess.TimeoutExpired:
             logger.error(f"Timeout lors de la compilation de {os.path.basename(temp_file_path)}")
-            return False, "Compilation timeout (> 10s)"
+            return False, "Compilation timeout (> 10s)", True
         
         except Exception as e:
             logger.error(f"Erreur lors de la compilation de {os.path.basename(temp_file_path)}: {str(e)}")
-            return False, f"Erreur de compilation: {str(e)}"
+            return False, f"Erreur de compilation: {str(e)}", False
             
     def _extract_class_name_from_file(self, file_path: str) -> Optional[str]:
         """
@@ -159,14 +293,12 @@ class JavaExecutor:
             str: Nom de la classe publique ou None si non trouvé
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-                # Recherche d'une classe publique
-                import re
-                match = re.search(r'public\s+class\s+(\w+)', content)
-                if match:
-                    return match.group(1)
+            content = read_source(file_path)
+            
+            # Recherche d'une classe publique
+            match = re.search(r'public\s+class\s+(\w+)', content)
+            if match:
+                return match.group(1)
         except Exception as e:
             logger.error(f"Erreur lors de l'extraction du nom de classe: {str(e)}")
             
@@ -219,44 +351,58 @@ class JavaExecutor:
         # Exécuter la classe Java
         try:
             logger.info(f"Exécution de {real_class_name} avec args={args}...")
-            result = subprocess.run(
-                ['java', '-cp', compile_dir, real_class_name] + args,
-                capture_output=True,
-                text=True,
-                timeout=timeout
+            run = run_process(
+                ['java'] + self._run_jvm_options() + ['-cp', compile_dir, real_class_name] + args,
+                "",
+                timeout,
+                limits=self.resource_limits,
+                cgroup=self.cgroup,
+                output_limits=self.output_limits
             )
             
-            if result.returncode == 0:
+            if run["timed_out"]:
+                logger.error(f"Timeout lors de l'exécution de {real_class_name}")
+                return False, "", f"Exécution timeout (> {timeout}s)"
+            elif run["exit_code"] == 0:
                 logger.info(f"Exécution réussie de {real_class_name}")
-                return True, result.stdout, result.stderr
+                return True, run["stdout"], run["stderr"]
             else:
-                logger.warning(f"Erreur lors de l'exécution de {real_class_name}: {result.stderr}")
-                return False, result.stdout, result.stderr
-        
-        except subprocess.TimeoutExpired:
-            logger.error(f"Timeout lors de l'exécution de {real_class_name}")
-            return False, "", f"Exécution timeout (> {timeout}s)"
+                logger.warning(f"Erreur lors de l'exécution de {real_class_name}: {run['stderr']}")
+                return False, run["stdout"], run["stderr"]
         
         except Exception as e:
             logger.error(f"Erreur lors de l'exécution de {real_class_name}: {str(e)}")
             return False, "", f"Erreur d'exécution: {str(e)}"
     
-    def test_with_inputs(self, file_path: str, test_inputs: List[str], timeout: int = 5) -> List[Dict[str, Any]]:
+    def test_with_inputs(self, file_path: str, test_inputs: List[str], timeout: int = 5,
+                         force_rerun: bool = False) -> List[Dict[str, Any]]:
         """
         Tester un programme Java avec plusieurs entrées.
         
+        Les résultats présents dans le cache d'exécution sont retournés sans
+        relancer le programme ; seules les entrées manquantes sont exécutées.
+        
         Args:
             file_path: Chemin vers le fichier Java
             test_inputs: Liste des entrées à tester
             timeout: Temps maximum d'exécution en secondes
+            force_rerun: Ignorer les résultats en cache et réexécuter toutes les entrées
         
         Returns:
             Liste des résultats de test avec statut, entrée, sortie et erreurs
         """
         results = []
         
-        # D'abord compiler le fichier
-        compile_success, compile_output = self.compile_java(file_path)
+        # D'abord compiler le fichier (ou réutiliser la compilation par lots)
+        precompiled = self._take_precompiled(file_path)
+        if precompiled:
+            compile_success, compile_output, compile_dir, class_name = precompiled
+        else:
+            compile_success, compile_output = self.compile_java(file_path)
+            file_class_name = os.path.splitext(os.path.basename(file_path))[0]
+            compile_dir = os.path.join(self.temp_dir, file_class_name)
+            # Vérifier s'il y a un nom de classe réel différent qui a été détecté lors de la compilation
+            class_name = getattr(self, '_real_class_name', file_class_name)
         
         if not compile_success:
             # Si la compilation échoue, retourner une erreur pour tous les tests
@@ -266,84 +412,521 @@ class JavaExecutor:
                     "success": False,
                     "compilation_error": True,
                     "stdout": "",
-                    "stderr": compile_output
+                    "stderr": compile_output,
+                    "output_truncated": False,
+                    "cpu_time": None,
+                    "peak_rss_kb": None
                 })
             return results
         
         # Si la compilation réussit, exécuter chaque test
-        for input_val in test_inputs:
-            # Extraire le nom de la classe Java pour ce fichier
-            file_name = os.path.basename(file_path)
-            class_name = os.path.splitext(file_name)[0]
+        real_class_name = self._resolve_class(compile_dir, class_name)
+        artifact_hash = ExecutionResultCache.hash_artifacts(compile_dir) if self.result_cache else None
+        
+        runs = [None] * len(test_inputs)
+        cache_keys = [None] * len(test_inputs)
+        if artifact_hash:
+            for i, input_val in enumerate(test_inputs):
+                cache_keys[i] = ExecutionResultCache.make_key(artifact_hash, input_val, timeout,
+                                                              self._run_jvm_options())
+                runs[i] = None if force_rerun else self.result_cache.get(cache_keys[i])
+                if runs[i]:
+                    logger.info(f"Résultat en cache pour {real_class_name} avec entrée '{input_val}'")
+        
+        # Exécuter uniquement les entrées absentes du cache
+        missing = [i for i, run in enumerate(runs) if run is None]
+        fresh_runs = self._run_inputs(compile_dir, real_class_name, [test_inputs[i] for i in missing], timeout)
+        for i, run in zip(missing, fresh_runs):
+            runs[i] = run
+            # Les timeouts et erreurs de lancement dépendent de la charge : ne pas les mémoriser,
+            # pas plus que les sorties tronquées (l'indicateur ne serait pas conservé) ni les
+            # arrêts par une limite de ressources (rejoués même après un relèvement des limites)
+            if cache_keys[i] and run["exit_code"] is not None and not run["timed_out"] \
+                    and not run.get("output_truncated") and run["exit_code"] not in LIMIT_EXIT_CODES:
+                self.result_cache.put(cache_keys[i], artifact_hash, run["exit_code"], run["stdout"], run["stderr"])
+        
+        for input_val, run in zip(test_inputs, runs):
+            results.append(self._format_run(input_val, run, timeout))
+        
+        return results
+    
+    def _run_inputs(self, compile_dir: str, class_name: str, inputs: List[str], timeout: int) -> List[Dict[str, Any]]:
+        """
+        Exécuter un programme avec plusieurs entrées : harnais persistant, sinon
+        pilote (une JVM pour toutes les entrées), sinon un processus par entrée.
+        
+        Args:
+            compile_dir: Répertoire contenant les fichiers .class
+            class_name: Nom de la classe principale
+            inputs: Entrées à fournir au programme
+            timeout: Temps maximum d'exécution par entrée en secondes
             
-            # Vérifier s'il y a un nom de classe réel différent qui a été détecté lors de la compilation
-            real_class_name = getattr(self, '_real_class_name', class_name)
+        Returns:
+            list: Un résultat brut ({'exit_code', 'stdout', 'stderr', 'timed_out'}) par entrée
+        """
+        if not inputs:
+            return []
+        
+        if self._get_harness() is None and self.use_driver and len(inputs) > 1:
+            support_classes_dir = self._get_support_classes()
+            if support_classes_dir:
+                logger.info(f"Exécution de {class_name} avec {len(inputs)} entrées dans une seule JVM")
+                driver = JavaInputDriver(support_classes_dir, java_command=['java'] + self._run_jvm_options(),
+                                         output_limits=self.output_limits, limits=self.resource_limits)
+                runs = driver.run_all(compile_dir, class_name, inputs, timeout)
+                return [run if run is not None else self._run_input_in_process(compile_dir, class_name, input_val, timeout)
+                        for input_val, run in zip(inputs, runs)]
+        
+        runs = []
+        for input_val in inputs:
+            logger.info(f"Test de {class_name} avec entrée '{input_val}'")
+            runs.append(self._run_input(compile_dir, class_name, input_val, timeout))
+        return runs
+    
+    def _run_input(self, compile_dir: str, class_name: str, input_val: str, timeout: int) -> Dict[str, Any]:
+        """
+        Exécuter un programme avec une entrée, dans le harnais JVM si possible.
+        
+        Args:
+            compile_dir: Répertoire contenant les fichiers .class
+            class_name: Nom de la classe principale
+            input_val: Entrée fournie au programme
+            timeout: Temps maximum d'exécution en secondes
             
-            compile_dir = os.path.join(self.temp_dir, class_name)
+        Returns:
+            dict: {'exit_code', 'stdout', 'stderr', 'timed_out'}
+        """
+        harness = self._get_harness()
+        run = harness.run(compile_dir, class_name, input_val, timeout) if harness else None
+        if run is None:
+            # Harnais indisponible : exécuter dans un processus dédié
+            run = self._run_input_in_process(compile_dir, class_name, input_val, timeout)
+        return run
+    
+    def _format_run(self, input_val: str, run: Dict[str, Any], timeout: int) -> Dict[str, Any]:
+        """
+        Convertir le résultat brut d'une exécution en résultat de test.
+        
+        Args:
+            input_val: Entrée fournie au programme
+            run: Résultat brut ({'exit_code', 'stdout', 'stderr', 'timed_out', 'cpu_time',
+                'peak_rss_kb'})
+            timeout: Temps maximum d'exécution en secondes
             
-            # Vérifier si le fichier .class existe avec le nom réel
-            class_file_path = os.path.join(compile_dir, f"{real_class_name}.class")
-            if not os.path.exists(class_file_path):
-                # Chercher tout fichier .class dans le répertoire
-                class_files = [f for f in os.listdir(compile_dir) if f.endswith('.class')]
-                if class_files:
-                    # Utiliser le premier fichier .class trouvé
-                    real_class_name = os.path.splitext(class_files[0])[0]
-                    logger.info(f"Utilisation de la classe trouvée: {real_class_name}")
+        Returns:
+            dict: Résultat du test (entrée, succès, sorties, troncature, ressources consommées ;
+                cpu_time et peak_rss_kb valent None si la mesure est impossible ou
+                si le résultat provient du cache)
+        """
+        if run.get("timed_out"):
+            logger.warning(f"Timeout pour test avec entrée '{input_val}'")
+            return {
+                "input": input_val,
+                "success": False,
+                "compilation_error": False,
+                "stdout": "",
+                "stderr": f"Exécution timeout (> {timeout}s)",
+                "output_truncated": bool(run.get("output_truncated")),
+                "cpu_time": run.get("cpu_time"),
+                "peak_rss_kb": run.get("peak_rss_kb")
+            }
+        
+        success = run["exit_code"] == 0
+        stderr = run["stderr"]
+        if hasattr(signal, 'SIGXCPU') and run["exit_code"] == -signal.SIGXCPU and self.resource_limits is not None:
+            # SIGXCPU : RLIMIT_CPU dépassé, ou temps CPU dépassé dans le harnais ou le pilote
+            stderr += f"\nLimite de temps CPU dépassée (> {self.resource_limits.cpu_seconds}s)"
+        if run.get("output_truncated"):
+            stderr += (f"\nSortie tronquée (seuls le début et la fin sont conservés ; "
+                       f"programme arrêté au-delà de {self.output_limits.hard_limit_bytes // 1024} Ko)")
+        logger.info(f"Test avec entrée '{input_val}' terminé: {'succès' if success else 'échec'}")
+        return {
+            "input": input_val,
+            "success": success,
+            "compilation_error": False,
+            "stdout": run["stdout"],
+            "stderr": stderr,
+            "output_truncated": bool(run.get("output_truncated")),
+            "cpu_time": run.get("cpu_time"),
+            "peak_rss_kb": run.get("peak_rss_kb")
+        }
+    
+    def _resolve_class(self, compile_dir: str, class_name: str) -> str:
+        """
+        Déterminer la classe principale à exécuter dans un répertoire de compilation.
+        
+        Args:
+            compile_dir: Répertoire contenant les fichiers .class
+            class_name: Nom de classe attendu
             
-            logger.info(f"Test de {real_class_name} avec entrée '{input_val}'")
+        Returns:
+            str: Nom de la classe à exécuter
+        """
+        real_class_name = class_name
+        
+        # Vérifier si le fichier .class existe avec le nom réel
+        class_file_path = os.path.join(compile_dir, f"{real_class_name}.class")
+        if not os.path.exists(class_file_path):
+            # Chercher tout fichier .class dans le répertoire
+            class_files = [f for f in os.listdir(compile_dir) if f.endswith('.class')]
+            if class_files:
+                # Utiliser le premier fichier .class trouvé
+                real_class_name = os.path.splitext(class_files[0])[0]
+                logger.info(f"Utilisation de la classe trouvée: {real_class_name}")
+        
+        return real_class_name
+    
+    def compile_batch(self, files: Dict[str, str], timeout: int = 10) -> Dict[str, Tuple[bool, str]]:
+        """
+        Compiler les fichiers de toute une cohorte en une seule JVM.
+        
+        Chaque fichier est copié dans son propre répertoire de compilation ; les
+        appels suivants à test_with_inputs sur ces fichiers réutilisent les classes
+        compilées au lieu de relancer javac.
+        
+        Args:
+            files: Dictionnaire {clé (ex. nom de l'étudiant): chemin du fichier Java}
+            timeout: Temps maximum de compilation par fichier en secondes
             
+        Returns:
+            dict: {clé: (success, output)} comme pour compile_java
+        """
+        staged = {}
+        for key, file_path in files.items():
             try:
-                # Exécuter le programme avec cette entrée spécifique
-                process = subprocess.Popen(
-                    ['java', '-cp', compile_dir, real_class_name],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                
-                try:
-                    # Fournir l'entrée et récupérer la sortie pour ce test spécifique
-                    stdout, stderr = process.communicate(input=input_val, timeout=timeout)
-                    success = process.returncode == 0
-                    
-                    # Ajouter ce résultat spécifique à la liste des résultats
-                    results.append({
-                        "input": input_val,
-                        "success": success,
-                        "compilation_error": False,
-                        "stdout": stdout,
-                        "stderr": stderr
-                    })
-                    
-                    logger.info(f"Test avec entrée '{input_val}' terminé: {'succès' if success else 'échec'}")
-                
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    results.append({
-                        "input": input_val,
-                        "success": False,
-                        "compilation_error": False,
-                        "stdout": "",
-                        "stderr": f"Exécution timeout (> {timeout}s)"
-                    })
-                    logger.warning(f"Timeout pour test avec entrée '{input_val}'")
+                staged[key] = self._stage_for_batch(file_path)
+            except OSError as e:
+                logger.error(f"Impossible de préparer {file_path} pour la compilation: {str(e)}")
+        
+        results = {}
+        for key, record in list(staged.items()):
+            cached = self._restore_from_cache(record["cache_key"], record["compile_dir"])
+            if cached:
+                self._record_precompiled(files[key], record, cached["success"], cached["output"])
+                results[key] = (cached["success"], cached["output"])
+                del staged[key]
+        
+        keys = list(staged)
+        outcomes = {}
+        diagnostics = {}
+        if keys and self._get_compile_server() is not None:
+            # Serveur résident : compilation en mémoire, diagnostics structurés
+            logger.info(f"Compilation en mémoire de {len(keys)} fichier(s)...")
+            for key in keys:
+                self._last_diagnostics = None
+                outcome = self._compile_in_server(staged[key]["source_path"], staged[key]["compile_dir"], timeout=timeout)
+                if outcome is not None:
+                    outcomes[key] = outcome
+                    diagnostics[key] = self._last_diagnostics
+        
+        remaining = [key for key in keys if key not in outcomes]
+        support_classes_dir = self._get_support_classes()
+        if support_classes_dir and remaining:
+            logger.info(f"Compilation par lots de {len(remaining)} fichier(s)...")
+            compiler = JavaBatchCompiler(support_classes_dir)
+            batch_outcomes = compiler.compile([staged[key]["source_path"] for key in remaining], timeout_per_file=timeout)
+            outcomes.update(zip(remaining, batch_outcomes))
+        
+        for key in keys:
+            outcome = outcomes.get(key)
+            record = staged[key]
+            timed_out = False
+            if outcome is None:
+                # Fichier non traité par la JVM de compilation : javac individuel
+                success, output, timed_out = self._run_javac(record["source_path"], timeout)
+            else:
+                success, output = outcome
+            if success:
+                logger.info(f"Compilation réussie pour {os.path.basename(record['source_path'])}")
+                output = "Compilation réussie"
+            else:
+                logger.warning(f"Échec de compilation pour {os.path.basename(record['source_path'])}: {output}")
+            key_diagnostics = diagnostics.get(key)
+            if key_diagnostics is None:
+                key_diagnostics = parse_javac_output(output)
             
-            except Exception as e:
-                results.append({
-                    "input": input_val,
-                    "success": False,
-                    "compilation_error": False,
-                    "stdout": "",
-                    "stderr": f"Erreur d'exécution: {str(e)}"
-                })
-                logger.error(f"Erreur pour test avec entrée '{input_val}': {str(e)}")
+            self._store_in_cache(record["cache_key"], record["compile_dir"], success, output, record["class_name"],
+                                 key_diagnostics, timed_out)
+            self._record_precompiled(files[key], record, success, output)
+            results[key] = (success, output)
         
+        for key in files:
+            if key not in results:
+                results[key] = (False, "Erreur de compilation: fichier illisible")
         return results
     
+    def _stage_for_batch(self, file_path: str) -> Dict[str, str]:
+        """
+        Copier un fichier dans un répertoire de compilation dédié, sous le nom de sa classe publique.
+        
+        Args:
+            file_path: Chemin vers le fichier Java
+            
+        Returns:
+            dict: Empreinte du source, répertoire de compilation, fichier copié et nom de classe
+        """
+        source = read_source_bytes(file_path)
+        
+        class_name = self._extract_class_name_from_file(file_path) or os.path.splitext(os.path.basename(file_path))[0]
+        self._batch_counter += 1
+        compile_dir = os.path.join(self.temp_dir, "__batch__", str(self._batch_counter))
+        os.makedirs(compile_dir, exist_ok=True)
+        
+        source_path = os.path.join(compile_dir, f"{class_name}.java")
+        with open(source_path, 'wb') as staged_file:
+            staged_file.write(source)
+        
+        return {
+            "digest": hashlib.sha256(source).hexdigest(),
+            "cache_key": CompilationCache.make_key(source, self.javac_version, class_name),
+            "compile_dir": compile_dir,
+            "source_path": source_path,
+            "class_name": class_name
+        }
+    
+    def _record_precompiled(self, file_path: str, record: Dict[str, str], success: bool, output: str):
+        """Mémoriser le résultat de compilation d'un fichier pour test_with_inputs."""
+        self._precompiled[os.path.abspath(file_path)] = (
+            record["digest"], success, output, record["compile_dir"], record["class_name"]
+        )
+    
+    def _cache_key(self, source_path: str) -> Optional[str]:
+        """
+        Calculer la clé de cache d'un fichier copié dans son répertoire de compilation.
+        
+        Args:
+            source_path: Chemin du fichier .java à compiler
+            
+        Returns:
+            str: Clé de cache, ou None si le cache est désactivé
+        """
+        if self.compile_cache is None:
+            return None
+        with open(source_path, 'rb') as source_file:
+            source = source_file.read()
+        class_name = os.path.splitext(os.path.basename(source_path))[0]
+        return CompilationCache.make_key(source, self.javac_version, class_name)
+    
+    def _restore_from_cache(self, cache_key: Optional[str], compile_dir: str) -> Optional[Dict[str, Any]]:
+        """Copier les classes en cache dans le répertoire de compilation, si elles existent."""
+        if self.compile_cache is None or cache_key is None:
+            return None
+        cached = self.compile_cache.get(cache_key, compile_dir)
+        if cached:
+            logger.info(f"Compilation réutilisée depuis le cache pour {cached['class_name']}")
+        return cached
+    
+    def _store_in_cache(self, cache_key: Optional[str], compile_dir: str, success: bool, output: str, class_name: str,
+                        diagnostics: Optional[List[Dict[str, Any]]] = None, timed_out: bool = False):
+        """Enregistrer une compilation dans le cache (sauf les échecs dus à un timeout)."""
+        if self.compile_cache is None or cache_key is None or timed_out:
+            return
+        self.compile_cache.put(cache_key, compile_dir, success, output, class_name, diagnostics)
+    
+    def get_cache_stats(self) -> Optional[Dict[str, int]]:
+        """
+        Obtenir les compteurs du cache de compilation.
+        
+        Returns:
+            dict: {'hits', 'misses', 'size'} ou None si le cache est désactivé
+        """
+        if self.compile_cache is None:
+            return None
+        return self.compile_cache.get_stats()
+    
+    def adopt_precompiled(self, other: 'JavaExecutor'):
+        """
+        Réutiliser les compilations et les classes de support d'un autre exécuteur.
+
+        Les répertoires restent dans celui de l'autre exécuteur : il ne doit pas être
+        nettoyé avant la fin des exécutions.
+
+        Args:
+            other: Exécuteur ayant effectué compile_batch
+        """
+        self._precompiled.update(other._precompiled)
+        if self._support_classes_dir is None and other._support_classes_dir:
+            self._support_classes_dir = other._support_classes_dir
+
+    def _take_precompiled(self, file_path: str) -> Optional[Tuple[bool, str, str, str]]:
+        """
+        Récupérer le résultat de compile_batch pour un fichier s'il est toujours à jour.
+        
+        Args:
+            file_path: Chemin vers le fichier Java
+            
+        Returns:
+            tuple: (success, output, compile_dir, class_name) ou None
+        """
+        record = self._precompiled.get(os.path.abspath(file_path))
+        if record is None:
+            return None
+        
+        digest, success, output, compile_dir, class_name = record
+        try:
+            if hashlib.sha256(read_source_bytes(file_path)).hexdigest() != digest:
+                return None
+        except OSError:
+            return None
+        
+        return success, output, compile_dir, class_name
+    
+    def _run_javac(self, source_path: str, timeout: int) -> Tuple[bool, str, bool]:
+        """
+        Compiler un fichier avec un processus javac dédié.
+        
+        Args:
+            source_path: Chemin du fichier à compiler
+            timeout: Temps maximum de compilation en secondes
+            
+        Returns:
+            (success, output, timed_out): Statut, sortie du compilateur et indicateur
+                de dépassement du temps de compilation
+        """
+        try:
+            result = subprocess.run(['javac', source_path], capture_output=True, text=True, timeout=timeout)
+            return result.returncode == 0, result.stderr, False
+        except subprocess.TimeoutExpired:
+            return False, f"Compilation timeout (> {timeout}s)", True
+        except Exception as e:
+            return False, f"Erreur de compilation: {str(e)}", False
+    
+    def _get_support_classes(self) -> Optional[str]:
+        """
+        Compiler (une seule fois) les classes Java de support.
+        
+        Returns:
+            str: Répertoire des classes de support, ou None si indisponible
+        """
+        if self._support_classes_dir is None:
+            support_dir = os.path.join(self.temp_dir, "__teachassist_support__")
+            self._support_classes_dir = compile_support_classes(support_dir) or ""
+        
+        return self._support_classes_dir or None
+    
+    def _get_compile_server(self) -> Optional[JavaCompileServer]:
+        """
+        Obtenir le serveur de compilation résident, en le préparant au premier appel.
+        
+        Returns:
+            JavaCompileServer: Le serveur, ou None s'il est désactivé ou indisponible
+        """
+        if not self.use_compile_server:
+            return None
+        
+        if self._compile_server is None:
+            classes_dir = self._get_support_classes()
+            if classes_dir is None:
+                self.use_compile_server = False
+                return None
+            self._compile_server = JavaCompileServer(classes_dir)
+        
+        if not self._compile_server.available:
+            return None
+        return self._compile_server
+    
+    def _compile_in_server(self, source_path: str, compile_dir: str, timeout: int = 10,
+                           file_name: Optional[str] = None) -> Optional[Tuple[bool, str]]:
+        """
+        Compiler un fichier dans le serveur résident et écrire ses classes.
+        
+        Les diagnostics structurés sont conservés dans self._last_diagnostics.
+        
+        Args:
+            source_path: Chemin du fichier à compiler
+            compile_dir: Répertoire où écrire les fichiers .class
+            timeout: Temps maximum de compilation en secondes
+            file_name: Nom de fichier présenté au compilateur (par défaut celui du fichier)
+            
+        Returns:
+            (success, output): Comme pour javac, ou None si le serveur est indisponible
+        """
+        server = self._get_compile_server()
+        if server is None:
+            return None
+        
+        file_name = file_name or os.path.basename(source_path)
+        try:
+            with open(source_path, 'r', encoding='utf-8', errors='replace') as source_file:
+                source = source_file.read()
+        except OSError:
+            return None
+        
+        logger.info(f"Compilation en mémoire de {file_name}...")
+        result = server.compile(file_name, source, timeout=timeout)
+        if result is None:
+            return None
+        
+        self._last_diagnostics = result["diagnostics"]
+        if not result["success"]:
+            return False, format_diagnostics(file_name, result["diagnostics"])
+        JavaCompileServer.write_classes(result["classes"], compile_dir)
+        logger.info(f"Compilation réussie pour {file_name}")
+        return True, "Compilation réussie"
+    
+    def _get_harness(self) -> Optional[JavaHarness]:
+        """
+        Obtenir le harnais JVM persistant, en le préparant au premier appel.
+        
+        Returns:
+            JavaHarness: Le harnais, ou None s'il est désactivé ou indisponible
+        """
+        if not self.use_harness:
+            return None
+        
+        if self._harness is None:
+            classes_dir = self._get_support_classes()
+            if classes_dir is None:
+                logger.warning("Harnais JVM indisponible, exécution d'un processus par entrée")
+                self.use_harness = False
+                return None
+            self._harness = JavaHarness(classes_dir, java_command=['java'] + self._run_jvm_options(),
+                                        output_limits=self.output_limits, limits=self.resource_limits)
+        
+        return self._harness
+    
+    def _run_input_in_process(self, compile_dir: str, class_name: str, input_val: str, timeout: int) -> Dict[str, Any]:
+        """
+        Exécuter un programme dans une JVM dédiée avec une entrée donnée.
+        
+        Args:
+            compile_dir: Répertoire contenant les fichiers .class
+            class_name: Nom de la classe principale
+            input_val: Entrée fournie au programme
+            timeout: Temps maximum d'exécution en secondes
+            
+        Returns:
+            dict: {'exit_code', 'stdout', 'stderr', 'timed_out', 'output_truncated', 'cpu_time', 'peak_rss_kb'}
+        """
+        try:
+            # Exécuter le programme avec cette entrée spécifique, limites appliquées au lancement
+            return run_process(
+                ['java'] + self._run_jvm_options() + ['-cp', compile_dir, class_name],
+                input_val,
+                timeout,
+                limits=self.resource_limits,
+                cgroup=self.cgroup,
+                output_limits=self.output_limits
+            )
+        except Exception as e:
+            logger.error(f"Erreur pour test avec entrée '{input_val}': {str(e)}")
+            return {"exit_code": None, "stdout": "", "stderr": f"Erreur d'exécution: {str(e)}", "timed_out": False,
+                    "output_truncated": False}
+    
+    def _run_jvm_options(self) -> List[str]:
+        """Options JVM des exécutions, y compris celles imposées par les limites de ressources."""
+        limit_options = self.resource_limits.jvm_options() if self.resource_limits else []
+        return self.jvm_options + limit_options
+    
     def clean_up(self):
         """Nettoyer les fichiers temporaires."""
+        if getattr(self, '_harness', None) is not None:
+            self._harness.stop()
+            self._harness = None
+        if getattr(self, '_compile_server', None) is not None:
+            self._compile_server.stop()
+            self._compile_server = None
+        
         try:
             if os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
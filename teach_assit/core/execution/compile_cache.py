@@ -0,0 +1,204 @@
+"""
+Cache persistant des compilations Java, indexé par le contenu du fichier source.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Taille maximale par défaut du cache sur disque (en octets)
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+META_FILE = "meta.json"
+
+
+class CompilationCache:
+    """
+    Associe sha256(source + version de javac + options) aux fichiers .class
+    produits et aux diagnostics du compilateur.
+
+    Chaque entrée est un répertoire `<clé[:2]>/<clé>/` contenant les .class et un
+    fichier meta.json. La date de modification de meta.json sert à l'éviction LRU
+    lorsque la taille totale dépasse la limite.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialiser le cache.
+
+        Args:
+            cache_dir: Répertoire du cache. Si None, utilise data/compile_cache à la racine du projet.
+            max_size: Taille maximale du cache en octets
+        """
+        if cache_dir is None:
+            project_root = Path(__file__).parent.parent.parent.parent
+            cache_dir = str(project_root / "data" / "compile_cache")
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._size = sum(self._entry_size(path) for path in self._entries())
+
+    @staticmethod
+    def make_key(source: bytes, compiler_version: str, class_name: str, flags: Iterable[str] = ()) -> str:
+        """
+        Calculer la clé d'une compilation.
+
+        Args:
+            source: Contenu du fichier source
+            compiler_version: Sortie de `javac -version`
+            class_name: Nom sous lequel le fichier est compilé (nom du fichier .java)
+            flags: Options passées au compilateur
+
+        Returns:
+            str: Empreinte sha256 hexadécimale
+        """
+        digest = hashlib.sha256(source)
+        for part in [compiler_version, class_name, *flags]:
+            digest.update(b"\0" + part.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key: str, dest_dir: str) -> Optional[Dict]:
+        """
+        Restaurer une compilation en cache dans un répertoire.
+
+        Args:
+            key: Clé calculée par make_key
+            dest_dir: Répertoire où copier les fichiers .class
+
+        Returns:
+            dict: {'success', 'output', 'class_name', 'diagnostics'} ou None si absent du cache
+        """
+        entry_dir = self._entry_dir(key)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+            os.makedirs(dest_dir, exist_ok=True)
+            for name in os.listdir(entry_dir):
+                if name.endswith('.class'):
+                    shutil.copy2(os.path.join(entry_dir, name), os.path.join(dest_dir, name))
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        meta.setdefault("diagnostics", None)
+        return meta
+
+    def put(self, key: str, compile_dir: str, success: bool, output: str, class_name: str,
+            diagnostics: Optional[List[Dict]] = None):
+        """
+        Enregistrer le résultat d'une compilation.
+
+        Args:
+            key: Clé calculée par make_key
+            compile_dir: Répertoire contenant les fichiers .class produits
+            success: Statut de la compilation
+            output: Diagnostics du compilateur
+            class_name: Nom de la classe principale
+            diagnostics: Diagnostics structurés {'kind', 'line', 'column', 'message'}
+        """
+        entry_dir = self._entry_dir(key)
+        staging_dir = f"{entry_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(staging_dir, exist_ok=True)
+            if success:
+                for name in os.listdir(compile_dir):
+                    if name.endswith('.class'):
+                        shutil.copy2(os.path.join(compile_dir, name), os.path.join(staging_dir, name))
+            with open(os.path.join(staging_dir, META_FILE), 'w', encoding='utf-8') as meta_file:
+                json.dump({"success": success, "output": output, "class_name": class_name,
+                           "diagnostics": diagnostics}, meta_file)
+
+            # Publication atomique : une entrée visible est toujours complète
+            if os.path.exists(entry_dir):
+                shutil.rmtree(staging_dir)
+                return
+            os.replace(staging_dir, entry_dir)
+        except OSError as e:
+            logger.warning(f"Impossible d'enregistrer la compilation dans le cache: {str(e)}")
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return
+
+        with self._lock:
+            self._size += self._entry_size(entry_dir)
+            over_limit = self._size > self.max_size
+        if over_limit:
+            self.evict()
+
+    def evict(self):
+        """Supprimer les entrées les moins récemment utilisées jusqu'à repasser sous 90 % de la limite."""
+        with self._lock:
+            target = int(self.max_size * 0.9)
+            entries = []
+            for path in self._entries():
+                try:
+                    entries.append((os.path.getmtime(os.path.join(path, META_FILE)), path))
+                except OSError:
+                    entries.append((0, path))
+            entries.sort()
+
+            size = sum(self._entry_size(path) for _, path in entries)
+            removed = 0
+            for _, path in entries:
+                if size <= target:
+                    break
+                size -= self._entry_size(path)
+                shutil.rmtree(path, ignore_errors=True)
+                removed += 1
+            self._size = size
+
+        if removed:
+            logger.info(f"Cache de compilation: {removed} entrée(s) supprimée(s)")
+
+    def clear(self):
+        """Vider complètement le cache."""
+        with self._lock:
+            for path in self._entries():
+                shutil.rmtree(path, ignore_errors=True)
+            self._size = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtenir les compteurs du cache.
+
+        Returns:
+            dict: {'hits', 'misses', 'size'}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": self._size}
+
+    def _entry_dir(self, key: str) -> str:
+        """Répertoire d'une entrée du cache."""
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def _entries(self):
+        """Lister les répertoires des entrées du cache."""
+        for prefix in os.listdir(self.cache_dir):
+            prefix_dir = os.path.join(self.cache_dir, prefix)
+            if len(prefix) != 2 or not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                if not name.endswith('.tmp'):
+                    yield os.path.join(prefix_dir, name)
+
+    @staticmethod
+    def _entry_size(entry_dir: str) -> int:
+        """Taille totale des fichiers d'une entrée."""
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+        except OSError:
+            return 0
@@ -0,0 +1,259 @@
+"""
+Serveur de compilation résident : une JVM qui compile les sources en mémoire
+avec javax.tools et renvoie les classes et des diagnostics structurés.
+"""
+
+import os
+import re
+import base64
+import queue
+import subprocess
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from teach_assit.core.execution.java_support import COMPILE_SERVER_CLASS
+from teach_assit.core.execution.java_harness import drain_stderr, kill_process, read_protocol
+
+logger = logging.getLogger(__name__)
+
+# Préfixes des lignes émises par le serveur
+SERVER_KINDS = ('READY', 'NOCOMPILER', 'CLASS', 'DIAG', 'DONE', 'ERR')
+
+# Libellés javac des types de diagnostics
+DIAGNOSTIC_LABELS = {
+    'ERROR': 'error',
+    'WARNING': 'warning',
+    'MANDATORY_WARNING': 'warning',
+    'NOTE': 'note'
+}
+
+# Ligne d'en-tête d'un diagnostic dans la sortie texte de javac
+JAVAC_DIAGNOSTIC_RE = re.compile(r'^(?P<file>.+?\.java):(?P<line>\d+): (?P<kind>error|warning): (?P<message>.*)$')
+
+
+def _encode(data: bytes) -> str:
+    """Encoder des octets en base64."""
+    return base64.b64encode(data).decode('ascii')
+
+
+def format_diagnostics(file_name: str, diagnostics: List[Dict[str, Any]]) -> str:
+    """
+    Mettre en forme des diagnostics comme la sortie de javac.
+
+    Args:
+        file_name: Nom du fichier compilé
+        diagnostics: Diagnostics {'kind', 'line', 'column', 'message'}
+
+    Returns:
+        str: Texte des diagnostics, suivi du nombre d'erreurs
+    """
+    lines = []
+    errors = 0
+    for diagnostic in diagnostics:
+        label = DIAGNOSTIC_LABELS.get(diagnostic['kind'], diagnostic['kind'].lower())
+        errors += diagnostic['kind'] == 'ERROR'
+        if diagnostic['line'] > 0:
+            lines.append(f"{file_name}:{diagnostic['line']}: {label}: {diagnostic['message']}")
+        else:
+            lines.append(f"{label}: {diagnostic['message']}")
+    if errors:
+        lines.append(f"{errors} error" + ("s" if errors > 1 else ""))
+    return "\n".join(lines)
+
+
+def parse_javac_output(output: str) -> List[Dict[str, Any]]:
+    """
+    Extraire les diagnostics de la sortie texte de javac (compilation hors serveur).
+
+    La colonne est déduite de la ligne du curseur (^) qui suit la ligne de code.
+
+    Args:
+        output: Sortie d'erreur de javac
+
+    Returns:
+        list: Diagnostics {'kind', 'line', 'column', 'message'}
+    """
+    diagnostics = []
+    lines = output.splitlines()
+    for i, line in enumerate(lines):
+        match = JAVAC_DIAGNOSTIC_RE.match(line)
+        if not match:
+            continue
+        column = -1
+        for caret_line in lines[i + 1:i + 4]:
+            if caret_line.strip() == '^':
+                column = caret_line.index('^') + 1
+                break
+        diagnostics.append({
+            "kind": match.group('kind').upper(),
+            "line": int(match.group('line')),
+            "column": column,
+            "message": match.group('message')
+        })
+    return diagnostics
+
+
+class JavaCompileServer:
+    """
+    JVM de compilation démarrée une fois, qui compile chaque source en mémoire.
+
+    Les fichiers .class produits sont écrits par l'appelant dans le répertoire
+    d'exécution ; si le serveur est indisponible (JRE sans compilateur, Java absent),
+    compile() retourne None et l'appelant se replie sur javac.
+    """
+
+    def __init__(self, support_classes_dir: str, java_command: Optional[List[str]] = None,
+                 startup_timeout: int = 30):
+        """
+        Initialiser le serveur.
+
+        Args:
+            support_classes_dir: Répertoire contenant les classes de support compilées
+            java_command: Commande de lancement de la JVM (par défaut ['java'])
+            startup_timeout: Temps maximum de démarrage de la JVM en secondes
+        """
+        self.support_classes_dir = support_classes_dir
+        self.java_command = list(java_command or ['java'])
+        self.startup_timeout = startup_timeout
+        self.available = True
+        self._process = None
+        self._responses = None
+        self._lock = threading.Lock()
+
+    def start(self) -> bool:
+        """
+        Démarrer la JVM du serveur et attendre qu'elle soit prête.
+
+        Returns:
+            bool: True si le serveur est prêt
+        """
+        command = self.java_command + ['-cp', self.support_classes_dir, COMPILE_SERVER_CLASS]
+        try:
+            process = subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            logger.warning(f"Impossible de démarrer le serveur de compilation: {str(e)}")
+            self.available = False
+            return False
+
+        responses = queue.Queue()
+        threading.Thread(target=read_protocol, args=(process, responses, SERVER_KINDS), daemon=True).start()
+        threading.Thread(target=drain_stderr, args=(process,), daemon=True).start()
+
+        try:
+            line = responses.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            line = None
+
+        if line != 'READY':
+            if line == 'NOCOMPILER':
+                logger.info("JVM sans compilateur intégré, compilation avec javac")
+            else:
+                logger.warning("Le serveur de compilation n'a pas démarré correctement")
+            self.available = False
+            kill_process(process)
+            return False
+
+        self._process = process
+        self._responses = responses
+        logger.info(f"Serveur de compilation démarré (pid {process.pid})")
+        return True
+
+    def compile(self, file_name: str, source: str, timeout: float = 10) -> Optional[Dict[str, Any]]:
+        """
+        Compiler un source en mémoire.
+
+        Args:
+            file_name: Nom du fichier (ex. Main.java), qui doit correspondre à la classe publique
+            source: Code source Java
+            timeout: Temps maximum de compilation en secondes
+
+        Returns:
+            dict: {'success', 'classes' ({nom binaire: octets}), 'diagnostics'
+                ([{'kind', 'line', 'column', 'message'}])}, ou None si le serveur est
+                indisponible ou n'a pas répondu à temps
+        """
+        with self._lock:
+            if not self.available:
+                return None
+            if (self._process is None or self._process.poll() is not None) and not self.start():
+                return None
+
+            command = f"COMPILE {_encode(file_name.encode('utf-8'))} {_encode(source.encode('utf-8'))}\n"
+            try:
+                self._process.stdin.write(command.encode('ascii'))
+                self._process.stdin.flush()
+            except OSError as e:
+                logger.warning(f"Serveur de compilation inaccessible: {str(e)}")
+                self._reset()
+                return None
+
+            classes = {}
+            diagnostics = []
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    line = self._responses.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    logger.warning(f"Timeout du serveur de compilation pour {file_name}")
+                    self._reset()
+                    return None
+
+                if line is None:
+                    logger.warning("Le serveur de compilation s'est arrêté")
+                    self._reset()
+                    return None
+
+                kind, _, payload = line.partition(' ')
+                parts = payload.split(' ')
+                if kind == 'CLASS':
+                    classes[base64.b64decode(parts[0]).decode('utf-8')] = base64.b64decode(parts[1])
+                elif kind == 'DIAG':
+                    diagnostics.append({
+                        "kind": parts[0],
+                        "line": int(parts[1]),
+                        "column": int(parts[2]),
+                        "message": base64.b64decode(parts[3]).decode('utf-8', errors='replace')
+                    })
+                elif kind == 'DONE':
+                    return {"success": parts[0] == '0', "classes": classes, "diagnostics": diagnostics}
+                elif kind == 'ERR':
+                    logger.warning(f"Erreur du serveur de compilation: {base64.b64decode(payload).decode('utf-8')}")
+                    return None
+
+    @staticmethod
+    def write_classes(classes: Dict[str, bytes], output_dir: str):
+        """
+        Écrire les classes compilées dans un répertoire de classpath.
+
+        Args:
+            classes: {nom binaire: octets} retourné par compile()
+            output_dir: Répertoire de destination
+        """
+        for binary_name, data in classes.items():
+            class_path = os.path.join(output_dir, *binary_name.split('.')) + ".class"
+            os.makedirs(os.path.dirname(class_path), exist_ok=True)
+            with open(class_path, 'wb') as class_file:
+                class_file.write(data)
+
+    def stop(self):
+        """Arrêter proprement la JVM du serveur."""
+        with self._lock:
+            process = self._process
+            if process is None:
+                return
+            try:
+                process.stdin.write(b"QUIT\n")
+                process.stdin.flush()
+                process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._reset()
+
+    def _reset(self):
+        """Tuer la JVM courante ; elle sera relancée à la prochaine compilation."""
+        if self._process is not None:
+            kill_process(self._process)
+        self._process = None
+        self._responses = None
@@ -0,0 +1,179 @@
+"""
+Pilote exécutant toutes les entrées de test d'un exercice dans un seul lancement de JVM.
+"""
+
+import base64
+import queue
+import subprocess
+import threading
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+from teach_assit.core.execution.java_support import DRIVER_CLASS
+from teach_assit.core.execution.java_harness import (
+    CpuLimitExceeded, cpu_limit_run, drain_stderr, kill_process, next_response, read_protocol
+)
+from teach_assit.core.execution.output_capture import OutputLimits
+from teach_assit.core.execution.sandbox import ProcessUsage, ResourceLimits, spawn
+
+logger = logging.getLogger(__name__)
+
+# Préfixes des lignes émises par le pilote
+DRIVER_KINDS = ('BEGIN', 'RESULT', 'EXIT', 'LEAK')
+
+
+def _decode(data: str) -> str:
+    """Décoder une chaîne base64 en texte UTF-8."""
+    return base64.b64decode(data).decode('utf-8', errors='replace')
+
+
+class JavaInputDriver:
+    """
+    Lance une JVM par exercice et par étudiant : le pilote Java appelle la méthode
+    main de l'étudiant une fois par entrée, dans un chargeur de classes neuf.
+
+    Après un System.exit ou un timeout, une nouvelle JVM reprend à l'entrée suivante.
+    Si le programme modifie un état global de la JVM, les entrées restantes sont
+    laissées à l'appelant pour une exécution dans des processus séparés. Les
+    limites de ressources s'appliquent à la JVM, sauf le temps CPU, contrôlé pour
+    chaque entrée.
+    """
+
+    def __init__(self, support_classes_dir: str, java_command: Optional[List[str]] = None,
+                 startup_timeout: int = 30, output_limits: Optional[OutputLimits] = None,
+                 limits: Optional[ResourceLimits] = None):
+        """
+        Initialiser le pilote.
+
+        Args:
+            support_classes_dir: Répertoire contenant les classes de support compilées
+            java_command: Commande de lancement de la JVM (par défaut ['java'])
+            startup_timeout: Temps maximum de démarrage de la JVM en secondes
+            output_limits: Limites de capture des sorties (par défaut OutputLimits())
+            limits: Limites de ressources (optionnel ; le tas est borné par java_command)
+        """
+        self.support_classes_dir = support_classes_dir
+        self.java_command = list(java_command or ['java'])
+        self.startup_timeout = startup_timeout
+        self.output_limits = output_limits or OutputLimits()
+        self.limits = limits
+
+    def run_all(self, class_dir: str, class_name: str, inputs: List[str],
+                timeout: float) -> List[Optional[Dict[str, Any]]]:
+        """
+        Exécuter un programme avec chaque entrée.
+
+        Args:
+            class_dir: Répertoire contenant les fichiers .class de l'étudiant
+            class_name: Nom de la classe principale
+            inputs: Entrées à fournir successivement au programme
+            timeout: Temps maximum d'exécution par entrée en secondes
+
+        Returns:
+            list: Pour chaque entrée, {'exit_code', 'stdout', 'stderr', 'timed_out',
+                'output_truncated', 'cpu_time', 'peak_rss_kb'}, ou None si elle doit être
+                exécutée dans un processus séparé ; cpu_time et peak_rss_kb valent None hors Linux
+        """
+        runs = [None] * len(inputs)
+        start = 0
+        while start < len(inputs):
+            next_start = self._run_from(class_dir, class_name, inputs, start, timeout, runs)
+            if next_start is None:
+                break
+            start = next_start
+        return runs
+
+    def _run_from(self, class_dir: str, class_name: str, inputs: List[str], start: int,
+                  timeout: float, runs: List[Optional[Dict[str, Any]]]) -> Optional[int]:
+        """
+        Lancer une JVM pour les entrées à partir de `start` et remplir `runs`.
+
+        Returns:
+            int: Indice de reprise après un System.exit ou un timeout, ou None si
+                toutes les entrées possibles ont été traitées
+        """
+        command = (self.java_command + ['-cp', self.support_classes_dir, DRIVER_CLASS, class_dir, class_name]
+                   + self.output_limits.java_args())
+        try:
+            process = spawn(command, self.limits, include_cpu=False,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except OSError as e:
+            logger.warning(f"Impossible de démarrer le pilote Java: {str(e)}")
+            return None
+
+        responses = queue.Queue()
+        threading.Thread(target=read_protocol, args=(process, responses, DRIVER_KINDS), daemon=True).start()
+        threading.Thread(target=drain_stderr, args=(process,), daemon=True).start()
+        threading.Thread(target=self._write_inputs, args=(process, inputs[start:]), daemon=True).start()
+
+        usage = ProcessUsage(process.pid)
+        current = None
+        pending_exit = None
+        deadline = time.monotonic() + self.startup_timeout
+        try:
+            while True:
+                try:
+                    line = next_response(responses, deadline, usage if current is not None else None, self.limits)
+                except queue.Empty:
+                    if current is None:
+                        logger.warning("Le pilote Java n'a pas démarré correctement")
+                        return None
+                    logger.warning(f"Timeout du pilote pour {class_name} (entrée {current})")
+                    runs[current] = {"exit_code": None, "stdout": "", "stderr": "", "timed_out": True,
+                                     "output_truncated": False, "cpu_time": None, "peak_rss_kb": None}
+                    return current + 1
+                except CpuLimitExceeded:
+                    logger.warning(f"Temps CPU dépassé par {class_name} (entrée {current})")
+                    runs[current] = cpu_limit_run(usage)
+                    return current + 1
+
+                if line is None:
+                    # Fin de la JVM : System.exit du programme, ou toutes les entrées traitées
+                    if pending_exit is None:
+                        return None
+                    cpu_time, peak_rss_kb = usage.cpu_time(), usage.peak_rss_kb()
+                    try:
+                        exit_code = process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        exit_code = None
+                    index, stdout, stderr, truncated = pending_exit
+                    runs[index] = {"exit_code": exit_code, "stdout": stdout, "stderr": stderr, "timed_out": False,
+                                   "output_truncated": truncated, "cpu_time": cpu_time, "peak_rss_kb": peak_rss_kb}
+                    return index + 1
+
+                kind, _, payload = line.partition(' ')
+                parts = payload.split(' ')
+                if kind == 'BEGIN':
+                    current = start + int(parts[0])
+                    usage.start()
+                    deadline = time.monotonic() + timeout
+                elif kind == 'RESULT':
+                    index = start + int(parts[0])
+                    runs[index] = {"exit_code": int(parts[1]), "stdout": _decode(parts[2]),
+                                   "stderr": _decode(parts[3]), "timed_out": False,
+                                   "output_truncated": parts[4] == '1', "cpu_time": usage.cpu_time(),
+                                   "peak_rss_kb": usage.peak_rss_kb()}
+                    current = None
+                    deadline = time.monotonic() + self.startup_timeout
+                elif kind == 'EXIT':
+                    pending_exit = (start + int(parts[0]), _decode(parts[1]), _decode(parts[2]), parts[3] == '1')
+                elif kind == 'LEAK':
+                    # L'entrée concernée et les suivantes seront réexécutées isolément
+                    index = start + int(parts[0])
+                    logger.info(f"État global modifié par {class_name} ({_decode(parts[1])}), "
+                                f"repli sur un processus par entrée")
+                    runs[index] = None
+                    return None
+        finally:
+            kill_process(process)
+
+    @staticmethod
+    def _write_inputs(process, inputs: List[str]):
+        """Envoyer les entrées au pilote (une ligne base64 par entrée)."""
+        try:
+            for input_val in inputs:
+                process.stdin.write(base64.b64encode(input_val.encode('utf-8')) + b"\n")
+            process.stdin.close()
+        except OSError:
+            pass
@@ -0,0 +1,295 @@
+"""
+Harnais JVM persistant pour exécuter les programmes étudiants sans relancer une JVM à chaque entrée.
+"""
+
+import base64
+import queue
+import signal
+import subprocess
+import threading
+import time
+import logging
+from typing import Dict, List, Any, Optional
+
+from teach_assit.core.execution.java_support import HARNESS_CLASS
+from teach_assit.core.execution.output_capture import OutputLimits
+from teach_assit.core.execution.sandbox import ProcessUsage, ResourceLimits, spawn
+
+logger = logging.getLogger(__name__)
+
+# Préfixes des lignes du protocole (les autres lignes, ex. avertissements JVM, sont ignorées)
+PROTOCOL_KINDS = ('READY', 'OK', 'ERR', 'EXIT')
+
+# Intervalle de contrôle du temps CPU pendant une exécution, en secondes
+CPU_CHECK_INTERVAL = 0.1
+
+
+class CpuLimitExceeded(Exception):
+    """Temps CPU d'une exécution dépassé dans une JVM partagée."""
+
+
+def _encode(text: str) -> str:
+    """Encoder une chaîne en base64 (UTF-8)."""
+    return base64.b64encode(text.encode('utf-8')).decode('ascii')
+
+
+def _decode(data: str) -> str:
+    """Décoder une chaîne base64 en texte UTF-8."""
+    return base64.b64decode(data).decode('utf-8', errors='replace')
+
+
+def read_protocol(process, responses, kinds=PROTOCOL_KINDS):
+    """
+    Lire les lignes du protocole sur la sortie standard d'une JVM de support.
+
+    Args:
+        process: Processus JVM
+        responses: File recevant les lignes reconnues, puis None à la fin du flux
+        kinds: Préfixes des lignes à transmettre
+    """
+    for raw_line in iter(process.stdout.readline, b''):
+        line = raw_line.decode('ascii', errors='replace').rstrip('\r\n')
+        if line.split(' ', 1)[0] in kinds:
+            responses.put(line)
+        else:
+            logger.debug(f"Sortie ignorée de la JVM: {line}")
+    responses.put(None)
+
+
+def next_response(responses, deadline: float, usage: Optional[ProcessUsage] = None,
+                  limits: Optional[ResourceLimits] = None):
+    """
+    Attendre la prochaine ligne du protocole en contrôlant le délai et le temps CPU.
+
+    RLIMIT_CPU ne convient pas à une JVM qui exécute plusieurs programmes : le
+    temps CPU de l'exécution en cours est donc relevé régulièrement.
+
+    Args:
+        responses: File remplie par read_protocol
+        deadline: Échéance (time.monotonic)
+        usage: Mesure de l'exécution en cours
+        limits: Limites dont cpu_seconds est appliqué
+
+    Returns:
+        str: Ligne reçue, ou None à la fin du flux
+
+    Raises:
+        queue.Empty: Délai dépassé
+        CpuLimitExceeded: Temps CPU dépassé
+    """
+    cpu_seconds = limits.cpu_seconds if limits else None
+    while True:
+        remaining = max(deadline - time.monotonic(), 0)
+        if not cpu_seconds or usage is None:
+            return responses.get(timeout=remaining)
+        try:
+            return responses.get(timeout=min(remaining, CPU_CHECK_INTERVAL))
+        except queue.Empty:
+            if remaining <= CPU_CHECK_INTERVAL:
+                raise
+            cpu_time = usage.cpu_time()
+            if cpu_time is not None and cpu_time > cpu_seconds:
+                raise CpuLimitExceeded()
+
+
+def cpu_limit_run(usage: Optional[ProcessUsage]) -> Dict[str, Any]:
+    """
+    Résultat d'une exécution arrêtée pour dépassement du temps CPU.
+
+    Le code de sortie est celui d'un processus tué par SIGXCPU, comme pour une
+    exécution dans un processus dédié.
+    """
+    return {"exit_code": -signal.SIGXCPU, "stdout": "", "stderr": "", "timed_out": False,
+            "output_truncated": False, "cpu_time": usage.cpu_time() if usage else None,
+            "peak_rss_kb": usage.peak_rss_kb() if usage else None}
+
+
+def drain_stderr(process):
+    """Vider l'erreur standard d'une JVM de support pour éviter de la bloquer."""
+    for raw_line in iter(process.stderr.readline, b''):
+        logger.debug(f"JVM de support (stderr): {raw_line.decode('utf-8', errors='replace').rstrip()}")
+
+
+def kill_process(process):
+    """Tuer un processus JVM s'il est encore actif."""
+    if process.poll() is None:
+        process.kill()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+class JavaHarness:
+    """
+    JVM démarrée une fois par session de correction, qui charge chaque classe
+    étudiante dans un chargeur de classes isolé.
+
+    Les délais d'exécution sont appliqués côté Python : si une exécution dépasse
+    son délai, la JVM est tuée puis relancée à la prochaine exécution. Les limites
+    de ressources s'appliquent à toute la JVM, sauf le temps CPU, contrôlé pour
+    chaque exécution.
+    """
+
+    def __init__(self, support_classes_dir: str, java_command: Optional[List[str]] = None,
+                 startup_timeout: int = 30, output_limits: Optional[OutputLimits] = None,
+                 limits: Optional[ResourceLimits] = None):
+        """
+        Initialiser le harnais.
+
+        Args:
+            support_classes_dir: Répertoire contenant les classes de support compilées
+            java_command: Commande de lancement de la JVM (par défaut ['java'])
+            startup_timeout: Temps maximum de démarrage de la JVM en secondes
+            output_limits: Limites de capture des sorties (par défaut OutputLimits())
+            limits: Limites de ressources (optionnel ; le tas est borné par java_command)
+        """
+        self.support_classes_dir = support_classes_dir
+        self.java_command = list(java_command or ['java'])
+        self.startup_timeout = startup_timeout
+        self.output_limits = output_limits or OutputLimits()
+        self.limits = limits
+        self._process = None
+        self._responses = None
+        self._usage = None
+        self._lock = threading.Lock()
+
+    def is_running(self) -> bool:
+        """Indique si la JVM du harnais est active."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> bool:
+        """
+        Démarrer la JVM du harnais et attendre qu'elle soit prête.
+
+        Returns:
+            bool: True si le harnais est prêt
+        """
+        command = (self.java_command + ['-cp', self.support_classes_dir, HARNESS_CLASS]
+                   + self.output_limits.java_args())
+        try:
+            process = spawn(
+                command,
+                self.limits,
+                include_cpu=False,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except OSError as e:
+            logger.warning(f"Impossible de démarrer le harnais Java: {str(e)}")
+            return False
+
+        responses = queue.Queue()
+        threading.Thread(target=read_protocol, args=(process, responses), daemon=True).start()
+        threading.Thread(target=drain_stderr, args=(process,), daemon=True).start()
+
+        try:
+            line = responses.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            line = None
+
+        if line != 'READY':
+            logger.warning("Le harnais Java n'a pas démarré correctement")
+            kill_process(process)
+            return False
+
+        self._process = process
+        self._responses = responses
+        self._usage = ProcessUsage(process.pid)
+        logger.info(f"Harnais Java démarré (pid {process.pid})")
+        return True
+
+    def run(self, class_dir: str, class_name: str, input_text: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Exécuter la méthode main d'une classe compilée avec une entrée donnée.
+
+        Args:
+            class_dir: Répertoire contenant les fichiers .class de l'étudiant
+            class_name: Nom de la classe principale
+            input_text: Texte fourni sur l'entrée standard
+            timeout: Temps maximum d'exécution en secondes
+
+        Returns:
+            dict: {'exit_code', 'stdout', 'stderr', 'timed_out', 'output_truncated', 'cpu_time',
+                'peak_rss_kb'} ou None si le harnais est indisponible (l'appelant doit alors
+                utiliser un processus dédié) ; cpu_time et peak_rss_kb valent None hors Linux
+        """
+        with self._lock:
+            if not self.is_running() and not self.start():
+                return None
+
+            process = self._process
+            usage = self._usage
+            usage.start()
+            command = f"RUN {_encode(class_dir)} {_encode(class_name)} {_encode(input_text)}\n"
+            try:
+                process.stdin.write(command.encode('ascii'))
+                process.stdin.flush()
+            except OSError as e:
+                logger.warning(f"Harnais Java inaccessible: {str(e)}")
+                self._reset()
+                return None
+
+            deadline = time.monotonic() + timeout
+            pending_output = ("", "", False)
+            while True:
+                try:
+                    line = next_response(self._responses, deadline, usage, self.limits)
+                except queue.Empty:
+                    logger.warning(f"Timeout du harnais pour {class_name}, redémarrage de la JVM")
+                    self._reset()
+                    return {"exit_code": None, "stdout": "", "stderr": "", "timed_out": True,
+                            "output_truncated": False, "cpu_time": None, "peak_rss_kb": None}
+                except CpuLimitExceeded:
+                    logger.warning(f"Temps CPU dépassé dans le harnais pour {class_name}, redémarrage de la JVM")
+                    run = cpu_limit_run(usage)
+                    self._reset()
+                    return run
+
+                if line is None:
+                    # La JVM s'est arrêtée (System.exit du programme étudiant)
+                    cpu_time, peak_rss_kb = usage.cpu_time(), usage.peak_rss_kb()
+                    try:
+                        exit_code = process.wait(timeout=max(deadline - time.monotonic(), 1))
+                    except subprocess.TimeoutExpired:
+                        exit_code = None
+                    self._reset()
+                    return {"exit_code": exit_code, "stdout": pending_output[0], "stderr": pending_output[1],
+                            "timed_out": False, "output_truncated": pending_output[2],
+                            "cpu_time": cpu_time, "peak_rss_kb": peak_rss_kb}
+
+                kind, _, payload = line.partition(' ')
+                if kind == 'OK':
+                    exit_code, stdout, stderr, truncated = payload.split(' ')
+                    return {"exit_code": int(exit_code), "stdout": _decode(stdout), "stderr": _decode(stderr),
+                            "timed_out": False, "output_truncated": truncated == '1',
+                            "cpu_time": usage.cpu_time(), "peak_rss_kb": usage.peak_rss_kb()}
+                if kind == 'EXIT':
+                    stdout, stderr, truncated = payload.split(' ')
+                    pending_output = (_decode(stdout), _decode(stderr), truncated == '1')
+                elif kind == 'ERR':
+                    logger.warning(f"Erreur du harnais Java: {_decode(payload)}")
+                    return None
+
+    def stop(self):
+        """Arrêter proprement la JVM du harnais."""
+        with self._lock:
+            process = self._process
+            if process is None:
+                return
+            try:
+                process.stdin.write(b"QUIT\n")
+                process.stdin.flush()
+                process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._reset()
+
+    def _reset(self):
+        """Tuer la JVM courante ; elle sera relancée à la prochaine exécution."""
+        if self._process is not None:
+            kill_process(self._process)
+        self._process = None
+        self._responses = None
+        self._usage = None
@@ -0,0 +1,631 @@
+"""
+Classes Java de support utilisées par l'exécuteur (harnais JVM persistant,
+compilateur par lots, serveur de compilation en mémoire).
+
+Le code source Java est embarqué ici pour ne pas dépendre de fichiers de données
+lors du packaging. Il est compilé une seule fois par session dans un répertoire
+de support, puis ajouté au classpath des commandes `java`.
+"""
+
+import os
+import hashlib
+import subprocess
+import logging
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Nom du fichier source (il ne contient que des classes non publiques)
+SUPPORT_SOURCE_NAME = "TeachAssistSupport.java"
+
+# Classe principale du harnais persistant
+HARNESS_CLASS = "TeachAssistHarness"
+
+# Classe principale du compilateur par lots (API javax.tools)
+BATCH_COMPILER_CLASS = "TeachAssistBatchCompiler"
+
+# Classe principale du serveur de compilation résident (compilation en mémoire)
+COMPILE_SERVER_CLASS = "TeachAssistCompileServer"
+
+# Classe principale du pilote exécutant toutes les entrées d'un exercice dans une JVM
+DRIVER_CLASS = "TeachAssistDriver"
+
+# Programme type utilisé pour préparer l'archive CDS et mesurer le démarrage
+WARMUP_CLASS = "TeachAssistWarmup"
+
+# Classes dont la présence indique que le support est déjà compilé
+SUPPORT_CLASSES = (HARNESS_CLASS, BATCH_COMPILER_CLASS, COMPILE_SERVER_CLASS, DRIVER_CLASS, WARMUP_CLASS)
+
+SUPPORT_SOURCE = r'''
+import java.io.BufferedReader;
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.File;
+import java.io.FileDescriptor;
+import java.io.FileInputStream;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.io.UnsupportedEncodingException;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.net.URI;
+import java.net.URL;
+import java.net.URLClassLoader;
+import java.nio.charset.StandardCharsets;
+import java.util.ArrayList;
+import java.util.Arrays;
+import java.util.Base64;
+import java.util.Collections;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Locale;
+import java.util.Map;
+import java.util.Properties;
+import java.util.Scanner;
+import java.util.Set;
+import java.util.TimeZone;
+import javax.tools.Diagnostic;
+import javax.tools.DiagnosticCollector;
+import javax.tools.FileObject;
+import javax.tools.ForwardingJavaFileManager;
+import javax.tools.JavaCompiler;
+import javax.tools.JavaFileManager;
+import javax.tools.JavaFileObject;
+import javax.tools.SimpleJavaFileObject;
+import javax.tools.StandardJavaFileManager;
+import javax.tools.ToolProvider;
+
+/**
+ * Exécute la méthode main d'une classe étudiante dans un chargeur de classes
+ * isolé, avec System.in/out/err redirigés.
+ */
+final class TeachAssistRunner {
+    private TeachAssistRunner() {
+    }
+
+    static String encode(byte[] data) {
+        return Base64.getEncoder().encodeToString(data);
+    }
+
+    static String encode(String text) {
+        try {
+            return encode(text.getBytes("UTF-8"));
+        } catch (UnsupportedEncodingException e) {
+            throw new IllegalStateException(e);
+        }
+    }
+
+    static String decode(String data) {
+        try {
+            return new String(Base64.getDecoder().decode(data), "UTF-8");
+        } catch (UnsupportedEncodingException e) {
+            throw new IllegalStateException(e);
+        }
+    }
+
+    static String encodeOutput(TeachAssistCappedOutput out, TeachAssistCappedOutput err) {
+        return encode(out.toByteArray()) + " " + encode(err.toByteArray()) + " "
+                + (out.isTruncated() || err.isTruncated() ? 1 : 0);
+    }
+
+    static PrintStream printStream(OutputStream buffer) {
+        try {
+            return new PrintStream(buffer, true, "UTF-8");
+        } catch (UnsupportedEncodingException e) {
+            throw new IllegalStateException(e);
+        }
+    }
+
+    private static void printUncaught(PrintStream err, Throwable error) {
+        if (error instanceof TeachAssistOutputLimitExceeded) {
+            // Budget de sortie dépassé : signalé par l'indicateur de troncature
+            return;
+        }
+        try {
+            err.print("Exception in thread \"main\" ");
+            error.printStackTrace(err);
+        } catch (TeachAssistOutputLimitExceeded ignored) {
+            // L'erreur standard elle-même a dépassé son budget
+        }
+    }
+
+    static int runMain(String classDir, String className, byte[] input, PrintStream out, PrintStream err) {
+        InputStream previousIn = System.in;
+        PrintStream previousOut = System.out;
+        PrintStream previousErr = System.err;
+        URLClassLoader loader = null;
+        int exitCode = 0;
+
+        System.setIn(new ByteArrayInputStream(input));
+        System.setOut(out);
+        System.setErr(err);
+        try {
+            // Le parent est le chargeur "plateforme" : les classes du harnais restent invisibles
+            loader = new URLClassLoader(new URL[] { new File(classDir).toURI().toURL() },
+                    ClassLoader.getSystemClassLoader().getParent());
+            Class<?> mainClass = Class.forName(className, true, loader);
+            Method main = mainClass.getMethod("main", String[].class);
+            main.setAccessible(true);
+            main.invoke(null, (Object) new String[0]);
+        } catch (InvocationTargetException e) {
+            printUncaught(err, e.getCause());
+            exitCode = 1;
+        } catch (ClassNotFoundException | NoClassDefFoundError e) {
+            err.println("Error: Could not find or load main class " + className);
+            exitCode = 1;
+        } catch (NoSuchMethodException e) {
+            err.println("Error: Main method not found in class " + className);
+            exitCode = 1;
+        } catch (Throwable t) {
+            printUncaught(err, t);
+            exitCode = 1;
+        } finally {
+            out.flush();
+            err.flush();
+            System.setIn(previousIn);
+            System.setOut(previousOut);
+            System.setErr(previousErr);
+            if (loader != null) {
+                try {
+                    loader.close();
+                } catch (IOException ignored) {
+                    // Rien à faire : le chargeur n'est plus utilisé
+                }
+            }
+        }
+        return exitCode;
+    }
+}
+
+/**
+ * Levée lorsqu'un programme dépasse le budget de sortie : interrompt sa boucle d'affichage.
+ */
+final class TeachAssistOutputLimitExceeded extends Error {
+    private static final long serialVersionUID = 1L;
+
+    TeachAssistOutputLimitExceeded() {
+        super("Budget de sortie dépassé", null, false, false);
+    }
+}
+
+/**
+ * Flux de sortie en mémoire bornée : conserve le début et la fin de ce qui est
+ * écrit, et lève TeachAssistOutputLimitExceeded au-delà du budget.
+ */
+final class TeachAssistCappedOutput extends OutputStream {
+    static final int DEFAULT_HEAD = 64 * 1024;
+    static final int DEFAULT_TAIL = 16 * 1024;
+    static final long DEFAULT_BUDGET = 8L * 1024 * 1024;
+
+    private final int headLimit;
+    private final long budget;
+    private final ByteArrayOutputStream head = new ByteArrayOutputStream();
+    private final byte[] tail;
+    private int tailStart;
+    private int tailLength;
+    private long total;
+
+    TeachAssistCappedOutput(int headLimit, int tailLimit, long budget) {
+        this.headLimit = headLimit;
+        this.tail = new byte[tailLimit];
+        this.budget = budget;
+    }
+
+    static TeachAssistCappedOutput fromArgs(String[] args, int offset) {
+        if (args.length >= offset + 3) {
+            return new TeachAssistCappedOutput(Integer.parseInt(args[offset]), Integer.parseInt(args[offset + 1]),
+                    Long.parseLong(args[offset + 2]));
+        }
+        return new TeachAssistCappedOutput(DEFAULT_HEAD, DEFAULT_TAIL, DEFAULT_BUDGET);
+    }
+
+    @Override
+    public synchronized void write(int b) {
+        write(new byte[] { (byte) b }, 0, 1);
+    }
+
+    @Override
+    public synchronized void write(byte[] data, int offset, int length) {
+        if (total > budget) {
+            throw new TeachAssistOutputLimitExceeded();
+        }
+        total += length;
+        int toHead = Math.min(length, Math.max(headLimit - head.size(), 0));
+        head.write(data, offset, toHead);
+        for (int i = offset + Math.max(toHead, length - tail.length); i < offset + length; i++) {
+            if (tailLength < tail.length) {
+                tail[(tailStart + tailLength++) % tail.length] = data[i];
+            } else {
+                tail[tailStart] = data[i];
+                tailStart = (tailStart + 1) % tail.length;
+            }
+        }
+        if (total > budget) {
+            throw new TeachAssistOutputLimitExceeded();
+        }
+    }
+
+    synchronized boolean isTruncated() {
+        return total > head.size() + tailLength;
+    }
+
+    synchronized byte[] toByteArray() {
+        ByteArrayOutputStream result = new ByteArrayOutputStream();
+        byte[] headBytes = head.toByteArray();
+        result.write(headBytes, 0, headBytes.length);
+        long omitted = total - head.size() - tailLength;
+        if (omitted > 0) {
+            byte[] marker;
+            try {
+                marker = ("\n[... " + omitted + " octets omis ...]\n").getBytes("UTF-8");
+            } catch (UnsupportedEncodingException e) {
+                throw new IllegalStateException(e);
+            }
+            result.write(marker, 0, marker.length);
+        }
+        for (int i = 0; i < tailLength; i++) {
+            result.write(tail[(tailStart + i) % tail.length]);
+        }
+        return result.toByteArray();
+    }
+}
+
+/**
+ * JVM persistante : lit des commandes "RUN <classDir> <classe> <entrée>" (base64)
+ * sur stdin et répond "OK <code> <stdout> <stderr> <tronqué>" sur stdout.
+ * Un appel à System.exit par le programme étudiant est signalé par une ligne
+ * "EXIT <stdout> <stderr> <tronqué>" émise depuis un hook d'arrêt.
+ * args (optionnels) = <début> <fin> <budget> : limites de capture des sorties.
+ */
+class TeachAssistHarness {
+    private static final Object LOCK = new Object();
+    private static TeachAssistCappedOutput pendingOut;
+    private static TeachAssistCappedOutput pendingErr;
+
+    public static void main(String[] args) throws IOException {
+        final PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        BufferedReader commands = new BufferedReader(
+                new InputStreamReader(new FileInputStream(FileDescriptor.in), "UTF-8"));
+
+        Runtime.getRuntime().addShutdownHook(new Thread(new Runnable() {
+            public void run() {
+                synchronized (LOCK) {
+                    if (pendingOut != null) {
+                        protocol.println("EXIT " + TeachAssistRunner.encodeOutput(pendingOut, pendingErr));
+                        protocol.flush();
+                    }
+                }
+            }
+        }));
+
+        protocol.println("READY");
+        String line;
+        while ((line = commands.readLine()) != null) {
+            if ("QUIT".equals(line)) {
+                break;
+            }
+            String[] parts = line.split(" ", -1);
+            if (parts.length != 4 || !"RUN".equals(parts[0])) {
+                protocol.println("ERR " + TeachAssistRunner.encode("Commande invalide"));
+                continue;
+            }
+
+            TeachAssistCappedOutput out = TeachAssistCappedOutput.fromArgs(args, 0);
+            TeachAssistCappedOutput err = TeachAssistCappedOutput.fromArgs(args, 0);
+            synchronized (LOCK) {
+                pendingOut = out;
+                pendingErr = err;
+            }
+            int exitCode = TeachAssistRunner.runMain(TeachAssistRunner.decode(parts[1]),
+                    TeachAssistRunner.decode(parts[2]), Base64.getDecoder().decode(parts[3]),
+                    TeachAssistRunner.printStream(out), TeachAssistRunner.printStream(err));
+            synchronized (LOCK) {
+                pendingOut = null;
+                pendingErr = null;
+            }
+            protocol.println("OK " + exitCode + " " + TeachAssistRunner.encodeOutput(out, err));
+        }
+    }
+}
+
+/**
+ * Compile plusieurs programmes dans une seule JVM avec l'API javax.tools :
+ * lit des lignes "COMPILE <arg1> <arg2> ..." (arguments javac en base64) et
+ * répond "DONE <code> <diagnostics>" pour chacune, dans l'ordre.
+ */
+class TeachAssistBatchCompiler {
+    public static void main(String[] args) throws IOException {
+        PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        if (compiler == null) {
+            // JVM sans compilateur (JRE) : l'appelant compile fichier par fichier
+            protocol.println("NOCOMPILER");
+            return;
+        }
+        BufferedReader commands = new BufferedReader(
+                new InputStreamReader(new FileInputStream(FileDescriptor.in), "UTF-8"));
+
+        protocol.println("READY");
+        String line;
+        while ((line = commands.readLine()) != null) {
+            if ("QUIT".equals(line)) {
+                break;
+            }
+            String[] parts = line.split(" ", -1);
+            if (parts.length < 2 || !"COMPILE".equals(parts[0])) {
+                protocol.println("ERR " + TeachAssistRunner.encode("Commande invalide"));
+                continue;
+            }
+
+            String[] compilerArgs = new String[parts.length - 1];
+            for (int i = 1; i < parts.length; i++) {
+                compilerArgs[i - 1] = TeachAssistRunner.decode(parts[i]);
+            }
+            ByteArrayOutputStream diagnostics = new ByteArrayOutputStream();
+            int exitCode;
+            try {
+                exitCode = compiler.run(null, diagnostics, diagnostics, compilerArgs);
+            } catch (Throwable t) {
+                PrintStream report = TeachAssistRunner.printStream(diagnostics);
+                t.printStackTrace(report);
+                report.flush();
+                exitCode = 1;
+            }
+            protocol.println("DONE " + exitCode + " " + TeachAssistRunner.encode(diagnostics.toByteArray()));
+        }
+    }
+}
+
+/**
+ * Serveur de compilation résident : lit des commandes "COMPILE <fichier> <source>"
+ * (base64) et compile le source en mémoire avec javax.tools, sans fichier temporaire.
+ * Répond par des lignes "CLASS <nom binaire> <octets>" (si la compilation réussit) et
+ * "DIAG <type> <ligne> <colonne> <message>", puis "DONE <code>".
+ */
+class TeachAssistCompileServer {
+    public static void main(String[] args) throws IOException {
+        PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        JavaCompiler compiler = ToolProvider.getSystemJavaCompiler();
+        if (compiler == null) {
+            protocol.println("NOCOMPILER");
+            return;
+        }
+        // Conservé entre les compilations : les index du JDK ne sont lus qu'une fois
+        StandardJavaFileManager standardManager = compiler.getStandardFileManager(null, null, StandardCharsets.UTF_8);
+        BufferedReader commands = new BufferedReader(
+                new InputStreamReader(new FileInputStream(FileDescriptor.in), "UTF-8"));
+
+        protocol.println("READY");
+        String line;
+        while ((line = commands.readLine()) != null) {
+            if ("QUIT".equals(line)) {
+                break;
+            }
+            String[] parts = line.split(" ", -1);
+            if (parts.length != 3 || !"COMPILE".equals(parts[0])) {
+                protocol.println("ERR " + TeachAssistRunner.encode("Commande invalide"));
+                continue;
+            }
+
+            final String source = TeachAssistRunner.decode(parts[2]);
+            final Map<String, ByteArrayOutputStream> classes = new LinkedHashMap<String, ByteArrayOutputStream>();
+            JavaFileManager fileManager = new ForwardingJavaFileManager<StandardJavaFileManager>(standardManager) {
+                @Override
+                public JavaFileObject getJavaFileForOutput(JavaFileManager.Location location, final String className,
+                        JavaFileObject.Kind kind, FileObject sibling) {
+                    return new SimpleJavaFileObject(URI.create("mem:///" + className.replace('.', '/') + kind.extension),
+                            kind) {
+                        @Override
+                        public OutputStream openOutputStream() {
+                            ByteArrayOutputStream buffer = new ByteArrayOutputStream();
+                            classes.put(className, buffer);
+                            return buffer;
+                        }
+                    };
+                }
+            };
+            JavaFileObject unit = new SimpleJavaFileObject(
+                    URI.create("string:///" + TeachAssistRunner.decode(parts[1])), JavaFileObject.Kind.SOURCE) {
+                @Override
+                public CharSequence getCharContent(boolean ignoreEncodingErrors) {
+                    return source;
+                }
+            };
+
+            DiagnosticCollector<JavaFileObject> diagnostics = new DiagnosticCollector<JavaFileObject>();
+            boolean success;
+            try {
+                success = compiler.getTask(null, fileManager, diagnostics, Arrays.asList("-proc:none"), null,
+                        Collections.singletonList(unit)).call();
+            } catch (Throwable t) {
+                protocol.println("DIAG ERROR -1 -1 " + TeachAssistRunner.encode(String.valueOf(t)));
+                success = false;
+            }
+
+            if (success) {
+                for (Map.Entry<String, ByteArrayOutputStream> entry : classes.entrySet()) {
+                    protocol.println("CLASS " + TeachAssistRunner.encode(entry.getKey()) + " "
+                            + TeachAssistRunner.encode(entry.getValue().toByteArray()));
+                }
+            }
+            for (Diagnostic<? extends JavaFileObject> diagnostic : diagnostics.getDiagnostics()) {
+                protocol.println("DIAG " + diagnostic.getKind() + " " + diagnostic.getLineNumber() + " "
+                        + diagnostic.getColumnNumber() + " " + TeachAssistRunner.encode(diagnostic.getMessage(null)));
+            }
+            protocol.println("DONE " + (success ? 0 : 1));
+        }
+    }
+}
+
+/**
+ * Exécute toutes les entrées d'un exercice dans une seule JVM : args = <classDir> <classe>
+ * [<début> <fin> <budget>], une entrée par ligne (base64) sur stdin. Pour chaque entrée,
+ * émet "BEGIN <i>" puis "RESULT <i> <code> <stdout> <stderr> <tronqué>". Un System.exit
+ * est signalé par "EXIT <i> <stdout> <stderr> <tronqué>" ; un état global modifié par le programme (propriétés
+ * système, locale, fuseau horaire, threads encore actifs) par "LEAK <i> <raison>",
+ * après quoi le pilote s'arrête.
+ */
+class TeachAssistDriver {
+    private static final Object LOCK = new Object();
+    private static int pendingIndex = -1;
+    private static TeachAssistCappedOutput pendingOut;
+    private static TeachAssistCappedOutput pendingErr;
+
+    public static void main(String[] args) throws IOException {
+        final PrintStream protocol = new PrintStream(new FileOutputStream(FileDescriptor.out), true, "UTF-8");
+        BufferedReader inputs = new BufferedReader(
+                new InputStreamReader(new FileInputStream(FileDescriptor.in), "UTF-8"));
+
+        Runtime.getRuntime().addShutdownHook(new Thread(new Runnable() {
+            public void run() {
+                synchronized (LOCK) {
+                    if (pendingIndex >= 0) {
+                        protocol.println("EXIT " + pendingIndex + " "
+                                + TeachAssistRunner.encodeOutput(pendingOut, pendingErr));
+                        protocol.flush();
+                    }
+                }
+            }
+        }));
+
+        Properties baselineProperties = new Properties();
+        baselineProperties.putAll(System.getProperties());
+        Locale baselineLocale = Locale.getDefault();
+        TimeZone baselineZone = TimeZone.getDefault();
+        Set<Thread> baselineThreads = liveNonDaemonThreads();
+
+        String line;
+        int index = 0;
+        while ((line = inputs.readLine()) != null) {
+            TeachAssistCappedOutput out = TeachAssistCappedOutput.fromArgs(args, 2);
+            TeachAssistCappedOutput err = TeachAssistCappedOutput.fromArgs(args, 2);
+            synchronized (LOCK) {
+                pendingIndex = index;
+                pendingOut = out;
+                pendingErr = err;
+            }
+            protocol.println("BEGIN " + index);
+            int exitCode = TeachAssistRunner.runMain(args[0], args[1], Base64.getDecoder().decode(line),
+                    TeachAssistRunner.printStream(out), TeachAssistRunner.printStream(err));
+            synchronized (LOCK) {
+                pendingIndex = -1;
+            }
+            protocol.println("RESULT " + index + " " + exitCode + " " + TeachAssistRunner.encodeOutput(out, err));
+
+            String leak = null;
+            if (!System.getProperties().equals(baselineProperties)) {
+                leak = "propriétés système modifiées";
+            } else if (!Locale.getDefault().equals(baselineLocale)) {
+                leak = "locale par défaut modifiée";
+            } else if (!TimeZone.getDefault().equals(baselineZone)) {
+                leak = "fuseau horaire par défaut modifié";
+            } else if (!baselineThreads.containsAll(liveNonDaemonThreads())) {
+                leak = "threads encore actifs après main";
+            }
+            if (leak != null) {
+                protocol.println("LEAK " + index + " " + TeachAssistRunner.encode(leak));
+                protocol.flush();
+                // halt : ne pas attendre les threads du programme étudiant
+                Runtime.getRuntime().halt(0);
+            }
+            index++;
+        }
+    }
+
+    private static Set<Thread> liveNonDaemonThreads() {
+        Set<Thread> threads = new HashSet<Thread>();
+        for (Thread thread : Thread.getAllStackTraces().keySet()) {
+            if (thread.isAlive() && !thread.isDaemon()) {
+                threads.add(thread);
+            }
+        }
+        return threads;
+    }
+}
+
+/**
+ * Programme représentatif des exercices étudiants (Scanner, Math, chaînes,
+ * collections, formatage) : sert à lister les classes du JDK à archiver (CDS)
+ * et à mesurer le temps de démarrage de la JVM.
+ */
+class TeachAssistWarmup {
+    public static void main(String[] args) {
+        Scanner scanner = new Scanner(System.in);
+        double value = scanner.hasNextDouble() ? scanner.nextDouble() : 2.5;
+
+        List<Integer> squares = new ArrayList<Integer>();
+        Map<String, Integer> counts = new HashMap<String, Integer>();
+        StringBuilder builder = new StringBuilder();
+        for (int i = 10; i > 0; i--) {
+            squares.add(i * i);
+            counts.put("n" + i, i % 3);
+            builder.append(i).append(',');
+        }
+        Collections.sort(squares);
+
+        String sentence = "Le rapide renard brun saute";
+        System.out.println(String.format("%.3f", Math.sqrt(Math.abs(value))));
+        System.out.printf("%d %s%n", squares.size(), builder.toString());
+        System.out.println(Integer.parseInt("42") + Double.parseDouble("0.5") + counts.size());
+        System.out.println(sentence.toUpperCase().split("\\s+").length + " " + Arrays.toString(squares.toArray()));
+        System.out.println(Math.max(Math.pow(value, 2), Math.floor(value)) + " " + Character.isLetter('a'));
+    }
+}
+'''
+
+
+def compile_support_classes(support_dir: str, javac_command: Optional[List[str]] = None) -> Optional[str]:
+    """
+    Compiler les classes Java de support dans un répertoire dédié.
+    
+    Les classes déjà compilées sont réutilisées tant que le code source embarqué
+    n'a pas changé.
+
+    Args:
+        support_dir: Répertoire racine du support (sources et classes)
+        javac_command: Commande du compilateur (par défaut ['javac'])
+
+    Returns:
+        str: Répertoire contenant les fichiers .class, ou None en cas d'échec
+    """
+    classes_dir = os.path.join(support_dir, "classes")
+    stamp_path = os.path.join(classes_dir, "source.sha256")
+    source_hash = hashlib.sha256(SUPPORT_SOURCE.encode('utf-8')).hexdigest()
+    try:
+        with open(stamp_path, 'r', encoding='ascii') as stamp_file:
+            up_to_date = stamp_file.read().strip() == source_hash
+    except OSError:
+        up_to_date = False
+    if up_to_date and all(os.path.exists(os.path.join(classes_dir, f"{name}.class")) for name in SUPPORT_CLASSES):
+        return classes_dir
+
+    os.makedirs(classes_dir, exist_ok=True)
+    source_path = os.path.join(support_dir, SUPPORT_SOURCE_NAME)
+    with open(source_path, 'w', encoding='utf-8') as source_file:
+        source_file.write(SUPPORT_SOURCE)
+
+    try:
+        result = subprocess.run(
+            list(javac_command or ['javac']) + ['-encoding', 'UTF-8', '-nowarn', '-d', classes_dir, source_path],
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except (subprocess.SubprocessError, OSError) as e:
+        logger.warning(f"Impossible de compiler les classes de support: {str(e)}")
+        return None
+
+    if result.returncode != 0:
+        logger.warning(f"Échec de compilation des classes de support: {result.stderr}")
+        return None
+
+    with open(stamp_path, 'w', encoding='ascii') as stamp_file:
+        stamp_file.write(source_hash)
+    logger.info(f"Classes de support compilées dans {classes_dir}")
+    return classes_dir
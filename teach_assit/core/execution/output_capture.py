@@ -0,0 +1,99 @@
+"""
+Capture bornée des sorties des programmes étudiants : seuls le début et la fin
+de chaque flux sont conservés, et le programme est arrêté au-delà d'un budget.
+"""
+
+from typing import List
+
+# Octets conservés au début et à la fin de chaque flux
+DEFAULT_HEAD_BYTES = 64 * 1024
+DEFAULT_TAIL_BYTES = 16 * 1024
+
+# Au-delà de ce volume produit sur un flux, le programme est arrêté
+DEFAULT_HARD_LIMIT_BYTES = 8 * 1024 * 1024
+
+
+def truncation_marker(omitted: int) -> bytes:
+    """Texte inséré à la place des octets omis (identique côté Java)."""
+    return f"\n[... {omitted} octets omis ...]\n".encode('utf-8')
+
+
+class OutputLimits:
+    """Limites de capture appliquées à stdout et stderr, séparément."""
+
+    def __init__(self, head_bytes: int = DEFAULT_HEAD_BYTES, tail_bytes: int = DEFAULT_TAIL_BYTES,
+                 hard_limit_bytes: int = DEFAULT_HARD_LIMIT_BYTES):
+        """
+        Initialiser les limites.
+
+        Args:
+            head_bytes: Octets conservés au début du flux
+            tail_bytes: Octets conservés à la fin du flux
+            hard_limit_bytes: Volume produit au-delà duquel le programme est arrêté
+        """
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.hard_limit_bytes = hard_limit_bytes
+
+    def java_args(self) -> List[str]:
+        """
+        Arguments transmis aux classes de support Java.
+
+        Returns:
+            list: [début, fin, budget] en octets
+        """
+        return [str(self.head_bytes), str(self.tail_bytes), str(self.hard_limit_bytes)]
+
+
+class OutputCapture:
+    """Accumule un flux en mémoire bornée (début + fin) et compte le volume total."""
+
+    def __init__(self, limits: OutputLimits):
+        """
+        Initialiser la capture.
+
+        Args:
+            limits: Limites de capture
+        """
+        self.limits = limits
+        self.total = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def feed(self, data: bytes) -> bool:
+        """
+        Ajouter un bloc lu sur le flux.
+
+        Args:
+            data: Octets lus
+
+        Returns:
+            bool: False si le budget du flux est dépassé
+        """
+        self.total += len(data)
+        room = self.limits.head_bytes - len(self._head)
+        if room > 0:
+            self._head += data[:room]
+            data = data[room:]
+        if data and self.limits.tail_bytes > 0:
+            self._tail += data
+            if len(self._tail) > self.limits.tail_bytes:
+                del self._tail[:len(self._tail) - self.limits.tail_bytes]
+        return self.total <= self.limits.hard_limit_bytes
+
+    @property
+    def truncated(self) -> bool:
+        """Indique si une partie du flux n'a pas été conservée."""
+        return self.total > len(self._head) + len(self._tail)
+
+    def getvalue(self) -> bytes:
+        """
+        Obtenir le contenu capturé.
+
+        Returns:
+            bytes: Début et fin du flux, séparés par un marqueur si des octets ont été omis
+        """
+        omitted = self.total - len(self._head) - len(self._tail)
+        if omitted > 0:
+            return bytes(self._head) + truncation_marker(omitted) + bytes(self._tail)
+        return bytes(self._head) + bytes(self._tail)
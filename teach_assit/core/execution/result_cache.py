@@ -0,0 +1,186 @@
+"""
+Cache persistant des résultats d'exécution (classe compilée, entrée standard).
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionResultCache:
+    """
+    Associe (empreinte des .class, entrée, timeout, options JVM) à la sortie
+    standard, l'erreur standard et le code de sortie d'une exécution.
+
+    Les entrées de test sont déterministes : relancer la même cohorte après un
+    ajustement des critères de notation ne réexécute que ce qui a changé.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialiser le cache.
+
+        Args:
+            db_path: Chemin de la base SQLite. Si None, utilise data/execution_cache.db à la racine du projet.
+        """
+        if db_path is None:
+            project_root = Path(__file__).parent.parent.parent.parent
+            data_dir = project_root / "data"
+            if not os.path.exists(data_dir):
+                os.makedirs(data_dir)
+            db_path = str(data_dir / "execution_cache.db")
+        self.db_path = db_path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialize()
+
+    def _get_connection(self):
+        """Ouvrir une connexion à la base du cache."""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _initialize(self):
+        """Créer la table du cache si nécessaire."""
+        conn = self._get_connection()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS execution_results (
+                cache_key TEXT PRIMARY KEY,
+                artifact_hash TEXT NOT NULL,
+                exit_code INTEGER NOT NULL,
+                stdout TEXT NOT NULL,
+                stderr TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_execution_results_artifact '
+                         'ON execution_results(artifact_hash)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def hash_artifacts(class_dir: str) -> str:
+        """
+        Calculer l'empreinte des fichiers .class d'un répertoire de compilation.
+
+        Args:
+            class_dir: Répertoire contenant les fichiers .class
+
+        Returns:
+            str: Empreinte sha256 hexadécimale
+        """
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(class_dir)):
+            if name.endswith('.class'):
+                digest.update(name.encode('utf-8') + b"\0")
+                with open(os.path.join(class_dir, name), 'rb') as class_file:
+                    digest.update(class_file.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(artifact_hash: str, stdin: str, timeout: float, jvm_flags: Iterable[str] = ()) -> str:
+        """
+        Calculer la clé d'une exécution.
+
+        Args:
+            artifact_hash: Empreinte des classes compilées
+            stdin: Entrée fournie au programme
+            timeout: Temps maximum d'exécution en secondes
+            jvm_flags: Options passées à la JVM
+
+        Returns:
+            str: Clé sha256 hexadécimale
+        """
+        digest = hashlib.sha256()
+        for part in [artifact_hash, stdin, repr(float(timeout)), *jvm_flags]:
+            digest.update(part.encode('utf-8') + b"\0")
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Lire un résultat en cache.
+
+        Args:
+            key: Clé calculée par make_key
+
+        Returns:
+            dict: {'exit_code', 'stdout', 'stderr'} ou None si absent
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                'SELECT exit_code, stdout, stderr FROM execution_results WHERE cache_key = ?', (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {"exit_code": row[0], "stdout": row[1], "stderr": row[2]}
+
+    def put(self, key: str, artifact_hash: str, exit_code: int, stdout: str, stderr: str):
+        """
+        Enregistrer le résultat d'une exécution.
+
+        Args:
+            key: Clé calculée par make_key
+            artifact_hash: Empreinte des classes compilées
+            exit_code: Code de sortie du programme
+            stdout: Sortie standard
+            stderr: Erreur standard
+        """
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                'INSERT OR REPLACE INTO execution_results '
+                '(cache_key, artifact_hash, exit_code, stdout, stderr, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (key, artifact_hash, exit_code, stdout, stderr, time.time())
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Impossible d'enregistrer le résultat d'exécution dans le cache: {str(e)}")
+        finally:
+            conn.close()
+
+    def invalidate(self, artifact_hash: Optional[str] = None) -> int:
+        """
+        Supprimer des résultats du cache.
+
+        Args:
+            artifact_hash: Empreinte des classes dont les résultats sont à supprimer.
+                Si None, vide tout le cache.
+
+        Returns:
+            int: Nombre de résultats supprimés
+        """
+        conn = self._get_connection()
+        try:
+            if artifact_hash is None:
+                cursor = conn.execute('DELETE FROM execution_results')
+            else:
+                cursor = conn.execute('DELETE FROM execution_results WHERE artifact_hash = ?', (artifact_hash,))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Obtenir les compteurs du cache.
+
+        Returns:
+            dict: {'hits', 'misses'}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,468 @@
+"""
+Exécution isolée des programmes étudiants : limites de ressources (rlimits,
+cgroup v2 optionnel) et mesure du temps CPU et de la mémoire utilisés.
+"""
+
+import os
+import sys
+import time
+import threading
+import itertools
+import signal
+import subprocess
+import logging
+from typing import Any, Dict, List, Optional
+
+from teach_assit.core.execution.output_capture import OutputCapture, OutputLimits
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Racine habituelle de la hiérarchie cgroup v2
+CGROUP_V2_ROOT = "/sys/fs/cgroup"
+
+# Taille des blocs lus sur les sorties du programme
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class ResourceLimits:
+    """
+    Limites appliquées à chaque JVM étudiante.
+
+    Une JVM réserve beaucoup d'espace d'adressage virtuel (tas, code compilé,
+    métadonnées) : la mémoire est donc bornée par défaut avec -Xmx plutôt que par
+    RLIMIT_AS, qui reste disponible pour les environnements qui le souhaitent.
+    RLIMIT_NPROC compte tous les processus et threads de l'utilisateur : il n'est
+    appliqué que s'il est explicitement configuré.
+    """
+
+    def __init__(self, cpu_seconds: Optional[int] = 10, heap_mb: Optional[int] = 256,
+                 address_space_mb: Optional[int] = None, max_processes: Optional[int] = None,
+                 max_file_size_mb: Optional[int] = 16):
+        """
+        Initialiser les limites.
+
+        Args:
+            cpu_seconds: Temps CPU maximum (tous threads confondus) en secondes
+            heap_mb: Taille maximale du tas Java en Mo (-Xmx)
+            address_space_mb: Espace d'adressage maximum en Mo (RLIMIT_AS)
+            max_processes: Nombre maximum de processus de l'utilisateur (RLIMIT_NPROC)
+            max_file_size_mb: Taille maximale d'un fichier écrit par le programme (RLIMIT_FSIZE)
+        """
+        self.cpu_seconds = cpu_seconds
+        self.heap_mb = heap_mb
+        self.address_space_mb = address_space_mb
+        self.max_processes = max_processes
+        self.max_file_size_mb = max_file_size_mb
+
+    def jvm_options(self) -> List[str]:
+        """
+        Options JVM correspondant aux limites.
+
+        Returns:
+            list: Options à ajouter à la commande java
+        """
+        return [f'-Xmx{self.heap_mb}m'] if self.heap_mb else []
+
+    def rlimits(self) -> List[tuple]:
+        """
+        Limites système à appliquer au processus.
+
+        Returns:
+            list: Tuples (ressource, (soft, hard)) ; vide si le module resource est indisponible
+        """
+        if resource is None:
+            return []
+
+        limits = []
+        if self.cpu_seconds:
+            # Limite dure un peu au-dessus : SIGXCPU puis SIGKILL
+            limits.append((resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds + 1)))
+        if self.address_space_mb:
+            size = self.address_space_mb * 1024 * 1024
+            limits.append((resource.RLIMIT_AS, (size, size)))
+        if self.max_processes and hasattr(resource, 'RLIMIT_NPROC'):
+            limits.append((resource.RLIMIT_NPROC, (self.max_processes, self.max_processes)))
+        if self.max_file_size_mb:
+            size = self.max_file_size_mb * 1024 * 1024
+            limits.append((resource.RLIMIT_FSIZE, (size, size)))
+        return limits
+
+
+class CgroupSlice:
+    """
+    Sous-groupe cgroup v2 délégué, dans lequel chaque exécution obtient son propre
+    cgroup (mémoire et nombre de tâches bornés, pic mémoire mesuré).
+
+    Le répertoire parent doit être accessible en écriture (délégation systemd,
+    conteneur...) ; sinon les exécutions se contentent des rlimits.
+    """
+
+    _counter = itertools.count()
+
+    def __init__(self, parent_path: str, memory_max_mb: Optional[int] = 512, pids_max: Optional[int] = 64):
+        """
+        Initialiser le sous-groupe.
+
+        Args:
+            parent_path: Cgroup parent délégué (ex. /sys/fs/cgroup/user.slice/.../teachassist)
+            memory_max_mb: Mémoire maximale par exécution en Mo (memory.max)
+            pids_max: Nombre maximum de tâches par exécution (pids.max)
+        """
+        self.parent_path = parent_path
+        self.memory_max_mb = memory_max_mb
+        self.pids_max = pids_max
+
+    @staticmethod
+    def is_available(parent_path: str) -> bool:
+        """Indique si le cgroup parent est un cgroup v2 accessible en écriture."""
+        return (os.path.exists(os.path.join(CGROUP_V2_ROOT, "cgroup.controllers"))
+                and os.path.isdir(parent_path) and os.access(parent_path, os.W_OK))
+
+    def create(self) -> Optional[str]:
+        """
+        Créer le cgroup d'une exécution.
+
+        Returns:
+            str: Chemin du cgroup créé, ou None en cas d'échec
+        """
+        path = os.path.join(self.parent_path, f"run-{os.getpid()}-{next(self._counter)}")
+        try:
+            os.mkdir(path)
+            if self.memory_max_mb:
+                self._write(path, "memory.max", str(self.memory_max_mb * 1024 * 1024))
+                self._write(path, "memory.swap.max", "0")
+            if self.pids_max:
+                self._write(path, "pids.max", str(self.pids_max))
+        except OSError as e:
+            logger.warning(f"Impossible de créer le cgroup d'exécution: {str(e)}")
+            self.remove(path)
+            return None
+        return path
+
+    def peak_memory_kb(self, path: str) -> Optional[int]:
+        """Pic de mémoire du cgroup en Ko (memory.peak, noyau 5.19+)."""
+        try:
+            with open(os.path.join(path, "memory.peak"), 'r') as peak_file:
+                return int(peak_file.read().strip()) // 1024
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def remove(path: str):
+        """Supprimer le cgroup d'une exécution terminée."""
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _write(path: str, name: str, value: str):
+        """Écrire un paramètre du cgroup (ignoré si le contrôleur n'est pas délégué)."""
+        try:
+            with open(os.path.join(path, name), 'w') as control_file:
+                control_file.write(value)
+        except FileNotFoundError:
+            pass
+
+
+def _ulimit_wrapper(rlimits: List[tuple]) -> List[str]:
+    """
+    Commande shell appliquant des rlimits avant d'exécuter la commande (systèmes sans prlimit).
+
+    Args:
+        rlimits: Tuples (ressource, (soft, hard)) retournés par ResourceLimits.rlimits
+
+    Returns:
+        list: Préfixe à placer devant la commande
+    """
+    # Options de ulimit et unité de la valeur (RLIMIT_FSIZE en blocs de 512 octets)
+    options = {resource.RLIMIT_CPU: ('-t', 1), resource.RLIMIT_AS: ('-v', 1024),
+               resource.RLIMIT_FSIZE: ('-f', 512)}
+    if hasattr(resource, 'RLIMIT_NPROC'):
+        options[resource.RLIMIT_NPROC] = ('-u', 1)
+    steps = []
+    for limit, (soft, hard) in rlimits:
+        option, unit = options[limit]
+        # Limite souple d'abord : la limite dure ne peut pas descendre en dessous
+        steps.append(f"ulimit -S {option} {soft // unit} && ulimit -H {option} {hard // unit}")
+    return ['/bin/sh', '-c', ' && '.join(steps + ['exec "$@"']), 'sh']
+
+
+def apply_limits(pid: int, rlimits: List[tuple], cgroup_path: Optional[str] = None):
+    """
+    Appliquer des limites à un processus déjà lancé (Linux).
+
+    Le processus démarre sans limites : elles sont posées juste après son
+    lancement, bien avant que la JVM n'exécute le code étudiant.
+
+    Args:
+        pid: Processus à limiter
+        rlimits: Tuples (ressource, (soft, hard)) retournés par ResourceLimits.rlimits
+        cgroup_path: Cgroup dans lequel placer le processus
+    """
+    try:
+        if cgroup_path:
+            with open(os.path.join(cgroup_path, "cgroup.procs"), 'w') as procs_file:
+                procs_file.write(str(pid))
+        for limit, values in rlimits:
+            resource.prlimit(pid, limit, values)
+    except ProcessLookupError:
+        # Processus déjà terminé
+        pass
+
+
+def spawn(command: List[str], limits: Optional[ResourceLimits] = None, cgroup_path: Optional[str] = None,
+          include_cpu: bool = True, **popen_kwargs) -> subprocess.Popen:
+    """
+    Lancer un processus avec des limites de ressources, sans `preexec_fn`.
+
+    `preexec_fn` n'est pas sûr dans un processus multithread (le fils peut se
+    bloquer sur un verrou détenu par un autre thread au moment du fork) : les
+    limites sont appliquées après le lancement avec prlimit, ou, sur les systèmes
+    qui n'en disposent pas, par un shell qui les pose avant d'exécuter la commande.
+
+    Args:
+        command: Commande à exécuter
+        limits: Limites à appliquer
+        cgroup_path: Cgroup dans lequel placer le processus (Linux)
+        include_cpu: Appliquer RLIMIT_CPU (False pour une JVM qui exécute plusieurs
+            programmes : le temps CPU est alors contrôlé par exécution, voir ProcessUsage)
+        **popen_kwargs: Arguments transmis à subprocess.Popen
+
+    Returns:
+        subprocess.Popen: Processus lancé
+    """
+    rlimits = limits.rlimits() if limits else []
+    if not include_cpu:
+        rlimits = [(limit, values) for limit, values in rlimits if limit != resource.RLIMIT_CPU]
+
+    if rlimits and not hasattr(resource, 'prlimit'):
+        return subprocess.Popen(_ulimit_wrapper(rlimits) + list(command), **popen_kwargs)
+
+    process = subprocess.Popen(command, **popen_kwargs)
+    if rlimits or cgroup_path:
+        apply_limits(process.pid, rlimits, cgroup_path)
+    return process
+
+
+class ProcessUsage:
+    """
+    Mesure des ressources consommées par une JVM qui exécute plusieurs programmes
+    (harnais, pilote), exécution par exécution (Linux, via /proc).
+
+    Le temps CPU compte tous les threads de la JVM pendant l'exécution (y compris
+    la compilation à la volée) ; le pic mémoire est remis à zéro au début de chaque
+    exécution. Ailleurs, les mesures valent None.
+    """
+
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+    def __init__(self, pid: int):
+        """
+        Initialiser la mesure.
+
+        Args:
+            pid: Processus mesuré
+        """
+        self.pid = pid
+        self._cpu_start = None
+
+    def start(self):
+        """Commencer la mesure d'une exécution."""
+        self._cpu_start = self._cpu_total()
+        try:
+            # Remise à zéro du pic de mémoire résidente (VmHWM)
+            with open(f"/proc/{self.pid}/clear_refs", 'w') as clear_file:
+                clear_file.write("5")
+        except OSError:
+            pass
+
+    def cpu_time(self) -> Optional[float]:
+        """Temps CPU consommé depuis start(), en secondes."""
+        total = self._cpu_total()
+        if total is None or self._cpu_start is None:
+            return None
+        return total - self._cpu_start
+
+    def peak_rss_kb(self) -> Optional[int]:
+        """Pic de mémoire résidente du processus depuis start(), en Ko."""
+        try:
+            with open(f"/proc/{self.pid}/status", 'r') as status_file:
+                for line in status_file:
+                    if line.startswith('VmHWM:'):
+                        return int(line.split()[1])
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+
+    def _cpu_total(self) -> Optional[float]:
+        """Temps CPU total du processus (utilisateur + système), en secondes."""
+        try:
+            with open(f"/proc/{self.pid}/stat", 'r') as stat_file:
+                # Les champs suivent le nom du programme, entre parenthèses
+                fields = stat_file.read().rsplit(')', 1)[1].split()
+            return (int(fields[11]) + int(fields[12])) / self.CLOCK_TICKS
+        except (OSError, ValueError, IndexError):
+            return None
+
+
+def run_process(command: List[str], input_text: str, timeout: float,
+                limits: Optional[ResourceLimits] = None,
+                cgroup: Optional[CgroupSlice] = None,
+                output_limits: Optional[OutputLimits] = None) -> Dict[str, Any]:
+    """
+    Exécuter une commande avec une entrée, des limites de ressources et une mesure
+    des ressources consommées.
+
+    Les sorties sont lues au fil de l'eau et seuls leur début et leur fin sont
+    conservés ; le processus est tué dès que le budget de sortie est dépassé.
+
+    Args:
+        command: Commande à exécuter
+        input_text: Texte fourni sur l'entrée standard
+        timeout: Temps maximum d'exécution (horloge murale) en secondes
+        limits: Limites de ressources (optionnel)
+        cgroup: Sous-groupe cgroup v2 (optionnel)
+        output_limits: Limites de capture des sorties (par défaut OutputLimits())
+
+    Returns:
+        dict: {'exit_code', 'stdout', 'stderr', 'timed_out', 'output_truncated',
+            'cpu_time', 'peak_rss_kb'} ; cpu_time (secondes) et peak_rss_kb valent
+            None si la mesure est impossible
+    """
+    output_limits = output_limits or OutputLimits()
+    cgroup_path = cgroup.create() if cgroup else None
+    process = spawn(
+        command,
+        limits,
+        cgroup_path,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE
+    )
+
+    try:
+        stdout, stderr = OutputCapture(output_limits), OutputCapture(output_limits)
+        readers = [
+            threading.Thread(target=_read_stream, args=(process, process.stdout, stdout), daemon=True),
+            threading.Thread(target=_read_stream, args=(process, process.stderr, stderr), daemon=True),
+            threading.Thread(target=_write_stream, args=(process.stdin, input_text), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+
+        timed_out = False
+        try:
+            _, status, usage = _wait_with_usage(process, timeout)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            _kill(process)
+            _, status, usage = _wait_with_usage(process, None)
+        for reader in readers:
+            reader.join(timeout=5)
+
+        cpu_time = peak_rss_kb = None
+        if usage is not None:
+            cpu_time = usage.ru_utime + usage.ru_stime
+            # ru_maxrss est en Ko sous Linux, en octets sous macOS
+            peak_rss_kb = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+        if cgroup_path:
+            peak_rss_kb = cgroup.peak_memory_kb(cgroup_path) or peak_rss_kb
+
+        return {
+            "exit_code": None if timed_out else status,
+            "stdout": _decode(stdout.getvalue()),
+            "stderr": _decode(stderr.getvalue()),
+            "timed_out": timed_out,
+            "output_truncated": stdout.truncated or stderr.truncated,
+            "cpu_time": cpu_time,
+            "peak_rss_kb": peak_rss_kb
+        }
+    finally:
+        if process.returncode is None:
+            _kill(process)
+        if cgroup_path:
+            CgroupSlice.remove(cgroup_path)
+
+
+def _wait_with_usage(process, timeout: Optional[float]):
+    """
+    Attendre la fin du processus en récupérant ses statistiques (os.wait4).
+
+    Returns:
+        tuple: (pid, code de sortie, rusage ou None)
+
+    Raises:
+        subprocess.TimeoutExpired: Si le processus ne se termine pas à temps
+    """
+    if not hasattr(os, 'wait4'):
+        return process.pid, process.wait(timeout=timeout), None
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.001
+    while True:
+        pid, status, usage = os.wait4(process.pid, 0 if deadline is None else os.WNOHANG)
+        if pid != 0:
+            break
+        if time.monotonic() >= deadline:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+    exit_code = os.waitstatus_to_exitcode(status)
+    # Le processus est récolté : l'indiquer à Popen pour qu'il ne l'attende plus
+    process.returncode = exit_code
+    return pid, exit_code, usage
+
+
+def _decode(data: bytes) -> str:
+    """Décoder une sortie du programme (fins de ligne normalisées comme en mode texte)."""
+    return data.decode('utf-8', errors='replace').replace('\r\n', '\n').replace('\r', '\n')
+
+
+def _kill(process):
+    """
+    Tuer le processus sans le récolter (Popen.kill pourrait le récolter et
+    faire perdre ses statistiques à os.wait4).
+    """
+    if process.returncode is not None:
+        return
+    if not hasattr(os, 'wait4'):
+        process.kill()
+        return
+    try:
+        os.kill(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _read_stream(process, stream, capture: OutputCapture):
+    """Lire un flux de sortie par blocs, et tuer le processus au-delà du budget."""
+    try:
+        while True:
+            chunk = stream.read1(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if not capture.feed(chunk):
+                logger.warning(f"Sortie trop volumineuse (> {capture.limits.hard_limit_bytes} octets), "
+                               f"arrêt du processus {process.pid}")
+                _kill(process)
+                break
+    except (OSError, ValueError):
+        pass
+    finally:
+        stream.close()
+
+
+def _write_stream(stream, text: str):
+    """Écrire l'entrée du programme puis fermer son entrée standard."""
+    try:
+        stream.write(text.encode('utf-8'))
+        stream.close()
+    except OSError:
+        pass
@@ -0,0 +1,196 @@
+"""
+Ordonnanceur d'exécution : répartit la compilation et les tests d'une cohorte sur un pool de workers.
+"""
+
+import os
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
+
+from teach_assit.core.execution.code_executor import JavaExecutor
+
+logger = logging.getLogger(__name__)
+
+# Estimation de la mémoire consommée par une JVM étudiante (en Mo)
+DEFAULT_JVM_MEMORY_MB = 256
+
+
+def get_available_memory_mb() -> Optional[int]:
+    """
+    Obtenir la mémoire disponible du système.
+
+    Returns:
+        int: Mémoire disponible en Mo, ou None si elle ne peut pas être déterminée
+    """
+    try:
+        with open('/proc/meminfo', 'r') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        pages = os.sysconf('SC_AVPHYS_PAGES')
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        return pages * page_size // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def default_worker_count(jvm_memory_mb: int = DEFAULT_JVM_MEMORY_MB) -> int:
+    """
+    Calculer le nombre de workers selon les cœurs et la mémoire disponibles.
+
+    Args:
+        jvm_memory_mb: Mémoire estimée par JVM en Mo
+
+    Returns:
+        int: Nombre de workers (au moins 1)
+    """
+    workers = os.cpu_count() or 1
+    available_mb = get_available_memory_mb()
+    if available_mb is not None:
+        workers = min(workers, available_mb // max(jvm_memory_mb, 1))
+    return max(1, workers)
+
+
+class ExecutionScheduler:
+    """
+    Exécute les tests d'une cohorte en parallèle.
+
+    Les fichiers sont d'abord compilés en un seul lot, puis les tests sont répartis
+    sur un pool borné de workers. Chaque worker possède son propre JavaExecutor
+    (et donc sa propre JVM persistante) : le travail réel se fait dans des
+    processus JVM, les threads Python ne font qu'attendre leurs résultats.
+
+    Un job est un dictionnaire contenant au moins 'file_path' et 'test_inputs' ;
+    les autres clés sont transmises telles quelles aux callbacks. Un ordonnanceur
+    sert à une seule exécution : une annulation demandée avant run() est respectée.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 executor_factory: Optional[Callable[[], JavaExecutor]] = None,
+                 timeout: int = 5, force_rerun: bool = False):
+        """
+        Initialiser l'ordonnanceur.
+
+        Args:
+            max_workers: Nombre de workers (par défaut selon les cœurs et la mémoire)
+            executor_factory: Fonction créant un JavaExecutor pour chaque worker
+            timeout: Temps maximum d'exécution d'une entrée en secondes
+            force_rerun: Ignorer les résultats d'exécution en cache
+        """
+        self.max_workers = max_workers or default_worker_count()
+        self.executor_factory = executor_factory or JavaExecutor
+        self.timeout = timeout
+        self.force_rerun = force_rerun
+        self._cancelled = threading.Event()
+        self._local = threading.local()
+        self._executors = []
+        self._executors_lock = threading.Lock()
+        self._compile_executor = None
+
+    def cancel(self):
+        """Annuler l'exécution : les jobs non démarrés sont abandonnés."""
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        """Indique si l'exécution a été annulée."""
+        return self._cancelled.is_set()
+
+    def run(self, jobs: List[Dict[str, Any]],
+            on_result: Callable[[Dict[str, Any], List[Dict[str, Any]]], None],
+            on_progress: Optional[Callable[[int, int], None]] = None) -> bool:
+        """
+        Compiler puis exécuter tous les jobs.
+
+        Les callbacks sont appelés depuis le thread appelant, au fil de l'eau.
+
+        Args:
+            jobs: Liste des jobs à exécuter
+            on_result: Appelé avec (job, résultats de test_with_inputs) pour chaque job terminé
+            on_progress: Appelé avec (jobs terminés, nombre total de jobs)
+
+        Returns:
+            bool: True si tous les jobs ont été exécutés, False en cas d'annulation
+        """
+        total = len(jobs)
+        if on_progress:
+            on_progress(0, total)
+        if not jobs:
+            return True
+
+        if self.is_cancelled():
+            return False
+
+        try:
+            # Compilation groupée : une seule JVM pour tous les fichiers
+            self._compile_executor = self.executor_factory()
+            self._compile_executor.compile_batch({job['file_path']: job['file_path'] for job in jobs})
+            if self.is_cancelled():
+                return False
+
+            workers = min(self.max_workers, total)
+            logger.info(f"Exécution de {total} job(s) avec {workers} worker(s)")
+            done = 0
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="teachassist-exec") as pool:
+                futures = {pool.submit(self._run_job, job): job for job in jobs}
+                for future in as_completed(futures):
+                    if future.cancelled():
+                        continue
+                    results = future.result()
+                    if results is None:
+                        continue
+                    done += 1
+                    on_result(futures[future], results)
+                    if on_progress:
+                        on_progress(done, total)
+                    if self.is_cancelled():
+                        for pending in futures:
+                            pending.cancel()
+            return not self.is_cancelled()
+        finally:
+            self._shutdown()
+
+    def _run_job(self, job: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Exécuter un job dans le worker courant (None si annulé avant son démarrage)."""
+        if self.is_cancelled():
+            return None
+
+        executor = getattr(self._local, 'executor', None)
+        if executor is None:
+            executor = self.executor_factory()
+            executor.adopt_precompiled(self._compile_executor)
+            self._local.executor = executor
+            with self._executors_lock:
+                self._executors.append(executor)
+
+        try:
+            return executor.test_with_inputs(job['file_path'], job['test_inputs'], timeout=self.timeout,
+                                             force_rerun=self.force_rerun)
+        except Exception as e:
+            logger.error(f"Erreur lors de l'exécution de {job['file_path']}: {str(e)}")
+            return [{
+                "input": input_val,
+                "success": False,
+                "compilation_error": False,
+                "stdout": "",
+                "stderr": f"Erreur d'exécution: {str(e)}",
+                "output_truncated": False,
+                "cpu_time": None,
+                "peak_rss_kb": None
+            } for input_val in job['test_inputs']]
+
+    def _shutdown(self):
+        """Arrêter les JVM des workers et supprimer leurs répertoires temporaires."""
+        with self._executors_lock:
+            executors = self._executors
+            self._executors = []
+        for executor in executors:
+            executor.clean_up()
+        if self._compile_executor is not None:
+            self._compile_executor.clean_up()
+            self._compile_executor = None
+        self._local = threading.local()
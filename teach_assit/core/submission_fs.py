@@ -0,0 +1,261 @@
+import os
+import re
+import shutil
+import threading
+import zipfile
+from collections import OrderedDict
+
+
+# Suffixe de la racine virtuelle d'une archive : 'A.zip!' contient 'A.zip!/src/Main.java'
+ARCHIVE_ROOT_SUFFIX = '!'
+
+# Nombre d'archives gardées ouvertes (les index des répertoires centraux sont tous conservés)
+MAX_OPEN_ARCHIVES = 32
+
+_ARCHIVE_PATH = re.compile(r'^(.*?\.zip)!(?:[\\/](.*))?$', re.IGNORECASE | re.DOTALL)
+
+
+def archive_root(zip_path):
+    """
+    Retourne la racine virtuelle d'une archive, utilisable comme un dossier (os.path.join).
+
+    Args:
+        zip_path (str): Chemin du fichier ZIP.
+
+    Returns:
+        str: Racine virtuelle ('/soumissions/A.zip!').
+    """
+    return zip_path + ARCHIVE_ROOT_SUFFIX
+
+
+def split_archive_path(path):
+    """
+    Sépare un chemin virtuel en chemin de l'archive et chemin relatif dans l'archive.
+
+    Args:
+        path (str): Chemin quelconque.
+
+    Returns:
+        tuple: (chemin du ZIP, chemin relatif normalisé ou ''), ou None pour un chemin réel.
+    """
+    match = _ARCHIVE_PATH.match(path)
+    if match is None:
+        return None
+    member = match.group(2)
+    return match.group(1), os.path.normpath(member) if member else ''
+
+
+def is_archive_path(path):
+    """Indique si un chemin désigne un fichier (ou la racine) d'une archive."""
+    return split_archive_path(path) is not None
+
+
+class SubmissionFileSystem:
+    """
+    Accès en lecture aux sources des soumissions, sur disque ou dans les archives ZIP.
+
+    Un chemin virtuel 'A.zip!/src/Main.java' désigne un fichier d'une archive
+    sans qu'elle soit extraite. Le répertoire central de chaque archive est lu une
+    fois puis conservé (relu si la taille ou la date du fichier change) ; les
+    archives les plus récemment lues restent ouvertes. Les chemins réels sont lus
+    directement sur disque.
+    """
+
+    def __init__(self, max_open=MAX_OPEN_ARCHIVES):
+        """
+        Initialise le système de fichiers.
+
+        Args:
+            max_open (int): Nombre maximum d'archives gardées ouvertes.
+        """
+        self.max_open = max_open
+        self._lock = threading.RLock()
+        self._indexes = {}  # {chemin du ZIP: (taille, date, {chemin relatif: nom dans l'archive})}
+        self._handles = OrderedDict()  # {chemin du ZIP: ZipFile}, du moins au plus récemment utilisé
+
+    def _index(self, zip_path):
+        """
+        Retourne l'index du répertoire central d'une archive, relu s'il a changé.
+
+        Returns:
+            dict: {chemin relatif normalisé: nom du membre dans l'archive}
+        """
+        stat = os.stat(zip_path)
+        cached = self._indexes.get(zip_path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+
+        self._close_handle(zip_path)
+        handle = zipfile.ZipFile(zip_path, 'r')
+        members = {os.path.normpath(info.filename): info.filename
+                   for info in handle.infolist() if not info.is_dir()}
+        self._indexes[zip_path] = (stat.st_size, stat.st_mtime_ns, members)
+        self._keep_open(zip_path, handle)
+        return members
+
+    def _handle(self, zip_path):
+        """Retourne l'archive ouverte (rouverte si elle a été fermée)."""
+        handle = self._handles.get(zip_path)
+        if handle is None:
+            handle = zipfile.ZipFile(zip_path, 'r')
+            self._keep_open(zip_path, handle)
+        else:
+            self._handles.move_to_end(zip_path)
+        return handle
+
+    def _keep_open(self, zip_path, handle):
+        """Garde une archive ouverte en fermant les moins récemment utilisées au-delà de max_open."""
+        self._handles[zip_path] = handle
+        while len(self._handles) > self.max_open:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+
+    def _close_handle(self, zip_path):
+        """Ferme une archive ouverte."""
+        handle = self._handles.pop(zip_path, None)
+        if handle is not None:
+            handle.close()
+
+    def list_sources(self, zip_path):
+        """
+        Liste les fichiers Java d'une archive.
+
+        Args:
+            zip_path (str): Chemin du fichier ZIP.
+
+        Returns:
+            list: Chemins relatifs normalisés, dans l'ordre de l'archive.
+        """
+        with self._lock:
+            return [name for name in self._index(zip_path) if name.lower().endswith('.java')]
+
+    def exists(self, path):
+        """
+        Indique si un fichier existe, sur disque ou dans une archive.
+
+        Args:
+            path (str): Chemin réel ou virtuel.
+
+        Returns:
+            bool: True si le fichier existe.
+        """
+        parts = split_archive_path(path)
+        if parts is None:
+            return os.path.isfile(path)
+        try:
+            with self._lock:
+                return parts[1] in self._index(parts[0])
+        except (OSError, zipfile.BadZipFile):
+            return False
+
+    def read_bytes(self, path):
+        """
+        Lit le contenu d'un fichier, sur disque ou dans une archive.
+
+        Args:
+            path (str): Chemin réel ou virtuel.
+
+        Returns:
+            bytes: Contenu du fichier.
+
+        Raises:
+            OSError: Fichier introuvable ou archive illisible.
+        """
+        parts = split_archive_path(path)
+        if parts is None:
+            with open(path, 'rb') as f:
+                return f.read()
+
+        zip_path, relative = parts
+        with self._lock:
+            try:
+                member = self._index(zip_path).get(relative)
+                if member is None:
+                    raise FileNotFoundError(f"Fichier introuvable dans l'archive : {path}")
+                return self._handle(zip_path).read(member)
+            except zipfile.BadZipFile as e:
+                raise OSError(f"Archive illisible {zip_path} : {e}") from e
+
+    def read_text(self, path, encoding='utf-8'):
+        """
+        Lit un fichier source, sur disque ou dans une archive.
+
+        Args:
+            path (str): Chemin réel ou virtuel.
+            encoding (str): Encodage du fichier.
+
+        Returns:
+            str: Contenu du fichier.
+        """
+        return self.read_bytes(path).decode(encoding)
+
+    def materialize(self, path, target_path):
+        """
+        Écrit un fichier sur disque, par exemple dans un répertoire de compilation.
+
+        Args:
+            path (str): Chemin réel ou virtuel du fichier.
+            target_path (str): Chemin du fichier à créer.
+
+        Returns:
+            str: target_path
+        """
+        if split_archive_path(path) is None:
+            shutil.copy2(path, target_path)
+            return target_path
+        content = self.read_bytes(path)
+        os.makedirs(os.path.dirname(target_path) or '.', exist_ok=True)
+        with open(target_path, 'wb') as f:
+            f.write(content)
+        return target_path
+
+    def close(self):
+        """Ferme les archives ouvertes (elles sont rouvertes au besoin)."""
+        with self._lock:
+            for zip_path in list(self._handles):
+                self._close_handle(zip_path)
+
+
+_shared_fs = None
+_shared_fs_lock = threading.Lock()
+
+
+def get_submission_fs():
+    """
+    Retourne le système de fichiers des soumissions partagé par le processus.
+
+    Returns:
+        SubmissionFileSystem: Système de fichiers partagé.
+    """
+    global _shared_fs
+    with _shared_fs_lock:
+        if _shared_fs is None:
+            _shared_fs = SubmissionFileSystem()
+        return _shared_fs
+
+
+def read_source(path, encoding='utf-8'):
+    """
+    Lit un fichier source d'une soumission, sur disque ou dans une archive.
+
+    Args:
+        path (str): Chemin réel ou virtuel ('A.zip!/src/Main.java').
+        encoding (str): Encodage du fichier.
+
+    Returns:
+        str: Contenu du fichier.
+    """
+    return get_submission_fs().read_text(path, encoding)
+
+
+def read_source_bytes(path):
+    """
+    Lit le contenu brut d'un fichier d'une soumission, sur disque ou dans une archive.
+
+    Args:
+        path (str): Chemin réel ou virtuel.
+
+    Returns:
+        bytes: Contenu du fichier.
+    """
+    return get_submission_fs().read_bytes(path)
@@ -0,0 +1,61 @@
+"""
+Thread pour analyser les soumissions en parallèle sans bloquer l'interface.
+"""
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from teach_assit.core.analysis.batch_analyzer import BatchAnalyzer
+
+
+class AnalysisThread(QThread):
+    """Thread qui répartit l'analyse statique sur plusieurs processus et transmet les résultats."""
+    result_ready = pyqtSignal(str, str, object)  # étudiant, fichier, résultat
+    progress_changed = pyqtSignal(int)  # nombre de fichiers analysés
+    analysis_finished = pyqtSignal(object)  # {étudiant: {fichier: résultat}}
+
+    def __init__(self, jobs, exercise_configs, parse_cache_dir=None, diagnostics_provider=None, max_workers=None,
+                 result_cache=None):
+        """
+        Initialiser le thread d'analyse.
+
+        Args:
+            jobs: Liste de tâches {'student', 'file', 'path', 'exercise_id'}
+            exercise_configs: Dictionnaire {identifiant d'exercice: ExerciseConfig}
+            parse_cache_dir: Répertoire du cache des arbres syntaxiques partagé par les processus
+            diagnostics_provider: Fonction (chemin) -> diagnostics du compilateur, appelée dans ce thread
+            max_workers: Nombre de processus d'analyse (par défaut, nombre de cœurs)
+            result_cache: Cache persistant des résultats d'analyse (seuls les fichiers modifiés sont analysés)
+        """
+        super().__init__()
+        self.jobs = jobs
+        self.diagnostics_provider = diagnostics_provider
+        self.batch_analyzer = BatchAnalyzer(exercise_configs, max_workers=max_workers, parse_cache_dir=parse_cache_dir,
+                                            result_cache=result_cache)
+
+    def cancel(self):
+        """Arrêter l'analyse après les fichiers en cours."""
+        self.batch_analyzer.cancel()
+
+    def _add_compile_diagnostics(self, job, result):
+        """Ajouter au résultat les diagnostics du compilateur, obtenus pendant que les processus analysent."""
+        if self.diagnostics_provider is None or 'error' in result:
+            return
+        diagnostics = self.diagnostics_provider(job['path'])
+        if diagnostics is not None:
+            result['compile_diagnostics'] = list(diagnostics)
+
+    def run(self):
+        analysis_results = {}
+        analyzed = 0
+        try:
+            for job, result in self.batch_analyzer.analyze(self.jobs):
+                self._add_compile_diagnostics(job, result)
+                analysis_results.setdefault(job['student'], {})[job['file']] = result
+                analyzed += 1
+                self.result_ready.emit(job['student'], job['file'], result)
+                self.progress_changed.emit(analyzed)
+        except Exception as e:
+            print(f"Erreur inattendue dans le thread d'analyse: {str(e)}")
+            import traceback
+            traceback.print_exc()
+        self.analysis_finished.emit(analysis_results)
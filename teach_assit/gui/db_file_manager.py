@@ -5,7 +5,7 @@ Widget pour la gestion des fichiers ZIP et dossiers extraits stockés dans la ba
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
                             QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox,
                             QFileDialog, QFrame, QTreeWidget, QTreeWidgetItem, QSplitter,
-                            QListWidget, QApplication)
+                            QListWidget, QApplication, QProgressDialog)
 from PyQt5.QtCore import Qt, QSize, pyqtSignal, QPropertyAnimation, QEasingCurve
 from PyQt5.QtGui import QIcon, QFont, QColor, QPalette
 import os
@@ -411,17 +411,22 @@ class DatabaseFileManager(QWidget):
             return
         
         # Créer une boîte de dialogue de progression
-        progress = QMessageBox()
+        progress = QProgressDialog(f"Extraction de {len(zip_files)} fichiers ZIP...", "Annuler", 0, len(zip_files), self)
         progress.setWindowTitle("Extraction en cours")
-        progress.setText(f"Extraction de {len(zip_files)} fichiers ZIP...\nCette opération peut prendre quelques instants.")
-        progress.setStandardButtons(QMessageBox.NoButton)
-        progress.setIcon(QMessageBox.Information)
+        progress.setWindowModality(Qt.WindowModal)
         progress.show()
         QApplication.processEvents()
         
+        def on_progress(done, total, zip_filename):
+            """Avancer la progression après chaque archive ; False annule les suivantes."""
+            progress.setValue(done)
+            progress.setLabelText(f"{zip_filename} traité ({done}/{total})")
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+        
         # Extraire les fichiers ZIP
         try:
-            results = self.submission_manager.extract_all_zip_files()
+            results = self.submission_manager.extract_all_zip_files(progress_callback=on_progress)
             
             # Fermer la boîte de dialogue de progression
             progress.close()
@@ -10,7 +10,9 @@ import glob
 import logging
 
 from teach_assit.core.analysis.config_loader import ConfigLoader
+from teach_assit.core.submission_fs import read_source
 from teach_assit.gui.feedback.assessment_loader import AssessmentLoader
+from teach_assit.utils.submission_index import get_submission_index
 
 class DataManager:
     """Gestionnaire de données pour le module de feedback."""
@@ -73,54 +75,40 @@ class DataManager:
         # Si on ne peut pas accéder directement au ResultsWidget, essayer de récupérer les données
         # depuis les fichiers logs ou le système de stockage temporaire
         try:
-            # Essayer de trouver le répertoire des exercices soumis
-            base_dirs = [
-                os.path.join(os.getcwd(), "tests", "java_samples", "TD*"),
-                os.path.join(os.getcwd(), "submissions", "*"),
-                # Autres chemins possibles où les soumissions pourraient être stockées
-            ]
-            
-            student_dirs = []
-            for base in base_dirs:
-                for td_dir in glob.glob(base):
-                    student_dir = os.path.join(td_dir, student)
-                    if os.path.exists(student_dir):
-                        student_dirs.append(student_dir)
-            
-            if not student_dirs:
-                # Aucun répertoire d'étudiant trouvé
+            # Fichiers .java de l'étudiant, d'après l'index des soumissions
+            java_files = get_submission_index().get_student_files(student, recursive=False)
+            if not java_files:
+                # Aucun fichier d'étudiant trouvé
                 return self.get_default_exercises()
                 
-            # Récupérer tous les fichiers .java dans les répertoires de l'étudiant
+            # Déterminer l'exercice de chacun des fichiers
             exercises = []
-            for student_dir in student_dirs:
-                java_files = glob.glob(os.path.join(student_dir, "*.java"))
-                for file_path in java_files:
-                    file_name = os.path.basename(file_path)
-                    
-                    # Déterminer l'ID de l'exercice à partir du nom du fichier
-                    exercise_id = self.get_exercise_id_from_filename(file_name)
-                    if exercise_id:
-                        # Vérifier si on a une configuration pour cet ID d'exercice
-                        if exercise_id in self.exercise_configs:
-                            config = self.exercise_configs[exercise_id]
-                            if isinstance(config, dict) and "name" in config:
-                                display_name = config["name"]
-                            else:
-                                display_name = exercise_id
+            for file_path in java_files:
+                file_name = os.path.basename(file_path)
+                
+                # Déterminer l'ID de l'exercice à partir du nom du fichier
+                exercise_id = self.get_exercise_id_from_filename(file_name)
+                if exercise_id:
+                    # Vérifier si on a une configuration pour cet ID d'exercice
+                    if exercise_id in self.exercise_configs:
+                        config = self.exercise_configs[exercise_id]
+                        if isinstance(config, dict) and "name" in config:
+                            display_name = config["name"]
                         else:
                             display_name = exercise_id
-                            
-                        exercises.append({
-                            'id': exercise_id,
-                            'file': file_name,
-                            'status': 'En attente',
-                            'path': file_path,  # Stocker le chemin complet pour un accès facile
-                            'display_name': display_name
-                        })
+                    else:
+                        display_name = exercise_id
                         
-                        # Ajouter au cache des chemins
-                        self.exercise_file_paths[exercise_id] = file_path
+                    exercises.append({
+                        'id': exercise_id,
+                        'file': file_name,
+                        'status': 'En attente',
+                        'path': file_path,  # Stocker le chemin complet pour un accès facile
+                        'display_name': display_name
+                    })
+                    
+                    # Ajouter au cache des chemins
+                    self.exercise_file_paths[exercise_id] = file_path
             
             return exercises if exercises else self.get_default_exercises()
             
@@ -255,53 +243,47 @@ class DataManager:
             # Construire les chemins possibles
             possible_paths = []
             
-            # 3.1 Chercher dans les dossiers de TD
-            for td_dir in glob.glob(os.path.join(os.getcwd(), "tests", "java_samples", "*")):
-                student_dir = os.path.join(td_dir, student)
-                if os.path.exists(student_dir):
-                    # Essayer avec le nom exact de l'exercice
-                    java_file = os.path.join(student_dir, f"{exercise_id}.java")
-                    if os.path.exists(java_file):
-                        possible_paths.append(java_file)
-                    
-                    # Essayer avec des formes normalisées comme "FonctionRacineCarree.java" ou "Exercice09.java"
-                    normalized_exercise = self._normalize_exercise_id(exercise_id)
-                    alt_files = [
-                        os.path.join(student_dir, f"{normalized_exercise}.java"),
-                        os.path.join(student_dir, f"Exercice{normalized_exercise.replace('exercice', '')}.java"),
-                        os.path.join(student_dir, f"E{normalized_exercise.replace('exercice', '')}.java")
-                    ]
-                    for alt_file in alt_files:
-                        if os.path.exists(alt_file):
-                            possible_paths.append(alt_file)
-                    
-                    # Chercher tous les fichiers Java qui pourraient correspondre
-                    for java_file in glob.glob(os.path.join(student_dir, "*.java")):
-                        file_name = os.path.basename(java_file).lower()
-                        exercise_parts = exercise_id.lower().split('-')
-                        # Chercher des correspondances partielles
-                        for part in exercise_parts:
-                            if part and len(part) > 2 and part in file_name:
-                                possible_paths.append(java_file)
-                                break
+            # 3.1 Chercher parmi les fichiers de l'étudiant (index des soumissions)
+            index = get_submission_index()
+            
+            # Essayer avec le nom exact de l'exercice, puis avec des formes normalisées
+            # comme "FonctionRacineCarree.java" ou "Exercice09.java"
+            normalized_exercise = self._normalize_exercise_id(exercise_id)
+            candidate_names = [
+                f"{exercise_id}.java",
+                f"{normalized_exercise}.java",
+                f"Exercice{normalized_exercise.replace('exercice', '')}.java",
+                f"E{normalized_exercise.replace('exercice', '')}.java"
+            ]
+            for candidate in candidate_names:
+                java_file = index.find(student, candidate)
+                if java_file:
+                    possible_paths.append(java_file)
+            
+            # Chercher tous les fichiers Java qui pourraient correspondre
+            exercise_parts = [part for part in exercise_id.lower().split('-') if part and len(part) > 2]
+            for java_file in index.get_student_files(student, recursive=False):
+                file_name = os.path.basename(java_file).lower()
+                # Chercher des correspondances partielles
+                if any(part in file_name for part in exercise_parts):
+                    possible_paths.append(java_file)
             
             # 3.2 Essayer de lire le premier fichier trouvé
             for file_path in possible_paths:
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        code = f.read()
-                        print(f"Code trouvé dans {file_path}: {len(code)} caractères")
-                        
-                        # Stocker dans le cache pour une utilisation future
-                        if student not in self.exercise_data:
-                            self.exercise_data[student] = {}
-                        if exercise_id not in self.exercise_data[student]:
-                            self.exercise_data[student][exercise_id] = {}
-                        self.exercise_data[student][exercise_id]['code'] = code
-                        
-                        # Stocker également le chemin du fichier
-                        self.exercise_file_paths[exercise_id] = file_path
-                        break
+                    code = read_source(file_path)
+                    print(f"Code trouvé dans {file_path}: {len(code)} caractères")
+                    
+                    # Stocker dans le cache pour une utilisation future
+                    if student not in self.exercise_data:
+                        self.exercise_data[student] = {}
+                    if exercise_id not in self.exercise_data[student]:
+                        self.exercise_data[student][exercise_id] = {}
+                    self.exercise_data[student][exercise_id]['code'] = code
+                    
+                    # Stocker également le chemin du fichier
+                    self.exercise_file_paths[exercise_id] = file_path
+                    break
                 except Exception as e:
                     print(f"Erreur lors de la lecture du fichier {file_path}: {e}")
         
@@ -613,38 +595,14 @@ public class {self._normalize_exercise_id(exercise_id)} {{
                             # (peut être dans n'importe quel sous-dossier de tests/java_samples/)
                             file_found = False
                             
-                            # 1. Chercher dans tous les dossiers TD*
-                            for td_dir in glob.glob(os.path.join(os.getcwd(), "tests", "java_samples", "TD*")):
-                                # Chercher directement dans le répertoire TD
-                                full_path = os.path.join(td_dir, file_name)
-                                if os.path.exists(full_path):
-                                    extracted_paths[exercise_id] = full_path
-                                    self.store_exercise_file_path(student, exercise_id, full_path)
-                                    print(f"Fichier trouvé dans le TD: {full_path}")
-                                    file_found = True
-                                    break
-                                    
-                                # Chercher dans le répertoire étudiant/exercice
-                                student_dir = os.path.join(td_dir, student)
-                                if os.path.exists(student_dir):
-                                    full_path = os.path.join(student_dir, file_name)
-                                    if os.path.exists(full_path):
-                                        extracted_paths[exercise_id] = full_path
-                                        self.store_exercise_file_path(student, exercise_id, full_path)
-                                        print(f"Fichier trouvé dans le répertoire étudiant: {full_path}")
-                                        file_found = True
-                                        break
-                                        
-                                    # Chercher dans des sous-dossiers (_temp_java_files, etc.)
-                                    for subdir in glob.glob(os.path.join(student_dir, "*")):
-                                        if os.path.isdir(subdir):
-                                            full_path = os.path.join(subdir, file_name)
-                                            if os.path.exists(full_path):
-                                                extracted_paths[exercise_id] = full_path
-                                                self.store_exercise_file_path(student, exercise_id, full_path)
-                                                print(f"Fichier trouvé dans un sous-dossier: {full_path}")
-                                                file_found = True
-                                                break
+                            # 1. Chercher parmi les fichiers de l'étudiant, sous-dossiers compris
+                            # (_temp_java_files, etc.), d'après l'index des soumissions
+                            full_path = get_submission_index().find(student, file_name)
+                            if full_path:
+                                extracted_paths[exercise_id] = full_path
+                                self.store_exercise_file_path(student, exercise_id, full_path)
+                                print(f"Fichier trouvé dans le répertoire étudiant: {full_path}")
+                                file_found = True
                             
                             # 2. Chercher dans le répertoire _temp_files
                             if not file_found:
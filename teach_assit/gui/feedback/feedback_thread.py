@@ -7,6 +7,7 @@ import re
 import os
 from PyQt5.QtCore import QThread, pyqtSignal
 from google import genai
+from teach_assit.core.submission_fs import read_source
 
 class FeedbackThread(QThread):
     """Thread pour générer du feedback avec l'API Gemini sans bloquer l'interface."""
@@ -38,8 +39,7 @@ class FeedbackThread(QThread):
                     try:
                         file_path = exercise.get('file_path')
                         print(f"Tentative de chargement du code depuis le fichier: {file_path}")
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            exercise['code'] = f.read()
+                        exercise['code'] = read_source(file_path)
                         print(f"Code chargé depuis {file_path}: {len(exercise['code'])} caractères")
                     except Exception as e:
                         print(f"Erreur lors de la lecture du fichier {file_path}: {str(e)}")
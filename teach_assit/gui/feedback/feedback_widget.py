@@ -17,6 +17,7 @@ from teach_assit.gui.feedback.data_manager import DataManager
 from teach_assit.gui.feedback.assessment_loader import AssessmentLoader
 from teach_assit.gui.feedback.utils import extract_note_from_feedback, extract_exercise_notes
 from teach_assit.core.database.db_manager import DatabaseManager
+from teach_assit.core.submission_fs import get_submission_fs
 
 class FeedbackWidget(QWidget):
     """Widget pour l'onglet Notes & Feedback intégrant l'API Gemini"""
@@ -325,7 +326,7 @@ class FeedbackWidget(QWidget):
                 
                 # Stocker le chemin du fichier pour une utilisation future
                 file_path = exercise.get('path', '')
-                if file_path and os.path.exists(file_path):
+                if file_path and get_submission_fs().exists(file_path):
                     self.data_manager.store_exercise_file_path(student, exercise_id, file_path)
             
             # Trier le tableau si nécessaire
@@ -8,6 +8,7 @@ import logging
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import QMessageBox
 
+from teach_assit.core.submission_fs import read_source
 from teach_assit.gui.feedback.feedback_thread import FeedbackThread
 from teach_assit.gui.feedback.utils import extract_note_from_feedback, extract_exercise_notes
 
@@ -136,8 +137,7 @@ class FeedbackGenerator(QObject):
             # Récupérer le code source
             code = ""
             try:
-                with open(exercise_file, 'r', encoding='utf-8') as f:
-                    code = f.read()
+                code = read_source(exercise_file)
                 logging.info(f"Code source lu depuis {exercise_file} pour l'exercice {exercise_id}: {len(code)} caractères")
             except Exception as e:
                 logging.error(f"Erreur lors de la lecture du fichier {exercise_file}: {str(e)}")
@@ -4,13 +4,14 @@ Gestionnaires d'événements et callbacks pour le module de feedback.
 
 import os
 import re
-import glob
 import logging
 import json
 from PyQt5.QtWidgets import QMessageBox
 
+from teach_assit.core.submission_fs import get_submission_fs
 from teach_assit.gui.feedback.utils import test_api_connection, save_feedback_to_file
 from teach_assit.gui.feedback.configuration import ExerciseIdNormalizer
+from teach_assit.utils.submission_index import get_submission_index
 
 
 class ExerciseFileLocator:
@@ -44,14 +45,14 @@ class ExerciseFileLocator:
         # Vérifier d'abord si nous avons déjà le chemin dans le data_manager
         if hasattr(self.data_manager, 'get_exercise_file_path'):
             stored_path = self.data_manager.get_exercise_file_path(student, exercise_id)
-            if stored_path and os.path.exists(stored_path):
+            if stored_path and get_submission_fs().exists(stored_path):
                 logging.info(f"Fichier trouvé dans le cache du data_manager: {stored_path}")
                 return stored_path
         
         # Ensuite vérifier si le chemin est déjà connu dans le cache générique du data_manager
         if hasattr(self.data_manager, 'exercise_file_paths') and exercise_id in self.data_manager.exercise_file_paths:
             file_path = self.data_manager.exercise_file_paths.get(exercise_id)
-            if os.path.exists(file_path):
+            if get_submission_fs().exists(file_path):
                 logging.info(f"Fichier trouvé dans le cache générique du data_manager: {file_path}")
                 # Stocker dans le data_manager spécifique pour utilisation future
                 if hasattr(self.data_manager, 'store_exercise_file_path'):
@@ -62,79 +63,63 @@ class ExerciseFileLocator:
         patterns = self.assessment_loader.get_exercise_patterns(exercise_id)
         logging.info(f"Patterns de recherche pour {exercise_id}: {patterns}")
         
-        # Rechercher dans les dossiers potentiels des TDs
-        search_dirs = []
+        # Fichiers Java de l'étudiant, d'après l'index des soumissions
+        java_files = get_submission_index().get_student_files(student, recursive=False)
+        logging.info(f"Fichiers Java trouvés pour {student}: {len(java_files)}")
         
-        # Ajouter tous les dossiers potentiels pour toutes les évaluations
-        for td_dir in glob.glob(os.path.join(os.getcwd(), "tests", "java_samples", "*")):
-            student_dir = os.path.join(td_dir, student)
-            if os.path.exists(student_dir):
-                search_dirs.append(student_dir)
-        
-        logging.info(f"Dossiers de recherche: {search_dirs}")
-        
-        # Rechercher dans tous les dossiers avec tous les patterns
-        for search_dir in search_dirs:
-            if not os.path.exists(search_dir):
-                continue
-            
-            # Vérifier s'il y a des fichiers Java dans ce dossier
-            java_files = glob.glob(os.path.join(search_dir, "*.java"))
-            logging.info(f"Fichiers Java trouvés dans {search_dir}: {len(java_files)}")
-            
-            # Rechercher d'abord avec les patterns
-            for pattern in patterns:
-                for java_file in java_files:
-                    # Vérifier si le nom du fichier contient le pattern
-                    if pattern.lower() in os.path.basename(java_file).lower():
-                        file_path = java_file
-                        logging.info(f"Fichier trouvé avec pattern '{pattern}': {file_path}")
-                        # Stocker pour utilisation future
-                        self._store_found_path(student, exercise_id, file_path)
-                        return file_path
-            
-            # Si toujours pas trouvé, essayer avec juste l'identifiant de l'exercice
+        # Rechercher d'abord avec les patterns
+        for pattern in patterns:
             for java_file in java_files:
-                if exercise_id.lower() in os.path.basename(java_file).lower():
+                # Vérifier si le nom du fichier contient le pattern
+                if pattern.lower() in os.path.basename(java_file).lower():
                     file_path = java_file
-                    logging.info(f"Fichier trouvé avec ID d'exercice: {file_path}")
+                    logging.info(f"Fichier trouvé avec pattern '{pattern}': {file_path}")
                     # Stocker pour utilisation future
                     self._store_found_path(student, exercise_id, file_path)
                     return file_path
-            
-            # Si toujours pas trouvé, chercher avec un ID normalisé
-            normalized_id = ExerciseIdNormalizer.normalize(exercise_id)
-            for java_file in java_files:
-                file_name = os.path.basename(java_file).lower()
-                if normalized_id in file_name:
+        
+        # Si toujours pas trouvé, essayer avec juste l'identifiant de l'exercice
+        for java_file in java_files:
+            if exercise_id.lower() in os.path.basename(java_file).lower():
+                file_path = java_file
+                logging.info(f"Fichier trouvé avec ID d'exercice: {file_path}")
+                # Stocker pour utilisation future
+                self._store_found_path(student, exercise_id, file_path)
+                return file_path
+        
+        # Si toujours pas trouvé, chercher avec un ID normalisé
+        normalized_id = ExerciseIdNormalizer.normalize(exercise_id)
+        for java_file in java_files:
+            file_name = os.path.basename(java_file).lower()
+            if normalized_id in file_name:
+                file_path = java_file
+                logging.info(f"Fichier trouvé avec ID normalisé '{normalized_id}': {file_path}")
+                # Stocker pour utilisation future
+                self._store_found_path(student, exercise_id, file_path)
+                return file_path
+        
+        # Si toujours pas trouvé, chercher par analyse des fichiers
+        for java_file in java_files:
+            file_name = os.path.basename(java_file)
+            # Extraire un numéro potentiel (ex: Exercice01.java -> 01)
+            number_match = re.search(r'(\d+)', file_name)
+            if number_match:
+                number = number_match.group(1)
+                # Vérifier si ce numéro est dans l'ID de l'exercice
+                if number in exercise_id:
                     file_path = java_file
-                    logging.info(f"Fichier trouvé avec ID normalisé '{normalized_id}': {file_path}")
+                    logging.info(f"Fichier trouvé par correspondance de numéro: {file_path}")
                     # Stocker pour utilisation future
                     self._store_found_path(student, exercise_id, file_path)
                     return file_path
-            
-            # Si toujours pas trouvé, chercher par analyse des fichiers
-            for java_file in java_files:
-                file_name = os.path.basename(java_file)
-                # Extraire un numéro potentiel (ex: Exercice01.java -> 01)
-                number_match = re.search(r'(\d+)', file_name)
-                if number_match:
-                    number = number_match.group(1)
-                    # Vérifier si ce numéro est dans l'ID de l'exercice
-                    if number in exercise_id:
-                        file_path = java_file
-                        logging.info(f"Fichier trouvé par correspondance de numéro: {file_path}")
-                        # Stocker pour utilisation future
-                        self._store_found_path(student, exercise_id, file_path)
-                        return file_path
-            
-            # Si on a toujours rien trouvé et qu'il n'y a qu'un seul fichier, l'utiliser
-            if len(java_files) == 1:
-                file_path = java_files[0]
-                logging.info(f"Utilisation du seul fichier disponible: {file_path}")
-                # Stocker pour utilisation future
-                self._store_found_path(student, exercise_id, file_path)
-                return file_path
+        
+        # Si on a toujours rien trouvé et qu'il n'y a qu'un seul fichier, l'utiliser
+        if len(java_files) == 1:
+            file_path = java_files[0]
+            logging.info(f"Utilisation du seul fichier disponible: {file_path}")
+            # Stocker pour utilisation future
+            self._store_found_path(student, exercise_id, file_path)
+            return file_path
         
         logging.warning(f"Aucun fichier trouvé pour l'exercice {exercise_id} de l'étudiant {student}")
         return None
@@ -315,7 +300,7 @@ class ResultsSynchronizer:
                     for exercise in exercises:
                         exercise_id = exercise.get('id')
                         file_path = exercise.get('path')
-                        if exercise_id and file_path and os.path.exists(file_path):
+                        if exercise_id and file_path and get_submission_fs().exists(file_path):
                             self.data_manager.store_exercise_file_path(student, exercise_id, file_path)
                             logging.info(f"Fichier préchargé pour {student}/{exercise_id}: {file_path}")
             
@@ -3,7 +3,7 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLabel, QStatusBar, QMessageBox, 
                              QSplitter, QProgressDialog, QApplication, QTabWidget,
                              QComboBox, QToolBar, QToolButton, QTableWidget, QTableWidgetItem, QHeaderView)
-from PyQt5.QtCore import Qt, QTimer, QSize, QPropertyAnimation, QEasingCurve, QRect
+from PyQt5.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve, QRect
 from PyQt5.QtGui import QIcon
 
 from teach_assit.gui.results_display import SubmissionTreeWidget
@@ -15,7 +15,9 @@ from teach_assit.gui.feedback import FeedbackWidget
 from teach_assit.gui.db_file_manager import DatabaseFileManager
 from teach_assit.utils.file_utils import SubmissionManager
 from teach_assit.core.analysis.config_loader import ConfigLoader
-from teach_assit.core.analysis.static_analyzer import StaticAnalyzer
+from teach_assit.core.analysis.parse_cache import ParseCache
+from teach_assit.core.analysis.analysis_cache import AnalysisResultCache
+from teach_assit.gui.analysis_thread import AnalysisThread
 from teach_assit.gui.styles import MAIN_STYLE, TOOLBAR_STYLE, MENU_STYLE, SIDEBAR_STYLE
 
 
@@ -26,6 +28,10 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.submission_manager = SubmissionManager()
         self.config_loader = ConfigLoader(os.getcwd())
+        # Arbres syntaxiques réutilisés entre les analyses et d'une session à l'autre
+        self.parse_cache = ParseCache(cache_dir=os.path.join(os.getcwd(), 'data', 'parse_cache'))
+        # Résultats d'analyse réutilisés tant que le fichier et les règles de l'exercice sont inchangés
+        self.analysis_cache = AnalysisResultCache(os.path.join(os.getcwd(), 'data', 'analysis_cache.db'))
         self.animations = []  # Pour stocker les animations en cours
         self.sidebar_expanded = False  # État initial de la barre latérale
         self.init_ui()
@@ -586,26 +592,15 @@ class MainWindow(QMainWindow):
         progress.setWindowModality(Qt.WindowModal)
         progress.show()
         
-        # Dictionnaire pour stocker les résultats
-        extraction_results = {}
-        
-        # Extraire chaque fichier ZIP individuellement
-        for i, zip_file in enumerate(zip_files):
-            if progress.wasCanceled():
-                break
-                
-            progress.setValue(i)
-            progress.setLabelText(f"Extraction de {zip_file}...")
-            
-            # Mise à jour de l'interface
+        def on_progress(done, total, zip_file):
+            """Avancer la progression après chaque archive ; False annule les suivantes."""
+            progress.setValue(done)
+            progress.setLabelText(f"Extraction de {zip_file} terminée ({done}/{total})")
             QApplication.processEvents()
-            
-            # Extraction du fichier
-            success, message = self.submission_manager.extract_zip_file(zip_file)
-            extraction_results[zip_file] = (success, message)
-            
-            # Pause courte pour donner le temps à l'interface de se mettre à jour
-            QTimer.singleShot(100, lambda: None)
+            return not progress.wasCanceled()
+        
+        # Extraire les fichiers ZIP en parallèle
+        extraction_results = self.submission_manager.extract_zip_files(zip_files, progress_callback=on_progress)
         
         # Fermer la boîte de dialogue de progression
         progress.setValue(len(zip_files))
@@ -652,6 +647,10 @@ class MainWindow(QMainWindow):
             if not success:
                 QMessageBox.warning(self, "Nettoyage", message)
         
+        # Fermer les connexions à la base de données (le journal WAL est reporté dans la base)
+        self.submission_manager.db_manager.close()
+        self.config_loader.db_manager.close()
+        
         event.accept()
     
     def update_submission_table(self):
@@ -687,64 +686,15 @@ class MainWindow(QMainWindow):
             self.analyze_button.setEnabled(False)
             return
             
-        # Créer un dictionnaire de correspondance entre mots-clés et exercices
-        exercise_keywords = {}
-        for ex in assessment.exercises:
-            ex_id = ex.get('exerciseId', '')
-            if ex_id:
-                # Extraire des mots-clés de l'ID de l'exercice
-                # Par exemple, '02-intervalle' donne 'intervalle'
-                if '-' in ex_id:
-                    keyword = ex_id.split('-', 1)[1].lower()
-                else:
-                    keyword = ex_id.lower()
-                exercise_keywords[keyword] = ex_id
+        # Associer les fichiers aux exercices de l'évaluation (matcher partagé, construit une fois)
+        matcher = assessment.get_exercise_matcher()
         
         # Filtrer les fichiers Java par exercice
         filtered_students = {}
         
         for student_name, info in student_folders.items():
-            java_files = info.get('java_files', [])
-            
-            # Filtrer les fichiers par exercice
-            filtered_files = []
-            
-            for java_file in java_files:
-                java_file_lower = java_file.lower()
-                
-                # Vérifier si le fichier correspond à l'un des exercices de l'évaluation
-                matches_exercise = False
-                
-                # Méthode 1: Correspondance directe avec l'ID d'exercice
-                for ex in assessment.exercises:
-                    ex_id = ex.get('exerciseId', '')
-                    if ex_id and ex_id.lower() in java_file_lower:
-                        matches_exercise = True
-                        break
-                
-                # Méthode 2: Correspondance avec les mots-clés extraits
-                if not matches_exercise:
-                    for keyword in exercise_keywords:
-                        if keyword in java_file_lower:
-                            matches_exercise = True
-                            break
-                        
-                        # Vérifier aussi le nom de base du fichier
-                        base_name = os.path.splitext(os.path.basename(java_file_lower))[0]
-                        if keyword in base_name:
-                            matches_exercise = True
-                            break
-                
-                # Méthode 3: Cas spéciaux
-                if not matches_exercise:
-                    if "intervalle" in java_file_lower and any("intervalle" in kw for kw in exercise_keywords):
-                        matches_exercise = True
-                    elif ("fonction" in java_file_lower or "log" in java_file_lower) and any(("fonction" in kw or "log" in kw) for kw in exercise_keywords):
-                        matches_exercise = True
-                
-                # Si le fichier correspond à un exercice de l'évaluation, l'ajouter à la liste filtrée
-                if matches_exercise:
-                    filtered_files.append(java_file)
+            # Ne garder que les fichiers qui correspondent à l'un des exercices de l'évaluation
+            filtered_files = list(matcher.filter_files(info.get('java_files', [])))
             
             # Si l'étudiant a des fichiers correspondant aux exercices, l'ajouter à la liste
             if filtered_files:
@@ -873,85 +823,32 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Aucune soumission", "Aucune soumission extraite à analyser.")
             return
         
-        # Créer un dictionnaire de correspondance entre mots-clés et exercices
-        exercise_keywords = {}
-        exercise_ids = []
-        for ex in assessment.exercises:
-            ex_id = ex.get('exerciseId', '')
-            if ex_id:
-                exercise_ids.append(ex_id)
-                # Extraire des mots-clés de l'ID de l'exercice
-                if '-' in ex_id:
-                    keyword = ex_id.split('-', 1)[1].lower()
-                else:
-                    keyword = ex_id.lower()
-                exercise_keywords[keyword] = ex_id
+        # Associer les fichiers aux exercices de l'évaluation (matcher partagé, construit une fois)
+        matcher = assessment.get_exercise_matcher()
         
         # DEBUG: Afficher les IDs d'exercices pour cette évaluation
         print(f"\n======= DEBUG: Exercices de l'évaluation {assessment.name} ({assessment_id}) =======")
-        print(f"IDs d'exercices: {exercise_ids}")
-        print(f"Mots-clés: {list(exercise_keywords.keys())}")
+        print(f"IDs d'exercices: {matcher.exercise_ids}")
         print("=====================================================================\n")
         
         # Filtrer les étudiants ayant des fichiers correspondant à l'évaluation sélectionnée
+        # (chaque fichier retenu est associé à son exercice)
         filtered_students = {}
         for student_name, info in all_student_folders.items():
-            java_files = info.get('java_files', [])
-            
-            # Filtrer les fichiers par exercice
-            filtered_files = []
-            
-            for java_file in java_files:
-                java_file_lower = java_file.lower()
-                
-                # Vérifier si le fichier correspond à l'un des exercices de l'évaluation
-                matches_exercise = False
-                matching_exercise_id = None
-                
-                # Méthode 1: Correspondance directe avec l'ID d'exercice
-                for ex in assessment.exercises:
-                    ex_id = ex.get('exerciseId', '')
-                    if ex_id and ex_id.lower() in java_file_lower:
-                        matches_exercise = True
-                        matching_exercise_id = ex_id
-                        break
-                
-                # Méthode 2: Correspondance avec les mots-clés extraits
-                if not matches_exercise:
-                    for keyword, ex_id in exercise_keywords.items():
-                        if keyword in java_file_lower:
-                            matches_exercise = True
-                            matching_exercise_id = ex_id
-                            break
-                        
-                        # Vérifier aussi le nom de base du fichier
-                        base_name = os.path.splitext(os.path.basename(java_file_lower))[0]
-                        if keyword in base_name:
-                            matches_exercise = True
-                            matching_exercise_id = ex_id
-                            break
-                
-                # Méthode 3: Cas spéciaux
-                if not matches_exercise:
-                    if "intervalle" in java_file_lower and any("intervalle" in kw for kw in exercise_keywords):
-                        matches_exercise = True
-                        matching_exercise_id = next((ex_id for ex_id in exercise_ids if "intervalle" in ex_id), None)
-                    elif ("fonction" in java_file_lower or "log" in java_file_lower) and any(("fonction" in kw or "log" in kw) for kw in exercise_keywords):
-                        matches_exercise = True
-                        matching_exercise_id = next((ex_id for ex_id in exercise_ids if "fonction" in ex_id or "log" in ex_id), None)
-                
-                # Si le fichier correspond à un exercice de l'évaluation, l'ajouter à la liste filtrée
-                if matches_exercise:
+            matched_files = {}
+            for java_file in info.get('java_files', []):
+                exercise_id = matcher.match(java_file)
+                if exercise_id:
                     # DEBUG: Afficher la correspondance trouvée
-                    print(f"Fichier correspondant: {java_file} -> Exercice: {matching_exercise_id}")
-                    filtered_files.append(java_file)
+                    print(f"Fichier correspondant: {java_file} -> Exercice: {exercise_id}")
+                    matched_files[java_file] = exercise_id
                 else:
                     print(f"Fichier ignoré (pas de correspondance): {java_file}")
             
             # Si l'étudiant a des fichiers correspondant aux exercices, l'ajouter à la liste
-            if filtered_files:
+            if matched_files:
                 filtered_info = info.copy()
-                filtered_info['java_files'] = filtered_files
+                filtered_info['java_files'] = matched_files
                 filtered_students[student_name] = filtered_info
         
         if not filtered_students:
@@ -961,21 +858,9 @@ class MainWindow(QMainWindow):
         # DEBUG: Résumé des étudiants et fichiers filtrés
         print(f"\n======= DEBUG: Résumé des étudiants filtrés pour {assessment.name} =======")
         for student, info in filtered_students.items():
-            print(f"Étudiant: {student}, Fichiers: {info['java_files']}")
+            print(f"Étudiant: {student}, Fichiers: {list(info['java_files'])}")
         print("=====================================================================\n")
         
-        # Créer une boîte de dialogue de progression
-        progress = QProgressDialog("Analyse des soumissions en cours...", "Annuler", 0, len(filtered_students), self)
-        progress.setWindowTitle("Analyse en cours")
-        progress.setWindowModality(Qt.WindowModal)
-        progress.show()
-        
-        # Créer l'analyseur statique
-        analyzer = StaticAnalyzer()
-        
-        # Dictionnaire pour stocker les résultats d'analyse
-        analysis_results = {}
-        
         # Préparer les configurations d'exercices pour l'analyse
         exercise_configs = {}
         for ex in assessment.exercises:
@@ -984,99 +869,70 @@ class MainWindow(QMainWindow):
             if config:
                 exercise_configs[ex_id] = config
         
-        # Analyser chaque soumission d'étudiant
-        student_count = 0
+        # Construire la liste des tâches d'analyse (étudiant, fichier, exercice)
+        jobs = []
         for student_name, info in filtered_students.items():
-            if progress.wasCanceled():
-                break
-            
-            progress.setValue(student_count)
-            progress.setLabelText(f"Analyse des soumissions de {student_name}...")
-            
-            # Mise à jour de l'interface
-            QApplication.processEvents()
-            
-            # Récupérer les fichiers Java de l'étudiant (déjà filtrés)
-            java_files = info.get('java_files', [])
+            # Fichiers Java de l'étudiant (déjà filtrés), avec leur exercice
+            matched_files = info.get('java_files', {})
             student_dir = info.get('path', '')
-            student_results = {}
             
-            # Analyser chaque fichier Java
-            for java_file in java_files:
-                file_path = os.path.join(student_dir, java_file)
+            for java_file, exercise_id in matched_files.items():
+                # Ignorer ce fichier si la configuration n'est pas trouvée
+                if exercise_id not in exercise_configs:
+                    print(f"ERREUR: Configuration introuvable pour l'exercice {exercise_id}")
+                    continue
                 
-                # Lire le contenu du fichier
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        code = f.read()
-                    
-                    # Déterminer l'exercice associé au fichier en utilisant les mots-clés
-                    exercise_id = None
-                    java_file_lower = java_file.lower()
-                    
-                    # Méthode 1: Correspondance directe avec l'ID d'exercice
-                    for ex in assessment.exercises:
-                        ex_id = ex.get('exerciseId', '')
-                        if ex_id and ex_id in java_file_lower:
-                            exercise_id = ex_id
-                            break
-                    
-                    # Méthode 2: Correspondance avec les mots-clés extraits
-                    if not exercise_id:
-                        for keyword, ex_id in exercise_keywords.items():
-                            if keyword in java_file_lower:
-                                exercise_id = ex_id
-                                break
-                            # Vérifier aussi si le keyword est dans le nom de base du fichier sans extension
-                            base_name = os.path.splitext(os.path.basename(java_file_lower))[0]
-                            if keyword in base_name:
-                                exercise_id = ex_id
-                                break
-                    
-                    # Méthode 3: Correspondance approfondie pour des cas spécifiques
-                    if not exercise_id:
-                        if "intervalle" in java_file_lower:
-                            for ex_id in exercise_keywords.values():
-                                if "intervalle" in ex_id:
-                                    exercise_id = ex_id
-                                    break
-                        elif "fonction" in java_file_lower or "log" in java_file_lower:
-                            for ex_id in exercise_keywords.values():
-                                if "fonction" in ex_id or "log" in ex_id:
-                                    exercise_id = ex_id
-                                    break
-                    
-                    # Si aucune correspondance, ignorer ce fichier
-                    if not exercise_id:
-                        print(f"ERREUR: {java_file} n'a pas d'exercice associé lors de l'analyse!")
-                        continue
-                    
-                    # Obtenir la configuration de l'exercice
-                    exercise_config = exercise_configs.get(exercise_id)
-                    if not exercise_config:
-                        print(f"ERREUR: Configuration introuvable pour l'exercice {exercise_id}")
-                        continue  # Ignorer ce fichier si la configuration n'est pas trouvée
-                    
-                    # Analyser le code
-                    result = analyzer.analyze_code(code, exercise_config)
-                    
-                    # Enrichir les résultats avec l'ID de l'exercice pour faciliter le filtrage ultérieur
-                    result['exerciseId'] = exercise_id
-                    student_results[java_file] = result
-                    
-                except Exception as e:
-                    student_results[java_file] = {
-                        'error': f"Erreur lors de l'analyse: {str(e)}",
-                        'exerciseId': exercise_id  # Peut être None si non déterminé
-                    }
-            
-            # Stocker les résultats pour cet étudiant uniquement s'il a des fichiers analysés
-            if student_results:
-                analysis_results[student_name] = student_results
-            student_count += 1
+                jobs.append({
+                    'student': student_name,
+                    'file': java_file,
+                    'path': os.path.join(student_dir, java_file),
+                    'exercise_id': exercise_id
+                })
+        
+        # Créer une boîte de dialogue de progression
+        progress = QProgressDialog("Analyse des soumissions en cours...", "Annuler", 0, len(jobs), self)
+        progress.setWindowTitle("Analyse en cours")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.show()
+        
+        # Analyser les soumissions dans plusieurs processus ; l'interface reste réactive.
+        # Seuls les fichiers nouveaux ou modifiés (ou dont l'exercice a changé) sont réanalysés.
+        # Les diagnostics du compilateur (si Java est disponible) sont obtenus dans le thread.
+        self.analysis_thread = AnalysisThread(
+            jobs,
+            exercise_configs,
+            parse_cache_dir=self.parse_cache.cache_dir,
+            diagnostics_provider=self.results_tab.code_executor.get_compile_diagnostics,
+            result_cache=self.analysis_cache
+        )
+        self.analysis_thread.progress_changed.connect(progress.setValue)
+        self.analysis_thread.result_ready.connect(
+            lambda student_name, java_file, result: progress.setLabelText(f"Analyse des soumissions de {student_name}...")
+        )
+        progress.canceled.connect(self.analysis_thread.cancel)
+        self.analysis_thread.analysis_finished.connect(
+            lambda analysis_results: self._on_analysis_finished(
+                analysis_results, assessment, exercise_configs, jobs, progress
+            )
+        )
+        self.analyze_button.setEnabled(False)
+        self.analysis_thread.start()
+    
+    def _on_analysis_finished(self, analysis_results, assessment, exercise_configs, jobs, progress):
+        """Afficher les résultats une fois l'analyse des soumissions terminée."""
+        self.analyze_button.setEnabled(True)
         
         # Fermer la boîte de dialogue de progression
-        progress.setValue(len(filtered_students))
+        progress.setValue(progress.maximum())
+        progress.close()
+        
+        # Rétablir l'ordre des étudiants et des fichiers (les résultats arrivent dans l'ordre de fin d'analyse)
+        ordered_results = {}
+        for job in jobs:
+            result = analysis_results.get(job['student'], {}).get(job['file'])
+            if result is not None:
+                ordered_results.setdefault(job['student'], {})[job['file']] = result
+        analysis_results = ordered_results
         
         if not analysis_results:
             QMessageBox.warning(self, "Aucun résultat", f"Aucun fichier n'a pu être analysé pour l'évaluation {assessment.name}.")
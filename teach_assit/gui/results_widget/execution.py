@@ -4,8 +4,16 @@ Module pour l'exécution de code Java.
 
 import os
 import logging
-from PyQt5.QtCore import qInstallMessageHandler, QtDebugMsg, QtInfoMsg, QtWarningMsg, QtCriticalMsg, QtFatalMsg
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal, qInstallMessageHandler, QtDebugMsg, QtInfoMsg, QtWarningMsg, QtCriticalMsg, QtFatalMsg
 from teach_assit.core.execution.code_executor import JavaExecutor
+from teach_assit.core.execution.compile_cache import CompilationCache
+from teach_assit.core.execution.result_cache import ExecutionResultCache
+from teach_assit.core.execution.scheduler import ExecutionScheduler
+from teach_assit.core.execution.cds import CdsArchiveManager
+from teach_assit.core.execution.sandbox import ResourceLimits
+from teach_assit.core.submission_fs import get_submission_fs, is_archive_path, read_source
+from teach_assit.utils.submission_index import get_submission_index
 
 class CodeExecutor:
     """Classe pour exécuter des codes étudiants avec différentes entrées."""
@@ -13,7 +21,47 @@ class CodeExecutor:
     def __init__(self):
         """Initialiser l'exécuteur de code."""
         self._setup_message_handler()
-        self.executor = JavaExecutor()
+        # Limites par défaut (temps CPU, tas, taille des fichiers) de chaque exécution étudiante
+        self.resource_limits = ResourceLimits()
+        self.executor = JavaExecutor(compile_cache=CompilationCache(), result_cache=ExecutionResultCache(),
+                                     resource_limits=self.resource_limits)
+        self.cds_manager = CdsArchiveManager()
+        self._jvm_options = None
+        self._jvm_options_lock = threading.Lock()
+        self._indexed_students = set()
+    
+    def get_jvm_options(self):
+        """Obtenir les options JVM de démarrage (archive CDS construite au premier appel).
+        
+        Returns:
+            list: Options à passer à chaque lancement de JVM
+        """
+        with self._jvm_options_lock:
+            if self._jvm_options is None:
+                try:
+                    self._jvm_options = self.cds_manager.get_jvm_options()
+                except Exception as e:
+                    logging.warning(f"Options JVM de démarrage indisponibles: {str(e)}")
+                    self._jvm_options = []
+            return list(self._jvm_options)
+    
+    def get_compile_diagnostics(self, file_path):
+        """Compiler un fichier et obtenir les diagnostics structurés du compilateur.
+        
+        Args:
+            file_path: Chemin du fichier Java
+            
+        Returns:
+            list: Diagnostics {'kind', 'line', 'column', 'message'}, ou None si Java est indisponible
+        """
+        if not self.executor.javac_version:
+            return None
+        try:
+            _, _, diagnostics = self.executor.compile_with_diagnostics(file_path)
+            return diagnostics
+        except Exception as e:
+            logging.warning(f"Diagnostics de compilation indisponibles pour {file_path}: {str(e)}")
+            return None
     
     def _setup_message_handler(self):
         """Configurer le gestionnaire de messages Qt pour supprimer les avertissements inutiles."""
@@ -45,48 +93,32 @@ class CodeExecutor:
             working_dir = os.getcwd()
         
         logging.info(f"Recherche du fichier '{file_name}' pour l'étudiant '{student_name}'")
-        logging.info(f"Répertoire de travail: {working_dir}")
-        
-        # Normaliser le nom du fichier (sans considérer la casse)
-        normalized_filename = file_name.lower()
-        
-        # Déterminer les informations de l'exercice et du TD à partir du nom de fichier
-        # Cette méthode plus générique utilise des patterns plutôt que des valeurs codées en dur
-        td_info = self._extract_assessment_info(normalized_filename)
-        
-        # Construire les chemins de recherche dynamiquement en fonction du TD identifié
-        possible_paths = [
-            # Chemin direct (si c'est déjà un chemin absolu)
-            file_name,
-            # Chemin relatif au répertoire courant
-            os.path.join(working_dir, file_name),
-            # Chemin dans le répertoire des fichiers extraits
-            os.path.join(working_dir, "extracted_files", student_name, file_name),
-            # Chemin dans le répertoire des soumissions
-            os.path.join(working_dir, "submitted_files", student_name, file_name),
-            # Chemin dans un dossier étudiant directement
-            os.path.join(working_dir, student_name, file_name),
-            # Variantes avec lettres minuscules
-            os.path.join(working_dir, "extracted_files", student_name.lower(), file_name),
-            os.path.join(working_dir, "submitted_files", student_name.lower(), file_name)
-        ]
-        
-        # Ajouter les chemins pour tous les TDs connus
-        for td_number in range(1, 10):  # Supporter TD1 à TD9
-            td_name = f"TD{td_number}"
-            possible_paths.append(os.path.join(working_dir, "tests", "java_samples", td_name, student_name, file_name))
-            possible_paths.append(os.path.join(working_dir, "tests", "java_samples", td_name, student_name.lower(), file_name))
         
-        # Vérifier chaque chemin
-        for path in possible_paths:
-            if os.path.exists(path):
+        # Chemin direct (absolu ou relatif au répertoire de travail)
+        for path in (file_name, os.path.join(working_dir, file_name)):
+            if get_submission_fs().exists(path):
                 logging.info(f"Fichier trouvé: {path}")
                 return path
-            else:
-                logging.debug(f"Chemin non trouvé: {path}")
         
-        # Si le fichier n'a pas été trouvé avec les chemins directs, essayer la recherche par similarité
-        return self._find_file_by_similarity(student_name, normalized_filename, td_info, working_dir)
+        # Dossiers des étudiants : extracted_files, submitted_files, tests/java_samples/TD*, dossiers extraits
+        index = get_submission_index(working_dir)
+        if (working_dir, student_name) not in self._indexed_students:
+            # Dossier de l'étudiant directement dans le répertoire de travail
+            index.add_student_dir(student_name, os.path.join(working_dir, student_name))
+            self._indexed_students.add((working_dir, student_name))
+        
+        file_path = index.find(student_name, file_name) or index.find_exercise(student_name, file_name)
+        if file_path:
+            logging.info(f"Fichier trouvé: {file_path}")
+            return file_path
+        
+        # Sinon, le fichier de l'étudiant qui partage le plus de mots-clés avec le nom recherché
+        file_path = index.find_similar(student_name, file_name)
+        if file_path:
+            logging.info(f"Fichier similaire trouvé: {file_path}")
+        else:
+            logging.warning(f"Aucun fichier trouvé pour '{file_name}' de l'étudiant '{student_name}'")
+        return file_path
     
     def _extract_assessment_info(self, normalized_filename):
         """Extrait les informations d'évaluation (TD) à partir du nom de fichier.
@@ -157,96 +189,6 @@ class CodeExecutor:
         
         return td_info
     
-    def _find_file_by_similarity(self, student_name, normalized_filename, td_info, working_dir):
-        """Trouve un fichier par similarité avec le nom demandé.
-        
-        Args:
-            student_name: Nom de l'étudiant
-            normalized_filename: Nom de fichier normalisé
-            td_info: Informations sur le TD et l'exercice
-            working_dir: Répertoire de travail
-            
-        Returns:
-            str: Chemin du fichier trouvé, ou None si non trouvé
-        """
-        # Chercher dans les répertoires d'étudiants tous les fichiers .java
-        student_dirs = [
-            os.path.join(working_dir, "extracted_files", student_name),
-            os.path.join(working_dir, "submitted_files", student_name),
-            os.path.join(working_dir, student_name)
-        ]
-        
-        # Ajouter les répertoires spécifiques au TD s'ils sont connus
-        if td_info["td_name"]:
-            student_dirs.append(os.path.join(working_dir, "tests", "java_samples", td_info["td_name"], student_name))
-            logging.info(f"Recherche spécifique pour {td_info['td_name']} avec mots-clés: {td_info['keywords']}")
-        
-        # Ajouter une recherche dans tous les TDs au cas où
-        for td_number in range(1, 10):  # Supporter TD1 à TD9
-            td_name = f"TD{td_number}"
-            student_dirs.append(os.path.join(working_dir, "tests", "java_samples", td_name, student_name))
-            
-        # Phase 1: Recherche dans les dossiers d'étudiants
-        for student_dir in student_dirs:
-            if not os.path.exists(student_dir):
-                continue
-                
-            for root, _, files in os.walk(student_dir):
-                for file in files:
-                    if file.lower().endswith('.java'):
-                        # Vérifier la correspondance par mots-clés ou par nom
-                        if self._is_matching_file(file.lower(), normalized_filename, td_info["keywords"]):
-                            full_path = os.path.join(root, file)
-                            logging.info(f"Fichier similaire trouvé: {full_path}")
-                            return full_path
-        
-        # Phase 2: Si un TD spécifique est identifié, chercher dans tout son répertoire
-        if td_info["td_name"]:
-            td_base_dir = os.path.join(working_dir, "tests", "java_samples", td_info["td_name"])
-            if os.path.exists(td_base_dir):
-                logging.info(f"Recherche approfondie dans tous les dossiers {td_info['td_name']}")
-                
-                for root, _, files in os.walk(td_base_dir):
-                    for file in files:
-                        if file.lower().endswith('.java'):
-                            # Vérification plus stricte par mots-clés pour limiter les faux positifs
-                            if self._is_matching_file(file.lower(), normalized_filename, td_info["keywords"], strict=True):
-                                full_path = os.path.join(root, file)
-                                logging.info(f"Fichier {td_info['td_name']} trouvé lors de la recherche approfondie: {full_path}")
-                                return full_path
-        
-        logging.warning(f"Aucun fichier trouvé pour '{normalized_filename}' de l'étudiant '{student_name}'")
-        return None
-    
-    def _is_matching_file(self, file_lower, normalized_filename, keywords, strict=False):
-        """Vérifie si un fichier correspond au nom recherché ou aux mots-clés.
-        
-        Args:
-            file_lower: Nom du fichier en minuscules
-            normalized_filename: Nom de fichier recherché normalisé
-            keywords: Liste de mots-clés à rechercher
-            strict: Si True, nécessite une correspondance plus stricte
-            
-        Returns:
-            bool: True si le fichier correspond, False sinon
-        """
-        # Correspondance directe entre noms
-        if normalized_filename in file_lower:
-            return True
-            
-        # Correspondance par mots-clés
-        if keywords:
-            # En mode strict, exiger au moins un mot-clé dans le nom du fichier
-            if strict:
-                return any(keyword in file_lower for keyword in keywords if len(keyword) > 3)
-            else:
-                # En mode normal, accepter des correspondances partielles
-                return any(
-                    part in file_lower 
-                    for part in normalized_filename.replace('-', ' ').split() 
-                    if len(part) > 3
-                )
-    
     def execute_code(self, file_path, test_inputs):
         """Exécuter un code avec différentes entrées.
         
@@ -257,7 +199,7 @@ class CodeExecutor:
         Returns:
             list: Liste des résultats d'exécution
         """
-        if not file_path or not os.path.exists(file_path):
+        if not file_path or not get_submission_fs().exists(file_path):
             return [self._create_error_result(input_val, "Fichier non trouvé") for input_val in test_inputs]
         
         try:
@@ -283,6 +225,7 @@ class CodeExecutor:
                 file_path = self._preprocess_java_file(file_path)
                 
                 # Exécuter le code avec les entrées de test
+                self.executor.jvm_options = self.get_jvm_options()
                 results = self.executor.test_with_inputs(file_path, test_inputs)
                 
                 # Ajouter des informations d'identification pour chaque résultat
@@ -307,6 +250,99 @@ class CodeExecutor:
             logging.error(error_msg)
             return [self._create_error_result(input_val, error_msg) for input_val in test_inputs]
     
+    def compile_all(self, file_paths):
+        """Compiler en un seul lot tous les fichiers Java qui seront exécutés.
+
+        Les appels suivants à execute_code sur ces fichiers réutilisent les
+        classes compilées.
+
+        Args:
+            file_paths: Liste des chemins des fichiers à compiler
+
+        Returns:
+            dict: {chemin: (succès, sortie du compilateur)}
+        """
+        java_files = {}
+        for file_path in file_paths:
+            if file_path and get_submission_fs().exists(file_path) and file_path.lower().endswith('.java'):
+                java_files[file_path] = self._preprocess_java_file(file_path)
+
+        if not java_files:
+            return {}
+
+        logging.info(f"Compilation groupée de {len(java_files)} fichier(s) Java")
+        return self.executor.compile_batch(java_files)
+
+    def create_scheduler(self, max_workers=None, force_rerun=False):
+        """Créer un ordonnanceur dont les workers partagent les caches de compilation et d'exécution.
+
+        Args:
+            max_workers: Nombre de workers (par défaut selon les cœurs et la mémoire)
+            force_rerun: Ignorer les résultats d'exécution en cache
+
+        Returns:
+            ExecutionScheduler: L'ordonnanceur
+        """
+        compile_cache = self.executor.compile_cache
+        result_cache = self.executor.result_cache
+        return ExecutionScheduler(
+            max_workers=max_workers,
+            executor_factory=lambda: JavaExecutor(compile_cache=compile_cache, result_cache=result_cache,
+                                                  jvm_options=self.get_jvm_options(),
+                                                  resource_limits=self.resource_limits),
+            force_rerun=force_rerun
+        )
+
+    def invalidate_execution_results(self):
+        """Supprimer tous les résultats d'exécution en cache.
+
+        Returns:
+            int: Nombre de résultats supprimés
+        """
+        if self.executor.result_cache is None:
+            return 0
+        return self.executor.result_cache.invalidate()
+
+    def execute_cohort(self, jobs, on_result, on_progress=None, scheduler=None):
+        """Exécuter en parallèle les codes de plusieurs étudiants.
+
+        Args:
+            jobs: Liste de dictionnaires contenant au moins 'file_path' et 'test_inputs'
+            on_result: Appelé avec (job, résultats) pour chaque job terminé
+            on_progress: Appelé avec (jobs terminés, nombre total de jobs)
+            scheduler: Ordonnanceur à utiliser (permet l'annulation depuis un autre thread)
+
+        Returns:
+            bool: True si tous les jobs ont été exécutés, False en cas d'annulation
+        """
+        scheduler = scheduler or self.create_scheduler()
+        runnable_jobs = []
+        for job in jobs:
+            file_path = job['file_path']
+            if not file_path or not get_submission_fs().exists(file_path) or not file_path.lower().endswith('.java'):
+                # Les fichiers introuvables ou non Java produisent directement une erreur
+                on_result(job, self.execute_code(file_path, job['test_inputs']))
+                continue
+            runnable_jobs.append({
+                "file_path": self._preprocess_java_file(file_path),
+                "test_inputs": job['test_inputs'],
+                "job": job
+            })
+
+        return scheduler.run(
+            runnable_jobs,
+            lambda runnable_job, results: on_result(runnable_job["job"], results),
+            on_progress
+        )
+
+    def get_cache_stats(self):
+        """Obtenir les compteurs du cache de compilation.
+
+        Returns:
+            dict: {'hits', 'misses', 'size'} ou None si le cache est désactivé
+        """
+        return self.executor.get_cache_stats()
+
     def _preprocess_java_file(self, file_path):
         """Prétraite un fichier Java pour éviter les erreurs de noms de classe/fichier.
         
@@ -316,6 +352,10 @@ class CodeExecutor:
         Returns:
             str: Chemin du fichier Java (potentiellement modifié)
         """
+        if is_archive_path(file_path):
+            # Fichier lu dans son archive : l'exécuteur le copie déjà sous le nom de sa classe
+            return file_path
+        
         try:
             # Extraire le nom de la classe du fichier
             real_class_name = self._extract_class_name_from_file(file_path)
@@ -362,16 +402,15 @@ class CodeExecutor:
             str: Nom de la classe principale ou None si non trouvé
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                # Recherche des déclarations de classe publique
-                import re
-                pattern = r'public\s+class\s+(\w+)'
-                match = re.search(pattern, content)
-                
-                if match:
-                    return match.group(1)
+            content = read_source(file_path)
+            
+            # Recherche des déclarations de classe publique
+            import re
+            pattern = r'public\s+class\s+(\w+)'
+            match = re.search(pattern, content)
+            
+            if match:
+                return match.group(1)
         except Exception as e:
             logging.error(f"Erreur lors de l'extraction du nom de classe: {str(e)}")
         
@@ -393,4 +432,37 @@ class CodeExecutor:
             "compilation_error": True,
             "stdout": "",
             "stderr": error_message
-        } 
\ No newline at end of file
+        } 
+
+
+class ExecutionThread(QThread):
+    """Thread pour exécuter les codes d'une cohorte sans bloquer l'interface."""
+    result_ready = pyqtSignal(object, object)
+    progress_changed = pyqtSignal(int, int)
+    execution_finished = pyqtSignal(bool)
+    error_occurred = pyqtSignal(str)
+
+    def __init__(self, code_executor, jobs, force_rerun=False):
+        super().__init__()
+        self.code_executor = code_executor
+        self.jobs = jobs  # Liste de dictionnaires décrivant chaque fichier à exécuter
+        self.scheduler = code_executor.create_scheduler(force_rerun=force_rerun)
+
+    def run(self):
+        try:
+            completed = self.code_executor.execute_cohort(
+                self.jobs,
+                self.result_ready.emit,
+                self.progress_changed.emit,
+                self.scheduler
+            )
+            self.execution_finished.emit(completed)
+        except Exception as e:
+            import traceback
+            logging.error(f"Exception lors de l'exécution: {str(e)}\n{traceback.format_exc()}")
+            self.error_occurred.emit(str(e))
+            self.execution_finished.emit(False)
+
+    def cancel(self):
+        """Demander l'annulation des exécutions restantes."""
+        self.scheduler.cancel()
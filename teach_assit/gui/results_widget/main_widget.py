@@ -10,16 +10,19 @@ import re
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QTableWidget, QTableWidgetItem, QComboBox, 
                            QPushButton, QLineEdit, QFrame, QHeaderView,
-                           QSizePolicy, QMessageBox, QScrollArea, QGroupBox, QDialog, QTextEdit)
+                           QSizePolicy, QMessageBox, QScrollArea, QGroupBox, QDialog, QTextEdit,
+                           QCheckBox)
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon, QColor, QFont
 
 from teach_assit.core.analysis.config_loader import ConfigLoader
+from teach_assit.core.analysis.exercise_matcher import ExerciseMatcher
 from teach_assit.core.analysis.models import ExerciseConfig
+from teach_assit.core.submission_fs import get_submission_fs, read_source
 from teach_assit.gui.results_widget.utils import SYMBOL_OK, SYMBOL_FAIL, SYMBOL_WARNING
 from teach_assit.gui.results_widget.dialogs import DetailsDialog, OutputDialog
 from teach_assit.gui.results_widget.report import format_detailed_report
-from teach_assit.gui.results_widget.execution import CodeExecutor
+from teach_assit.gui.results_widget.execution import CodeExecutor, ExecutionThread
 from teach_assit.gui.results_widget.ui_components import (
     StatusWidget, ExerciseWidget, ResultWidget, ActionsWidget, ExecutionResultWidget
 )
@@ -286,19 +289,55 @@ class ResultsWidget(QWidget):
             }
         """)
         
-        # Créer un layout horizontal pour centrer le bouton
+        # Bouton d'annulation (actif uniquement pendant l'exécution)
+        cancel_button = QPushButton("Annuler")
+        cancel_button.setEnabled(False)
+        cancel_button.setStyleSheet("""
+            QPushButton {
+                background-color: #e74c3c;
+                color: white;
+                border: none;
+                padding: 10px;
+                border-radius: 4px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #c0392b;
+            }
+            QPushButton:disabled {
+                background-color: #95a5a6;
+            }
+        """)
+        
+        # Créer un layout horizontal pour centrer les boutons
         button_layout = QHBoxLayout()
         button_layout.addStretch()
         button_layout.addWidget(execute_button)
+        button_layout.addWidget(cancel_button)
         button_layout.addStretch()
         
+        # Option pour ignorer les résultats d'exécution en cache
+        self.force_rerun_checkbox = QCheckBox("Forcer la ré-exécution")
+        self.force_rerun_checkbox.setToolTip("Réexécuter tous les tests même si leurs résultats sont en cache")
+        button_layout.addWidget(self.force_rerun_checkbox)
+        
         execution_layout.addLayout(button_layout)
         
         # Connecter le bouton à la fonction d'exécution
         execute_button.clicked.connect(self.execute_all_codes)
         
-        # Stocker une référence au bouton d'exécution
+        cancel_button.clicked.connect(self.cancel_execution)
+        
+        # Stocker une référence aux boutons d'exécution
         self.execute_button = execute_button
+        self.cancel_execution_button = cancel_button
+        self.execution_thread = None
+        
+        # Statistiques du cache de compilation
+        self.compile_cache_label = QLabel("")
+        self.compile_cache_label.setStyleSheet("color: #555;")
+        self.compile_cache_label.setAlignment(Qt.AlignCenter)
+        execution_layout.addWidget(self.compile_cache_label)
         
         # Tableau des résultats d'exécution
         self._init_execution_results_table(execution_layout)
@@ -611,9 +650,6 @@ class ResultsWidget(QWidget):
         # Récupérer toutes les configurations d'exercices depuis la base de données
         exercise_configs = config_loader.get_all_exercise_configs()
         
-        # Structure de données pour stocker les résultats
-        all_results = []
-        
         # Obtenir la liste de tous les étudiants du tableau de résultats
         students = set()
         for row in range(self.results_table.rowCount()):
@@ -678,131 +714,192 @@ class ResultsWidget(QWidget):
         
         if not exercises_to_process:
             QMessageBox.warning(self, "Aucun exercice", "Aucun exercice correspondant n'a été trouvé dans les configurations.")
-            self.execute_button.setEnabled(True)
-            self.execute_button.setText("Exécuter les codes")
+            self._reset_execution_buttons()
             return
         
         print(f"Exercices à traiter: {list(exercises_to_process.keys())}")
         
+        # Associer les fichiers aux exercices (même matcher que l'analyse, avec des alias de noms)
+        matcher = ExerciseMatcher(
+            list(exercises_to_process),
+            aliases={ex_id: self._exercise_aliases(ex_id) for ex_id in exercises_to_process}
+        )
+        
         try:
-            # Pour chaque étudiant, exécuter les exercices identifiés
+            # Localiser d'abord les fichiers de chaque étudiant pour chaque exercice
+            execution_jobs = []
             for student_name in students:
                 print(f"Traitement des exercices pour l'étudiant: {student_name}")
+                matched_files = None
                 
                 # Parcourir les exercices à traiter
                 for ex_id, config in exercises_to_process.items():
-                    # Récupérer les entrées de test pour cet exercice
-                    test_inputs = self._get_test_inputs_for_exercise(config, ex_id)
-                    
-                    # Générer différents noms de fichiers possibles pour cet exercice
-                    potential_file_names = self._generate_potential_file_names(ex_id)
-                    
-                    # Chercher le fichier correspondant avec une logique améliorée
-                    file_found = False
-                    
-                    # Recherche par nom de fichier
-                    for file_name in potential_file_names:
-                        file_path = self.code_executor.find_file_path(student_name, file_name)
-                        if file_path:
-                            print(f"Fichier pour {ex_id} trouvé: {file_path}")
-                            file_found = True
-                            
-                            # Exécuter le code avec les entrées de test
-                            test_results = self.code_executor.execute_code(file_path, test_inputs)
-                            
-                            # Ajouter les résultats à la liste
-                            for i, result in enumerate(test_results):
-                                input_val = test_inputs[i] if i < len(test_inputs) else ""
-                                
-                                # Récupérer la description du test si disponible
-                                input_description = ""
-                                if hasattr(config, 'get_test_inputs') and config.get_test_inputs() and i < len(config.get_test_inputs()):
-                                    test_config = config.get_test_inputs()[i]
-                                    if isinstance(test_config, dict):
-                                        input_description = test_config.get("description", "")
-                                
-                                # Créer un identifiant unique pour cette exécution
-                                execution_id = f"{ex_id}_{i}"
-                                
-                                all_results.append({
-                                    "student": student_name,
-                                    "exercise": config.name,
-                                    "exercise_id": ex_id,
-                                    "file_path": file_path,
-                                    "input": input_val,
-                                    "input_description": input_description,
-                                    "success": result["success"],
-                                    "compilation_error": result.get("compilation_error", False),
-                                    "stdout": result.get("stdout", ""),
-                                    "stderr": result.get("stderr", ""),
-                                    "execution_id": execution_id  # Identifiant unique pour cette exécution
-                                })
-                            
-                            # Passer à l'exercice suivant
-                            break
-                    
-                    # Si le fichier n'a pas été trouvé, essayer une recherche par mots-clés
-                    if not file_found:
-                        file_path = self._find_file_by_keywords(student_name, ex_id, current_assessment)
+                    file_path = self._locate_exercise_file(student_name, ex_id)
+                    if not file_path:
+                        # Les fichiers de l'étudiant ne sont parcourus qu'une fois
+                        if matched_files is None:
+                            matched_files = self._match_student_files(student_name, matcher, current_assessment)
+                        file_path = matched_files.get(ex_id)
                         if file_path:
                             print(f"Fichier pour {ex_id} trouvé par recherche de mots-clés: {file_path}")
-                            
-                            # Exécuter le code avec les entrées de test
-                            test_results = self.code_executor.execute_code(file_path, test_inputs)
-                            
-                            # Ajouter les résultats à la liste
-                            for i, result in enumerate(test_results):
-                                input_val = test_inputs[i] if i < len(test_inputs) else ""
-                                
-                                # Récupérer la description du test si disponible
-                                input_description = ""
-                                if hasattr(config, 'get_test_inputs') and config.get_test_inputs() and i < len(config.get_test_inputs()):
-                                    test_config = config.get_test_inputs()[i]
-                                    if isinstance(test_config, dict):
-                                        input_description = test_config.get("description", "")
-                                
-                                # Créer un identifiant unique pour cette exécution
-                                execution_id = f"{ex_id}_{i}"
-                                
-                                all_results.append({
-                                    "student": student_name,
-                                    "exercise": config.name,
-                                    "exercise_id": ex_id,
-                                    "file_path": file_path,
-                                    "input": input_val,
-                                    "input_description": input_description,
-                                    "success": result["success"],
-                                    "compilation_error": result.get("compilation_error", False),
-                                    "stdout": result.get("stdout", ""),
-                                    "stderr": result.get("stderr", ""),
-                                    "execution_id": execution_id  # Identifiant unique pour cette exécution
-                                })
-                        else:
-                            print(f"Aucun fichier trouvé pour l'exercice {ex_id} et l'étudiant {student_name}")
-            
-            # Vérifier si nous avons des résultats à afficher
-            if not all_results:
+                    if file_path:
+                        execution_jobs.append({
+                            "student": student_name,
+                            "exercise_id": ex_id,
+                            "config": config,
+                            "file_path": file_path,
+                            "test_inputs": self._get_test_inputs_for_exercise(config, ex_id)
+                        })
+                    else:
+                        print(f"Aucun fichier trouvé pour l'exercice {ex_id} et l'étudiant {student_name}")
+        
+        except Exception as e:
+            import traceback
+            traceback_str = traceback.format_exc()
+            print(f"Exception lors de l'exécution: {str(e)}\n{traceback_str}")
+            QMessageBox.critical(self, "Erreur d'exécution", f"Une erreur est survenue lors de l'exécution: {str(e)}")
+            self._reset_execution_buttons()
+            return
+        
+        # Compiler et exécuter en arrière-plan ; les résultats arrivent au fil de l'eau
+        self._execution_results = []
+        self._executed_exercises = list(exercises_to_process.keys())
+        self.execution_results_table.setRowCount(0)
+        
+        self.execution_thread = ExecutionThread(
+            self.code_executor, execution_jobs, force_rerun=self.force_rerun_checkbox.isChecked()
+        )
+        self.execution_thread.result_ready.connect(self._on_execution_result)
+        self.execution_thread.progress_changed.connect(self._on_execution_progress)
+        self.execution_thread.error_occurred.connect(self._on_execution_error)
+        self.execution_thread.execution_finished.connect(self._on_execution_finished)
+        self.cancel_execution_button.setEnabled(True)
+        self.execution_thread.start()
+    
+    def cancel_execution(self):
+        """Annuler l'exécution en cours (les exécutions déjà démarrées se terminent)."""
+        if self.execution_thread and self.execution_thread.isRunning():
+            self.execution_thread.cancel()
+            self.cancel_execution_button.setEnabled(False)
+            self.execute_button.setText("Annulation en cours...")
+    
+    def _on_execution_result(self, job, test_results):
+        """Ajouter au tableau les résultats d'un fichier dès qu'ils sont disponibles."""
+        rows = self._build_execution_rows(
+            job["student"], job["exercise_id"], job["config"], job["file_path"], job["test_inputs"], test_results
+        )
+        self._execution_results.extend(rows)
+        self._append_execution_rows(rows)
+    
+    def _on_execution_progress(self, done, total):
+        """Afficher la progression de l'exécution."""
+        if self.cancel_execution_button.isEnabled():
+            self.execute_button.setText(f"Exécution en cours... ({done}/{total})")
+    
+    def _on_execution_error(self, message):
+        """Signaler une erreur survenue dans le thread d'exécution."""
+        QMessageBox.critical(self, "Erreur d'exécution", f"Une erreur est survenue lors de l'exécution: {message}")
+    
+    def _on_execution_finished(self, completed):
+        """Afficher les résultats définitifs (regroupés et triés) à la fin de l'exécution."""
+        self._update_compile_cache_label()
+        
+        # Vérifier si nous avons des résultats à afficher
+        if not self._execution_results:
+            if completed:
                 QMessageBox.warning(
                     self, 
                     "Aucun résultat d'exécution", 
                     f"Aucun fichier n'a pu être exécuté avec les tests spécifiés. Assurez-vous que:\n\n"
-                    f"1. Les fichiers correspondent aux exercices: {', '.join(exercises_to_process.keys())}\n"
+                    f"1. Les fichiers correspondent aux exercices: {', '.join(self._executed_exercises)}\n"
                     f"2. Les configurations d'exercices contiennent des données d'entrée de test valides.\n"
                     f"3. Les fichiers Java sont correctement nommés et placés dans les dossiers des étudiants."
                 )
-            else:
-                # Afficher les résultats
-                self._display_execution_results(all_results)
-        
-        except Exception as e:
-            import traceback
-            traceback_str = traceback.format_exc()
-            print(f"Exception lors de l'exécution: {str(e)}\n{traceback_str}")
-            QMessageBox.critical(self, "Erreur d'exécution", f"Une erreur est survenue lors de l'exécution: {str(e)}")
+        else:
+            # Afficher les résultats
+            self._display_execution_results(self._execution_results)
         
-        # Réactiver le bouton d'exécution
+        self._reset_execution_buttons()
+    
+    def _reset_execution_buttons(self):
+        """Réactiver le bouton d'exécution."""
         self.execute_button.setEnabled(True)
         self.execute_button.setText("Exécuter les codes")
+        self.cancel_execution_button.setEnabled(False)
+    
+    def _update_compile_cache_label(self):
+        """Afficher les compteurs du cache de compilation."""
+        stats = self.code_executor.get_cache_stats()
+        if stats is None:
+            self.compile_cache_label.setText("")
+            return
+        self.compile_cache_label.setText(
+            f"Cache de compilation : {stats['hits']} réutilisée(s), {stats['misses']} compilée(s)"
+        )
+    
+    def _locate_exercise_file(self, student_name, ex_id):
+        """Trouver le fichier d'un étudiant correspondant à un exercice d'après les noms usuels.
+        
+        Args:
+            student_name: Nom de l'étudiant
+            ex_id: Identifiant de l'exercice
+            
+        Returns:
+            str: Chemin du fichier trouvé ou None
+        """
+        # Recherche par nom de fichier
+        for file_name in self._generate_potential_file_names(ex_id):
+            file_path = self.code_executor.find_file_path(student_name, file_name)
+            if file_path:
+                print(f"Fichier pour {ex_id} trouvé: {file_path}")
+                return file_path
+        return None
+    
+    def _build_execution_rows(self, student_name, ex_id, config, file_path, test_inputs, test_results):
+        """Convertir les résultats d'exécution d'un fichier en lignes du tableau d'exécution.
+        
+        Args:
+            student_name: Nom de l'étudiant
+            ex_id: Identifiant de l'exercice
+            config: Configuration de l'exercice
+            file_path: Chemin du fichier exécuté
+            test_inputs: Entrées de test utilisées
+            test_results: Résultats retournés par l'exécuteur
+            
+        Returns:
+            list: Résultats formatés pour l'affichage
+        """
+        rows = []
+        for i, result in enumerate(test_results):
+            input_val = test_inputs[i] if i < len(test_inputs) else ""
+            
+            # Récupérer la description du test si disponible
+            input_description = ""
+            if hasattr(config, 'get_test_inputs') and config.get_test_inputs() and i < len(config.get_test_inputs()):
+                test_config = config.get_test_inputs()[i]
+                if isinstance(test_config, dict):
+                    input_description = test_config.get("description", "")
+            
+            # Créer un identifiant unique pour cette exécution
+            execution_id = f"{ex_id}_{i}"
+            
+            rows.append({
+                "student": student_name,
+                "exercise": config.name,
+                "exercise_id": ex_id,
+                "file_path": file_path,
+                "input": input_val,
+                "input_description": input_description,
+                "success": result["success"],
+                "compilation_error": result.get("compilation_error", False),
+                "stdout": result.get("stdout", ""),
+                "stderr": result.get("stderr", ""),
+                "output_truncated": result.get("output_truncated", False),
+                "cpu_time": result.get("cpu_time"),
+                "peak_rss_kb": result.get("peak_rss_kb"),
+                "execution_id": execution_id  # Identifiant unique pour cette exécution
+            })
+        return rows
     
     def _get_test_inputs_for_exercise(self, config, ex_id):
         """Récupère les entrées de test pour un exercice donné depuis la configuration."""
@@ -956,54 +1053,49 @@ class ResultsWidget(QWidget):
         
         return potential_files
     
-    def _find_file_by_keywords(self, student_name, ex_id, current_assessment=None):
-        """Recherche un fichier par mots-clés dans les dossiers de l'étudiant."""
-        # Déterminer les mots-clés à rechercher selon le type d'exercice
-        keywords = []
+    def _exercise_aliases(self, ex_id):
+        """Retourne les mots-clés qui désignent un exercice dans les noms de fichiers."""
         ex_name = ex_id.lower()
         
         if "racine" in ex_name or "carre" in ex_name:
-            keywords = ["racine", "carre", "fonction"]
+            return ["racine", "carre", "fonction"]
         elif "mot" in ex_name or "comptage" in ex_name:
-            keywords = ["mot", "comptage", "compteur", "mots"]
+            return ["mot", "comptage", "compteur", "mots"]
         elif "triangle" in ex_name:
-            keywords = ["triangle", "isocele"]
+            return ["triangle", "isocele"]
         elif "sequence" in ex_name:
-            keywords = ["sequence", "numerique"]
+            return ["sequence", "numerique"]
         elif "palindrome" in ex_name:
-            keywords = ["palindrome"]
-        else:
-            # Si aucun mot-clé spécifique, utiliser des parties de l'ID
-            parts = ex_id.split('-')
-            keywords = [p for p in parts if len(p) > 2]  # Ignorer les parties trop courtes
-        
-        # Ajouter l'extension Java comme mot-clé
-        keywords.append("java")
-        
-        print(f"Recherche par mots-clés pour {ex_id}: {keywords}")
+            return ["palindrome"]
         
-        # Rechercher dans les dossiers des évaluations
-        for td_dir in glob.glob(os.path.join(os.getcwd(), "tests", "java_samples", current_assessment or "TD*")):
-            student_dir = os.path.join(td_dir, student_name)
-            if os.path.exists(student_dir):
-                # Chercher tous les fichiers Java
-                java_files = glob.glob(os.path.join(student_dir, "*.java"))
-                for file_path in java_files:
-                    file_name = os.path.basename(file_path).lower()
-                    # Vérifier si un des mots-clés est présent dans le nom du fichier
-                    if any(keyword.lower() in file_name for keyword in keywords):
-                        return file_path
-        
-        # Chercher directement dans le dossier de l'étudiant
-        student_dir = os.path.join(os.getcwd(), "tests", "java_samples", student_name)
-        if os.path.exists(student_dir):
-            java_files = glob.glob(os.path.join(student_dir, "*.java"))
-            for file_path in java_files:
-                file_name = os.path.basename(file_path).lower()
-                if any(keyword.lower() in file_name for keyword in keywords):
-                    return file_path
+        # Si aucun mot-clé spécifique, utiliser des parties de l'ID
+        return [p for p in ex_id.split('-') if len(p) > 2]  # Ignorer les parties trop courtes
+    
+    def _match_student_files(self, student_name, matcher, current_assessment=None):
+        """Associer en un seul parcours les fichiers Java d'un étudiant aux exercices.
         
-        return None
+        Args:
+            student_name: Nom de l'étudiant
+            matcher: ExerciseMatcher des exercices à traiter
+            current_assessment: Nom de l'évaluation courante
+            
+        Returns:
+            dict: {identifiant d'exercice: chemin du premier fichier correspondant}
+        """
+        # Dossiers des évaluations, puis dossier de l'étudiant directement
+        student_dirs = [
+            os.path.join(td_dir, student_name)
+            for td_dir in glob.glob(os.path.join(os.getcwd(), "tests", "java_samples", current_assessment or "TD*"))
+        ]
+        student_dirs.append(os.path.join(os.getcwd(), "tests", "java_samples", student_name))
+        
+        matched_files = {}
+        for student_dir in student_dirs:
+            for file_path in sorted(glob.glob(os.path.join(student_dir, "*.java"))):
+                ex_id = matcher.match(os.path.basename(file_path))
+                if ex_id and ex_id not in matched_files:
+                    matched_files[ex_id] = file_path
+        return matched_files
     
     def _display_execution_results(self, results):
         """Afficher les résultats d'exécution dans le tableau."""
@@ -1065,105 +1157,7 @@ class ResultsWidget(QWidget):
             self.execution_results_table.setRowCount(len(filtered_results))
             
             for i, result in enumerate(filtered_results):
-                # Étudiant
-                student_item = QTableWidgetItem(result["student"])
-                student_item.setTextAlignment(Qt.AlignCenter)
-                student_item.setFont(QFont("Arial", 10, QFont.Bold))
-                self.execution_results_table.setItem(i, 0, student_item)
-                
-                # Exercice - afficher le nom complet avec l'ID si disponible
-                exercise_name = result["exercise"]
-                exercise_id = result.get("exercise_id", "")
-                exercise_type = result.get("exercise_type", "")
-                
-                if exercise_type:
-                    display_name = f"{exercise_name} ({exercise_type})"
-                elif exercise_id:
-                    display_name = f"{exercise_name} ({exercise_id})"
-                else:
-                    display_name = exercise_name
-                
-                exercise_item = QTableWidgetItem(display_name)
-                exercise_item.setTextAlignment(Qt.AlignCenter)
-                self.execution_results_table.setItem(i, 1, exercise_item)
-                
-                # Test
-                input_value = result["input"]
-                input_description = result.get("input_description", "")
-                
-                if input_description:
-                    test_text = f"{input_description} (n = {input_value})"
-                elif input_value:
-                    test_text = f"n = {input_value}"
-                else:
-                    test_text = "Exécution sans entrée"
-                    
-                test_item = QTableWidgetItem(test_text)
-                test_item.setTextAlignment(Qt.AlignCenter)
-                self.execution_results_table.setItem(i, 2, test_item)
-                
-                # Résultat
-                result_widget = ExecutionResultWidget(
-                    success=result["success"],
-                    compilation_error=result.get("compilation_error", False),
-                    output_text=result.get("stdout", "")
-                )
-                
-                self.execution_results_table.setCellWidget(i, 3, result_widget)
-                
-                # Actions
-                actions_widget = QWidget()
-                actions_layout = QHBoxLayout(actions_widget)
-                actions_layout.setContentsMargins(5, 5, 5, 5)
-                actions_layout.setAlignment(Qt.AlignCenter)
-                
-                # Bouton pour voir la sortie complète
-                view_output_button = QPushButton("Voir la sortie")
-                view_output_button.setIcon(QIcon("icons/info.svg"))
-                view_output_button.setStyleSheet("""
-                    QPushButton {
-                        background-color: #f8f9fa;
-                        border: 1px solid #dfe4ea;
-                        border-radius: 4px;
-                        padding: 5px 10px;
-                        color: #3498db;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #e9ecef;
-                    }
-                """)
-                
-                # Construire un titre et un contenu détaillés qui identifient clairement l'exercice
-                display_title = f"{result['student']} - {exercise_name}"
-                if exercise_type:
-                    display_title += f" ({exercise_type})"
-                elif exercise_id:
-                    display_title += f" ({exercise_id})"
-                display_title += f" - Entrée: {input_value}"
-                
-                # Préparer le texte complet pour l'affichage avec des informations d'identification claires
-                full_output = f"=== EXERCICE: {exercise_name}"
-                if exercise_type:
-                    full_output += f" [{exercise_type}]"
-                elif exercise_id:
-                    full_output += f" ({exercise_id})"
-                full_output += " ===\n"
-                
-                full_output += f"=== ENTRÉE: {input_value} ===\n\n"
-                full_output += f"=== SORTIE STANDARD ===\n{result.get('stdout', '')}\n\n"
-                if result.get("stderr", ""):
-                    full_output += f"=== ERREURS ===\n{result.get('stderr', '')}"
-                
-                # Stocker la sortie complète et configurer le bouton
-                view_output_button.clicked.connect(
-                    lambda checked, output=full_output, title=display_title: 
-                    self.show_output_dialog(title, output)
-                )
-                
-                actions_layout.addWidget(view_output_button)
-                
-                self.execution_results_table.setCellWidget(i, 4, actions_widget)
+                self._fill_execution_row(i, result)
             
             # Ajuster les hauteurs de ligne
             for i in range(self.execution_results_table.rowCount()):
@@ -1172,6 +1166,121 @@ class ResultsWidget(QWidget):
             # Aucun résultat à afficher
             QMessageBox.information(self, "Aucun résultat", "Aucun fichier n'a pu être exécuté avec les tests spécifiés.")
     
+    def _append_execution_rows(self, rows):
+        """Ajouter des résultats à la fin du tableau d'exécution, sans le reconstruire."""
+        for result in rows:
+            row = self.execution_results_table.rowCount()
+            self.execution_results_table.insertRow(row)
+            self._fill_execution_row(row, result)
+            self.execution_results_table.setRowHeight(row, 80)
+    
+    def _fill_execution_row(self, i, result):
+        """Remplir une ligne du tableau d'exécution avec un résultat."""
+        # Étudiant
+        student_item = QTableWidgetItem(result["student"])
+        student_item.setTextAlignment(Qt.AlignCenter)
+        student_item.setFont(QFont("Arial", 10, QFont.Bold))
+        self.execution_results_table.setItem(i, 0, student_item)
+        
+        # Exercice - afficher le nom complet avec l'ID si disponible
+        exercise_name = result["exercise"]
+        exercise_id = result.get("exercise_id", "")
+        exercise_type = result.get("exercise_type", "")
+        
+        if exercise_type:
+            display_name = f"{exercise_name} ({exercise_type})"
+        elif exercise_id:
+            display_name = f"{exercise_name} ({exercise_id})"
+        else:
+            display_name = exercise_name
+        
+        exercise_item = QTableWidgetItem(display_name)
+        exercise_item.setTextAlignment(Qt.AlignCenter)
+        self.execution_results_table.setItem(i, 1, exercise_item)
+        
+        # Test
+        input_value = result["input"]
+        input_description = result.get("input_description", "")
+        
+        if input_description:
+            test_text = f"{input_description} (n = {input_value})"
+        elif input_value:
+            test_text = f"n = {input_value}"
+        else:
+            test_text = "Exécution sans entrée"
+            
+        test_item = QTableWidgetItem(test_text)
+        test_item.setTextAlignment(Qt.AlignCenter)
+        self.execution_results_table.setItem(i, 2, test_item)
+        
+        # Résultat
+        result_widget = ExecutionResultWidget(
+            success=result["success"],
+            compilation_error=result.get("compilation_error", False),
+            output_text=result.get("stdout", "")
+        )
+        
+        self.execution_results_table.setCellWidget(i, 3, result_widget)
+        
+        # Actions
+        actions_widget = QWidget()
+        actions_layout = QHBoxLayout(actions_widget)
+        actions_layout.setContentsMargins(5, 5, 5, 5)
+        actions_layout.setAlignment(Qt.AlignCenter)
+        
+        # Bouton pour voir la sortie complète
+        view_output_button = QPushButton("Voir la sortie")
+        view_output_button.setIcon(QIcon("icons/info.svg"))
+        view_output_button.setStyleSheet("""
+            QPushButton {
+                background-color: #f8f9fa;
+                border: 1px solid #dfe4ea;
+                border-radius: 4px;
+                padding: 5px 10px;
+                color: #3498db;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #e9ecef;
+            }
+        """)
+        
+        # Construire un titre et un contenu détaillés qui identifient clairement l'exercice
+        display_title = f"{result['student']} - {exercise_name}"
+        if exercise_type:
+            display_title += f" ({exercise_type})"
+        elif exercise_id:
+            display_title += f" ({exercise_id})"
+        display_title += f" - Entrée: {input_value}"
+        
+        # Préparer le texte complet pour l'affichage avec des informations d'identification claires
+        full_output = f"=== EXERCICE: {exercise_name}"
+        if exercise_type:
+            full_output += f" [{exercise_type}]"
+        elif exercise_id:
+            full_output += f" ({exercise_id})"
+        full_output += " ===\n"
+        
+        full_output += f"=== ENTRÉE: {input_value} ===\n\n"
+        full_output += f"=== SORTIE STANDARD ===\n{result.get('stdout', '')}\n\n"
+        if result.get("stderr", ""):
+            full_output += f"=== ERREURS ===\n{result.get('stderr', '')}\n\n"
+        if result.get("cpu_time") is not None:
+            full_output += f"=== RESSOURCES ===\nTemps CPU: {result['cpu_time']:.2f}s"
+            if result.get("peak_rss_kb") is not None:
+                full_output += f" - Mémoire max: {result['peak_rss_kb'] // 1024} Mo"
+            full_output += "\n"
+        
+        # Stocker la sortie complète et configurer le bouton
+        view_output_button.clicked.connect(
+            lambda checked, output=full_output, title=display_title: 
+            self.show_output_dialog(title, output)
+        )
+        
+        actions_layout.addWidget(view_output_button)
+        
+        self.execution_results_table.setCellWidget(i, 4, actions_widget)
+    
     def get_student_list(self):
         """Récupère la liste des étudiants affichés dans le tableau de résultats"""
         students = set()
@@ -1427,10 +1536,9 @@ class ResultsWidget(QWidget):
                 break
                 
         # Lire le contenu du fichier trouvé
-        if file_path and os.path.exists(file_path):
+        if file_path and get_submission_fs().exists(file_path):
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    code = f.read()
+                code = read_source(file_path)
                 print(f"Code source lu avec succès: {len(code)} caractères")
             except Exception as e:
                 print(f"Erreur lors de la lecture du fichier {file_path}: {e}")
@@ -29,6 +29,18 @@ def format_detailed_report(result, exercise_config):
             error_msg = fix_encoding(error.get('message', 'Erreur inconnue'))
             details += f"  {SYMBOL_FAIL} Ligne {error.get('line', 'inconnue')}: {error_msg}\n"
     
+    # Diagnostics du compilateur Java
+    if 'compile_diagnostics' in result:
+        compile_errors = [d for d in result['compile_diagnostics'] if d.get('kind') == 'ERROR']
+        compile_symbol = SYMBOL_OK if not compile_errors else SYMBOL_FAIL
+        details += f"\n{compile_symbol} COMPILATION: " + ("Aucune erreur" if not compile_errors else f"{len(compile_errors)} erreur(s)") + "\n"
+        for diagnostic in result['compile_diagnostics']:
+            symbol = SYMBOL_FAIL if diagnostic.get('kind') == 'ERROR' else SYMBOL_WARNING
+            position = f"Ligne {diagnostic.get('line')}" if diagnostic.get('line', -1) > 0 else "Fichier"
+            if diagnostic.get('column', -1) > 0:
+                position += f", colonne {diagnostic['column']}"
+            details += f"  {symbol} {position}: {fix_encoding(diagnostic.get('message', ''))}\n"
+    
     # Vérification des méthodes
     methods_ok = not result.get('missing_methods', [])
     methods_symbol = SYMBOL_OK if methods_ok else SYMBOL_WARNING
@@ -105,6 +117,8 @@ def format_detailed_report(result, exercise_config):
             details += f"\n{operators_symbol} OPÉRATEURS NON AUTORISÉS:\n"
             for op_info in disallowed_operators:
                 message = fix_encoding(op_info.get('message', ''))
+                if op_info.get('line'):
+                    message = f"Ligne {op_info['line']}, colonne {op_info['column']}: {message}"
                 details += f"  {SYMBOL_FAIL} {message}\n"
         else:
             details += f"\n{operators_symbol} OPÉRATEURS: Tous les opérateurs utilisés sont autorisés.\n"
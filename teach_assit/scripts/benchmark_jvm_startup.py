@@ -0,0 +1,44 @@
+"""
+Script pour construire l'archive CDS du JDK installé et mesurer le gain
+de temps de démarrage des programmes étudiants.
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# Ajouter le répertoire racine au PYTHONPATH pour les imports
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from teach_assit.core.execution.cds import CdsArchiveManager
+
+def main():
+    """
+    Construit (si nécessaire) l'archive CDS puis compare les temps de lancement.
+    """
+    parser = argparse.ArgumentParser(description="Mesure du temps de démarrage de la JVM")
+    parser.add_argument("--runs", type=int, default=10, help="Nombre de lancements par configuration")
+    args = parser.parse_args()
+    
+    manager = CdsArchiveManager()
+    version = manager.get_java_version()
+    if version is None:
+        print("Java n'est pas disponible.")
+        return 1
+    
+    print(f"JVM: {version.splitlines()[0]}")
+    print(f"Options retenues: {' '.join(manager.get_jvm_options()) or '(aucune)'}")
+    
+    timings = manager.benchmark(runs=args.runs)
+    if timings is None:
+        print("Impossible de compiler le programme de mesure (javac est-il installé ?).")
+        return 1
+    
+    print(f"Sans options : {timings['baseline'] * 1000:.1f} ms par lancement")
+    print(f"Avec options : {timings['tuned'] * 1000:.1f} ms par lancement")
+    print(f"Gain         : {timings['delta'] * 1000:.1f} ms ({timings['delta'] / timings['baseline'] * 100:.1f} %)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,24 +2,49 @@ import os
 import zipfile
 import shutil
 import hashlib
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from teach_assit.core.database.db_manager import DatabaseManager
-from teach_assit.core.database.zip_manager import ZipManager
+from teach_assit.core.database.zip_manager import HASH_CHUNK_SIZE, ZipManager
+from teach_assit.core.submission_fs import archive_root, is_archive_path, read_source, split_archive_path
+from teach_assit.utils.submission_index import get_submission_index
+
+
+# Nombre d'archives enregistrées par transaction par le thread d'écriture
+WRITE_BATCH_SIZE = 50
+
+# Paramètre de l'application activant la lecture des soumissions directement dans les ZIP
+ZERO_EXTRACTION_SETTING = "zero_extraction"
 
 
 class SubmissionManager:
     """Gestionnaire des soumissions d'étudiants (fichiers ZIP)."""
     
-    def __init__(self):
-        """Initialise le gestionnaire de soumissions."""
+    def __init__(self, zero_extraction=None, db_manager=None):
+        """
+        Initialise le gestionnaire de soumissions.
+        
+        Args:
+            zero_extraction (bool, optional): Lire les sources directement dans les archives
+                au lieu de les extraire (par défaut, le paramètre 'zero_extraction' de la base)
+            db_manager (DatabaseManager, optional): Gestionnaire de base de données.
+                Si None, utilise la base de l'application.
+        """
         self.base_dir = ""
         self.extraction_dir = ""
         self.student_folders = {}  # {nom_etudiant: {path: chemin, java_files: [liste_fichiers]}}
         
         # Initialisation de la base de données SQLite
-        self.db_manager = DatabaseManager()
+        self.db_manager = db_manager or DatabaseManager()
         self.zip_manager = ZipManager(self.db_manager)
+        
+        if zero_extraction is None:
+            zero_extraction = self.db_manager.get_setting(ZERO_EXTRACTION_SETTING, "0") in ("1", "true", "True")
+        self.zero_extraction = zero_extraction
+        
+        # Thread unique d'écriture dans la base de données (créé au besoin)
+        self._db_writer = None
     
     def set_base_directory(self, directory):
         """Définit le répertoire de base contenant les fichiers ZIP."""
@@ -27,6 +52,8 @@ class SubmissionManager:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.extraction_dir = os.path.join(directory, f"extracted_{timestamp}")
         self.student_folders = {}
+        # Les dossiers d'étudiants extraits seront retrouvés par l'index des soumissions
+        get_submission_index().add_root(self.extraction_dir)
         return self.extraction_dir
     
     def list_zip_files(self):
@@ -40,57 +67,212 @@ class SubmissionManager:
         """
         Extrait un fichier ZIP dans un dossier dédié à l'étudiant et stocke dans la base de données.
         """
+        return self.extract_zip_files([zip_filename])[zip_filename]
+    
+    def extract_zip_files(self, zip_filenames, progress_callback=None, max_workers=None):
+        """
+        Extrait des fichiers ZIP dans les dossiers des étudiants.
+        
+        Les archives sont traitées en parallèle (empreinte MD5, lecture du répertoire
+        central et extraction) ; les archives prêtes sont enregistrées par lots,
+        une transaction par lot, par un thread d'écriture unique. Seules les
+        archives nouvelles ou modifiées sont extraites : les autres, reconnues à
+        leur taille et leur date de modification puis à leur empreinte, gardent
+        leur dossier d'extraction et leurs fichiers enregistrés. En mode sans
+        extraction, rien n'est écrit sur disque : le dossier de l'étudiant est la
+        racine virtuelle de l'archive ('A.zip!'), lue par le système de fichiers
+        des soumissions.
+        
+        Args:
+            zip_filenames (list): Noms des fichiers ZIP du répertoire de base
+            progress_callback (callable, optional): Appelée dans le thread appelant après
+                chaque archive avec (archives traitées, total, nom du ZIP) ; si elle
+                retourne False, les archives pas encore commencées sont annulées
+            max_workers (int, optional): Nombre de threads d'extraction
+            
+        Returns:
+            dict: {nom du ZIP: (succès, message)}
+        """
         if not self.extraction_dir:
             raise ValueError("Le répertoire d'extraction n'a pas été défini")
             
         # Création du répertoire d'extraction s'il n'existe pas
-        os.makedirs(self.extraction_dir, exist_ok=True)
+        if not self.zero_extraction:
+            os.makedirs(self.extraction_dir, exist_ok=True)
         
-        zip_path = os.path.join(self.base_dir, zip_filename)
+        if self._db_writer is None:
+            self._db_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="submission-db-writer")
         
-        # Extraction du nom de l'étudiant depuis le nom du fichier ZIP
-        student_name = os.path.splitext(zip_filename)[0]
-        student_dir = os.path.join(self.extraction_dir, student_name)
-        
-        # Création du répertoire de l'étudiant
-        os.makedirs(student_dir, exist_ok=True)
-        
-        # Extraction du contenu du ZIP
-        try:
-            # Stockage dans la base de données SQLite
-            description = f"Soumission de {student_name}"
-            zip_id, _ = self.zip_manager.import_zip_file(
-                filepath=zip_path,
-                description=description,
-                auto_extract=False
-            )
-            
-            # Extraction traditionnelle du ZIP pour maintenir la compatibilité
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(student_dir)
-            
-            # Liste des fichiers Java extraits
-            java_files = self._find_java_files(student_dir)
+        # Archives déjà importées, chargées en une requête et partagées par les threads
+        catalog = self.zip_manager.get_archive_catalog()
+        
+        results = {zip_filename: None for zip_filename in zip_filenames}
+        prepared = {}
+        writes = []
+        batch = []
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(self._prepare_submission, zip_filename, catalog): zip_filename
+                       for zip_filename in zip_filenames}
+            cancelled = False
+            for done, future in enumerate(as_completed(futures), 1):
+                zip_filename = futures[future]
+                try:
+                    prepared[zip_filename] = future.result()
+                    batch.append(zip_filename)
+                except CancelledError:
+                    results[zip_filename] = (False, "Extraction annulée")
+                except zipfile.BadZipFile:
+                    results[zip_filename] = (False, "Fichier ZIP corrompu ou invalide")
+                except Exception as e:
+                    results[zip_filename] = (False, f"Erreur lors de l'extraction : {str(e)}")
+                
+                # Stockage dans la base de données SQLite, pendant l'extraction des suivantes
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    writes.append(self._submit_write(batch, prepared))
+                    batch = []
+                
+                if progress_callback and not cancelled and progress_callback(done, len(futures), zip_filename) is False:
+                    cancelled = True
+                    for pending in futures:
+                        pending.cancel()
+        if batch:
+            writes.append(self._submit_write(batch, prepared))
+        
+        for names, write in writes:
+            try:
+                ids = write.result()
+            except Exception as e:
+                for zip_filename in names:
+                    results[zip_filename] = (False, f"Erreur lors de l'extraction : {str(e)}")
+                    del prepared[zip_filename]
+                continue
+            for zip_filename, (zip_id, folder_id) in zip(names, ids):
+                prepared[zip_filename]['zip_id'] = zip_id
+                prepared[zip_filename]['folder_id'] = folder_id
+        
+        # Dossiers des étudiants dans l'ordre des archives demandées
+        for zip_filename in zip_filenames:
+            entry = prepared.get(zip_filename)
+            if entry is None:
+                continue
+            java_files = entry['java_files']
             
             # Stockage des informations (pour la compatibilité avec l'existant)
-            self.student_folders[student_name] = {
-                'path': student_dir,
+            self.student_folders[entry['student_name']] = {
+                'path': entry['student_dir'],
                 'java_files': java_files,
-                'zip_id': zip_id  # Stocke l'ID de la BD pour référence future
+                'zip_id': entry['zip_id']  # Stocke l'ID de la BD pour référence future
             }
             
-            # Extraction dans la base de données et stockage des informations
-            folder_id = self.zip_manager.extract_zip(zip_id, zip_path)
-            
             # Mise à jour des métadonnées dans la base de données
-            self._store_java_files_info(folder_id, java_files, student_dir)
+            self._store_java_files_info(entry['folder_id'], java_files, entry['student_dir'])
             
-            return True, f"Extraction réussie : {len(java_files)} fichier(s) Java trouvé(s)"
+            if entry['reused'] or self.zero_extraction:
+                # Le dossier réutilisé ou virtuel se trouve hors du répertoire d'extraction courant
+                get_submission_index().add_student_dir(entry['student_name'], entry['student_dir'])
+            if self.zero_extraction:
+                results[zip_filename] = (True, f"Archive indexée sans extraction : {len(java_files)} fichier(s) Java trouvé(s)")
+            elif entry['reused']:
+                results[zip_filename] = (True, f"Archive déjà importée : {len(java_files)} fichier(s) Java trouvé(s)")
+            else:
+                results[zip_filename] = (True, f"Extraction réussie : {len(java_files)} fichier(s) Java trouvé(s)")
+        
+        return results
+    
+    def _prepare_submission(self, zip_filename, catalog):
+        """
+        Extrait une archive dans le dossier de l'étudiant (exécuté par un thread d'extraction).
+        
+        Les fichiers sont listés depuis le répertoire central du ZIP, sans parcourir
+        le dossier extrait. Une archive déjà importée et inchangée n'est pas extraite
+        de nouveau : son dossier d'extraction est réutilisé. En mode sans extraction,
+        seuls les fichiers Java sont enregistrés, avec leur chemin virtuel dans l'archive.
+        
+        Args:
+            zip_filename (str): Nom du fichier ZIP du répertoire de base
+            catalog (ArchiveCatalog): Archives déjà importées
+        
+        Returns:
+            dict: {'student_name', 'student_dir', 'java_files', 'reused', 'archive'}, où
+                'archive' est l'archive à enregistrer avec import_prepared_zip_files
+        """
+        zip_path = os.path.join(self.base_dir, zip_filename)
+        
+        # Extraction du nom de l'étudiant depuis le nom du fichier ZIP
+        student_name = os.path.splitext(zip_filename)[0]
+        
+        entry, md5_hash, file_size, file_mtime = self.zip_manager.find_imported_archive(zip_path, catalog)
+        # Une archive importée dans l'autre mode (extraite ou virtuelle) est réenregistrée
+        if entry is not None and is_archive_path(entry['folder_path']) != self.zero_extraction:
+            entry = None
+        if self.zero_extraction:
+            student_dir = archive_root(zip_path)
+        elif entry is not None:
+            student_dir = entry['folder_path']
+        else:
+            student_dir = os.path.join(self.extraction_dir, student_name)
+            # Création du répertoire de l'étudiant
+            os.makedirs(student_dir, exist_ok=True)
+        
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            entries = [info for info in zip_ref.infolist() if not info.is_dir()]
+            if entry is None and not self.zero_extraction:
+                zip_ref.extractall(student_dir)
+        
+        files = []
+        java_files = []
+        for info in entries:
+            # Chemin relatif par rapport au répertoire de l'étudiant
+            rel_path = os.path.normpath(info.filename)
+            if self.zero_extraction and not rel_path.lower().endswith('.java'):
+                continue
+            files.append((os.path.join(student_dir, rel_path), info.file_size,
+                          os.path.splitext(rel_path)[1].lstrip('.')))
+            if rel_path.lower().endswith('.java'):
+                java_files.append(rel_path)
+        
+        return {
+            'student_name': student_name,
+            'student_dir': student_dir,
+            'java_files': java_files,
+            'reused': entry is not None,
+            'archive': {
+                'filename': zip_filename,
+                'filepath': zip_path,
+                'file_size': file_size,
+                'file_mtime': file_mtime,
+                'md5_hash': md5_hash,
+                'description': f"Soumission de {student_name}",
+                'folder_path': student_dir,
+                # Enregistrés seulement si le dossier est nouveau pour cette archive
+                # (par exemple une archive identique rendue par un autre étudiant)
+                'files': files
+            }
+        }
+    
+    def read_source(self, student_name, java_file):
+        """
+        Lit un fichier Java d'un étudiant, extrait ou encore dans son archive.
+        
+        Args:
+            student_name (str): Nom de l'étudiant
+            java_file (str): Chemin du fichier relatif au dossier de l'étudiant
             
-        except zipfile.BadZipFile:
-            return False, "Fichier ZIP corrompu ou invalide"
-        except Exception as e:
-            return False, f"Erreur lors de l'extraction : {str(e)}"
+        Returns:
+            str: Contenu du fichier
+        """
+        folder = self.get_student_folders()[student_name]
+        return read_source(os.path.join(folder['path'], java_file))
+    
+    def _submit_write(self, zip_filenames, prepared):
+        """
+        Confie un lot d'archives préparées au thread d'écriture.
+        
+        Returns:
+            tuple: (noms des ZIP du lot, future des tuples (zip_id, folder_id))
+        """
+        archives = [prepared[zip_filename]['archive'] for zip_filename in zip_filenames]
+        return list(zip_filenames), self._db_writer.submit(self.zip_manager.import_prepared_zip_files, archives)
     
     def _store_java_files_info(self, folder_id, java_files, student_dir):
         """
@@ -100,28 +282,14 @@ class SubmissionManager:
         # spécifiques sur les fichiers Java dans la base de données
         pass
     
-    def extract_all_zip_files(self):
-        """Extrait tous les fichiers ZIP du répertoire de base."""
-        results = {}
-        zip_files = self.list_zip_files()
-        
-        for zip_file in zip_files:
-            results[zip_file] = self.extract_zip_file(zip_file)
-            
-        return results
-    
-    def _find_java_files(self, directory):
-        """Trouve récursivement tous les fichiers Java dans un répertoire."""
-        java_files = []
-        
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.lower().endswith('.java'):
-                    # Chemin relatif par rapport au répertoire de l'étudiant
-                    rel_path = os.path.relpath(os.path.join(root, file), directory)
-                    java_files.append(rel_path)
+    def extract_all_zip_files(self, progress_callback=None):
+        """
+        Extrait tous les fichiers ZIP du répertoire de base.
         
-        return java_files
+        Args:
+            progress_callback (callable, optional): Voir extract_zip_files
+        """
+        return self.extract_zip_files(self.list_zip_files(), progress_callback)
     
     def get_student_folders(self):
         """
@@ -149,6 +317,10 @@ class SubmissionManager:
                         folder_id = folder[0]
                         folder_path = folder[1]
                         
+                        # Dossier supprimé du disque (ou archive déplacée) depuis l'import
+                        if not self._folder_exists(folder_path):
+                            continue
+                        
                         # Récupérer les fichiers java dans ce dossier
                         extracted_files = self.get_extracted_files_from_db(folder_id)
                         java_files = []
@@ -167,6 +339,7 @@ class SubmissionManager:
                         
                         # Ajouter à la liste des dossiers d'étudiants
                         if student_name not in self.student_folders:
+                            get_submission_index().add_student_dir(student_name, folder_path)
                             self.student_folders[student_name] = {
                                 'path': folder_path,
                                 'java_files': java_files,
@@ -176,6 +349,14 @@ class SubmissionManager:
         
         return self.student_folders
     
+    @staticmethod
+    def _folder_exists(folder_path):
+        """Indique si un dossier d'étudiant existe encore (dossier extrait, ou archive en mode sans extraction)."""
+        parts = split_archive_path(folder_path)
+        if parts is not None:
+            return os.path.isfile(parts[0])
+        return os.path.isdir(folder_path)
+    
     def get_all_zip_files_from_db(self):
         """
         Récupère tous les fichiers ZIP stockés dans la base de données.
@@ -210,10 +391,20 @@ class SubmissionManager:
         return self.zip_manager.get_extracted_files(folder_id)
     
     def clean_extraction_directory(self):
-        """Supprime le répertoire d'extraction."""
+        """
+        Supprime le répertoire d'extraction.
+        
+        Les dossiers d'étudiants qu'il contenait sont aussi retirés de la base de
+        données : leurs archives seront extraites de nouveau au prochain import.
+        """
         if self.extraction_dir and os.path.exists(self.extraction_dir):
             try:
                 shutil.rmtree(self.extraction_dir)
+                self.db_manager.delete_extracted_folders_under(self.extraction_dir)
+                self.student_folders = {
+                    name: folder for name, folder in self.student_folders.items()
+                    if self._folder_exists(folder['path'])
+                }
                 return True, "Répertoire d'extraction supprimé avec succès"
             except Exception as e:
                 return False, f"Erreur lors de la suppression du répertoire : {str(e)}"
@@ -231,6 +422,6 @@ class SubmissionManager:
         """
         hash_md5 = hashlib.md5()
         with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
                 hash_md5.update(chunk)
         return hash_md5.hexdigest()
\ No newline at end of file
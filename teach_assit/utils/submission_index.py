@@ -0,0 +1,369 @@
+import os
+import re
+import glob
+import time
+import threading
+import zipfile
+
+from teach_assit.core.submission_fs import get_submission_fs, split_archive_path
+
+
+# Délai minimal entre deux vérifications des dates de modification des dossiers
+REFRESH_INTERVAL = 1.0
+
+_TOKEN_PATTERN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+
+
+def normalize_name(name):
+    """
+    Normalise un nom de fichier ou un identifiant d'exercice pour les comparaisons.
+
+    '09-fonction-racine-carree.java' donne '09fonctionracinecarree'.
+
+    Args:
+        name (str): Nom de fichier (avec ou sans extension) ou identifiant d'exercice.
+
+    Returns:
+        str: Nom en minuscules, sans extension '.java' ni séparateurs.
+    """
+    base = os.path.basename(name)
+    if base.lower().endswith('.java'):
+        base = base[:-5]
+    return re.sub(r'[^0-9a-z]', '', base.lower())
+
+
+def name_tokens(name):
+    """
+    Découpe un nom en mots-clés ('RacineCarree.java' donne {'racine', 'carree'}).
+
+    Args:
+        name (str): Nom de fichier ou identifiant d'exercice.
+
+    Returns:
+        set: Mots-clés en minuscules d'au moins 4 lettres.
+    """
+    base = os.path.basename(name)
+    if base.lower().endswith('.java'):
+        base = base[:-5]
+    return {token.lower() for token in _TOKEN_PATTERN.findall(base) if len(token) > 3 and not token.isdigit()}
+
+
+def _name_keys(name):
+    """Clés d'un nom normalisé : avec et sans numéro d'exercice en tête."""
+    normalized = normalize_name(name)
+    keys = [normalized]
+    without_number = normalized.lstrip('0123456789')
+    if without_number and without_number != normalized:
+        keys.append(without_number)
+    return keys
+
+
+class SubmissionIndex:
+    """
+    Index en mémoire des fichiers Java soumis par les étudiants.
+
+    Les fichiers sont recensés une fois depuis des racines (dont chaque
+    sous-dossier est le dossier d'un étudiant) et des dossiers d'étudiants
+    déclarés, par exemple ceux enregistrés dans la base de données. Les
+    recherches sont ensuite des accès à des dictionnaires : (étudiant, nom de
+    fichier), (étudiant, identifiant d'exercice normalisé) et un index inversé
+    des mots-clés pour les correspondances approchées. Seuls les dossiers dont
+    la date de modification a changé sont parcourus à nouveau.
+
+    Un dossier d'étudiant peut aussi être la racine virtuelle d'une archive
+    ('A.zip!') : ses fichiers sont alors lus dans le répertoire central du ZIP.
+    """
+
+    def __init__(self, roots=None, refresh_interval=REFRESH_INTERVAL):
+        """
+        Initialise l'index.
+
+        Args:
+            roots (list, optional): Racines ou motifs glob de racines ('tests/java_samples/TD*').
+            refresh_interval (float): Délai minimal entre deux vérifications des dossiers.
+        """
+        self.refresh_interval = refresh_interval
+        self._root_patterns = []
+        self._student_dirs = []  # [(étudiant en minuscules, dossier)], dans l'ordre de priorité
+        self._dirs = {}  # {dossier: (date de modification, fichiers .java, sous-dossiers)}
+        self._lock = threading.RLock()
+        self._last_refresh = 0.0
+        self._stale = True
+        self._indexed_dirs = None
+        self._by_name = {}
+        self._by_exercise = {}
+        self._by_token = {}
+        self._files = {}
+        for root in roots or []:
+            self.add_root(root)
+
+    def add_root(self, root):
+        """
+        Ajoute une racine dont chaque sous-dossier est le dossier d'un étudiant.
+
+        Args:
+            root (str): Chemin ou motif glob ; les racines créées plus tard sont prises en compte.
+        """
+        with self._lock:
+            if root and root not in self._root_patterns:
+                self._root_patterns.append(root)
+                self._stale = True
+
+    def add_student_dir(self, student, directory):
+        """
+        Déclare le dossier d'un étudiant (par exemple un dossier extrait enregistré en base).
+
+        Args:
+            student (str): Nom de l'étudiant.
+            directory (str): Dossier contenant ses fichiers.
+        """
+        entry = (student.lower(), os.path.normpath(directory))
+        with self._lock:
+            if entry not in self._student_dirs:
+                self._student_dirs.append(entry)
+                self._stale = True
+
+    def refresh(self, force=False):
+        """
+        Met à jour l'index pour les dossiers modifiés depuis le dernier parcours.
+
+        Args:
+            force (bool): Vérifier les dossiers même si la dernière vérification est récente.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not force and not self._stale and now - self._last_refresh < self.refresh_interval:
+                return
+            self._last_refresh = now
+            self._stale = False
+
+            changed = False
+            student_dirs = list(self._student_dirs)
+            roots = set()
+            for pattern in self._root_patterns:
+                for root in sorted(glob.glob(pattern)):
+                    roots.add(root)
+                    changed |= self._scan_dir(root, files=False)
+                    for name in self._dirs[root][2] if root in self._dirs else ():
+                        entry = (name.lower(), os.path.join(root, name))
+                        if entry not in student_dirs:
+                            student_dirs.append(entry)
+
+            seen = set()
+            for _, directory in student_dirs:
+                changed |= self._scan_tree(directory, seen)
+            # Oublier les dossiers supprimés ou qui ne sont plus indexés
+            for directory in set(self._dirs) - seen - roots:
+                del self._dirs[directory]
+            if changed or student_dirs != self._indexed_dirs:
+                self._rebuild(student_dirs)
+                self._indexed_dirs = student_dirs
+
+    def _scan_dir(self, directory, files=True):
+        """
+        Relit un dossier si sa date de modification a changé.
+
+        Returns:
+            bool: True si le contenu du dossier a été relu.
+        """
+        if split_archive_path(directory) is not None:
+            return self._scan_archive_dir(directory, files)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return self._dirs.pop(directory, None) is not None
+        cached = self._dirs.get(directory)
+        if cached is not None and cached[0] == mtime:
+            return False
+
+        java_files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        subdirs.append(entry.name)
+                    elif files and entry.name.lower().endswith('.java'):
+                        java_files.append(entry.name)
+        except OSError:
+            pass
+        self._dirs[directory] = (mtime, sorted(java_files), sorted(subdirs))
+        return True
+
+    def _scan_archive_dir(self, directory, files=True):
+        """
+        Relit un dossier virtuel d'une archive si l'archive a été modifiée.
+
+        Returns:
+            bool: True si le contenu du dossier a été relu.
+        """
+        zip_path, relative = split_archive_path(directory)
+        try:
+            mtime = os.stat(zip_path).st_mtime_ns
+            cached = self._dirs.get(directory)
+            if cached is not None and cached[0] == mtime:
+                return False
+            sources = get_submission_fs().list_sources(zip_path)
+        except (OSError, zipfile.BadZipFile):
+            return self._dirs.pop(directory, None) is not None
+
+        prefix = relative + os.sep if relative else ''
+        java_files = set()
+        subdirs = set()
+        for source in sources:
+            if not source.startswith(prefix):
+                continue
+            head, sep, _ = source[len(prefix):].partition(os.sep)
+            if sep:
+                subdirs.add(head)
+            elif files:
+                java_files.add(head)
+        self._dirs[directory] = (mtime, sorted(java_files), sorted(subdirs))
+        return True
+
+    def _scan_tree(self, directory, seen):
+        """Relit les dossiers modifiés d'une arborescence et note les dossiers visités."""
+        changed = False
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            seen.add(current)
+            changed |= self._scan_dir(current)
+            cached = self._dirs.get(current)
+            if cached is not None:
+                stack.extend(os.path.join(current, name) for name in reversed(cached[2]))
+        return changed
+
+    def _rebuild(self, student_dirs):
+        """Reconstruit les dictionnaires de recherche à partir des dossiers relus."""
+        self._by_name = {}
+        self._by_exercise = {}
+        self._by_token = {}
+        self._files = {}
+        for student, directory in student_dirs:
+            stack = [directory]
+            while stack:
+                current = stack.pop()
+                cached = self._dirs.get(current)
+                if cached is None:
+                    continue
+                for file_name in cached[1]:
+                    self._add_file(student, directory, os.path.join(current, file_name))
+                stack.extend(os.path.join(current, name) for name in reversed(cached[2]))
+
+    def _add_file(self, student, student_dir, path):
+        """Ajoute un fichier aux dictionnaires de recherche (le premier enregistré l'emporte)."""
+        relative = os.path.relpath(path, student_dir)
+        self._files.setdefault(student, []).append((relative, path))
+        for name in {relative.lower(), relative.replace(os.sep, '/').lower(), os.path.basename(path).lower()}:
+            self._by_name.setdefault((student, name), path)
+        for key in _name_keys(path):
+            self._by_exercise.setdefault((student, key), path)
+        for token in name_tokens(path):
+            self._by_token.setdefault((student, token), []).append(path)
+
+    def find(self, student, file_name):
+        """
+        Cherche un fichier d'un étudiant par son nom ou son chemin relatif.
+
+        Args:
+            student (str): Nom de l'étudiant.
+            file_name (str): Nom du fichier (insensible à la casse).
+
+        Returns:
+            str: Chemin du fichier, ou None.
+        """
+        self.refresh()
+        with self._lock:
+            student = student.lower()
+            return (self._by_name.get((student, file_name.lower()))
+                    or self._by_name.get((student, file_name.replace('\\', '/').lower())))
+
+    def find_exercise(self, student, exercise_id):
+        """
+        Cherche le fichier d'un étudiant dont le nom normalisé est celui de l'exercice.
+
+        Args:
+            student (str): Nom de l'étudiant.
+            exercise_id (str): Identifiant d'exercice ou nom de fichier.
+
+        Returns:
+            str: Chemin du fichier, ou None.
+        """
+        self.refresh()
+        with self._lock:
+            student = student.lower()
+            for key in _name_keys(exercise_id):
+                path = self._by_exercise.get((student, key))
+                if path:
+                    return path
+        return None
+
+    def find_similar(self, student, name):
+        """
+        Cherche le fichier d'un étudiant qui partage le plus de mots-clés avec un nom.
+
+        Args:
+            student (str): Nom de l'étudiant.
+            name (str): Nom de fichier ou identifiant d'exercice.
+
+        Returns:
+            str: Chemin du fichier, ou None si aucun mot-clé n'est partagé.
+        """
+        self.refresh()
+        with self._lock:
+            student = student.lower()
+            scores = {}
+            for token in name_tokens(name):
+                for path in self._by_token.get((student, token), ()):
+                    scores[path] = scores.get(path, 0) + 1
+            if not scores:
+                return None
+            order = {path: i for i, (_, path) in enumerate(self._files.get(student, []))}
+            return min(scores, key=lambda path: (-scores[path], order[path]))
+
+    def get_student_files(self, student, recursive=True):
+        """
+        Retourne les fichiers Java d'un étudiant.
+
+        Args:
+            student (str): Nom de l'étudiant.
+            recursive (bool): Inclure les fichiers des sous-dossiers.
+
+        Returns:
+            list: Chemins des fichiers, dans l'ordre des dossiers déclarés.
+        """
+        self.refresh()
+        with self._lock:
+            files = self._files.get(student.lower(), [])
+            return [path for relative, path in files if recursive or os.sep not in relative]
+
+
+_shared_indexes = {}
+_shared_indexes_lock = threading.Lock()
+
+
+def get_submission_index(working_dir=None):
+    """
+    Retourne l'index des soumissions partagé pour un répertoire de travail.
+
+    Il couvre extracted_files/, submitted_files/, tests/java_samples/TD* et
+    submissions/* sous le répertoire de travail ; les dossiers extraits par le
+    gestionnaire de soumissions y sont ajoutés.
+
+    Args:
+        working_dir (str, optional): Répertoire de travail (par défaut le répertoire courant).
+
+    Returns:
+        SubmissionIndex: Index partagé.
+    """
+    working_dir = os.path.abspath(working_dir or os.getcwd())
+    with _shared_indexes_lock:
+        if working_dir not in _shared_indexes:
+            _shared_indexes[working_dir] = SubmissionIndex([
+                os.path.join(working_dir, "extracted_files"),
+                os.path.join(working_dir, "submitted_files"),
+                os.path.join(working_dir, "tests", "java_samples", "TD*"),
+                os.path.join(working_dir, "submissions", "*"),
+            ])
+        return _shared_indexes[working_dir]
@@ -0,0 +1,75 @@
+from teach_assit.core.analysis.analysis_cache import AnalysisResultCache
+from teach_assit.core.analysis.batch_analyzer import BatchAnalyzer
+from teach_assit.core.analysis.models import ExerciseConfig
+
+
+CODE = """
+public class Intervalle {
+    public static void main(String[] args) {
+        int x = 4;
+        System.out.println(x < 3);
+    }
+}
+"""
+
+
+def make_config(pattern):
+    """Configuration d'exercice avec un pattern requis."""
+    return ExerciseConfig({
+        'id': '02-intervalle',
+        'rules': {
+            'requiredMethods': [{'name': 'main', 'params': ['String[]'], 'returnType': 'void'}],
+            'allowedOperators': ['<'],
+            'customPatterns': [{'pattern': pattern, 'description': 'Pattern', 'required': True}]
+        }
+    })
+
+
+def analyze(cache, config, path):
+    """Analyse un fichier et retourne son résultat."""
+    job = {'student': 'etudiant', 'file': path.name, 'path': str(path), 'exercise_id': '02-intervalle'}
+    batch = BatchAnalyzer({'02-intervalle': config}, max_workers=1, result_cache=cache)
+    return [result for _, result in batch.analyze([job])][0]
+
+
+class TestAnalysisResultCache:
+    """Tests pour la réanalyse incrémentale."""
+    
+    def test_unchanged_file_is_not_reanalysed(self, tmp_path):
+        """Un fichier et des règles inchangés réutilisent le résultat en cache."""
+        path = tmp_path / "Intervalle.java"
+        path.write_text(CODE, encoding='utf-8')
+        cache = AnalysisResultCache(str(tmp_path / "analysis.db"))
+        
+        first = analyze(cache, make_config(r'println'), path)
+        second = analyze(cache, make_config(r'println'), path)
+        
+        assert second == first
+        assert cache.get_stats() == {'hits': 1, 'partial_hits': 0, 'misses': 1}
+    
+    def test_pattern_change_reruns_only_patterns(self, tmp_path):
+        """Si seuls les patterns changent, seule la règle des patterns est réévaluée."""
+        path = tmp_path / "Intervalle.java"
+        path.write_text(CODE, encoding='utf-8')
+        cache = AnalysisResultCache(str(tmp_path / "analysis.db"))
+        
+        analyze(cache, make_config(r'println'), path)
+        result = analyze(cache, make_config(r'Scanner'), path)
+        
+        assert [p['description'] for p in result['analysis_details']['missing_patterns']] == ['Pattern']
+        assert cache.get_stats()['partial_hits'] == 1
+    
+    def test_rule_or_source_change_is_a_miss(self, tmp_path):
+        """Une autre règle ou un autre source imposent une nouvelle analyse."""
+        path = tmp_path / "Intervalle.java"
+        path.write_text(CODE, encoding='utf-8')
+        cache = AnalysisResultCache(str(tmp_path / "analysis.db"))
+        analyze(cache, make_config(r'println'), path)
+        
+        config = make_config(r'println')
+        config.rules['allowedOperators'] = ['<', '==']
+        analyze(cache, config, path)
+        path.write_text(CODE.replace("4", "5"), encoding='utf-8')
+        analyze(cache, config, path)
+        
+        assert cache.get_stats() == {'hits': 0, 'partial_hits': 0, 'misses': 3}
@@ -0,0 +1,59 @@
+import javalang
+
+from teach_assit.core.analysis.ast_index import AstIndex
+from teach_assit.core.analysis.parse_cache import ParseCache
+
+
+CODE = """
+public class Notes {
+    private int total;
+
+    public static void main(String[] args) {
+        int Compteur = 0;
+        for (int i = 0; i < 3; i++) {
+            if (i > 1) {
+                Compteur += inconnu;
+            }
+        }
+    }
+
+    double calculerMoyenne(int a, int b) {
+        return (a + b + total) / 2.0;
+    }
+}
+"""
+
+
+class TestAstIndex:
+    """Tests pour l'index des faits de l'arbre syntaxique."""
+
+    def test_index_matches_tree_filter(self):
+        """L'index collecte les mêmes nœuds que les parcours tree.filter."""
+        tree = javalang.parse.parse(CODE)
+        index = AstIndex(tree)
+
+        assert [m['name'] for m in index.methods] == [m.name for _, m in tree.filter(javalang.tree.MethodDeclaration)]
+        assert index.control_counts['for'] == len(list(tree.filter(javalang.tree.ForStatement)))
+        assert index.control_counts['if'] == 1
+        assert not index.has_control_structure('while')
+        assert [v['name'] for v in index.local_variables] == ['Compteur']
+
+    def test_signatures_and_scopes(self):
+        """Les signatures et les portées sont résolues en un seul parcours."""
+        index = AstIndex(javalang.parse.parse(CODE))
+
+        assert index.class_method_signatures() == {
+            'main': [{'params': ['String[]'], 'return': 'void'}],
+            'calculerMoyenne': [{'params': ['int', 'int'], 'return': 'double'}]
+        }
+        assert index.field_names == {'total'}
+        main = index.methods[0]
+        assert main['locals'] == {'args', 'Compteur'}
+        assert main['position'] == (5, 19)
+
+    def test_index_is_built_once_per_tree(self):
+        """Le cache d'arbres conserve l'index avec l'arbre."""
+        cache = ParseCache()
+
+        assert cache.index(CODE) is cache.index(CODE)
+        assert cache.get_stats()['misses'] == 1
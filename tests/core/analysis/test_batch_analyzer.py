@@ -0,0 +1,60 @@
+from teach_assit.core.analysis.batch_analyzer import BatchAnalyzer
+from teach_assit.core.analysis.models import ExerciseConfig
+from teach_assit.core.analysis.static_analyzer import StaticAnalyzer
+
+
+CONFIGS = {
+    '02-intervalle': ExerciseConfig({
+        'id': '02-intervalle',
+        'rules': {
+            'requiredMethods': [{'name': 'main', 'params': ['String[]'], 'returnType': 'void'}],
+            'allowedOperators': ['<', '==']
+        }
+    })
+}
+
+CODE = """
+public class Intervalle {
+    public static void main(String[] args) {
+        int x = %d;
+        System.out.println(x < 3 || x > 5);
+    }
+}
+"""
+
+
+def make_jobs(tmp_path, count):
+    """Écrit count soumissions et retourne les tâches correspondantes."""
+    jobs = []
+    for i in range(count):
+        path = tmp_path / f"Intervalle{i}.java"
+        path.write_text(CODE % i, encoding='utf-8')
+        jobs.append({'student': f"etudiant{i}", 'file': path.name, 'path': str(path), 'exercise_id': '02-intervalle'})
+    return jobs
+
+
+class TestBatchAnalyzer:
+    """Tests pour l'analyse par lots."""
+    
+    def test_pool_matches_sequential_analysis(self, tmp_path):
+        """Les résultats des processus sont ceux de l'analyse séquentielle."""
+        jobs = make_jobs(tmp_path, 6)
+        results = {job['student']: result for job, result in BatchAnalyzer(CONFIGS, max_workers=2).analyze(jobs)}
+        
+        assert sorted(results) == [job['student'] for job in jobs]
+        expected = StaticAnalyzer().analyze_code(CODE % 0, CONFIGS['02-intervalle'])
+        expected['exerciseId'] = '02-intervalle'
+        assert results['etudiant0'] == expected
+        assert [op['operator'] for op in results['etudiant0']['analysis_details']['disallowed_operators']] == ['||', '>']
+    
+    def test_errors_are_reported_per_job(self, tmp_path):
+        """Un fichier illisible ou sans configuration produit un résultat d'erreur."""
+        jobs = [
+            {'student': 'a', 'file': 'A.java', 'path': str(tmp_path / 'absent.java'), 'exercise_id': '02-intervalle'},
+            {'student': 'b', 'file': 'B.java', 'path': str(tmp_path / 'absent.java'), 'exercise_id': 'inconnu'}
+        ]
+        results = dict((job['student'], result) for job, result in BatchAnalyzer(CONFIGS, max_workers=1).analyze(jobs))
+        
+        assert results['a']['error'].startswith("Erreur lors de l'analyse")
+        assert results['b']['exerciseId'] == 'inconnu'
+        assert 'error' in results['b']
@@ -0,0 +1,38 @@
+from teach_assit.core.analysis.exercise_matcher import ExerciseMatcher, KeywordAutomaton
+from teach_assit.core.analysis.models import AssessmentConfig
+
+
+class TestExerciseMatcher:
+    """Tests pour l'association des fichiers aux exercices."""
+    
+    def test_automaton_finds_overlapping_keywords(self):
+        """Toutes les occurrences sont trouvées en un seul parcours, y compris imbriquées."""
+        automaton = KeywordAutomaton()
+        for keyword in ('he', 'she', 'his', 'hers'):
+            automaton.add(keyword, keyword)
+        
+        assert sorted(automaton.search('ushers')) == ['he', 'hers', 'she']
+    
+    def test_match_priorities(self):
+        """L'identifiant complet prime sur le mot-clé, puis sur les mots-clés spéciaux."""
+        matcher = ExerciseMatcher(['08-fonction-log', '09-fonction-racine-carree', '02-intervalle'])
+        
+        assert matcher.match('TD3/09-fonction-racine-carree.java') == '09-fonction-racine-carree'
+        assert matcher.match('fonction-log.java') == '08-fonction-log'
+        assert matcher.match('Intervalle.java') == '02-intervalle'
+        assert matcher.match('Log.java') == '08-fonction-log'
+        assert matcher.match('RacineCarree.java') is None
+        assert matcher.filter_files(['Intervalle.java', 'Autre.java']) == {'Intervalle.java': '02-intervalle'}
+    
+    def test_aliases_and_assessment_cache(self):
+        """Les alias complètent la correspondance ; le matcher d'une évaluation est réutilisé."""
+        matcher = ExerciseMatcher(['09-fonction-racine-carree'], aliases={'09-fonction-racine-carree': ['racine']})
+        assert matcher.match('RacineCarree.java') == '09-fonction-racine-carree'
+        
+        assessment = AssessmentConfig({'exercises': [{'exerciseId': '02-intervalle', 'maxPoints': 10}]})
+        shared = assessment.get_exercise_matcher()
+        assert assessment.get_exercise_matcher() is shared
+        
+        assessment.add_exercise('10-comptage-mots', 10)
+        assert assessment.get_exercise_matcher() is not shared
+        assert assessment.get_exercise_matcher().match('comptage-mots.java') == '10-comptage-mots'
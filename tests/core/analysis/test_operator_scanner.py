@@ -0,0 +1,42 @@
+from teach_assit.core.analysis.models import ExerciseConfig
+from teach_assit.core.analysis.operator_scanner import scan_operators, tokenize_java
+from teach_assit.core.analysis.static_analyzer import StaticAnalyzer
+
+
+CODE = """
+import java.util.*;
+
+public class Intervalle {
+    public static void main(String[] args) {
+        Map<String, List<int[]>> notes = new HashMap<>();
+        String texte = "a+b"; // x - y
+        int x = -1;
+        int y = x >> 2 >>> 1;
+        System.out.println("x: " + x);
+    }
+}
+"""
+
+
+class TestOperatorScanner:
+    """Tests pour la recherche des opérateurs sur les jetons."""
+
+    def test_scan_ignores_types_strings_and_comments(self):
+        """Génériques, chaînes, commentaires, moins unaire et concaténation ne sont pas signalés."""
+        operators = [op for op, _, _ in scan_operators(tokenize_java(CODE))]
+
+        assert operators == ['=', '=', '=', '=', '>>', '>>>']
+
+    def test_positions(self):
+        """Chaque opérateur est signalé avec sa ligne et sa colonne exactes."""
+        found = scan_operators(tokenize_java("boolean ok = a < b\n    && c != d;"))
+
+        assert found == [('=', 1, 12), ('<', 1, 16), ('&&', 2, 5), ('!=', 2, 10)]
+
+    def test_fallback_checks_operators(self):
+        """Les opérateurs sont vérifiés même si le code est syntaxiquement invalide."""
+        config = ExerciseConfig({'rules': {'allowedOperators': ['<', '==']}})
+        result = StaticAnalyzer().analyze_code("public class A { void f() { if (a > b) { }", config)
+
+        assert result['is_valid'] is False
+        assert [(op['operator'], op['line'], op['column']) for op in result['analysis_details']['disallowed_operators']] == [('>', 1, 35)]
@@ -0,0 +1,64 @@
+import pytest
+from javalang.parser import JavaSyntaxError
+
+from teach_assit.core.analysis.parse_cache import ParseCache
+
+
+VALID_CODE = """
+public class Intervalle {
+    public static void main(String[] args) {
+        int x = 3;
+        System.out.println(x > 2 ? "oui" : "non");
+    }
+}
+"""
+
+
+class TestParseCache:
+    """Tests pour le cache des arbres syntaxiques."""
+    
+    def test_same_code_is_parsed_once(self):
+        """Un code déjà analysé retourne le même arbre sans nouvelle analyse."""
+        cache = ParseCache()
+        first = cache.parse(VALID_CODE)
+        second = cache.parse(VALID_CODE)
+        
+        assert first is second
+        assert cache.get_stats() == {'hits': 1, 'misses': 1, 'size': 1}
+    
+    def test_syntax_errors_are_cached(self):
+        """Une erreur de syntaxe est relevée à chaque appel, sans nouvelle analyse."""
+        cache = ParseCache()
+        for _ in range(2):
+            with pytest.raises(JavaSyntaxError):
+                cache.parse("public class A { void f( }")
+        
+        assert cache.get_stats()['misses'] == 1
+    
+    def test_lru_bound(self):
+        """Le nombre d'arbres en mémoire est borné."""
+        cache = ParseCache(max_entries=2)
+        for name in ("A", "B", "C"):
+            cache.parse(f"class {name} {{}}")
+        
+        assert cache.get_stats()['size'] == 2
+    
+    def test_disk_layer(self, tmp_path):
+        """Les arbres sont réutilisés depuis le disque par une nouvelle instance."""
+        ParseCache(cache_dir=str(tmp_path)).parse(VALID_CODE)
+        
+        cache = ParseCache(cache_dir=str(tmp_path))
+        tree = cache.parse(VALID_CODE)
+        
+        assert tree.types[0].name == "Intervalle"
+        assert cache.get_stats()['misses'] == 0
+    
+    def test_tokens_are_shared_with_parser(self):
+        """Le code est découpé en jetons une seule fois, pour le parser et les opérateurs."""
+        cache = ParseCache()
+        cache.parse(VALID_CODE)
+        tokens = cache.tokens(VALID_CODE)
+        
+        assert tokens is cache.tokens(VALID_CODE)
+        assert tokens[0].value == "public"
+        assert cache.get_stats()['misses'] == 1
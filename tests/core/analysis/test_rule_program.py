@@ -0,0 +1,50 @@
+from teach_assit.core.analysis.models import ExerciseConfig
+from teach_assit.core.analysis.operator_scanner import tokenize_java
+
+
+CONFIG = {
+    'id': '02-intervalle',
+    'rules': {
+        'requiredMethods': [{'name': 'main', 'params': ['String[]'], 'returnType': 'void'}],
+        'allowedOperators': ['<', '==', '&&', '>='],
+        'customPatterns': [
+            {'pattern': r'Scanner\s+\w+', 'description': 'Lecture clavier', 'required': True},
+            {'pattern': '(', 'description': 'Pattern invalide', 'required': True}
+        ]
+    }
+}
+
+
+class TestRuleProgram:
+    """Tests pour les règles compilées d'un exercice."""
+
+    def test_program_is_cached_until_rules_change(self):
+        """Le programme est réutilisé, puis recompilé si les règles sont modifiées."""
+        config = ExerciseConfig({'id': CONFIG['id'], 'rules': dict(CONFIG['rules'])})
+        program = config.get_rule_program()
+
+        assert config.get_rule_program() is program
+
+        config.rules['allowedOperators'] = ['<']
+        updated = config.get_rule_program()
+
+        assert updated is not program
+        assert '>=' in updated.disallowed_operators
+
+    def test_compiled_rules(self):
+        """Les signatures sont résolues et les patterns invalides signalés."""
+        program = ExerciseConfig(CONFIG).get_rule_program()
+
+        assert program.required_methods[0]['regex'].search("public static void main(String[] args)")
+        assert program.patterns[0]['regex'].search("Scanner sc = new Scanner(System.in);")
+        assert program.patterns[1]['regex'] is None
+        assert program.patterns[1]['error']
+
+    def test_disallowed_operators_single_pass(self):
+        """Un opérateur autorisé n'est pas lu comme un opérateur plus court."""
+        program = ExerciseConfig(CONFIG).get_rule_program()
+        code = "boolean ok = (x >= 0) && (x < 1) || y > 2; // a - b\nint z = a - b;"
+
+        found = program.find_disallowed_operators(tokenize_java(code))
+
+        assert found == [('||', 1, 34), ('>', 1, 39), ('-', 2, 11)]
@@ -0,0 +1,63 @@
+import pytest
+import sqlite3
+import threading
+
+from teach_assit.core.database.managers import ConnectionProvider
+
+
+class TestConnectionProvider:
+    """Tests pour le fournisseur de connexions."""
+    
+    def test_connection_reused_per_thread(self, tmp_path):
+        """Un thread réutilise sa connexion ; un autre thread a la sienne."""
+        provider = ConnectionProvider(str(tmp_path / "test.db"))
+        conn = provider.get_connection()
+        
+        assert provider.get_connection() is conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+        
+        other = []
+        thread = threading.Thread(target=lambda: other.append(provider.get_connection()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+        provider.close()
+    
+    def test_transaction_and_close(self, tmp_path):
+        """Une transaction est annulée en cas d'erreur ; close() ferme et rouvre au besoin."""
+        provider = ConnectionProvider(str(tmp_path / "test.db"))
+        with provider.transaction() as conn:
+            conn.execute('CREATE TABLE t (x INTEGER)')
+            conn.execute('INSERT INTO t VALUES (1)')
+        try:
+            with provider.transaction() as conn:
+                conn.execute('INSERT INTO t VALUES (2)')
+                raise ValueError()
+        except ValueError:
+            pass
+        
+        provider.close()
+        conn = provider.get_connection()
+        assert conn.execute('SELECT x FROM t').fetchall() == [(1,)]
+        provider.close()
+    
+    def test_connection_closed_when_thread_ends(self, tmp_path):
+        """La connexion d'un thread terminé est fermée et n'est plus conservée."""
+        provider = ConnectionProvider(str(tmp_path / "test.db"))
+        provider.get_connection()
+        
+        opened = []
+        def work():
+            conn = provider.get_connection()
+            conn.execute('SELECT 1')
+            opened.append(conn)
+        for _ in range(20):
+            thread = threading.Thread(target=work)
+            thread.start()
+            thread.join()
+        
+        assert len(provider._connections) == 1
+        with pytest.raises(sqlite3.ProgrammingError):
+            opened[0].execute('SELECT 1')
+        provider.close()
@@ -0,0 +1,87 @@
+import sqlite3
+
+from teach_assit.core.database.db_manager import AUDITED_CALLS, DatabaseManager
+from teach_assit.core.database.managers.schema_manager import SCHEMA_VERSION
+
+
+class TestSchemaManager:
+    """Tests pour les migrations du schéma et l'audit des plans de requêtes."""
+
+    def test_migrations_applied_once(self, tmp_path):
+        """Une base existante sans version reçoit les index ; une réouverture ne refait rien."""
+        db_path = str(tmp_path / "test.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute('CREATE TABLE feedbacks (id INTEGER PRIMARY KEY, student_name TEXT, '
+                     'assessment_id TEXT, creation_date TIMESTAMP)')
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        assert db.get_schema_version() == SCHEMA_VERSION
+        indexes = {row[0] for row in db.connection_provider.get_connection().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {'idx_feedbacks_student_name', 'idx_extracted_files_folder_id'} <= indexes
+        db.close()
+
+        db = DatabaseManager(db_path)
+        assert db.get_schema_version() == SCHEMA_VERSION
+        db.close()
+
+    def test_manager_queries_use_indexes(self, tmp_path):
+        """Aucune requête filtrée des gestionnaires ne parcourt une table entière."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        zip_id, _ = db.import_zip_with_contents("A.zip", "/zips/A.zip", 100, "/extracted/A",
+                                                [("/extracted/A/Main.java", 10, 'java')])
+
+        assert db.audit_query_plans(AUDITED_CALLS + [('delete_zip_file', (zip_id,))]) == []
+
+        db.connection_provider.get_connection().execute('DROP INDEX idx_extracted_files_folder_id')
+        regressions = db.audit_query_plans([('get_files_by_folder', (1,))])
+        assert regressions[0]['scans'] == ['SCAN extracted_files']
+        db.close()
+
+    def test_legacy_tables_rebuilt_with_cascade(self, tmp_path):
+        """Les anciennes tables sont reconstruites avec leurs lignes et suppriment en cascade."""
+        db_path = str(tmp_path / "test.db")
+        conn = sqlite3.connect(db_path)
+        conn.executescript('''
+        CREATE TABLE zip_files (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT NOT NULL,
+            filepath TEXT NOT NULL, file_size INTEGER NOT NULL, upload_date TIMESTAMP, md5_hash TEXT,
+            description TEXT);
+        CREATE TABLE extracted_folders (id INTEGER PRIMARY KEY AUTOINCREMENT, zip_id INTEGER NOT NULL,
+            folder_path TEXT NOT NULL, extraction_date TIMESTAMP, status TEXT DEFAULT 'active',
+            FOREIGN KEY (zip_id) REFERENCES zip_files (id));
+        CREATE TABLE extracted_files (id INTEGER PRIMARY KEY AUTOINCREMENT, folder_id INTEGER NOT NULL,
+            filepath TEXT NOT NULL, file_size INTEGER NOT NULL, file_type TEXT,
+            FOREIGN KEY (folder_id) REFERENCES extracted_folders (id));
+        INSERT INTO zip_files (id, filename, filepath, file_size) VALUES (1, 'A.zip', '/zips/A.zip', 1);
+        INSERT INTO extracted_folders (id, zip_id, folder_path) VALUES (1, 1, '/extracted/A'), (2, 9, '/orphan');
+        INSERT INTO extracted_files (folder_id, filepath, file_size) VALUES (1, 'Main.java', 1), (2, 'X.java', 1);
+        ''')
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        assert [row[1] for row in db.get_files_by_folder(1)] == ['Main.java']
+        assert db.get_files_by_folder(2) == []
+        assert db.delete_zip_file(1)
+        conn = db.connection_provider.get_connection()
+        assert conn.execute('SELECT COUNT(*) FROM extracted_files').fetchone()[0] == 0
+        db.close()
+
+    def test_duplicate_archives_kept(self, tmp_path):
+        """Les imports existants d'une même archive sont conservés par la migration."""
+        db_path = str(tmp_path / "test.db")
+        conn = sqlite3.connect(db_path)
+        conn.executescript('''
+        CREATE TABLE zip_files (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT NOT NULL,
+            filepath TEXT NOT NULL, file_size INTEGER NOT NULL, upload_date TIMESTAMP, md5_hash TEXT,
+            description TEXT);
+        INSERT INTO zip_files (id, filename, filepath, file_size, md5_hash) VALUES
+            (1, 'A.zip', '/zips/A.zip', 1, 'h'), (2, 'B.zip', '/zips/B.zip', 1, 'h'), (3, 'C.zip', '/zips/C.zip', 1, NULL);
+        ''')
+        conn.close()
+
+        db = DatabaseManager(db_path)
+        assert [row[0] for row in db.get_archive_states()] == [1, 2, 3]
+        with db.connection_provider.transaction() as conn:
+            conn.execute("INSERT INTO zip_files (filename, filepath, file_size, md5_hash) VALUES ('D', '/D', 1, 'h')")
+        db.close()
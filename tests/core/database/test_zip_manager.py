@@ -0,0 +1,95 @@
+import pytest
+
+from teach_assit.core.database.db_manager import DatabaseManager
+
+
+def make_archive(name, files):
+    """Décrire une archive extraite."""
+    return {
+        'filename': f"{name}.zip",
+        'filepath': f"/zips/{name}.zip",
+        'file_size': 100,
+        'md5_hash': name,
+        'description': None,
+        'folder_path': f"/extracted/{name}",
+        'files': [(f"/extracted/{name}/{file}", 10, 'java') for file in files]
+    }
+
+
+class TestZipManagerBulk:
+    """Tests pour l'enregistrement groupé des archives."""
+    
+    def test_import_batch_in_one_transaction(self, tmp_path):
+        """Un lot d'archives est enregistré avec tous ses fichiers."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        ids = db.import_zips_with_contents([make_archive("A", ["Main.java", "B.java"]), make_archive("B", ["C.java"])])
+        
+        assert len(ids) == 2
+        assert [row[1] for row in db.get_files_by_folder(ids[0][1])] == ["/extracted/A/Main.java", "/extracted/A/B.java"]
+        assert db.add_extracted_files_bulk(ids[1][1], [("/extracted/B/D.java", 5, 'java')]) == 1
+        assert len(db.get_files_by_folder(ids[1][1])) == 2
+        db.close()
+    
+    def test_failed_batch_is_rolled_back(self, tmp_path):
+        """Si une archive du lot est invalide, aucune n'est enregistrée."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        broken = make_archive("B", ["C.java"])
+        del broken['folder_path']
+        
+        with pytest.raises(KeyError):
+            db.import_zips_with_contents([make_archive("A", ["Main.java"]), broken])
+        
+        assert db.get_all_zip_files() == []
+        db.close()
+    
+    def test_delete_batch_cascades(self, tmp_path):
+        """La suppression d'un lot retire dossiers et fichiers ; un dossier partagé est conservé."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        shared = make_archive("C", ["D.java"])
+        shared['folder_path'] = "/extracted/A"
+        ids = db.import_zips_with_contents([make_archive("A", ["Main.java"]), make_archive("B", ["C.java"]), shared])
+        
+        assert db.delete_zip_files([ids[0][0], ids[1][0]]) == ["/extracted/B"]
+        assert [row[0] for row in db.get_all_zip_files()] == [ids[2][0]]
+        assert db.get_files_by_folder(ids[0][1]) == []
+        assert db.get_extracted_folders_by_zip(ids[1][0]) == []
+        assert db.delete_zip_files([ids[2][0]]) == ["/extracted/A"]
+        db.close()
+    
+    def test_reimport_reuses_archive(self, tmp_path):
+        """Une archive réimportée depuis le même chemin est mise à jour et garde son dossier."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        first = db.import_zips_with_contents([make_archive("A", ["Main.java"])])[0]
+        
+        assert db.import_zips_with_contents([make_archive("A", ["Main.java"])]) == [first]
+        assert len(db.get_all_zip_files()) == 1
+        assert len(db.get_files_by_folder(first[1])) == 1
+        
+        # Dossier extrait ailleurs : les anciens dossiers sont remplacés
+        moved = make_archive("A", ["Main.java"])
+        moved['folder_path'] = "/extracted/A2"
+        zip_id, folder_id = db.import_zips_with_contents([moved])[0]
+        assert zip_id == first[0] and folder_id != first[1]
+        assert [row[1] for row in db.get_extracted_folders_by_zip(zip_id)] == ["/extracted/A2"]
+        db.close()
+    
+    def test_identical_archives_keep_their_rows(self, tmp_path):
+        """Deux étudiants rendant la même archive gardent chacun leur ligne et leurs fichiers."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        dupont = make_archive("A", ["Main.java"])
+        dupont['filepath'] = "/zips/Dupont_Jean.zip"
+        first = db.import_zips_with_contents([dupont])[0]
+        
+        martin = make_archive("A", [])
+        martin['filename'] = "Martin_Paul.zip"
+        martin['filepath'] = "/zips/Martin_Paul.zip"
+        martin['source_folder_id'] = first[1]
+        second = db.import_zips_with_contents([martin])[0]
+        
+        assert second[0] != first[0]
+        assert sorted(row[1] for row in db.get_all_zip_files()) == ["A.zip", "Martin_Paul.zip"]
+        assert [row[1] for row in db.get_files_by_folder(first[1])] == ["/extracted/A/Main.java"]
+        assert [row[1] for row in db.get_files_by_folder(second[1])] == ["/extracted/A/Main.java"]
+        assert db.delete_zip_files([second[0]]) == []
+        assert len(db.get_files_by_folder(first[1])) == 1
+        db.close()
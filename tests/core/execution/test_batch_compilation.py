@@ -0,0 +1,66 @@
+import os
+import shutil
+import pytest
+import tempfile
+from teach_assit.core.execution.code_executor import JavaExecutor
+
+
+requires_jdk = pytest.mark.skipif(shutil.which('javac') is None, reason="JDK non disponible")
+
+VALID_PROGRAM = """
+public class Intervalle {
+    public static void main(String[] args) {
+        System.out.println("%s");
+    }
+}
+"""
+
+INVALID_PROGRAM = """
+public class Intervalle {
+    public static void main(String[] args) {
+        System.out.println("oubli du point-virgule")
+    }
+}
+"""
+
+
+@requires_jdk
+class TestBatchCompilation:
+    """Tests pour la compilation groupée d'une cohorte."""
+
+    @pytest.fixture
+    def cohort(self):
+        """Créer trois soumissions déclarant la même classe publique."""
+        temp_dir = tempfile.mkdtemp()
+        sources = {
+            "Dupont_Jean": VALID_PROGRAM % "Dupont",
+            "Martin_Marie": INVALID_PROGRAM,
+            "Durand_Paul": VALID_PROGRAM % "Durand",
+        }
+        files = {}
+        for student, source in sources.items():
+            student_dir = os.path.join(temp_dir, student)
+            os.makedirs(student_dir)
+            files[student] = os.path.join(student_dir, "Intervalle.java")
+            with open(files[student], 'w', encoding='utf-8') as f:
+                f.write(source)
+        yield files
+        shutil.rmtree(temp_dir)
+
+    def test_compile_batch_splits_diagnostics(self, cohort):
+        """Chaque étudiant obtient ses propres diagnostics et ses propres classes."""
+        executor = JavaExecutor()
+        try:
+            results = executor.compile_batch(cohort)
+
+            assert results["Dupont_Jean"][0] is True
+            assert results["Durand_Paul"][0] is True
+            assert results["Martin_Marie"][0] is False
+            assert "';' expected" in results["Martin_Marie"][1]
+
+            outputs = {student: executor.test_with_inputs(path, [""])[0]["stdout"].strip()
+                       for student, path in cohort.items()}
+            assert outputs["Dupont_Jean"] == "Dupont"
+            assert outputs["Durand_Paul"] == "Durand"
+        finally:
+            executor.clean_up()
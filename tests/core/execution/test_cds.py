@@ -0,0 +1,65 @@
+import json
+import os
+import shutil
+import sys
+import pytest
+import tempfile
+from teach_assit.core.execution.cds import CdsArchiveManager, FAILED_BUILD_RETRY_SECONDS
+
+
+class TestCdsArchiveManager:
+    """Tests pour la gestion de l'archive CDS."""
+
+    @pytest.fixture
+    def cds_dir(self):
+        temp_dir = tempfile.mkdtemp()
+        yield temp_dir
+        shutil.rmtree(temp_dir)
+
+    def test_no_options_without_java(self, cds_dir):
+        """Sans JVM, aucune option n'est proposée."""
+        manager = CdsArchiveManager(cds_dir, java_command=['teachassist-java-introuvable'])
+        assert manager.get_java_version() is None
+        assert manager.get_jvm_options() == []
+
+    @pytest.mark.skipif(shutil.which('javac') is None, reason="JDK non disponible")
+    def test_options_are_reused_for_same_jdk(self, cds_dir):
+        """Les options validées sont enregistrées puis relues sans reconstruction."""
+        options = CdsArchiveManager(cds_dir).get_jvm_options()
+        assert '-XX:TieredStopAtLevel=1' in options or options == []
+        assert CdsArchiveManager(cds_dir).get_jvm_options() == options
+
+    @pytest.fixture
+    def fake_java(self, cds_dir):
+        """JVM factice : répond à -version et échoue pour tout le reste."""
+        script = os.path.join(cds_dir, "fake_java.py")
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write("import sys\nprint('fake java 1.0', file=sys.stderr)\nsys.exit(0 if sys.argv[1:] == ['-version'] else 1)\n")
+        return [sys.executable, script]
+
+    def test_failed_build_is_retried_later(self, cds_dir, fake_java, monkeypatch):
+        """Un échec de construction n'est pas conservé comme configuration définitive."""
+        assert CdsArchiveManager(cds_dir, java_command=fake_java).get_jvm_options() == []
+        meta_files = [name for name in os.listdir(cds_dir) if name.endswith('.json')]
+        meta_path = os.path.join(cds_dir, meta_files[0])
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        assert meta["options"] == [] and "failed_at" in meta
+
+        builds = []
+
+        def fake_build(manager, version, version_hash):
+            builds.append(version_hash)
+            return ['-Xshare:auto']
+
+        monkeypatch.setattr(CdsArchiveManager, '_build', fake_build)
+        # Échec récent : pas de nouvelle tentative
+        assert CdsArchiveManager(cds_dir, java_command=fake_java).get_jvm_options() == []
+        assert builds == []
+
+        meta["failed_at"] -= FAILED_BUILD_RETRY_SECONDS + 1
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        assert CdsArchiveManager(cds_dir, java_command=fake_java).get_jvm_options() == ['-Xshare:auto']
+        assert CdsArchiveManager(cds_dir, java_command=fake_java).get_jvm_options() == ['-Xshare:auto']
+        assert len(builds) == 1
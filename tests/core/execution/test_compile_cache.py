@@ -0,0 +1,98 @@
+import os
+import shutil
+import subprocess
+import types
+import pytest
+import tempfile
+from teach_assit.core.execution import code_executor
+from teach_assit.core.execution.code_executor import JavaExecutor
+from teach_assit.core.execution.compile_cache import CompilationCache
+
+
+class TestCompilationCache:
+    """Tests pour le cache persistant des compilations."""
+
+    @pytest.fixture
+    def temp_dirs(self):
+        """Créer un répertoire de cache et un répertoire de compilation."""
+        temp_dir = tempfile.mkdtemp()
+        cache_dir = os.path.join(temp_dir, "cache")
+        compile_dir = os.path.join(temp_dir, "compile")
+        os.makedirs(compile_dir)
+        yield cache_dir, compile_dir, temp_dir
+        shutil.rmtree(temp_dir)
+
+    def _write_class(self, compile_dir, name, size):
+        with open(os.path.join(compile_dir, f"{name}.class"), 'wb') as f:
+            f.write(b"\xca\xfe" * (size // 2))
+
+    def test_key_depends_on_source_and_compiler(self):
+        """La clé change avec le source, la version de javac et les options."""
+        key = CompilationCache.make_key(b"class A {}", "javac 17", "A")
+        assert key == CompilationCache.make_key(b"class A {}", "javac 17", "A")
+        assert key != CompilationCache.make_key(b"class A { }", "javac 17", "A")
+        assert key != CompilationCache.make_key(b"class A {}", "javac 21", "A")
+        assert key != CompilationCache.make_key(b"class A {}", "javac 17", "A", ["-g"])
+
+    def test_put_then_get_restores_classes(self, temp_dirs):
+        """Une compilation enregistrée est restaurée avec ses diagnostics."""
+        cache_dir, compile_dir, temp_dir = temp_dirs
+        cache = CompilationCache(cache_dir)
+        self._write_class(compile_dir, "Intervalle", 100)
+        self._write_class(compile_dir, "Intervalle$1", 50)
+        key = CompilationCache.make_key(b"source", "javac 17", "Intervalle")
+
+        assert cache.get(key, os.path.join(temp_dir, "restore")) is None
+        cache.put(key, compile_dir, True, "Compilation réussie", "Intervalle")
+
+        restore_dir = os.path.join(temp_dir, "restore")
+        meta = CompilationCache(cache_dir).get(key, restore_dir)
+        assert meta == {"success": True, "output": "Compilation réussie", "class_name": "Intervalle",
+                        "diagnostics": None}
+        assert sorted(os.listdir(restore_dir)) == ["Intervalle$1.class", "Intervalle.class"]
+        assert cache.get_stats()["misses"] == 1
+
+    def test_eviction_removes_least_recently_used(self, temp_dirs):
+        """Les entrées les moins récemment utilisées sont supprimées en premier."""
+        cache_dir, compile_dir, temp_dir = temp_dirs
+        cache = CompilationCache(cache_dir, max_size=2500)
+        self._write_class(compile_dir, "Main", 1000)
+        keys = [CompilationCache.make_key(str(i).encode(), "javac 17", "Main") for i in range(3)]
+
+        cache.put(keys[0], compile_dir, True, "", "Main")
+        cache.put(keys[1], compile_dir, True, "", "Main")
+        # Rendre la première entrée plus récente que la seconde
+        os.utime(os.path.join(cache._entry_dir(keys[1]), "meta.json"), (0, 0))
+        cache.put(keys[2], compile_dir, True, "", "Main")
+
+        restore_dir = os.path.join(temp_dir, "restore")
+        assert cache.get(keys[1], restore_dir) is None
+        assert cache.get(keys[0], restore_dir) is not None
+        assert cache.get(keys[2], restore_dir) is not None
+        assert cache.get_stats()["size"] <= 2500
+
+    def test_executor_skips_timed_out_compilations(self, temp_dirs, monkeypatch):
+        """Seuls les échecs dus au timeout ne sont pas mis en cache, quel que soit le message du compilateur."""
+        cache_dir, compile_dir, temp_dir = temp_dirs
+        cache = CompilationCache(cache_dir)
+        executor = JavaExecutor(temp_dir=os.path.join(temp_dir, "work"), compile_cache=cache,
+                                use_harness=False, use_driver=False, use_compile_server=False)
+        source_path = os.path.join(temp_dir, "Main.java")
+        with open(source_path, 'w', encoding='utf-8') as f:
+            f.write("public class Main { int timeout = x; }")
+
+        def javac_timeout(command, **kwargs):
+            raise subprocess.TimeoutExpired(command, kwargs.get('timeout'))
+
+        monkeypatch.setattr(code_executor.subprocess, 'run', javac_timeout)
+        assert executor.compile_java(source_path) == (False, "Compilation timeout (> 10s)")
+        assert cache.get_stats()["size"] == 0
+
+        error = "Main.java:1: error: cannot find symbol timeout"
+        monkeypatch.setattr(code_executor.subprocess, 'run',
+                            lambda command, **kwargs: types.SimpleNamespace(returncode=1, stdout="", stderr=error))
+        assert executor.compile_java(source_path) == (False, error)
+
+        monkeypatch.setattr(code_executor.subprocess, 'run', javac_timeout)
+        assert executor.compile_java(source_path) == (False, error)
+        assert cache.get_stats()["hits"] == 1
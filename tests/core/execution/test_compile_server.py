@@ -0,0 +1,68 @@
+"""
+Tests du serveur de compilation en mémoire et des diagnostics structurés.
+"""
+
+import shutil
+import pytest
+
+from teach_assit.core.execution.code_executor import JavaExecutor
+from teach_assit.core.execution.compile_server import format_diagnostics, parse_javac_output
+
+JAVAC_OUTPUT = """Main.java:4: error: ';' expected
+        int x = 3
+                 ^
+Main.java:6: warning: [deprecation] foo() in Bar has been deprecated
+        new Bar().foo();
+                 ^
+1 error
+1 warning
+"""
+
+
+class TestDiagnostics:
+    """Tests de la mise en forme et de l'extraction des diagnostics."""
+
+    def test_parse_javac_output(self):
+        """Les diagnostics texte de javac sont convertis en ligne, colonne et message."""
+        diagnostics = parse_javac_output(JAVAC_OUTPUT)
+
+        assert diagnostics == [
+            {"kind": "ERROR", "line": 4, "column": 18, "message": "';' expected"},
+            {"kind": "WARNING", "line": 6, "column": 18,
+             "message": "[deprecation] foo() in Bar has been deprecated"}
+        ]
+
+    def test_format_diagnostics(self):
+        """Les diagnostics du serveur sont présentés comme la sortie de javac."""
+        text = format_diagnostics("Main.java", [
+            {"kind": "ERROR", "line": 4, "column": 18, "message": "';' expected"},
+            {"kind": "NOTE", "line": -1, "column": -1, "message": "Recompile with -Xlint"}
+        ])
+
+        assert text == "Main.java:4: error: ';' expected\nnote: Recompile with -Xlint\n1 error"
+
+
+@pytest.mark.skipif(shutil.which('javac') is None, reason="JDK non installé")
+class TestCompileServer:
+    """Tests de la compilation en mémoire dans le serveur résident."""
+
+    def test_compile_with_diagnostics(self, tmp_path):
+        """Le serveur produit les classes et des diagnostics structurés."""
+        valid = tmp_path / "Hello.java"
+        valid.write_text('public class Hello { public static void main(String[] a) { System.out.println("ok"); } }')
+        invalid = tmp_path / "Broken.java"
+        invalid.write_text("public class Broken {\n    int x = 3\n}\n")
+
+        executor = JavaExecutor(temp_dir=str(tmp_path / "build"))
+        try:
+            assert executor.compile_with_diagnostics(str(valid))[0]
+            assert executor.execute_java(str(valid))[1].strip() == "ok"
+
+            success, output, diagnostics = executor.compile_with_diagnostics(str(invalid))
+            assert not success
+            assert "Broken.java:2: error" in output
+            assert diagnostics[0]["kind"] == "ERROR"
+            assert diagnostics[0]["line"] == 2
+            assert diagnostics[0]["column"] > 0
+        finally:
+            executor.clean_up()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import pytest
+import tempfile
+from teach_assit.core.execution.code_executor import JavaExecutor
+from teach_assit.core.execution.sandbox import ResourceLimits
+
+
+requires_jdk = pytest.mark.skipif(shutil.which('javac') is None, reason="JDK non disponible")
+
+ECHO_PROGRAM = """
+import java.util.Scanner;
+
+public class Echo {
+    public static void main(String[] args) {
+        Scanner scanner = new Scanner(System.in);
+        int n = scanner.nextInt();
+        if (n < 0) {
+            System.out.println("negatif");
+            System.exit(3);
+        }
+        System.out.println("carre=" + (n * n));
+    }
+}
+"""
+
+SPIN_PROGRAM = """
+public class Spin {
+    public static void main(String[] args) {
+        long n = 0;
+        while (true) {
+            n++;
+        }
+    }
+}
+"""
+
+
+@requires_jdk
+class TestJavaHarness:
+    """Tests pour l'exécution de plusieurs entrées dans une même JVM."""
+
+    @pytest.fixture
+    def java_file(self):
+        """Créer un programme Java de test."""
+        temp_dir = tempfile.mkdtemp()
+        path = os.path.join(temp_dir, "Echo.java")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(ECHO_PROGRAM)
+        yield path
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.parametrize("use_harness, use_driver", [(True, False), (False, True)])
+    def test_single_jvm_modes_match_process_execution(self, java_file, use_harness, use_driver):
+        """Le harnais et le pilote doivent produire les mêmes résultats qu'une JVM par entrée."""
+        inputs = ["3", "-1", "abc", "5"]
+
+        shared_executor = JavaExecutor(use_harness=use_harness, use_driver=use_driver)
+        process_executor = JavaExecutor(use_harness=False, use_driver=False)
+        try:
+            shared_results = shared_executor.test_with_inputs(java_file, inputs)
+            process_results = process_executor.test_with_inputs(java_file, inputs)
+        finally:
+            shared_executor.clean_up()
+            process_executor.clean_up()
+
+        assert [r["success"] for r in shared_results] == [True, False, False, True]
+        for shared_result, process_result in zip(shared_results, process_results):
+            assert shared_result["success"] == process_result["success"]
+            assert shared_result["stdout"] == process_result["stdout"]
+        assert "InputMismatchException" in shared_results[2]["stderr"]
+
+    @pytest.mark.skipif(not os.path.exists('/proc/self/stat'), reason="mesure par /proc indisponible")
+    @pytest.mark.parametrize("use_harness, use_driver", [(True, False), (False, True)])
+    def test_single_jvm_modes_apply_limits(self, java_file, use_harness, use_driver):
+        """Le harnais et le pilote mesurent chaque entrée et arrêtent un dépassement du temps CPU."""
+        spin_file = os.path.join(os.path.dirname(java_file), "Spin.java")
+        with open(spin_file, 'w', encoding='utf-8') as f:
+            f.write(SPIN_PROGRAM)
+
+        executor = JavaExecutor(use_harness=use_harness, use_driver=use_driver,
+                                resource_limits=ResourceLimits(cpu_seconds=1))
+        try:
+            echo_results = executor.test_with_inputs(java_file, ["3", "4"])
+            spin_results = executor.test_with_inputs(spin_file, ["", ""], timeout=20)
+        finally:
+            executor.clean_up()
+
+        assert all(r["success"] and r["cpu_time"] is not None for r in echo_results)
+        assert all(r["peak_rss_kb"] for r in echo_results)
+        assert not any(r["success"] for r in spin_results)
+        assert "Limite de temps CPU dépassée" in spin_results[0]["stderr"]
@@ -0,0 +1,54 @@
+"""
+Tests de la capture bornée des sorties.
+"""
+
+import sys
+import pytest
+
+from teach_assit.core.execution.output_capture import OutputCapture, OutputLimits, truncation_marker
+from teach_assit.core.execution.sandbox import run_process
+
+
+class TestOutputCapture:
+    """Tests de OutputCapture."""
+
+    def test_small_output_is_kept(self):
+        """Une sortie sous les limites est conservée telle quelle."""
+        capture = OutputCapture(OutputLimits(head_bytes=8, tail_bytes=4, hard_limit_bytes=100))
+        assert capture.feed(b"abcdef")
+        assert capture.feed(b"ghij")
+
+        assert capture.getvalue() == b"abcdefghij"
+        assert not capture.truncated
+
+    def test_head_and_tail_are_kept(self):
+        """Au-delà des limites, seuls le début et la fin sont conservés."""
+        capture = OutputCapture(OutputLimits(head_bytes=4, tail_bytes=3, hard_limit_bytes=100))
+        for chunk in (b"0123", b"456789", b"abc", b"xyz"):
+            assert capture.feed(chunk)
+
+        assert capture.truncated
+        assert capture.getvalue() == b"0123" + truncation_marker(9) + b"xyz"
+
+    def test_hard_limit(self):
+        """Le dépassement du budget est signalé."""
+        capture = OutputCapture(OutputLimits(head_bytes=4, tail_bytes=4, hard_limit_bytes=10))
+        assert capture.feed(b"x" * 10)
+        assert not capture.feed(b"x")
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason="lecture des flux testée sous POSIX")
+class TestRunProcessOutput:
+    """Tests de la capture des sorties par run_process."""
+
+    def test_flooding_program_is_killed(self):
+        """Un programme qui affiche sans fin est arrêté avant le timeout."""
+        limits = OutputLimits(head_bytes=1024, tail_bytes=256, hard_limit_bytes=1024 * 1024)
+        run = run_process([sys.executable, '-c', "while True: print('x' * 100)"], "", timeout=30,
+                          output_limits=limits)
+
+        assert not run["timed_out"]
+        assert run["output_truncated"]
+        assert run["exit_code"] != 0
+        assert len(run["stdout"]) < 2048
+        assert run["stdout"].startswith('x' * 100)
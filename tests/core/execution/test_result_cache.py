@@ -0,0 +1,73 @@
+import os
+import hashlib
+import shutil
+import signal
+import pytest
+import tempfile
+from teach_assit.core.execution.code_executor import JavaExecutor
+from teach_assit.core.execution.result_cache import ExecutionResultCache
+
+
+class TestExecutionResultCache:
+    """Tests pour le cache des résultats d'exécution."""
+
+    @pytest.fixture
+    def cache(self):
+        """Créer un cache dans un répertoire temporaire."""
+        temp_dir = tempfile.mkdtemp()
+        yield ExecutionResultCache(os.path.join(temp_dir, "execution_cache.db"))
+        shutil.rmtree(temp_dir)
+
+    def test_key_covers_all_inputs(self):
+        """La clé dépend de l'artefact, de l'entrée, du timeout et des options JVM."""
+        key = ExecutionResultCache.make_key("abc", "2.5", 5)
+        assert key == ExecutionResultCache.make_key("abc", "2.5", 5.0)
+        assert key != ExecutionResultCache.make_key("abd", "2.5", 5)
+        assert key != ExecutionResultCache.make_key("abc", "-1", 5)
+        assert key != ExecutionResultCache.make_key("abc", "2.5", 10)
+        assert key != ExecutionResultCache.make_key("abc", "2.5", 5, ["-Xmx64m"])
+
+    def test_put_get_and_invalidate(self, cache):
+        """Les résultats sont relus puis supprimés par empreinte d'artefact."""
+        first = ExecutionResultCache.make_key("artefact1", "0.5", 5)
+        second = ExecutionResultCache.make_key("artefact2", "0.5", 5)
+        assert cache.get(first) is None
+
+        cache.put(first, "artefact1", 0, "Racine: 0.707\n", "")
+        cache.put(second, "artefact2", 1, "", "Exception")
+        assert cache.get(first) == {"exit_code": 0, "stdout": "Racine: 0.707\n", "stderr": ""}
+        assert cache.get_stats() == {"hits": 1, "misses": 1}
+
+        assert cache.invalidate("artefact1") == 1
+        assert cache.get(first) is None
+        assert cache.get(second) is not None
+        assert cache.invalidate() == 1
+        assert cache.get(second) is None
+
+    @pytest.mark.skipif(not hasattr(signal, 'SIGXCPU'), reason="SIGXCPU indisponible")
+    def test_runs_killed_by_limits_are_not_cached(self, cache, tmp_path, monkeypatch):
+        """Un arrêt par limite de ressources est réexécuté, par exemple après un relèvement des limites."""
+        source_path = tmp_path / "Main.java"
+        source_path.write_text("public class Main {}")
+        compile_dir = tmp_path / "classes"
+        compile_dir.mkdir()
+        (compile_dir / "Main.class").write_bytes(b"\xca\xfe")
+
+        executor = JavaExecutor(temp_dir=str(tmp_path / "work"), result_cache=cache,
+                                use_harness=False, use_driver=False, use_compile_server=False)
+        executor._precompiled[os.path.abspath(source_path)] = (
+            hashlib.sha256(source_path.read_bytes()).hexdigest(), True, "", str(compile_dir), "Main")
+        runs = {"boucle": {"exit_code": -signal.SIGXCPU, "stdout": "", "stderr": "", "timed_out": False},
+                "fichier": {"exit_code": -signal.SIGXFSZ, "stdout": "", "stderr": "", "timed_out": False},
+                "ok": {"exit_code": 0, "stdout": "fini\n", "stderr": "", "timed_out": False}}
+        executed = []
+
+        def fake_run_inputs(compile_dir, class_name, inputs, timeout):
+            executed.extend(inputs)
+            return [runs[input_val] for input_val in inputs]
+
+        monkeypatch.setattr(executor, '_run_inputs', fake_run_inputs)
+        executor.test_with_inputs(str(source_path), ["boucle", "fichier", "ok"])
+        executor.test_with_inputs(str(source_path), ["boucle", "fichier", "ok"])
+
+        assert executed == ["boucle", "fichier", "ok", "boucle", "fichier"]
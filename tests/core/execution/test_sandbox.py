@@ -0,0 +1,136 @@
+"""
+Tests de l'exécution avec limites de ressources.
+"""
+
+import os
+import queue
+import subprocess
+import sys
+import time
+import pytest
+
+from teach_assit.core.execution import sandbox
+from teach_assit.core.execution.java_harness import CpuLimitExceeded, next_response
+from teach_assit.core.execution.sandbox import ProcessUsage, ResourceLimits, run_process, spawn
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32', reason="rlimits indisponibles sous Windows")
+
+requires_proc = pytest.mark.skipif(not os.path.exists('/proc/self/stat'), reason="/proc indisponible")
+
+FSIZE_PROBE = "import resource; print(resource.getrlimit(resource.RLIMIT_FSIZE)[0])"
+
+
+class TestRunProcess:
+    """Tests de run_process."""
+
+    def test_reports_output_and_usage(self):
+        """La sortie, le code de retour et les ressources consommées sont rapportés."""
+        code = "import sys; data = bytearray(32 * 1024 * 1024); print(sys.stdin.read().upper())"
+        run = run_process([sys.executable, '-c', code], "bonjour", timeout=10)
+
+        assert run["exit_code"] == 0
+        assert run["stdout"] == "BONJOUR\n"
+        assert not run["timed_out"]
+        assert run["cpu_time"] is not None and run["cpu_time"] >= 0
+        assert run["peak_rss_kb"] >= 32 * 1024
+
+    def test_timeout_kills_process(self):
+        """Un programme trop long est arrêté et signalé comme timeout."""
+        run = run_process([sys.executable, '-c', "import time; time.sleep(30)"], "", timeout=0.5)
+
+        assert run["timed_out"]
+        assert run["exit_code"] is None
+
+    def test_cpu_limit(self):
+        """La limite de temps CPU arrête une boucle infinie avant le timeout."""
+        run = run_process([sys.executable, '-c', "while True: pass"], "", timeout=20,
+                          limits=ResourceLimits(cpu_seconds=1, heap_mb=None))
+
+        assert not run["timed_out"]
+        assert run["exit_code"] < 0
+        assert run["cpu_time"] >= 0.9
+
+    def test_file_size_limit(self, tmp_path):
+        """Un programme ne peut pas écrire de fichier plus grand que la limite."""
+        target = tmp_path / "out.bin"
+        code = f"open({str(target)!r}, 'wb').write(b'x' * 4 * 1024 * 1024)"
+        run = run_process([sys.executable, '-c', code], "", timeout=10,
+                          limits=ResourceLimits(max_file_size_mb=1, heap_mb=None))
+
+        assert run["exit_code"] != 0
+        assert target.stat().st_size <= 1024 * 1024
+
+    def test_jvm_options(self):
+        """La limite de tas est traduite en option -Xmx."""
+        assert ResourceLimits(heap_mb=128).jvm_options() == ['-Xmx128m']
+        assert ResourceLimits(heap_mb=None).jvm_options() == []
+
+
+class TestSpawn:
+    """Tests de spawn (limites appliquées sans preexec_fn)."""
+
+    def test_no_preexec_fn(self, monkeypatch):
+        """Le processus est lancé sans preexec_fn, dangereux dans un processus multithread."""
+        calls = []
+        popen = subprocess.Popen
+
+        def recording_popen(*args, **kwargs):
+            calls.append(kwargs)
+            return popen(*args, **kwargs)
+
+        monkeypatch.setattr(sandbox.subprocess, 'Popen', recording_popen)
+        run = run_process([sys.executable, '-c', FSIZE_PROBE], "", timeout=10,
+                          limits=ResourceLimits(max_file_size_mb=1, heap_mb=None))
+
+        assert run["stdout"].strip() == str(1024 * 1024)
+        assert all('preexec_fn' not in kwargs for kwargs in calls)
+
+    def test_shell_wrapper_without_prlimit(self, monkeypatch):
+        """Sans prlimit, les limites sont posées par un shell avant la commande."""
+        monkeypatch.delattr(sandbox.resource, 'prlimit', raising=False)
+        process = spawn([sys.executable, '-c', FSIZE_PROBE], ResourceLimits(max_file_size_mb=1, heap_mb=None),
+                        stdout=subprocess.PIPE)
+        stdout, _ = process.communicate(timeout=10)
+
+        assert stdout.decode().strip() == str(1024 * 1024)
+
+    def test_cpu_limit_can_be_left_out(self):
+        """Une JVM partagée reçoit les limites sauf RLIMIT_CPU, contrôlé par exécution."""
+        process = spawn([sys.executable, '-c', "import resource; print(resource.getrlimit(resource.RLIMIT_CPU)[0])"],
+                        ResourceLimits(cpu_seconds=1, heap_mb=None), include_cpu=False, stdout=subprocess.PIPE)
+        stdout, _ = process.communicate(timeout=10)
+
+        assert int(stdout.decode()) != 1
+
+
+@requires_proc
+class TestProcessUsage:
+    """Tests de la mesure d'une exécution dans un processus partagé."""
+
+    @pytest.fixture
+    def busy_process(self):
+        """Processus qui consomme du temps CPU jusqu'à son arrêt."""
+        process = subprocess.Popen([sys.executable, '-c', "data = bytearray(16 * 1024 * 1024)\nwhile True: pass"])
+        yield process
+        process.kill()
+        process.wait()
+
+    def test_measures_run(self, busy_process):
+        """Le temps CPU est compté depuis start() et le pic mémoire est rapporté."""
+        usage = ProcessUsage(busy_process.pid)
+        time.sleep(0.5)
+        usage.start()
+        time.sleep(0.5)
+
+        assert 0.2 <= usage.cpu_time() <= 1.0
+        assert usage.peak_rss_kb() >= 16 * 1024
+
+    def test_cpu_limit_interrupts_wait(self, busy_process):
+        """L'attente d'une réponse s'arrête dès que le temps CPU de l'exécution est dépassé."""
+        usage = ProcessUsage(busy_process.pid)
+        usage.start()
+        started = time.monotonic()
+
+        with pytest.raises(CpuLimitExceeded):
+            next_response(queue.Queue(), started + 20, usage, ResourceLimits(cpu_seconds=1))
+        assert time.monotonic() - started < 5
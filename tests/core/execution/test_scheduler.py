@@ -0,0 +1,75 @@
+from teach_assit.core.execution.scheduler import ExecutionScheduler, default_worker_count
+
+
+class FakeExecutor:
+    """Exécuteur factice qui renvoie l'entrée en sortie."""
+
+    instances = []
+
+    def __init__(self):
+        self.cleaned = False
+        FakeExecutor.instances.append(self)
+
+    def compile_batch(self, files):
+        return {key: (True, "Compilation réussie") for key in files}
+
+    def adopt_precompiled(self, other):
+        pass
+
+    def test_with_inputs(self, file_path, test_inputs, timeout=5, force_rerun=False):
+        return [{"input": value, "success": True, "compilation_error": False,
+                 "stdout": f"{file_path}:{value}", "stderr": ""} for value in test_inputs]
+
+    def clean_up(self):
+        self.cleaned = True
+
+
+class TestExecutionScheduler:
+    """Tests pour l'ordonnanceur d'exécution parallèle."""
+
+    def setup_method(self):
+        FakeExecutor.instances = []
+
+    def test_runs_all_jobs_and_reports_progress(self):
+        """Chaque job produit un résultat et la progression atteint le total."""
+        jobs = [{"file_path": f"Etudiant{i}/Main.java", "test_inputs": ["1", "2"], "student": i} for i in range(10)]
+        received = {}
+        progress = []
+
+        scheduler = ExecutionScheduler(max_workers=4, executor_factory=FakeExecutor)
+        completed = scheduler.run(jobs, lambda job, results: received.setdefault(job["student"], results),
+                                  lambda done, total: progress.append((done, total)))
+
+        assert completed is True
+        assert sorted(received) == list(range(10))
+        assert received[3][1]["stdout"] == "Etudiant3/Main.java:2"
+        assert progress[0] == (0, 10) and progress[-1] == (10, 10)
+        assert all(executor.cleaned for executor in FakeExecutor.instances)
+
+    def test_cancel_skips_pending_jobs(self):
+        """Après une annulation, les jobs non démarrés ne sont pas exécutés."""
+        jobs = [{"file_path": f"Etudiant{i}/Main.java", "test_inputs": ["1"]} for i in range(50)]
+        scheduler = ExecutionScheduler(max_workers=1, executor_factory=FakeExecutor)
+        received = []
+
+        def on_result(job, results):
+            received.append(job)
+            scheduler.cancel()
+
+        assert scheduler.run(jobs, on_result) is False
+        assert len(received) < len(jobs)
+
+    def test_cancel_before_run_is_kept(self):
+        """Une annulation demandée avant le démarrage de run() n'est pas perdue."""
+        jobs = [{"file_path": f"Etudiant{i}/Main.java", "test_inputs": ["1"]} for i in range(5)]
+        scheduler = ExecutionScheduler(max_workers=2, executor_factory=FakeExecutor)
+        received = []
+
+        scheduler.cancel()
+        assert scheduler.run(jobs, lambda job, results: received.append(job)) is False
+        assert received == []
+        assert FakeExecutor.instances == []
+
+    def test_default_worker_count_is_positive(self):
+        assert default_worker_count() >= 1
+        assert default_worker_count(jvm_memory_mb=10 ** 9) == 1
@@ -0,0 +1,104 @@
+import os
+import shutil
+import zipfile
+import pytest
+
+from teach_assit.core.execution.code_executor import JavaExecutor
+from teach_assit.core.submission_fs import SubmissionFileSystem, archive_root, split_archive_path
+from teach_assit.utils.submission_index import SubmissionIndex
+
+
+ARCHIVED_PROGRAM = """
+import java.util.Scanner;
+
+public class Salutation {
+    public static void main(String[] args) {
+        Scanner scanner = new Scanner(System.in);
+        System.out.println("Bonjour " + scanner.nextLine());
+    }
+}
+"""
+
+
+class TestSubmissionFileSystem:
+    """Tests pour la lecture des soumissions directement dans les archives."""
+
+    @pytest.fixture
+    def student_zip(self, tmp_path):
+        """Créer l'archive d'un étudiant avec un fichier Java dans un sous-dossier."""
+        zip_path = str(tmp_path / "Dupont.zip")
+        with zipfile.ZipFile(zip_path, 'w') as zip_file:
+            zip_file.writestr("Main.java", "public class Main {}")
+            zip_file.writestr("src/RacineCarree.java", "public class RacineCarree {}")
+            zip_file.writestr("README.txt", "exercice")
+        return zip_path
+
+    def test_paths(self, student_zip):
+        """Un chemin virtuel se découpe en archive et chemin relatif ; un chemin réel non."""
+        path = os.path.join(archive_root(student_zip), "src", "RacineCarree.java")
+        assert split_archive_path(path) == (student_zip, os.path.join("src", "RacineCarree.java"))
+        assert split_archive_path(archive_root(student_zip)) == (student_zip, '')
+        assert split_archive_path(student_zip) is None
+
+    def test_read_and_materialize(self, student_zip, tmp_path):
+        """Les sources sont lues sans extraction ; seul le fichier demandé est écrit."""
+        fs = SubmissionFileSystem(max_open=1)
+        root = archive_root(student_zip)
+        assert fs.list_sources(student_zip) == ["Main.java", os.path.join("src", "RacineCarree.java")]
+        assert fs.read_text(os.path.join(root, "src", "RacineCarree.java")) == "public class RacineCarree {}"
+        assert fs.exists(os.path.join(root, "Main.java"))
+        assert not fs.exists(os.path.join(root, "Absent.java"))
+        with pytest.raises(FileNotFoundError):
+            fs.read_bytes(os.path.join(root, "Absent.java"))
+
+        target = str(tmp_path / "compile" / "Main.java")
+        fs.materialize(os.path.join(root, "Main.java"), target)
+        assert sorted(os.listdir(tmp_path)) == ["Dupont.zip", "compile"]
+        with open(target, encoding='utf-8') as f:
+            assert f.read() == "public class Main {}"
+        fs.close()
+
+    def test_index_archive_student(self, student_zip):
+        """L'index des soumissions recense les fichiers d'une archive déclarée comme dossier."""
+        index = SubmissionIndex(refresh_interval=0)
+        index.add_student_dir("Dupont", archive_root(student_zip))
+        path = index.find_exercise("dupont", "racine-carree")
+        assert path == os.path.join(archive_root(student_zip), "src", "RacineCarree.java")
+        assert [os.path.basename(p) for p in index.get_student_files("Dupont", recursive=False)] == ["Main.java"]
+
+
+@pytest.mark.skipif(shutil.which('javac') is None, reason="JDK non disponible")
+class TestArchiveExecution:
+    """Tests pour l'exécution d'un fichier lu directement dans une archive."""
+
+    @pytest.fixture
+    def archived_program(self, tmp_path):
+        """Créer une archive contenant un programme dont le fichier ne porte pas le nom de la classe."""
+        zip_path = str(tmp_path / "Dupont.zip")
+        with zipfile.ZipFile(zip_path, 'w') as zip_file:
+            zip_file.writestr("src/exercice.java", ARCHIVED_PROGRAM)
+        return os.path.join(archive_root(zip_path), "src", "exercice.java")
+
+    def test_java_executor_runs_archived_file(self, archived_program, tmp_path):
+        """L'exécuteur compile et exécute le fichier sans extraire l'archive."""
+        executor = JavaExecutor()
+        try:
+            results = executor.test_with_inputs(archived_program, ["Paul"])
+            assert results[0]["success"] is True
+            assert "Bonjour Paul" in results[0]["stdout"]
+            assert executor.compile_batch({"Dupont": archived_program})["Dupont"][0] is True
+        finally:
+            executor.clean_up()
+        assert sorted(os.listdir(tmp_path)) == ["Dupont.zip"]
+
+    def test_code_executor_runs_archived_file(self, archived_program):
+        """Le code de l'interface compile et exécute un fichier d'archive de bout en bout."""
+        execution = pytest.importorskip("teach_assit.gui.results_widget.execution")
+        code_executor = execution.CodeExecutor()
+        try:
+            assert code_executor.compile_all([archived_program])[archived_program][0] is True
+            results = code_executor.execute_code(archived_program, ["Paul"])
+            assert results[0].get("compilation_error") is not True
+            assert "Bonjour Paul" in results[0]["stdout"]
+        finally:
+            code_executor.executor.clean_up()
@@ -3,6 +3,7 @@ import pytest
 import tempfile
 import zipfile
 import shutil
+from teach_assit.core.database.db_manager import DatabaseManager
 from teach_assit.utils.file_utils import SubmissionManager
 
 
@@ -56,10 +57,17 @@ class TestSubmissionManager:
         
         return temp_dir
     
-    def test_list_zip_files(self, create_test_zip):
+    @pytest.fixture
+    def db_manager(self, tmp_path):
+        """Base de données temporaire (la base de l'application n'est pas modifiée)."""
+        db = DatabaseManager(str(tmp_path / "test.db"))
+        yield db
+        db.close()
+    
+    def test_list_zip_files(self, create_test_zip, db_manager):
         """Tester la fonction list_zip_files."""
         temp_dir = create_test_zip
-        manager = SubmissionManager()
+        manager = SubmissionManager(db_manager=db_manager)
         manager.set_base_directory(temp_dir)
         
         zip_files = manager.list_zip_files()
@@ -67,10 +75,10 @@ class TestSubmissionManager:
         assert "Dupont_Jean.zip" in zip_files
         assert "Invalid.zip" in zip_files
     
-    def test_extract_valid_zip(self, create_test_zip):
+    def test_extract_valid_zip(self, create_test_zip, db_manager):
         """Tester l'extraction d'un fichier ZIP valide."""
         temp_dir = create_test_zip
-        manager = SubmissionManager()
+        manager = SubmissionManager(db_manager=db_manager)
         manager.set_base_directory(temp_dir)
         
         success, message = manager.extract_zip_file("Dupont_Jean.zip")
@@ -86,20 +94,20 @@ class TestSubmissionManager:
         assert "Main.java" in java_files
         assert os.path.join("utils", "Helper.java").replace("\\", "/") in [f.replace("\\", "/") for f in java_files]
     
-    def test_extract_invalid_zip(self, create_test_zip):
+    def test_extract_invalid_zip(self, create_test_zip, db_manager):
         """Tester l'extraction d'un fichier ZIP invalide."""
         temp_dir = create_test_zip
-        manager = SubmissionManager()
+        manager = SubmissionManager(db_manager=db_manager)
         manager.set_base_directory(temp_dir)
         
         success, message = manager.extract_zip_file("Invalid.zip")
         assert success is False
         assert "Fichier ZIP corrompu ou invalide" in message
     
-    def test_extract_all_zip_files(self, create_test_zip):
+    def test_extract_all_zip_files(self, create_test_zip, db_manager):
         """Tester l'extraction de tous les fichiers ZIP."""
         temp_dir = create_test_zip
-        manager = SubmissionManager()
+        manager = SubmissionManager(db_manager=db_manager)
         manager.set_base_directory(temp_dir)
         
         results = manager.extract_all_zip_files()
@@ -109,10 +117,68 @@ class TestSubmissionManager:
         assert results["Dupont_Jean.zip"][0] is True  # Succès
         assert results["Invalid.zip"][0] is False  # Échec
     
-    def test_clean_extraction_directory(self, create_test_zip):
+    def test_extract_reports_progress_and_records_files(self, create_test_zip, db_manager):
+        """La progression est signalée par archive ; les fichiers du répertoire central sont enregistrés."""
+        temp_dir = create_test_zip
+        manager = SubmissionManager(db_manager=db_manager)
+        manager.set_base_directory(temp_dir)
+        
+        calls = []
+        results = manager.extract_zip_files(["Dupont_Jean.zip", "Invalid.zip"],
+                                            progress_callback=lambda *args: calls.append(args))
+        assert sorted(call[2] for call in calls) == ["Dupont_Jean.zip", "Invalid.zip"]
+        assert [call[:2] for call in calls] == [(1, 2), (2, 2)]
+        assert results["Dupont_Jean.zip"][0] is True
+        
+        folder = manager.get_extracted_folders_from_db(manager.student_folders["Dupont_Jean"]["zip_id"])[0]
+        assert folder[1] == os.path.join(manager.extraction_dir, "Dupont_Jean")
+        files = manager.get_extracted_files_from_db(folder[0])
+        assert sorted(os.path.basename(row[1]) for row in files) == ["Helper.java", "Main.java", "README.txt"]
+        assert all(os.path.exists(row[1]) for row in files)
+    
+    def test_reextract_reuses_unchanged_archives(self, create_test_zip, db_manager):
+        """Une archive inchangée n'est pas extraite de nouveau ; une archive modifiée l'est."""
+        temp_dir = create_test_zip
+        manager = SubmissionManager(db_manager=db_manager)
+        manager.set_base_directory(temp_dir)
+        manager.extract_zip_file("Dupont_Jean.zip")
+        first = dict(manager.student_folders["Dupont_Jean"])
+        
+        manager.extraction_dir = os.path.join(temp_dir, "extracted_second")
+        success, message = manager.extract_zip_file("Dupont_Jean.zip")
+        assert success is True
+        assert "Archive déjà importée : 2 fichier(s) Java" in message
+        assert manager.student_folders["Dupont_Jean"]["path"] == first["path"]
+        assert manager.student_folders["Dupont_Jean"]["zip_id"] == first["zip_id"]
+        assert not os.path.exists(os.path.join(manager.extraction_dir, "Dupont_Jean"))
+        
+        with zipfile.ZipFile(os.path.join(temp_dir, "Dupont_Jean.zip"), 'a') as zip_file:
+            zip_file.writestr("Extra.java", "public class Extra {}")
+        success, message = manager.extract_zip_file("Dupont_Jean.zip")
+        assert "Extraction réussie : 3 fichier(s) Java" in message
+        assert manager.student_folders["Dupont_Jean"]["path"] == os.path.join(manager.extraction_dir, "Dupont_Jean")
+    
+    def test_zero_extraction_reads_from_archive(self, create_test_zip, db_manager):
+        """En mode sans extraction, aucun fichier n'est écrit et les sources sont lues dans le ZIP."""
+        temp_dir = create_test_zip
+        manager = SubmissionManager(zero_extraction=True, db_manager=db_manager)
+        manager.set_base_directory(temp_dir)
+        
+        success, message = manager.extract_zip_file("Dupont_Jean.zip")
+        assert success is True
+        assert "sans extraction : 2 fichier(s) Java" in message
+        assert not os.path.exists(manager.extraction_dir)
+        assert manager.student_folders["Dupont_Jean"]["path"] == os.path.join(temp_dir, "Dupont_Jean.zip!")
+        assert "public class Helper" in manager.read_source("Dupont_Jean", os.path.join("utils", "Helper.java"))
+        
+        folder = manager.get_extracted_folders_from_db(manager.student_folders["Dupont_Jean"]["zip_id"])[0]
+        files = manager.get_extracted_files_from_db(folder[0])
+        assert sorted(os.path.basename(row[1]) for row in files) == ["Helper.java", "Main.java"]
+    
+    def test_clean_extraction_directory(self, create_test_zip, db_manager):
         """Tester le nettoyage du répertoire d'extraction."""
         temp_dir = create_test_zip
-        manager = SubmissionManager()
+        manager = SubmissionManager(db_manager=db_manager)
         manager.set_base_directory(temp_dir)
         
         # Extraire d'abord un fichier
@@ -127,4 +193,23 @@ class TestSubmissionManager:
         assert "supprimé avec succès" in message
         
         # Vérifier que le répertoire a bien été supprimé
-        assert not os.path.exists(manager.extraction_dir) 
\ No newline at end of file
+        assert not os.path.exists(manager.extraction_dir)         
+        # Les dossiers supprimés ne sont plus proposés, même après redémarrage
+        zip_id = manager.get_all_zip_files_from_db()[0][0]
+        assert manager.get_extracted_folders_from_db(zip_id) == []
+        assert SubmissionManager(db_manager=db_manager).get_student_folders() == {}
+        
+        # L'archive est extraite de nouveau au prochain import
+        manager.set_base_directory(temp_dir)
+        success, message = manager.extract_zip_file("Dupont_Jean.zip")
+        assert "Extraction réussie : 2 fichier(s) Java" in message
+    
+    def test_student_folders_skip_missing_directories(self, create_test_zip, db_manager):
+        """Un dossier supprimé hors de l'application n'est pas proposé à l'analyse."""
+        temp_dir = create_test_zip
+        manager = SubmissionManager(db_manager=db_manager)
+        manager.set_base_directory(temp_dir)
+        manager.extract_zip_file("Dupont_Jean.zip")
+        shutil.rmtree(manager.extraction_dir)
+        
+        assert SubmissionManager(db_manager=db_manager).get_student_folders() == {}
@@ -0,0 +1,45 @@
+import os
+from teach_assit.utils.submission_index import SubmissionIndex, name_tokens
+
+
+def write_java(path):
+    """Créer un fichier Java vide (et ses dossiers)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("public class A {}")
+
+
+class TestSubmissionIndex:
+    """Tests pour l'index des soumissions."""
+    
+    def test_lookups(self, tmp_path):
+        """Recherche par nom, par identifiant d'exercice et par mots-clés."""
+        root = tmp_path / "TD3"
+        write_java(str(root / "GOGO" / "09-fonction-racine-carree.java"))
+        write_java(str(root / "GOGO" / "_temp_java_files" / "CompteurMots.java"))
+        write_java(str(root / "SAM" / "RacineCarree.java"))
+        index = SubmissionIndex([str(tmp_path / "TD*")])
+        
+        assert index.find("gogo", "CompteurMots.java").endswith("CompteurMots.java")
+        assert index.find_exercise("GOGO", "09-fonction-racine-carree").endswith("09-fonction-racine-carree.java")
+        assert index.find_exercise("SAM", "racine-carree").endswith("RacineCarree.java")
+        assert index.find_exercise("SAM", "09-fonction-racine-carree") is None
+        assert index.find_similar("SAM", "09-fonction-racine-carree.java").endswith("RacineCarree.java")
+        assert [os.path.basename(p) for p in index.get_student_files("GOGO", recursive=False)] == ["09-fonction-racine-carree.java"]
+        assert name_tokens("SequenceNumeriqueDoWhile.java") == {"sequence", "numerique", "while"}
+    
+    def test_incremental_refresh(self, tmp_path):
+        """Les fichiers ajoutés ou supprimés sont pris en compte, les autres dossiers ne sont pas relus."""
+        student_dir = tmp_path / "extracted" / "ARES"
+        write_java(str(student_dir / "Triangle.java"))
+        index = SubmissionIndex(refresh_interval=0)
+        index.add_student_dir("ARES", str(student_dir))
+        assert index.find("ares", "Sequence.java") is None
+        
+        write_java(str(student_dir / "src" / "Sequence.java"))
+        assert index.find("ares", "Sequence.java").endswith(os.path.join("src", "Sequence.java"))
+        assert index.find("ares", "src/Sequence.java")
+        
+        os.remove(str(student_dir / "Triangle.java"))
+        os.utime(str(student_dir), ns=(0, 1))
+        assert index.find("ares", "Triangle.java") is None